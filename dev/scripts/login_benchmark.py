@@ -0,0 +1,70 @@
+# This file is part of the Reproducible and Reusable Data Analysis Workflow
+# Server (flowServ).
+#
+# Copyright (C) 2019-2021 NYU.
+#
+# flowServ is free software; you can redistribute it and/or modify it under the
+# terms of the MIT License; see LICENSE file for more details.
+
+"""Benchmark for login throughput. Registers one user per client and then runs
+a burst of concurrent login requests against a SQLite database in a temporary
+directory. Reports the number of logins per second for different numbers of
+password hash rounds.
+
+Note that the size of the hashing worker pool is fixed once the pool is
+created. Run the script with different values for the number of workers to
+compare the effect of the pool size.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import sys
+import tempfile
+import time
+
+from flowserv.model.database import DB, TEST_DB
+from flowserv.model.user import UserManager
+
+
+def login(db: DB, username: str, rounds: int, workers: int):
+    """Login the given user in a new database session."""
+    with db.session() as session:
+        users = UserManager(session, hash_rounds=rounds, hash_workers=workers)
+        users.login_user(username, 'pwd')
+
+
+def run(rounds: int, workers: int, clients: int, requests: int) -> float:
+    """Run the login benchmark. Returns the number of logins per second."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        db = DB(connect_url=TEST_DB(tmpdir)).init()
+        usernames = ['user{}'.format(i) for i in range(clients)]
+        with db.session() as session:
+            users = UserManager(session, hash_rounds=rounds, hash_workers=workers)
+            for username in usernames:
+                users.register_user(username, 'pwd')
+        # Login each user once to create the API keys.
+        for username in usernames:
+            login(db, username, rounds, workers)
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=clients) as executor:
+            futures = [
+                executor.submit(login, db, usernames[i % clients], rounds, workers)
+                for i in range(requests)
+            ]
+            for f in futures:
+                f.result()
+        return requests / (time.perf_counter() - start)
+
+
+if __name__ == '__main__':
+    args = sys.argv[1:]
+    if len(args) > 3:
+        print('usage: [<workers> [<clients> [<requests>]]]')
+        sys.exit(-1)
+    workers = int(args[0]) if len(args) > 0 else 2
+    clients = int(args[1]) if len(args) > 1 else 16
+    requests = int(args[2]) if len(args) > 2 else 200
+    print('workers={}, clients={}, requests={}'.format(workers, clients, requests))
+    for rounds in [1000, 10000, 29000, 100000]:
+        rate = run(rounds=rounds, workers=workers, clients=clients, requests=requests)
+        print('rounds={:>6}: {:8.1f} logins/sec'.format(rounds, rate))
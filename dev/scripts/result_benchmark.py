@@ -0,0 +1,85 @@
+# This file is part of the Reproducible and Reusable Data Analysis Workflow
+# Server (flowServ).
+#
+# Copyright (C) 2019-2021 NYU.
+#
+# flowServ is free software; you can redistribute it and/or modify it under the
+# terms of the MIT License; see LICENSE file for more details.
+
+"""Benchmark for reading run results from result files of different sizes.
+Compares loading the full result document and querying each column path
+with the compiled result extractor. Result files are generated in JSON and
+YAML format in a temporary directory. Each result file contains the values for
+the result columns followed by a large array of additional data.
+"""
+
+import json
+import os
+import sys
+import tempfile
+import time
+import yaml
+
+from flowserv.model.parameter.numeric import PARA_FLOAT, PARA_INT
+from flowserv.model.result import extractor
+from flowserv.model.template.schema import ResultColumn, ResultSchema
+
+import flowserv.util as util
+
+
+SCHEMA = ResultSchema(
+    result_file='results.json',
+    columns=[
+        ResultColumn('count', 'Total Count', PARA_INT, path='summary/count'),
+        ResultColumn('avg', 'Average', PARA_FLOAT, path='summary/stats/avg')
+    ]
+)
+
+
+def baseline(filename: str, format: str) -> dict:
+    """Read the full result document and query the column paths."""
+    with open(filename, 'rb') as f:
+        if format == util.FORMAT_YAML:
+            doc = yaml.load(f, Loader=yaml.FullLoader)
+        else:
+            doc = json.load(f)
+    return {c.column_id: util.jquery(doc=doc, path=c.jpath()) for c in SCHEMA.columns}
+
+
+def compiled(filename: str, format: str) -> dict:
+    """Read the column values with the compiled result extractor."""
+    with open(filename, 'rb') as f:
+        return extractor(SCHEMA).read(f, format=format)
+
+
+def run(basedir: str, rows: int, format: str, repeat: int):
+    """Run the benchmark for a result file with the given number of rows."""
+    doc = {
+        'summary': {'count': rows, 'stats': {'avg': 0.5}},
+        'rows': [{'id': i, 'value': i / 2, 'label': 'row {}'.format(i)} for i in range(rows)]
+    }
+    filename = os.path.join(basedir, 'results.{}'.format(format.lower()))
+    util.write_object(filename=filename, obj=doc, format=format)
+    size = os.stat(filename).st_size / (1024 * 1024)
+    timings = list()
+    for func in [baseline, compiled]:
+        start = time.perf_counter()
+        for _ in range(repeat):
+            values = func(filename, format)
+        timings.append((time.perf_counter() - start) / repeat)
+        assert values == {'count': rows, 'avg': 0.5}
+    print('{:>4} {:>8} rows {:8.2f} MB: full {:8.3f}s, compiled {:8.3f}s'.format(
+        format, rows, size, *timings
+    ))
+
+
+if __name__ == '__main__':
+    args = sys.argv[1:]
+    if len(args) > 1:
+        print('usage: [<repeat>]')
+        sys.exit(-1)
+    repeat = int(args[0]) if args else 3
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for format in [util.FORMAT_JSON, util.FORMAT_YAML]:
+            for rows in [100, 10000, 100000]:
+                run(basedir=tmpdir, rows=rows, format=format, repeat=repeat)
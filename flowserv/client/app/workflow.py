@@ -16,7 +16,7 @@ import time
 from flowserv.client.app.run import Run
 from flowserv.model.files import FileHandle
 from flowserv.model.template.parameter import ParameterIndex
-from flowserv.service.api import APIFactory
+from flowserv.service.api import API, APIFactory
 from flowserv.service.run.argument import serialize_arg, serialize_fh
 from flowserv.volume.base import IOHandle, IOBuffer
 from flowserv.volume.fs import FSFile
@@ -213,40 +213,7 @@ class Workflow(object):
         """
         arguments = self._parameters.set_defaults(arguments=arguments)
         with self.service() as api:
-            # Upload any argument values as files that are either of type
-            # StringIO or BytesIO.
-            arglist = list()
-            for key, val in arguments.items():
-                # Convert arguments to the format that is expected by the run
-                # manager. We pay special attention to file parameters. Input
-                # files may be represented as strings, IO buffers or file
-                # objects.
-                para = self._parameters.get(key)
-                if para is None:
-                    raise err.UnknownParameterError(key)
-                if para.is_file():
-                    # Upload a given file prior to running the application.
-                    upload_file = None
-                    target = None
-                    if isinstance(val, str):
-                        upload_file = FSFile(val)
-                    elif isinstance(val, StringIO):
-                        buf = BytesIO(val.read().encode('utf8'))
-                        upload_file = IOBuffer(buf)
-                    elif isinstance(val, BytesIO):
-                        upload_file = IOBuffer(val)
-                    elif isinstance(val, IOHandle):
-                        upload_file = val
-                    else:
-                        msg = 'invalid argument {} for {}'.format(key, val)
-                        raise err.InvalidArgumentError(msg)
-                    fh = api.uploads().upload_file(
-                        group_id=self.group_id,
-                        file=upload_file,
-                        name=key
-                    )
-                    val = serialize_fh(fh[filelbls.FILE_ID], target=target)
-                arglist.append(serialize_arg(key, val))
+            arglist = self._arglist(api=api, arguments=arguments)
             # Execute the run and return the serialized run handle.
             run = api.runs().start_run(
                 group_id=self.group_id,
@@ -254,13 +221,100 @@ class Workflow(object):
                 config=config
             )
             rh = Run(doc=run, service=self.service)
-            # Wait for run to finish if active an poll interval is given.
+            # Wait for run to finish if active an poll interval is given. The
+            # poll interval is the maximum time to block on a single state
+            # change.
             while poll_interval and rh.is_active():
-                time.sleep(poll_interval)
-                rh = self.poll_run(run_id=rh.run_id)
+                run = api.runs().wait_for_run(
+                    run_id=rh.run_id,
+                    state=run['state'],
+                    timeout=poll_interval
+                )
+                rh = Run(doc=run, service=self.service)
             pprun = self.get_postproc_results()
             if pprun is not None:
                 while poll_interval and pprun.is_active():
                     time.sleep(poll_interval)
                     pprun = self.get_postproc_results()
             return rh
+
+    def start_runs(
+        self, arguments: List[Dict], config: Optional[Dict] = None
+    ) -> List[Run]:
+        """Run the associated workflow for each of the given sets of arguments,
+        e.g., for a parameter sweep. All runs are submitted with a single call
+        to the run service. Does not wait for the runs to finish.
+
+        Parameters
+        ----------
+        arguments: list(dict)
+            List of dictionaries of user-provided arguments.
+        config: dict, default=None
+            Optional implementation-specific configuration settings that can be
+            used to overwrite settings that were initialized at object creation.
+
+        Returns
+        -------
+        list(flowserv.client.app.run.Run)
+        """
+        with self.service() as api:
+            argument_sets = list()
+            for args in arguments:
+                args = self._parameters.set_defaults(arguments=args)
+                argument_sets.append(self._arglist(api=api, arguments=args))
+            runs = api.runs().start_runs(
+                group_id=self.group_id,
+                argument_sets=argument_sets,
+                config=config
+            )
+            return [Run(doc=run, service=self.service) for run in runs]
+
+    def _arglist(self, api: API, arguments: Dict) -> List[Dict]:
+        """Convert the given arguments to the list of serialized arguments
+        that is expected by the run service. Upload any argument values for
+        file parameters.
+
+        Parameters
+        ----------
+        api: flowserv.service.api.API
+            Service API for file uploads.
+        arguments: dict
+            Dictionary of user-provided arguments.
+
+        Returns
+        -------
+        list(dict)
+        """
+        arglist = list()
+        for key, val in arguments.items():
+            # Convert arguments to the format that is expected by the run
+            # manager. We pay special attention to file parameters. Input
+            # files may be represented as strings, IO buffers or file
+            # objects.
+            para = self._parameters.get(key)
+            if para is None:
+                raise err.UnknownParameterError(key)
+            if para.is_file():
+                # Upload a given file prior to running the application.
+                upload_file = None
+                target = None
+                if isinstance(val, str):
+                    upload_file = FSFile(val)
+                elif isinstance(val, StringIO):
+                    buf = BytesIO(val.read().encode('utf8'))
+                    upload_file = IOBuffer(buf)
+                elif isinstance(val, BytesIO):
+                    upload_file = IOBuffer(val)
+                elif isinstance(val, IOHandle):
+                    upload_file = val
+                else:
+                    msg = 'invalid argument {} for {}'.format(key, val)
+                    raise err.InvalidArgumentError(msg)
+                fh = api.uploads().upload_file(
+                    group_id=self.group_id,
+                    file=upload_file,
+                    name=key
+                )
+                val = serialize_fh(fh[filelbls.FILE_ID], target=target)
+            arglist.append(serialize_arg(key, val))
+        return arglist
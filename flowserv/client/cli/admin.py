@@ -48,3 +48,18 @@ def init(force=False):
     if connect_url is None:
         raise err.MissingConfigurationError('database Url')
     DB(connect_url=connect_url).init()
+
+
+@click.command()
+def upgrade():
+    """Upgrade the database schema to the latest version."""
+    # Raise errors if the database URL is not set.
+    config = env()
+    connect_url = config.get(FLOWSERV_DB)
+    if connect_url is None:
+        raise err.MissingConfigurationError('database Url')
+    db = DB(connect_url=connect_url)
+    migrations = db.upgrade()
+    for m in migrations:
+        click.echo('Applied migration {} ({})'.format(m.version, m.description))
+    click.echo('Database schema is at version {}'.format(db.version()))
@@ -15,7 +15,7 @@ from typing import Dict
 import click
 import os
 
-from flowserv.client.cli.admin import configuration, init
+from flowserv.client.cli.admin import configuration, init, upgrade
 from flowserv.client.cli.app import cli_app
 from flowserv.client.cli.cleanup import cli_cleanup
 from flowserv.client.cli.group import cli_group
@@ -152,9 +152,10 @@ def cli_flowserv(ctx):
     )
 
 
-# Administrative tasks (init, config, and cleanup)
+# Administrative tasks (init, upgrade, config, and cleanup)
 cli_flowserv.add_command(configuration, name='config')
 cli_flowserv.add_command(init, name='init')
+cli_flowserv.add_command(upgrade, name='upgrade')
 cli_flowserv.add_command(cli_cleanup, name='cleanup')
 
 # Applications
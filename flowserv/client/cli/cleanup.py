@@ -10,7 +10,7 @@
 
 import click
 
-from flowserv.client.api import service
+from flowserv.client.api import ClientAPI, service
 from flowserv.client.cli.table import ResultTable
 from flowserv.model.parameter.base import PARA_STRING
 
@@ -28,10 +28,14 @@ from flowserv.model.parameter.base import PARA_STRING
 )
 def delete_obsolete_runs(before, state):
     """Delete old runs."""
+    def progress(count, total):
+        click.echo('{} of {} runs deleted ...'.format(count, total))
+
     with service() as api:
         count = api.runs().run_manager.delete_obsolete_runs(
             date=before,
-            state=state
+            state=state,
+            callback=progress
         )
         click.echo('{} runs deleted.'.format(count))
 
@@ -61,6 +65,19 @@ def list_obsolete_runs(before, state):
         click.echo(line)
 
 
+@click.command()
+@click.option(
+    '-f', '--fail',
+    is_flag=True,
+    default=False,
+    help='Set recovered runs to error state'
+)
+def recover_runs(fail):
+    """Recover pending runs of stopped processes."""
+    count = ClientAPI().recover_runs(fail=fail)
+    click.echo('{} runs recovered.'.format(count))
+
+
 # -- Command Group ------------------------------------------------------------
 
 @click.group()
@@ -71,3 +88,4 @@ def cli_cleanup():
 
 cli_cleanup.add_command(delete_obsolete_runs, name='delete')
 cli_cleanup.add_command(list_obsolete_runs, name='list')
+cli_cleanup.add_command(recover_runs, name='recover')
@@ -9,6 +9,7 @@
 """Command line interface to manage workflow runs."""
 
 import click
+import shutil
 
 from flowserv.client.api import service
 from flowserv.client.cli.parameter import read
@@ -60,7 +61,7 @@ def download_result_archive(output, run):
     with service() as api:
         buf = api.runs().get_result_archive(run_id=run).open()
         with open(output, 'wb') as local_file:
-            local_file.write(buf.read())
+            shutil.copyfileobj(buf, local_file)
 
 
 @click.command()
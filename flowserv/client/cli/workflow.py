@@ -11,6 +11,7 @@ workflow templates in the repository.
 """
 
 import click
+import shutil
 
 from flowserv.client.api import service
 from flowserv.client.cli.table import ResultTable
@@ -138,7 +139,7 @@ def download_result_archive(ctx, output, workflow):
     with service() as api:
         buf = api.workflows().get_result_archive(workflow_id=workflow_id).open()
         with open(output, 'wb') as local_file:
-            local_file.write(buf.read())
+            shutil.copyfileobj(buf, local_file)
 
 
 @click.command()
@@ -128,10 +128,16 @@ FLOWSERV_ACCESS_TOKEN = 'FLOWSERV_ACCESS_TOKEN'
 FLOWSERV_AUTH_LOGINTTL = 'FLOWSERV_AUTH_TTL'
 # Authentication policy
 FLOWSERV_AUTH = 'FLOWSERV_AUTH'
+# Number of rounds for password hashes
+FLOWSERV_AUTH_HASHROUNDS = 'FLOWSERV_AUTH_HASHROUNDS'
+# Number of threads for computing and verifying password hashes
+FLOWSERV_AUTH_HASHWORKERS = 'FLOWSERV_AUTH_HASHWORKERS'
 
 
 """Default values for environment variables."""
 DEFAULT_LOGINTTL = 24 * 60 * 60
+DEFAULT_HASHROUNDS = 29000
+DEFAULT_HASHWORKERS = 2
 # Access policies
 AUTH_DEFAULT = 'default'
 AUTH_OPEN = 'open'
@@ -157,6 +163,29 @@ DEFAULT_ASYNC = 'True'
 FLOWSERV_POLL_INTERVAL = 'FLOWSERV_POLLINTERVAL'
 DEFAULT_POLL_INTERVAL = 2
 
+# Quiet period and maximum delay (in sec.) for post-processing runs. If the
+# quiet period is zero, post-processing runs are started synchronously after
+# each successful run.
+FLOWSERV_POSTPROC_DELAY = 'FLOWSERV_POSTPROC_DELAY'
+FLOWSERV_POSTPROC_MAXDELAY = 'FLOWSERV_POSTPROC_MAXDELAY'
+DEFAULT_POSTPROC_DELAY = 0
+DEFAULT_POSTPROC_MAXDELAY = 60
+
+# Maximum number of active runs in total, per workflow group, and per workflow.
+# Runs are queued if a limit is reached. There are no limits by default.
+FLOWSERV_RUNS_MAX = 'FLOWSERV_RUNS_MAX'
+FLOWSERV_RUNS_GROUPQUOTA = 'FLOWSERV_RUNS_GROUPQUOTA'
+FLOWSERV_RUNS_WORKFLOWQUOTA = 'FLOWSERV_RUNS_WORKFLOWQUOTA'
+# Fair-share weights for workflow groups. The value is a dictionary (or the
+# path to a file containing the dictionary) that maps group identifier to
+# weights. These weights take precedence over the weights in the engine
+# configuration of a workflow.
+FLOWSERV_RUNS_WEIGHTS = 'FLOWSERV_RUNS_WEIGHTS'
+# Unique identifier for the run scheduler of an API process. Pending runs of a
+# process are recovered when it restarts if the identifier is stable.
+# Otherwise, a new identifier is created for each process.
+FLOWSERV_RUNS_OWNER = 'FLOWSERV_RUNS_OWNER'
+
 
 # -- Client -------------------------------------------------------------------
 
@@ -270,6 +299,33 @@ class Config(dict):
         self[FLOWSERV_AUTH] = AUTH_OPEN
         return self
 
+    def password_hashing(self, rounds: int, workers: Optional[int] = None) -> Config:
+        """Set the number of rounds for password hashes and (optionally) the
+        number of threads that compute and verify password hashes.
+
+        Returns
+        -------
+        flowserv.config.Config
+        """
+        self[FLOWSERV_AUTH_HASHROUNDS] = rounds
+        if workers is not None:
+            self[FLOWSERV_AUTH_HASHWORKERS] = workers
+        return self
+
+    def postproc_delay(self, delay: float, max_delay: Optional[float] = None) -> Config:
+        """Set the quiet period and (optionally) the maximum delay for
+        post-processing runs. Use a quiet period of zero to start
+        post-processing runs synchronously.
+
+        Returns
+        -------
+        flowserv.config.Config
+        """
+        self[FLOWSERV_POSTPROC_DELAY] = delay
+        if max_delay is not None:
+            self[FLOWSERV_POSTPROC_MAXDELAY] = max_delay
+        return self
+
     def run_async(self) -> Config:
         """Set the run asynchronous flag to True.
 
@@ -280,6 +336,40 @@ class Config(dict):
         self[FLOWSERV_ASYNC] = True
         return self
 
+    def run_quota(
+        self, max_runs: Optional[int] = None, group: Optional[int] = None,
+        workflow: Optional[int] = None
+    ) -> Config:
+        """Set the maximum number of active runs in total, per workflow group,
+        and per workflow. Runs that exceed a limit are queued.
+
+        Returns
+        -------
+        flowserv.config.Config
+        """
+        if max_runs is not None:
+            self[FLOWSERV_RUNS_MAX] = max_runs
+        if group is not None:
+            self[FLOWSERV_RUNS_GROUPQUOTA] = group
+        if workflow is not None:
+            self[FLOWSERV_RUNS_WORKFLOWQUOTA] = workflow
+        return self
+
+    def run_weights(self, weights: Dict[str, float]) -> Config:
+        """Set the fair-share weights for workflow groups.
+
+        Parameters
+        ----------
+        weights: dict
+            Mapping of group identifier to fair-share weights.
+
+        Returns
+        -------
+        flowserv.config.Config
+        """
+        self[FLOWSERV_RUNS_WEIGHTS] = weights
+        return self
+
     def run_sync(self) -> Config:
         """Set the run asynchronous flag to False.
 
@@ -418,9 +508,18 @@ ENV = [
     (FLOWSERV_APP, None, None),
     (FLOWSERV_AUTH_LOGINTTL, DEFAULT_LOGINTTL, to_int),
     (FLOWSERV_AUTH, AUTH_DEFAULT, None),
+    (FLOWSERV_AUTH_HASHROUNDS, DEFAULT_HASHROUNDS, to_int),
+    (FLOWSERV_AUTH_HASHWORKERS, DEFAULT_HASHWORKERS, to_int),
     (FLOWSERV_BACKEND_CLASS, None, None),
     (FLOWSERV_BACKEND_MODULE, None, None),
     (FLOWSERV_POLL_INTERVAL, DEFAULT_POLL_INTERVAL, to_float),
+    (FLOWSERV_POSTPROC_DELAY, DEFAULT_POSTPROC_DELAY, to_float),
+    (FLOWSERV_POSTPROC_MAXDELAY, DEFAULT_POSTPROC_MAXDELAY, to_float),
+    (FLOWSERV_RUNS_MAX, None, to_int),
+    (FLOWSERV_RUNS_GROUPQUOTA, None, to_int),
+    (FLOWSERV_RUNS_WORKFLOWQUOTA, None, to_int),
+    (FLOWSERV_RUNS_WEIGHTS, None, read_config_obj),
+    (FLOWSERV_RUNS_OWNER, None, None),
     (FLOWSERV_ACCESS_TOKEN, None, None),
     (FLOWSERV_CLIENT, LOCAL_CLIENT, None),
     (FLOWSERV_DB, None, None),
@@ -27,7 +27,7 @@ providing access to these files.
 """
 
 from abc import ABCMeta, abstractmethod
-from typing import Dict, Optional, Tuple
+from typing import Dict, List, Optional, Tuple
 
 from flowserv.model.base import RunObject
 from flowserv.model.template.base import WorkflowTemplate
@@ -98,3 +98,44 @@ class WorkflowController(metaclass=ABCMeta):  # pragma: no cover
         flowserv.model.workflow.state.WorkflowState, flowserv.volume.base.StorageVolume
         """
         raise NotImplementedError()  # pragma: no cover
+
+    def exec_workflows(
+        self, runs: List[Tuple[RunObject, Dict]], template: WorkflowTemplate,
+        staticfs: StorageVolume, config: Optional[Dict] = None
+    ) -> List[Tuple[WorkflowState, StorageVolume]]:
+        """Initiate the execution of a given workflow template for multiple
+        runs. Each run is given as a tuple of run handle and the dictionary of
+        argument values for the run. Returns the list of workflow states and
+        run storage volumes in the order of the given runs.
+
+        The default implementation calls :meth:`exec_workflow` for each run.
+        Implementations can override this method to submit runs to the
+        workflow engine in bulk.
+
+        Parameters
+        ----------
+        runs: list of (flowserv.model.base.RunObject, dict)
+            Handles and argument values for the runs that are being executed.
+        template: flowserv.model.template.base.WorkflowTemplate
+            Workflow template containing the parameterized specification and
+            the parameter declarations.
+        staticfs: flowserv.volume.base.StorageVolume
+            Storage volume that contains the static files from the workflow
+            template.
+        config: dict, default=None
+            Optional implementation-specific configuration settings that can be
+            used to overwrite settings that were initialized at object creation.
+
+        Returns
+        -------
+        list of (flowserv.model.workflow.state.WorkflowState, flowserv.volume.base.StorageVolume)
+        """
+        return [
+            self.exec_workflow(
+                run=run,
+                template=template,
+                arguments=arguments,
+                staticfs=staticfs,
+                config=config
+            ) for run, arguments in runs
+        ]
@@ -16,7 +16,10 @@ workflow execution, get workflow status, and to download workflow result files.
 from __future__ import annotations
 from abc import ABCMeta, abstractmethod
 from dataclasses import dataclass
-from typing import Dict, List
+from typing import Callable, Dict, List, Optional
+
+import logging
+import random
 
 from flowserv.model.base import RunObject
 from flowserv.model.template.base import WorkflowTemplate
@@ -24,6 +27,65 @@ from flowserv.model.workflow.state import WorkflowState
 from flowserv.volume.base import StorageVolume
 
 
+@dataclass
+class PollingPolicy:
+    """Policy for polling the state of remote workflows. Workflows are polled
+    at the initial interval after they were submitted and whenever their
+    state changes. While the state of a workflow remains unchanged the
+    interval is increased by the backoff factor up to the maximum interval.
+    Each delay is randomized by the jitter (fraction of the interval) to
+    avoid synchronized polls.
+
+    The default policy polls at a fixed interval.
+    """
+    # Initial polling interval (in sec.).
+    interval: float
+    # Maximum polling interval (in sec.). Uses the initial interval if None.
+    max_interval: Optional[float] = None
+    # Factor by which the interval is increased while the state is unchanged.
+    backoff: float = 2
+    # Maximum random deviation from the interval (as fraction of the interval).
+    jitter: float = 0
+
+    def delay(self, interval: float) -> float:
+        """Get the randomized delay until the next poll for the given
+        polling interval.
+
+        Parameters
+        ----------
+        interval: float
+            Current polling interval (in sec.).
+
+        Returns
+        -------
+        float
+        """
+        if not self.jitter:
+            return interval
+        return interval * (1 + random.uniform(-self.jitter, self.jitter))
+
+    def next(self, interval: float, changed: bool) -> float:
+        """Get the polling interval following the given interval. The interval
+        is reset to the initial interval if the workflow state has changed.
+
+        Parameters
+        ----------
+        interval: float
+            Current polling interval (in sec.).
+        changed: bool
+            Flag indicating whether the workflow state changed at the last
+            poll.
+
+        Returns
+        -------
+        float
+        """
+        if changed:
+            return self.interval
+        max_interval = self.max_interval if self.max_interval is not None else self.interval
+        return min(interval * self.backoff, max_interval)
+
+
 @dataclass
 class RemoteWorkflowHandle:
     """Base class for remote workflow handles. Remote workflows may have an
@@ -147,6 +209,80 @@ class RemoteClient(metaclass=ABCMeta):
         """
         raise NotImplementedError()  # pragma: no cover
 
+    def get_workflow_states(
+        self, workflows: Dict[str, WorkflowState]
+    ) -> Dict[str, WorkflowState]:
+        """Get information about the current state for a list of workflows.
+        The workflows are given as a dictionary that maps the workflow
+        identifier to the last known state of the workflow.
+
+        The result maps the workflow identifier to the current workflow state.
+        Workflows whose state cannot be retrieved are not included in the
+        result. The workflow poller counts these as failed status requests.
+
+        The default implementation calls :meth:`get_workflow_state` for each
+        workflow. Clients for workflow engines that support batched status
+        queries should override this method.
+
+        Parameters
+        ----------
+        workflows: dict
+            Mapping of unique workflow identifier to the last known state of
+            the workflow.
+
+        Returns
+        -------
+        dict
+        """
+        result = dict()
+        for workflow_id, current_state in workflows.items():
+            try:
+                result[workflow_id] = self.get_workflow_state(
+                    workflow_id=workflow_id,
+                    current_state=current_state
+                )
+            except Exception as ex:
+                logging.warning('cannot get state for workflow {} ({})'.format(workflow_id, ex))
+        return result
+
+    def polling_policy(self) -> Optional[PollingPolicy]:
+        """Get the policy for polling the state of workflows that are
+        executed by this client. If the result is None, the workflow
+        controller polls at a fixed interval.
+
+        Returns
+        -------
+        flowserv.controller.remote.client.PollingPolicy
+        """
+        return None
+
+    def subscribe(self, callback: Callable[[str, WorkflowState], bool]) -> bool:
+        """Register a callback for state changes of remote workflows. Clients
+        for workflow engines that push state changes (e.g., via webhooks or a
+        message queue) call the callback with the remote workflow identifier
+        and the new workflow state. Returns True if the client pushes state
+        changes. In this case the workflow controller only polls the workflow
+        state as a fallback.
+
+        Clients that receive state changes via the
+        :class:`flowserv.controller.remote.notify.NotificationServer` register
+        the server URL together with the server token with the remote engine.
+        The engine has to send the token in the notification token header.
+
+        The default implementation does not support push notifications.
+
+        Parameters
+        ----------
+        callback: callable
+            Function that receives the remote workflow identifier and the new
+            workflow state. Returns False if the workflow is unknown.
+
+        Returns
+        -------
+        bool
+        """
+        return False
+
     @abstractmethod
     def stop_workflow(self, workflow_id: str):
         """Stop the execution of the workflow with the given identifier.
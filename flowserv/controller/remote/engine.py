@@ -18,7 +18,7 @@ from typing import Dict, Optional, Tuple
 import logging
 
 from flowserv.controller.base import WorkflowController
-from flowserv.controller.remote.client import RemoteClient
+from flowserv.controller.remote.client import PollingPolicy, RemoteClient
 from flowserv.model.base import RunObject
 from flowserv.model.template.base import WorkflowTemplate
 from flowserv.model.workflow.state import WorkflowState
@@ -29,14 +29,23 @@ import flowserv.controller.remote.monitor as monitor
 import flowserv.util as util
 
 
+"""Maximum interval (in sec.) for fallback polling of workflows whose state
+changes are pushed by the remote engine.
+"""
+FALLBACK_INTERVAL = 60
+
+
 class RemoteWorkflowController(WorkflowController):
     """Workflow controller that executes workflow templates for a given set of
-    arguments using an external workflow engine. Each workflow is monitored by
-    a separate process that continuously polls the workflow state.
+    arguments using an external workflow engine. All workflows that are
+    executed asynchronously are monitored by a single poller thread that
+    continuously polls the workflow states.
     """
     def __init__(
         self, client: RemoteClient, poll_interval: float, is_async: bool,
-        service: Optional[APIFactory] = None
+        service: Optional[APIFactory] = None,
+        batch_size: Optional[int] = monitor.DEFAULT_BATCHSIZE,
+        max_workers: Optional[int] = monitor.DEFAULT_MAXWORKERS
     ):
         """Initialize the client that is used to interact with the remote
         workflow engine.
@@ -47,22 +56,39 @@ class RemoteWorkflowController(WorkflowController):
             Engine-specific implementation of the remote client that is used by
             the controller to interact with the workflow engine.
         poll_interval: int or float, default=None
-            Frequency (in sec.) at which the remote workflow engine is polled.
+            Frequency (in sec.) at which the remote workflow engine is polled
+            if the client does not define a polling policy.
         is_async: bool, optional
             Flag that determines whether workflows execution is synchronous or
             asynchronous by default.
         service: flowserv.service.api.APIFactory, default=None
             API factory for service callback during asynchronous workflow
             execution.
+        batch_size: int, default=100
+            Maximum number of workflows in a single status request to the
+            remote workflow engine.
+        max_workers: int, default=4
+            Maximum number of concurrent status requests to the remote
+            workflow engine.
         """
         self.client = client
         self.poll_interval = poll_interval
         self.is_async = is_async
-        self.service = service
-        # Dictionary of all running tasks. Maintains tuples containing the
-        # multi-process pool object and the remote workflow identifier for
-        # each run.
+        # Dictionary of all running tasks. Maps the run identifier to the
+        # remote workflow identifier.
         self.tasks = dict()
+        # Register for state changes that are pushed by the remote engine.
+        # Workflows are then only polled as a fallback.
+        self.push = client.subscribe(self.notify)
+        # Poller that monitors all asynchronously executed workflows.
+        self.poller = monitor.WorkflowPoller(
+            client=client,
+            policy=self.polling_policy(),
+            service=service,
+            tasks=self.tasks,
+            batch_size=batch_size,
+            max_workers=max_workers
+        )
 
     def cancel_run(self, run_id: str):
         """Request to cancel execution of the given run. This method is usually
@@ -76,8 +102,8 @@ class RemoteWorkflowController(WorkflowController):
             Unique run identifier.
         """
         # Ensure that the run has not been removed already
-        if run_id in self.tasks:
-            workflow_id = self.tasks[run_id]
+        workflow_id = self.tasks.get(run_id)
+        if workflow_id is not None:
             # Stop workflow execution at the engine. Ignore any errors that
             # may be raised.
             try:
@@ -85,10 +111,75 @@ class RemoteWorkflowController(WorkflowController):
             except Exception as ex:
                 logging.error(ex, exc_info=True)
                 logging.debug('\n'.join(util.stacktrace(ex)))
-            # Delete the task from the dictionary. The state of the
-            # respective run will be updated by the workflow engine that
-            # uses this controller for workflow execution
-            del self.tasks[run_id]
+            # Stop monitoring the workflow and delete the task from the
+            # dictionary. The state of the respective run will be updated by
+            # the workflow engine that uses this controller for workflow
+            # execution
+            self.poller.remove(run_id)
+
+    def polling_policy(self) -> PollingPolicy:
+        """Get the policy for polling the state of remote workflows. Uses the
+        policy of the remote client if defined. By default, workflows are
+        polled at the fixed poll interval of the controller. If the remote
+        engine pushes state changes, the interval for the fallback polling
+        increases up to one minute while the workflow state is unchanged.
+
+        Returns
+        -------
+        flowserv.controller.remote.client.PollingPolicy
+        """
+        policy = self.client.polling_policy()
+        if policy is not None:
+            return policy
+        elif self.push:
+            return PollingPolicy(
+                interval=self.poll_interval,
+                max_interval=max(self.poll_interval, FALLBACK_INTERVAL),
+                jitter=0.1
+            )
+        return PollingPolicy(interval=self.poll_interval)
+
+    def notify(self, workflow_id: str, state: WorkflowState) -> bool:
+        """Update the state of a remote workflow that is executed
+        asynchronously when the remote engine pushes a state change. Returns
+        False if the workflow is not monitored by the controller.
+
+        Parameters
+        ----------
+        workflow_id: string
+            Unique identifier for the remote workflow.
+        state: flowserv.model.workflow.state.WorkflowState
+            New state of the remote workflow.
+
+        Returns
+        -------
+        bool
+        """
+        return self.poller.notify(workflow_id=workflow_id, state=state)
+
+    @property
+    def service(self) -> APIFactory:
+        """Get the API factory that receives the run state updates from the
+        workflow poller.
+
+        Returns
+        -------
+        flowserv.service.api.APIFactory
+        """
+        return self.poller.service
+
+    @service.setter
+    def service(self, service: APIFactory):
+        """Set the API factory that receives the run state updates from the
+        workflow poller.
+
+        Parameters
+        ----------
+        service: flowserv.service.api.APIFactory
+            API factory for service callback during asynchronous workflow
+            execution.
+        """
+        self.poller.service = service
 
     def exec_workflow(
         self, run: RunObject, template: WorkflowTemplate, arguments: Dict,
@@ -145,13 +236,8 @@ class RemoteWorkflowController(WorkflowController):
             # workflow state or not.
             if self.is_async:
                 self.tasks[run.run_id] = workflow_id
-                # Start monitor tread for asynchronous monitoring.
-                monitor.WorkflowMonitor(
-                    workflow=workflow,
-                    poll_interval=self.poll_interval,
-                    service=self.service,
-                    tasks=self.tasks
-                ).start()
+                # Add the workflow to the poller for asynchronous monitoring.
+                self.poller.add(workflow)
                 return workflow.state, workflow.runstore
             else:
                 # Run workflow synchronously. This will lock the calling thread
@@ -159,7 +245,8 @@ class RemoteWorkflowController(WorkflowController):
                 # workflow execution to finish.
                 state = monitor.monitor_workflow(
                     workflow=workflow,
-                    poll_interval=self.poll_interval
+                    poll_interval=self.poll_interval,
+                    policy=self.polling_policy()
                 )
                 return state, workflow.runstore
         except Exception as ex:
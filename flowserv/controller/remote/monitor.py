@@ -6,93 +6,379 @@
 # flowServ is free software; you can redistribute it and/or modify it under the
 # terms of the MIT License; see LICENSE file for more details.
 
-"""Monitor for remote workflow executions. The monitor is a separate thread
-that continously polls the remote workflow engine to update the workflow state
-in the local database.
+"""Monitor for remote workflow executions. The workflow poller is a single
+thread that continously polls the remote workflow engine for the state of all
+active workflows of a controller and updates the workflow state in the local
+database.
 """
 
-from typing import Dict, Optional
-from threading import Thread
+from concurrent.futures import ThreadPoolExecutor
+from threading import Event, Lock, RLock, Thread
+from typing import Dict, List, Optional
 
 import logging
 import time
 
-from flowserv.controller.remote.client import RemoteWorkflowHandle
+from flowserv.controller.remote.client import PollingPolicy, RemoteClient, RemoteWorkflowHandle
 from flowserv.model.workflow.state import StateSuccess, WorkflowState
 from flowserv.service.api import APIFactory
 
-import flowserv.error as err
 import flowserv.util as util
 
 
-class WorkflowMonitor(Thread):
-    """Thread that monitors execution of an external workflow. Polls the state
-    of the workflow in regular intervals. Updates the local workflow state as
-    the remote state changes.
+"""Default number of workflows per status request and default number of
+concurrent status requests to the remote workflow engine.
+"""
+DEFAULT_BATCHSIZE = 100
+DEFAULT_MAXWORKERS = 4
+
+"""Default number of consecutive failed status requests for a workflow before
+the workflow is set to error state.
+"""
+DEFAULT_MAXFAILURES = 3
+
+
+class WorkflowPoller(object):
+    """Monitor the execution of all active workflows for a remote client. A
+    single background thread polls the state of the workflows using batched
+    status requests. The number of concurrent requests to the remote workflow
+    engine is limited. The local workflow state is updated as the remote state
+    changes.
+
+    Each workflow is polled according to the polling policy. The interval for
+    a workflow is increased while its state remains unchanged. All workflows
+    that are due within the jitter window are polled together. State changes
+    that are pushed by the remote engine are applied via :meth:`notify`.
+
+    If a batched status request fails, the state of each workflow in the batch
+    is requested individually. A workflow whose state cannot be retrieved
+    keeps its current state and is polled again with an increased interval.
+    The workflow is set to error state only after repeated failures.
+
+    The background thread is started when the first workflow is added. It
+    terminates when there are no more active workflows.
     """
     def __init__(
-        self, workflow: RemoteWorkflowHandle, poll_interval: float,
-        service: APIFactory, tasks: Dict
+        self, client: RemoteClient, policy: PollingPolicy,
+        service: APIFactory, tasks: Dict,
+        batch_size: Optional[int] = DEFAULT_BATCHSIZE,
+        max_workers: Optional[int] = DEFAULT_MAXWORKERS,
+        max_failures: Optional[int] = DEFAULT_MAXFAILURES
     ):
-        """Initialize the workflow information and the connection to the local
+        """Initialize the remote client and the connection to the local
         service API.
 
         Parameters
         ----------
-        workflow: flowserv.controller.remote.client.RemoteWorkflowHandle
-            Handle for the monitored workflow.
-        poll_interval: float
-            Frequency (in sec.) at which the remote workflow engine is polled.
-        service: contextlib,contextmanager, default=None
-            Context manager to create an instance of the service API.
+        client: flowserv.controller.remote.client.RemoteClient
+            Client that is used to poll the state of the workflows.
+        policy: flowserv.controller.remote.client.PollingPolicy
+            Policy for the intervals at which the remote workflow engine is
+            polled.
+        service: flowserv.service.api.APIFactory
+            Factory for service API instances that receives the run state
+            updates.
         tasks: dict
             Task dictionary that maps run identifier to remote workflow
             identifier.
+        batch_size: int, default=100
+            Maximum number of workflows in a single status request.
+        max_workers: int, default=4
+            Maximum number of concurrent status requests.
+        max_failures: int, default=3
+            Number of consecutive failed status requests for a workflow before
+            the workflow is set to error state.
         """
-        Thread.__init__(self)
-        self.workflow = workflow
-        self.poll_interval = poll_interval
+        self.client = client
+        self.policy = policy
         self.service = service
         self.tasks = tasks
+        self.batch_size = batch_size
+        self.max_workers = max_workers
+        self.max_failures = max_failures
+        # Handles for monitored workflows, indexed by the run identifier.
+        self._workflows = dict()
+        # Current polling interval and the time of the next poll for each
+        # monitored workflow.
+        self._schedule = dict()
+        # Run identifier for the remote workflow identifier of all monitored
+        # workflows.
+        self._index = dict()
+        # Number of consecutive failed status requests for workflows.
+        self._failures = dict()
+        self._event = Event()
+        self._lock = Lock()
+        # State updates are either triggered by the poller thread or by push
+        # notifications from the remote engine.
+        self._updatelock = RLock()
+        self._worker = None
 
-    def run(self):
-        """Poll the remote server continuously until execution is finished."""
-        try:
-            monitor_workflow(
-                workflow=self.workflow,
-                poll_interval=self.poll_interval,
-                service=self.service
-            )
-        except Exception as ex:
-            logging.error(ex, exc_info=True)
-            strace = util.stacktrace(ex)
-            logging.debug('\n'.join(strace))
-            state = self.workflow.state.error(messages=strace)
-            if self.service is not None:
-                with self.service() as api:
-                    try:
-                        api.runs().update_run(
-                            run_id=self.workflow.run_id,
-                            state=state,
-                            runstore=self.workflow.runstore
-                        )
-                    except err.ConstraintViolationError:
-                        pass
-        # Remove the workflow information form the task list.
+    def add(self, workflow: RemoteWorkflowHandle):
+        """Add a workflow to the set of monitored workflows. Starts the
+        background thread if it is not running.
+
+        Parameters
+        ----------
+        workflow: flowserv.controller.remote.client.RemoteWorkflowHandle
+            Handle for the monitored workflow.
+        """
+        logging.info('start monitoring workflow {}'.format(workflow.workflow_id))
+        interval = self.policy.interval
+        with self._lock:
+            self._workflows[workflow.run_id] = workflow
+            self._index[workflow.workflow_id] = workflow.run_id
+            self._schedule[workflow.run_id] = (interval, time.monotonic() + self.policy.delay(interval))
+            if self._worker is None:
+                self._worker = Thread(target=self._run, daemon=True)
+                self._worker.start()
+        self._event.set()
+
+    def due(self, now: float) -> List[RemoteWorkflowHandle]:
+        """Get the list of workflows that are due for polling at the given
+        time. Includes the workflows that are due within the jitter window.
+
+        Parameters
+        ----------
+        now: float
+            Current time (monotonic clock).
+
+        Returns
+        -------
+        list of flowserv.controller.remote.client.RemoteWorkflowHandle
+        """
+        deadline = now + self.policy.interval * self.policy.jitter
+        with self._lock:
+            return [
+                self._workflows[run_id] for run_id, (_, due) in self._schedule.items()
+                if due <= deadline
+            ]
+
+    def notify(self, workflow_id: str, state: WorkflowState) -> bool:
+        """Update the state of a monitored workflow when the remote engine
+        pushes a state change. Returns False if the workflow is not monitored
+        by the poller.
+
+        Parameters
+        ----------
+        workflow_id: string
+            Unique identifier for the remote workflow.
+        state: flowserv.model.workflow.state.WorkflowState
+            New state of the remote workflow.
+
+        Returns
+        -------
+        bool
+        """
+        with self._lock:
+            workflow = self._workflows.get(self._index.get(workflow_id))
+        if workflow is None:
+            return False
+        self._update(workflow=workflow, state=state, now=time.monotonic())
+        return True
+
+    def poll(self, now: Optional[float] = None) -> int:
+        """Poll the state of all monitored workflows that are due at the given
+        time. Workflows that are no longer active are removed. Returns the
+        number of workflows that remain active.
+
+        Parameters
+        ----------
+        now: float, default=None
+            Current time (monotonic clock). Uses the current time by default.
+
+        Returns
+        -------
+        int
+        """
+        now = now if now is not None else time.monotonic()
+        workflows = self.due(now)
+        batches = [
+            workflows[i:i + self.batch_size] for i in range(0, len(workflows), self.batch_size)
+        ]
+        if len(batches) > 1 and self.max_workers > 1:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                states = list(executor.map(self._poll_batch, batches))
+        else:
+            states = [self._poll_batch(batch) for batch in batches]
+        for batch, batch_states in zip(batches, states):
+            for workflow in batch:
+                self._update(workflow=workflow, state=batch_states.get(workflow.workflow_id), now=now)
+        with self._lock:
+            return len(self._workflows)
+
+    def wakeup(self) -> Optional[float]:
+        """Get the time when the next workflow is due for polling. The result
+        is None if there are no monitored workflows.
+
+        Returns
+        -------
+        float
+        """
+        with self._lock:
+            return min([due for _, due in self._schedule.values()], default=None)
+
+    def remove(self, run_id: str):
+        """Stop monitoring the workflow for the given run.
+
+        Parameters
+        ----------
+        run_id: string
+            Unique run identifier.
+        """
+        with self._lock:
+            workflow = self._workflows.pop(run_id, None)
+            if workflow is not None:
+                self._index.pop(workflow.workflow_id, None)
+            self._schedule.pop(run_id, None)
+            self._failures.pop(run_id, None)
+        self.tasks.pop(run_id, None)
+
+    def size(self) -> int:
+        """Get the number of monitored workflows.
+
+        Returns
+        -------
+        int
+        """
+        with self._lock:
+            return len(self._workflows)
+
+    def _poll_batch(self, workflows: List[RemoteWorkflowHandle]) -> Dict[str, WorkflowState]:
+        """Get the current state for a batch of workflows. If the status
+        request for the batch fails, the state of each workflow is requested
+        individually. Workflows that are missing from the result of the batch
+        request count as failed status requests. The result does not contain
+        a state for workflows whose state could not be retrieved, unless the
+        status request for the workflow failed repeatedly. In this case the
+        result contains an error state for the workflow.
+
+        Parameters
+        ----------
+        workflows: list of flowserv.controller.remote.client.RemoteWorkflowHandle
+            Handles for monitored workflows.
+
+        Returns
+        -------
+        dict
+        """
+        errors = dict()
         try:
-            del self.tasks[self.run_id]
+            states = self.client.get_workflow_states({w.workflow_id: w.state for w in workflows})
         except Exception as ex:
-            logging.error(ex, exc_info=True)
-            logging.debug('\n'.join(util.stacktrace(ex)))
+            logging.warning('batch status request failed ({}); poll workflows individually'.format(ex))
+            states = dict()
+            for w in workflows:
+                try:
+                    states[w.workflow_id] = self.client.get_workflow_state(
+                        workflow_id=w.workflow_id,
+                        current_state=w.state
+                    )
+                except Exception as ex:
+                    errors[w.workflow_id] = ex
+        result = dict()
+        for w in workflows:
+            state = states.get(w.workflow_id)
+            if state is None:
+                error = errors.get(w.workflow_id, ValueError('no state for workflow {}'.format(w.workflow_id)))
+                state = self._poll_failed(workflow=w, error=error)
+            else:
+                with self._lock:
+                    self._failures.pop(w.run_id, None)
+            if state is not None:
+                result[w.workflow_id] = state
+        return result
+
+    def _poll_failed(self, workflow: RemoteWorkflowHandle, error: Exception) -> Optional[WorkflowState]:
+        """Record a failed status request for a workflow. Returns an error
+        state if the number of consecutive failures for the workflow reached
+        the maximum. Otherwise, the result is None.
+
+        Parameters
+        ----------
+        workflow: flowserv.controller.remote.client.RemoteWorkflowHandle
+            Handle for the polled workflow.
+        error: Exception
+            Error that was raised by the status request.
+
+        Returns
+        -------
+        flowserv.model.workflow.state.WorkflowState
+        """
+        with self._lock:
+            failures = self._failures.get(workflow.run_id, 0) + 1
+            self._failures[workflow.run_id] = failures
+        if failures < self.max_failures:
+            logging.warning('cannot poll workflow {} ({})'.format(workflow.workflow_id, error))
+            return None
+        logging.error(error, exc_info=True)
+        strace = util.stacktrace(error)
+        logging.debug('\n'.join(strace))
+        return workflow.state.error(messages=strace)
+
+    def _run(self):
+        """Poll the remote engine continuously until there are no more active
+        workflows.
+        """
+        while True:
+            wakeup = self.wakeup()
+            if wakeup is None:
+                with self._lock:
+                    if not self._workflows:
+                        self._worker = None
+                        return
+                continue
+            self._event.wait(timeout=max(0, wakeup - time.monotonic()))
+            self._event.clear()
+            try:
+                self.poll()
+            except Exception as ex:
+                logging.error(ex, exc_info=True)
+                logging.debug('\n'.join(util.stacktrace(ex)))
+
+    def _update(self, workflow: RemoteWorkflowHandle, state: WorkflowState, now: float):
+        """Update the workflow and the polling schedule after the workflow
+        state was polled.
+
+        Parameters
+        ----------
+        workflow: flowserv.controller.remote.client.RemoteWorkflowHandle
+            Handle for the polled workflow.
+        state: flowserv.model.workflow.state.WorkflowState
+            Polled state of the workflow.
+        now: float
+            Time of the poll (monotonic clock).
+        """
+        with self._updatelock:
+            if workflow.run_id not in self._workflows:
+                # The workflow was finished or removed by a concurrent update.
+                return
+            changed = state is not None and state != workflow.state
+            if changed:
+                workflow.state = state
+                state = result_state(workflow=workflow, state=state)
+                if not update_workflow(workflow=workflow, state=state, service=self.service):
+                    self.remove(workflow.run_id)
+                    return
+                elif not workflow.is_active():
+                    logging.info('finished run {} = {}'.format(workflow.run_id, state.type_id))
+                    self.remove(workflow.run_id)
+                    return
+        with self._lock:
+            if workflow.run_id in self._schedule:
+                interval, _ = self._schedule[workflow.run_id]
+                interval = self.policy.next(interval=interval, changed=changed)
+                self._schedule[workflow.run_id] = (interval, now + self.policy.delay(interval))
 
 
 # -- Helper functions ---------------------------------------------------------
 
 def monitor_workflow(
-    workflow: RemoteWorkflowHandle, poll_interval: float, service: Optional[APIFactory] = None
+    workflow: RemoteWorkflowHandle, poll_interval: float, service: Optional[APIFactory] = None,
+    policy: Optional[PollingPolicy] = None
 ) -> WorkflowState:
     """Monitor a remote workflow run by continuous polling at a given interval.
-    Updates the local workflow state as the remote state changes.
+    Updates the local workflow state as the remote state changes. If a polling
+    policy is given, the intervals are determined by the policy instead.
 
     Returns the state of the inactive workflow and the temporary directory that
     contains the downloaded run result files. The run directory may be None for
@@ -104,55 +390,103 @@ def monitor_workflow(
         Handle for the monitored workflow.
     poll_interval: float
         Frequency (in sec.) at which the remote workflow engine is polled.
-    service: contextlib,contextmanager, default=None
-        Context manager to create an instance of the service API.
+    service: flowserv.service.api.APIFactory, default=None
+        Factory for service API instances that receives the run state updates.
+    policy: flowserv.controller.remote.client.PollingPolicy, default=None
+        Policy for the intervals at which the remote workflow engine is
+        polled.
 
     Returns
     -------
     flowserv.model.workflow.state.WorkflowState
     """
     logging.info('start monitoring workflow {}'.format(workflow.workflow_id))
+    policy = policy if policy is not None else PollingPolicy(interval=poll_interval)
+    interval = policy.interval
     # Monitor the workflow state until the workflow is not in an active
     # state anymore.
     while workflow.is_active():
-        time.sleep(poll_interval)
+        time.sleep(policy.delay(interval))
         # Get the current workflow status
         state = workflow.poll_state()
+        interval = policy.next(interval=interval, changed=state is not None)
         if state is None:
             # Do nothing if the workflow status hasn't changed
             continue
-        if state.is_success():
-            # Create a modified workflow state handle that contains the
-            # workflow result resources.
-            state = StateSuccess(
-                created_at=state.created_at,
-                started_at=state.started_at,
-                finished_at=state.finished_at,
-                files=workflow.output_files
-            )
-        # Update the local state and the workflow state in the service API.
-        if service is not None:
-            try:
-                with service() as api:
-                    api.runs().update_run(
-                        run_id=workflow.run_id,
-                        state=state,
-                        runstore=workflow.runstore
-                    )
-            except Exception as ex:
-                # If the workflow is canceled for example, the state in the
-                # API will have been changed and this may cause an error
-                # here. If the remote workflow, however, remains active we
-                # notify the remote engine to stop the workflow.
-                logging.error('attempt to update run {}'.format(workflow.run_id))
-                logging.error(ex, exc_info=True)
-                if state.is_active():
-                    try:
-                        workflow.client.stop_workflow(workflow.workflow_id)
-                    except Exception as ex:
-                        logging.error(ex, exc_info=True)
-                # Stop the thread by exiting the run method.
-                return state
+        state = result_state(workflow=workflow, state=state)
+        if not update_workflow(workflow=workflow, state=state, service=service):
+            # Stop monitoring if the state update cannot be delivered.
+            return state
     msg = 'finished run {} = {}'.format(workflow.run_id, state.type_id)
     logging.info(msg)
     return state
+
+
+def result_state(workflow: RemoteWorkflowHandle, state: WorkflowState) -> WorkflowState:
+    """Get the state of a remote workflow that is reported to the service API.
+    For successful workflows the state contains the workflow output files.
+
+    Parameters
+    ----------
+    workflow: flowserv.controller.remote.client.RemoteWorkflowHandle
+        Handle for the monitored workflow.
+    state: flowserv.model.workflow.state.WorkflowState
+        New state of the remote workflow.
+
+    Returns
+    -------
+    flowserv.model.workflow.state.WorkflowState
+    """
+    if state.is_success():
+        # Create a modified workflow state handle that contains the
+        # workflow result resources.
+        return StateSuccess(
+            created_at=state.created_at,
+            started_at=state.started_at,
+            finished_at=state.finished_at,
+            files=workflow.output_files
+        )
+    return state
+
+
+def update_workflow(
+    workflow: RemoteWorkflowHandle, state: WorkflowState,
+    service: Optional[APIFactory] = None
+) -> bool:
+    """Update the workflow state in the service API after the state of a
+    remote workflow has changed. Returns False if the state update could not
+    be delivered. In this case the local run state is not going to change
+    anymore. If the remote workflow remains active, the remote engine is
+    notified to stop the workflow.
+
+    Parameters
+    ----------
+    workflow: flowserv.controller.remote.client.RemoteWorkflowHandle
+        Handle for the monitored workflow.
+    state: flowserv.model.workflow.state.WorkflowState
+        New state of the remote workflow (as returned by :func:`result_state`).
+    service: flowserv.service.api.APIFactory, default=None
+        Factory for service API instances that receives the run state updates.
+
+    Returns
+    -------
+    bool
+    """
+    if service is None:
+        return True
+    try:
+        service.update_run(
+            run_id=workflow.run_id,
+            state=state,
+            runstore=workflow.runstore
+        )
+    except Exception as ex:
+        logging.error('attempt to update run {}'.format(workflow.run_id))
+        logging.error(ex, exc_info=True)
+        if state.is_active():
+            try:
+                workflow.client.stop_workflow(workflow.workflow_id)
+            except Exception as ex:
+                logging.error(ex, exc_info=True)
+        return False
+    return True
@@ -0,0 +1,204 @@
+# This file is part of the Reproducible and Reusable Data Analysis Workflow
+# Server (flowServ).
+#
+# Copyright (C) 2019-2021 NYU.
+#
+# flowServ is free software; you can redistribute it and/or modify it under the
+# terms of the MIT License; see LICENSE file for more details.
+
+"""HTTP endpoint for state change notifications that are pushed by remote
+workflow engines. The endpoint accepts POST requests with a Json body that
+contains the remote workflow identifier and the serialized workflow state.
+Notifications are passed to a callback function, e.g., the notify method of
+the remote workflow controller.
+
+Each request has to contain the shared secret of the server in the
+notification token header. The secret is registered with the remote workflow
+engine together with the endpoint URL when the client subscribes to state
+changes. Requests without a valid token are rejected.
+"""
+
+from __future__ import annotations
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Thread
+from typing import Callable, Dict, Optional, Tuple
+
+import hmac
+import json
+import logging
+import secrets
+
+from flowserv.model.workflow.state import WorkflowState, deserialize_state, serialize_state
+
+import flowserv.util as util
+
+
+"""Request header that contains the shared secret for notifications."""
+HEADER_TOKEN = 'X-Flowserv-Notify-Token'
+
+"""Labels for notification messages."""
+LABEL_STATE = 'state'
+LABEL_WORKFLOW_ID = 'workflowId'
+
+
+class NotificationServer(object):
+    """Local HTTP server that receives state change notifications for remote
+    workflows. The server is running in a background thread. Each request is
+    handled in a separate thread.
+    """
+    def __init__(
+        self, callback: Callable[[str, WorkflowState], bool],
+        token: Optional[str] = None, host: Optional[str] = '127.0.0.1',
+        port: Optional[int] = 0
+    ):
+        """Initialize the callback function, the shared secret, and the server
+        address.
+
+        Parameters
+        ----------
+        callback: callable
+            Function that receives the remote workflow identifier and the new
+            workflow state. Returns False if the workflow is unknown.
+        token: string, default=None
+            Shared secret that is expected in the notification token header of
+            each request. A random secret is generated if no value is given.
+        host: string, default='127.0.0.1'
+            Host name for the server.
+        port: int, default=0
+            Port for the server. By default, an unused port is selected.
+        """
+        self.callback = callback
+        self.token = token if token else secrets.token_urlsafe(32)
+        self.server = ThreadingHTTPServer((host, port), handler(callback, self.token))
+        self.server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        """Get the URL for the notification endpoint.
+
+        Returns
+        -------
+        string
+        """
+        host, port = self.server.server_address[:2]
+        return 'http://{}:{}/'.format(host, port)
+
+    def start(self) -> NotificationServer:
+        """Start the server in a background thread. Returns the server
+        instance.
+
+        Returns
+        -------
+        flowserv.controller.remote.notify.NotificationServer
+        """
+        self._thread = Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop the server and release the server socket."""
+        if self._thread is not None:
+            self.server.shutdown()
+            self._thread.join()
+            self._thread = None
+        self.server.server_close()
+
+
+# -- Helper functions ---------------------------------------------------------
+
+def handler(callback: Callable[[str, WorkflowState], bool], token: str) -> type:
+    """Get the request handler class for notifications that are passed to the
+    given callback function.
+
+    Parameters
+    ----------
+    callback: callable
+        Function that receives the remote workflow identifier and the new
+        workflow state.
+    token: string
+        Shared secret that is expected in the notification token header.
+
+    Returns
+    -------
+    type
+    """
+    class NotificationHandler(BaseHTTPRequestHandler):
+        """Handler for POST requests that contain state change notifications.
+        Responds with status 204 if the notification was accepted, 400 for
+        invalid notifications, 401 for requests without token, 403 for
+        requests with an invalid token, and 404 for unknown workflows.
+        """
+        def do_POST(self):
+            # Verify the shared secret before the request body is read.
+            request_token = self.headers.get(HEADER_TOKEN)
+            if not request_token:
+                self.send_response(401)
+                self.end_headers()
+                return
+            if not hmac.compare_digest(request_token.encode('utf-8'), token.encode('utf-8')):
+                logging.warning('invalid notification token from {}'.format(self.client_address[0]))
+                self.send_response(403)
+                self.end_headers()
+                return
+            try:
+                size = int(self.headers.get('Content-Length', 0))
+                workflow_id, state = parse_message(json.loads(self.rfile.read(size)))
+            except (KeyError, TypeError, ValueError) as ex:
+                logging.error(ex, exc_info=True)
+                self.send_response(400)
+                self.end_headers()
+                return
+            try:
+                accepted = callback(workflow_id, state)
+            except Exception as ex:
+                logging.error(ex, exc_info=True)
+                logging.debug('\n'.join(util.stacktrace(ex)))
+                self.send_response(500)
+                self.end_headers()
+                return
+            self.send_response(204 if accepted else 404)
+            self.end_headers()
+
+        def log_message(self, format, *args):
+            logging.debug(format % args)
+
+    return NotificationHandler
+
+
+def message(workflow_id: str, state: WorkflowState) -> Dict:
+    """Get the notification message for a state change of a remote workflow.
+
+    Parameters
+    ----------
+    workflow_id: string
+        Unique identifier for the remote workflow.
+    state: flowserv.model.workflow.state.WorkflowState
+        New state of the remote workflow.
+
+    Returns
+    -------
+    dict
+    """
+    return {LABEL_WORKFLOW_ID: workflow_id, LABEL_STATE: serialize_state(state)}
+
+
+def parse_message(doc: Dict) -> Tuple[str, WorkflowState]:
+    """Get the remote workflow identifier and the workflow state from a
+    notification message.
+
+    Parameters
+    ----------
+    doc: dict
+        Notification message as returned by :func:`message`.
+
+    Returns
+    -------
+    string, flowserv.model.workflow.state.WorkflowState
+
+    Raises
+    ------
+    KeyError
+    ValueError
+    """
+    return doc[LABEL_WORKFLOW_ID], deserialize_state(doc[LABEL_STATE])
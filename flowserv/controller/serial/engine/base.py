@@ -16,19 +16,27 @@ All workflow run files will be maintained in a (temporary) directory on the
 storage volume that is associated with the workflow engine. The base folder for
 these run files can be configured by setting the environment variable
 *FLOWSERV_SERIAL_RUNSDIR*.
+
+Asynchronous runs are executed in a separate worker process. Each worker
+process is the leader of its own process group. Canceling a run terminates
+the whole process group (including all sub-processes that were started by
+workflow steps), stops the Docker containers of the run, and removes the run
+folder.
 """
 
 from collections import defaultdict
 from functools import partial
-from multiprocessing import Lock, Pool
+from multiprocessing import Lock, Pool, Value
 from typing import Dict, List, Optional, Tuple
 
 import logging
+import time
 
 from flowserv.config import FLOWSERV_ASYNC, FLOWSERV_FILESTORE
 from flowserv.controller.base import WorkflowController
 from flowserv.controller.serial.engine.config import ENGINECONFIG, RUNSDIR
 from flowserv.controller.serial.engine.runner import exec_workflow
+from flowserv.controller.worker.cancel import init_run_process, kill_process_group, stop_containers
 from flowserv.controller.worker.manager import WorkerPool
 from flowserv.controller.serial.workflow.result import RunResult
 from flowserv.model.workflow.step import ContainerStep
@@ -84,6 +92,10 @@ class SerialWorkflowEngine(WorkflowController):
         self.tasks = dict()
         # Lock to manage asynchronous access to the task dictionary
         self.lock = Lock()
+        # Statistics for canceled runs.
+        self.canceled = 0
+        self.cancel_latency = 0.0
+        self.max_cancel_latency = 0.0
 
     def cancel_run(self, run_id: str):
         """Request to cancel execution of the given run. This method is usually
@@ -91,23 +103,61 @@ class SerialWorkflowEngine(WorkflowController):
         execution. It is therefore assumed that the state of the workflow run
         is updated accordingly by the caller.
 
+        Terminating the worker process triggers the cancellation handler of
+        the run process that stops all containers of the run and terminates
+        the process group of the run. Processes and containers that are still
+        running afterwards are killed by the controller. The run folder is
+        removed and the time it took to cancel the run is recorded.
+
         Parameters
         ----------
         run_id: string
             Unique run identifier
         """
+        start = time.perf_counter()
+        with self.lock:
+            # Ensure that the run has not been removed already. Delete the
+            # task from the dictionary. The state of the respective run will be
+            # updated by the workflow engine that uses this controller for
+            # workflow execution
+            task = self.tasks.pop(run_id, None)
+        if task is None:
+            return
+        pool, _, pgid = task
+        # Close the pool and terminate any running processes
+        if pool is not None:
+            pool.close()
+            pool.terminate()
+        if pgid is not None:
+            kill_process_group(pgid.value)
+        stop_containers(run_id)
+        # Remove the run folder.
+        try:
+            self.fs.get_store_for_folder(key=util.join(self.runsdir, run_id)).erase()
+        except Exception as ex:
+            logging.error(ex, exc_info=True)
+        latency = time.perf_counter() - start
+        logging.info('canceled run {} in {:.3f}s'.format(run_id, latency))
+        with self.lock:
+            self.canceled += 1
+            self.cancel_latency += latency
+            self.max_cancel_latency = max(self.max_cancel_latency, latency)
+
+    def cancel_stats(self) -> Dict:
+        """Get statistics for canceled runs. The latency is the average time in
+        seconds between the cancel request and the termination of all run
+        processes and containers.
+
+        Returns
+        -------
+        dict
+        """
         with self.lock:
-            # Ensure that the run has not been removed already
-            if run_id in self.tasks:
-                pool, _ = self.tasks[run_id]
-                # Close the pool and terminate any running processes
-                if pool is not None:
-                    pool.close()
-                    pool.terminate()
-                # Delete the task from the dictionary. The state of the
-                # respective run will be updated by the workflow engine that
-                # uses this controller for workflow execution
-                del self.tasks[run_id]
+            return {
+                'canceled': self.canceled,
+                'latency': self.cancel_latency / self.canceled if self.canceled else 0.0,
+                'maxLatency': self.max_cancel_latency
+            }
 
     def exec_workflow(
         self, run: RunObject, template: WorkflowTemplate, arguments: Dict,
@@ -205,8 +255,15 @@ class SerialWorkflowEngine(WorkflowController):
             # exceptions to set the run state properly.
             state = state.start()
             if self.is_async:
-                # Run steps asynchronously in a separate process
-                pool = Pool(processes=1)
+                # Run steps asynchronously in a separate process. The process
+                # is the leader of a process group that contains all processes
+                # of the run.
+                pgid = Value('i', 0)
+                pool = Pool(
+                    processes=1,
+                    initializer=init_run_process,
+                    initargs=(run.run_id, pgid)
+                )
                 task_callback_function = partial(
                     callback_function,
                     lock=self.lock,
@@ -214,7 +271,7 @@ class SerialWorkflowEngine(WorkflowController):
                     service=self.service
                 )
                 with self.lock:
-                    self.tasks[run.run_id] = (pool, state)
+                    self.tasks[run.run_id] = (pool, state, pgid)
                 pool.apply_async(
                     run_workflow,
                     args=(
@@ -261,21 +318,20 @@ def callback_function(result, lock, tasks, service):
         Lock for concurrency control
     tasks: dict
         Task index of the backend
-    service: contextlib.contextmanager
-        Context manager to create an instance of the service API.
+    service: flowserv.service.api.APIFactory
+        Factory for service API instances that receives the run state update.
     """
     run_id, runstore, state_dict = result
     logging.info('finished run {} with {}'.format(run_id, state_dict))
     with lock:
         if run_id in tasks:
             # Close the pool and remove the entry from the task index
-            pool, _ = tasks[run_id]
+            pool, _, _ = tasks[run_id]
             pool.close()
             del tasks[run_id]
     state = serialize.deserialize_state(state_dict)
     try:
-        with service() as api:
-            api.runs().update_run(run_id=run_id, state=state, runstore=Volume(doc=runstore))
+        service.update_run(run_id=run_id, state=state, runstore=Volume(doc=runstore))
     except Exception as ex:
         logging.error(ex, exc_info=True)
         logging.debug('\n'.join(util.stacktrace(ex)))
@@ -150,11 +150,12 @@ def parse_template(template: WorkflowTemplate, arguments: Dict) -> Tuple[List[Co
         step = Step(identifier=step_id, action=action, inputs=input_files, outputs=output_files)
         steps.append(step)
     # Get the workflow arguments that are defined in the workflow template.
-    # Expand template parameter references using the given argument set.
-    run_args = workflow_spec.get('parameters', {})
-    for key in run_args.keys():
+    # Expand template parameter references using the given argument set. The
+    # template is not modified since it may be used for multiple runs.
+    run_args = dict()
+    for key, value in workflow_spec.get('parameters', {}).items():
         run_args[key] = tp.expand_value(
-            value=run_args[key],
+            value=value,
             arguments=arguments,
             parameters=template.parameters
         )
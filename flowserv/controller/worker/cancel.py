@@ -0,0 +1,170 @@
+# This file is part of the Reproducible and Reusable Data Analysis Workflow
+# Server (flowServ).
+#
+# Copyright (C) 2019-2021 NYU.
+#
+# flowServ is free software; you can redistribute it and/or modify it under the
+# terms of the MIT License; see LICENSE file for more details.
+
+"""Cooperative cancellation for workflow runs that are executed in a separate
+process.
+
+Each asynchronous run of the serial workflow engine is executed by a worker
+process that is initialized using :func:`init_run_process`. The worker process
+becomes the leader of a new process group. All sub-processes that are started
+by workflow steps (e.g., shell commands that are run by the subprocess worker)
+are members of this process group. Docker containers that are started for the
+run are labeled with the run identifier.
+
+When the run is canceled, the worker process receives a SIGTERM signal. The
+signal handler stops all containers for the run and then terminates the whole
+process group. The engine uses :func:`kill_process_group` and
+:func:`stop_containers` as a fallback for processes and containers that are
+still running after the worker process was terminated.
+"""
+
+from typing import Dict
+
+import logging
+import os
+import signal
+import time
+
+
+"""Label for Docker containers that contains the run identifier."""
+LABEL_RUN = 'org.flowserv.run'
+
+
+"""Identifier of the run that is executed by the current process. The value
+is None for all processes that were not initialized as run processes.
+"""
+_run_id = None
+
+
+def init_run_process(run_id: str, pgid=None):
+    """Initialize a worker process for the execution of the given run. Makes
+    the process the leader of a new process group and installs the signal
+    handler for cooperative cancellation.
+
+    This function is used as the initializer for the process pool that
+    executes the run.
+
+    Parameters
+    ----------
+    run_id: string
+        Unique run identifier.
+    pgid: multiprocessing.Value, default=None
+        Shared value that receives the identifier of the process group.
+    """
+    global _run_id
+    _run_id = run_id
+    if hasattr(os, 'setpgrp'):
+        os.setpgrp()
+        if pgid is not None:
+            pgid.value = os.getpgrp()
+    signal.signal(signal.SIGTERM, cancel_handler)
+
+
+def kill_process_group(pgid: int, timeout: float = 1) -> bool:
+    """Terminate all processes in the given process group. Sends SIGTERM to
+    the process group and SIGKILL to processes that are still alive after the
+    timeout. Returns True if the process group still existed.
+
+    Parameters
+    ----------
+    pgid: int
+        Process group identifier.
+    timeout: float, default=1
+        Time (in sec.) that processes are given to terminate before they are
+        killed.
+
+    Returns
+    -------
+    bool
+    """
+    if not pgid or not hasattr(os, 'killpg'):
+        return False
+    if not signal_group(pgid, signal.SIGTERM):
+        return False
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if not signal_group(pgid, 0):
+            return True
+        time.sleep(0.05)
+    signal_group(pgid, signal.SIGKILL)
+    return True
+
+
+def run_labels() -> Dict:
+    """Get the labels for Docker containers that are started by the current
+    process. The result is empty if the process is not a run process.
+
+    Returns
+    -------
+    dict
+    """
+    return {LABEL_RUN: _run_id} if _run_id is not None else dict()
+
+
+def stop_containers(run_id: str) -> int:
+    """Kill and remove all Docker containers that are labeled with the given
+    run identifier. Returns the number of containers that were stopped.
+
+    Does nothing if the Docker package is not installed or if the Docker
+    daemon cannot be reached.
+
+    Parameters
+    ----------
+    run_id: string
+        Unique run identifier.
+
+    Returns
+    -------
+    int
+    """
+    # Import docker package here to avoid errors for installations that do
+    # not intend to use Docker and therefore did not install the package.
+    try:
+        import docker
+    except ImportError:
+        return 0
+    count = 0
+    try:
+        client = docker.from_env()
+        try:
+            filters = {'label': '{}={}'.format(LABEL_RUN, run_id)}
+            for container in client.containers.list(all=True, filters=filters):
+                logging.info('stop container {} for run {}'.format(container.id, run_id))
+                container.remove(force=True)
+                count += 1
+        finally:
+            client.close()
+    except Exception as ex:
+        logging.debug('cannot stop containers for run {}: {}'.format(run_id, ex))
+    return count
+
+
+# -- Helper functions ---------------------------------------------------------
+
+def cancel_handler(signum, frame):  # pragma: no cover
+    """Signal handler for run processes. Stops the containers of the run and
+    terminates all processes in the process group of the run (including the
+    current process).
+    """
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    if _run_id is not None:
+        stop_containers(_run_id)
+    if hasattr(os, 'killpg') and os.getpgrp() == os.getpid():
+        os.killpg(os.getpgrp(), signal.SIGTERM)
+    os._exit(128 + signal.SIGTERM)
+
+
+def signal_group(pgid: int, sig: int) -> bool:
+    """Send a signal to a process group. Returns False if the process group
+    does not exist.
+    """
+    try:
+        os.killpg(pgid, sig)
+    except ProcessLookupError:
+        return False
+    return True
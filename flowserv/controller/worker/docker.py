@@ -20,6 +20,7 @@ import shutil
 from flowserv.controller.serial.workflow.result import ExecResult
 from flowserv.model.workflow.step import ContainerStep, NotebookStep
 from flowserv.controller.worker.base import ContainerWorker, Worker
+from flowserv.controller.worker.cancel import run_labels
 from flowserv.volume.fs import FileSystemStorage
 
 import flowserv.util as util
@@ -263,13 +264,16 @@ def docker_run(
             logging.info('{}'.format(cmd))
             # Run detached container to be able to capture output to
             # both, STDOUT and STDERR. DO NOT remove the container yet
-            # in order to be able to get the captured outputs.
+            # in order to be able to get the captured outputs. The container
+            # is labeled with the run identifier so that it can be stopped
+            # when the run is canceled.
             container = client.containers.run(
                 image=image,
                 command=cmd,
                 volumes=volumes,
                 remove=False,
                 environment=env,
+                labels=run_labels(),
                 detach=True
             )
             # Wait for container to finish. The returned dictionary will
@@ -12,13 +12,15 @@ given user can execute a requested action.
 """
 
 from abc import ABCMeta, abstractmethod
+from sqlalchemy.orm import make_transient_to_detached
+from typing import FrozenSet
 
-from flowserv.model.base import APIKey, GroupObject, RunObject, User
+from flowserv.model.base import APIKey, GroupObject, RunObject, User, group_member
 
 import datetime as dt
-import dateutil.parser
 
 import flowserv.error as err
+import flowserv.model.cache as cache
 
 
 class Auth(metaclass=ABCMeta):
@@ -56,18 +58,30 @@ class Auth(metaclass=ABCMeta):
         # The API key may be None. In this case an error is raised.
         if api_key is None:
             raise err.UnauthenticatedAccessError()
+        # Use the cached user information for validated API keys to avoid
+        # querying the database. Tokens that were invalidated in the current
+        # session are not removed from the cache before the commit.
+        changed = api_key in self.session.info.get(cache.TOKENS_KEY, ())
+        cached = cache.tokens.get(api_key) if not changed else None
+        if cached is not None:
+            user_id, name = cached
+            user = User(user_id=user_id, name=name)
+            make_transient_to_detached(user)
+            return self.session.merge(user, load=False)
         # Get information for user that that is associated with the API key
         # together with the expiry date of the key. If the API key is unknown
         # or expired raise an error.
-        query = self.session.query(User)\
+        query = self.session.query(User, APIKey.expires)\
             .filter(User.user_id == APIKey.user_id)\
             .filter(APIKey.value == api_key)
-        user = query.one_or_none()
-        if user is None:
+        result = query.one_or_none()
+        if result is None:
             raise err.UnauthenticatedAccessError()
-        expires = dateutil.parser.parse(user.api_key.expires)
+        user, expires = result
         if expires < dt.datetime.now():
             raise err.UnauthenticatedAccessError()
+        if not changed:
+            cache.tokens.put(api_key, (user.user_id, user.name), expires=expires)
         return user
 
     @abstractmethod
@@ -195,14 +209,33 @@ class DefaultAuthPolicy(Auth):
         if run_group is None:
             return True
         # Check if the user is a member of the run group.
-        group = self.session\
-            .query(GroupObject)\
-            .filter(GroupObject.group_id == run_group)\
-            .one_or_none()
-        for member in group.members:
-            if member.user_id == user_id:
-                return True
-        return False
+        return run_group in self.user_groups(user_id)
+
+    def user_groups(self, user_id: str) -> FrozenSet[str]:
+        """Get identifier of all groups that the given user is a member of.
+        The group memberships for a user are cached for a short period of
+        time. The cache is bypassed if the memberships of the user were
+        changed in the current (uncommitted) session.
+
+        Parameters
+        ----------
+        user_id: string
+            Unique user identifier
+
+        Returns
+        -------
+        frozenset of string
+        """
+        changed = user_id in self.session.info.get(cache.SESSION_KEY, ())
+        groups = cache.memberships.get(user_id) if not changed else None
+        if groups is None:
+            query = self.session\
+                .query(group_member.c.group_id)\
+                .filter(group_member.c.user_id == user_id)
+            groups = frozenset([g for g, in query])
+            if not changed:
+                cache.memberships.put(user_id, groups)
+        return groups
 
 
 class OpenAccessAuth(Auth):
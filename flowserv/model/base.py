@@ -10,10 +10,10 @@
 
 import json
 
-from sqlalchemy import Boolean, Integer, String, Text
-from sqlalchemy import Column, ForeignKey, UniqueConstraint, Table
+from sqlalchemy import Boolean, DateTime, Integer, String, Text
+from sqlalchemy import Column, ForeignKey, Index, UniqueConstraint, Table
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import deferred, relationship
 from sqlalchemy.types import TypeDecorator, Unicode
 
 from flowserv.model.parameter.base import ParameterGroup
@@ -22,6 +22,7 @@ from flowserv.model.template.files import WorkflowOutputFile
 from flowserv.model.template.parameter import ParameterIndex
 from flowserv.model.template.schema import ResultSchema
 
+import flowserv.model.workflow.cache as cache
 import flowserv.model.workflow.state as st
 import flowserv.util as util
 
@@ -236,7 +237,7 @@ class APIKey(Base):
         primary_key=True
     )
     value = Column(String(32), default=util.get_unique_identifier, unique=True)
-    expires = Column(String(32), nullable=False)
+    expires = Column(DateTime, nullable=False)
 
 
 class PasswordRequest(Base):
@@ -302,6 +303,11 @@ class WorkflowObject(Base):
     defined for the template or if it has not been executed yet. The post-
     processing key contains the sorted list of identifier for the runs that
     were used as input to generate the post-processing results.
+
+    The template components are loaded lazily (as one group) since parsing
+    them is expensive and they are not needed for workflow listings. Use
+    :meth:`get_template` to access the template components. The parsed
+    template is cached for each template version.
     """
     # -- Schema ---------------------------------------------------------------
     __tablename__ = 'workflow_template'
@@ -314,10 +320,13 @@ class WorkflowObject(Base):
     name = Column(String(512), nullable=False, unique=True)
     description = Column(Text)
     instructions = Column(Text)
-    workflow_spec = Column(JsonObject, nullable=False)
-    parameters = Column(WorkflowParameters)
-    parameter_groups = Column(WorkflowParameterGroups)
-    outputs = Column(WorkflowOutputs)
+    # Unique version stamp for the template components. Used as part of the
+    # key for the parsed template cache.
+    template_version = Column(String(32), default=util.get_unique_identifier)
+    workflow_spec = deferred(Column(JsonObject, nullable=False), group='template')
+    parameters = deferred(Column(WorkflowParameters), group='template')
+    parameter_groups = deferred(Column(WorkflowParameterGroups), group='template')
+    outputs = deferred(Column(WorkflowOutputs), group='template')
     # Optional configuration settings that will be used as the default for this
     # workflow AND the postproc workflow.
     engine_config = Column(JsonObject, nullable=True)
@@ -325,9 +334,9 @@ class WorkflowObject(Base):
     # reference the workflow to ensure integrity with respect to deleting
     # the workflow and all dependend runs.
     postproc_run_id = Column(String(32), nullable=True)
-    postproc_spec = Column(JsonObject, nullable=True)
+    postproc_spec = deferred(Column(JsonObject, nullable=True), group='template')
     ignore_postproc = Column(Boolean, nullable=False, default=False)
-    result_schema = Column(WorkflowResultSchema)
+    result_schema = deferred(Column(WorkflowResultSchema), group='template')
 
     # -- Relationships --------------------------------------------------------
     groups = relationship(
@@ -350,6 +359,9 @@ class WorkflowObject(Base):
         """Get template for the workflow. The optional parameters allow to
         override the default values with group-specific values.
 
+        The parsed template is taken from the template cache if possible. The
+        returned template components must not be modified.
+
         Parameters
         ----------
         workflow_spec: dict, default=None
@@ -361,13 +373,32 @@ class WorkflowObject(Base):
         -------
         flowserv.model.template.base.WorkflowTemplate
         """
+        # The version stamp is not set for workflow objects that have not been
+        # flushed to the database yet. Templates are not cached in this case.
+        version = self.template_version
+        template = None
+        if version is not None:
+            template = cache.templates.get(self.workflow_id, version)
+        if template is None:
+            template = WorkflowTemplate(
+                workflow_spec=self.workflow_spec,
+                parameters=self.parameters,
+                parameter_groups=self.parameter_groups,
+                outputs=self.outputs,
+                postproc_spec=self.postproc_spec,
+                result_schema=self.result_schema
+            )
+            if version is not None:
+                cache.templates.put(self.workflow_id, version, template)
+        if workflow_spec is None and parameters is None:
+            return template
         return WorkflowTemplate(
-            workflow_spec=self.workflow_spec if workflow_spec is None else workflow_spec,  # noqa: E501
-            parameters=self.parameters if parameters is None else parameters,
-            parameter_groups=self.parameter_groups,
-            outputs=self.outputs,
-            postproc_spec=self.postproc_spec,
-            result_schema=self.result_schema
+            workflow_spec=template.workflow_spec if workflow_spec is None else workflow_spec,  # noqa: E501
+            parameters=template.parameters if parameters is None else parameters,
+            parameter_groups=template.parameter_groups,
+            outputs=template.outputs,
+            postproc_spec=template.postproc_spec,
+            result_schema=template.result_schema
         )
 
     def ranking(self):
@@ -390,8 +421,9 @@ class WorkflowObject(Base):
         -------
         bool
         """
-        has_schema = self.result_schema is not None
-        has_postproc = self.postproc_spec is not None
+        template = self.get_template()
+        has_schema = template.result_schema is not None
+        has_postproc = template.postproc_spec is not None
         return has_schema and has_postproc and not self.ignore_postproc
 
 
@@ -428,7 +460,8 @@ class GroupObject(Base):
     name = Column(String(512), nullable=False)
     workflow_id = Column(
         String(32),
-        ForeignKey('workflow_template.workflow_id')
+        ForeignKey('workflow_template.workflow_id'),
+        index=True
     )
     owner_id = Column(String(32), ForeignKey('api_user.user_id'))
     parameters = Column(WorkflowParameters, nullable=False)
@@ -464,7 +497,11 @@ class UploadFile(FileObject):
     # -- Schema ---------------------------------------------------------------
     __tablename__ = 'group_upload_file'
 
-    group_id = Column(String(32), ForeignKey('workflow_group.group_id'))
+    group_id = Column(
+        String(32),
+        ForeignKey('workflow_group.group_id'),
+        index=True
+    )
 
     # -- Relationships --------------------------------------------------------
     group = relationship('GroupObject', back_populates='uploads')
@@ -476,6 +513,16 @@ class UploadFile(FileObject):
 workflow parameters, and timestamps.
 """
 
+"""Run priority classes. Queued runs with a higher priority are started first.
+The priority of group submission runs can be lowered with the *priority*
+element in the engine configuration of the workflow or the group. Only
+post-processing runs have a high priority.
+"""
+PRIORITY = 'priority'
+PRIORITY_LOW = -1
+PRIORITY_NORMAL = 0
+PRIORITY_HIGH = 1
+
 
 class RunObject(Base):
     """ Workflow runs may be triggered by workflow group members or they
@@ -491,12 +538,14 @@ class RunObject(Base):
     )
     workflow_id = Column(
         String(32),
-        ForeignKey('workflow_template.workflow_id')
+        ForeignKey('workflow_template.workflow_id'),
+        index=True
     )
     group_id = Column(
         String(32),
         ForeignKey('workflow_group.group_id'),
-        nullable=True
+        nullable=True,
+        index=True
     )
     state_type = Column(String(8), nullable=False)
     created_at = Column(String(32), default=util.utc_now, nullable=False)
@@ -504,6 +553,16 @@ class RunObject(Base):
     ended_at = Column(String(32))
     arguments = Column(JsonObject)
     result = Column(JsonObject)
+    # Key of the cached archive of run result files in the file store.
+    archive_key = Column(String(1024))
+    priority = Column(Integer, nullable=False, default=PRIORITY_NORMAL)
+    # Identifier of the run scheduler (process) that holds the run.
+    owner = Column(String(32), nullable=True)
+
+    # Index for keyset pagination of group run listings.
+    __table_args__ = (
+        Index('ix_workflow_run_group_created', 'group_id', 'created_at', 'run_id'),
+    )
 
     # -- Relationships --------------------------------------------------------
     files = relationship('RunFile', cascade='all, delete, delete-orphan')
@@ -612,14 +671,15 @@ class RunObject(Base):
         -------
         dict(string: flowserv.model.template.files.WorkflowOutputFile)
         """
+        template = self.workflow.get_template()
         if self.group_id is not None:
             # The run is for a workflow group submission.
-            outputs = self.workflow.outputs
+            outputs = template.outputs
         else:
             # The run was for a ppst-processing workflow. In this case the
             # postproc sepecification will contain the output file definitions
             # that we are interested in.
-            outputs = self.workflow.postproc_spec.get('outputs')
+            outputs = template.postproc_spec.get('outputs')
             if outputs is not None:
                 outputs = [WorkflowOutputFile.from_dict(f) for f in outputs]
         # Return an empty dictionary if no output specification was found.
@@ -676,7 +736,8 @@ class RunFile(FileObject):
 
     run_id = Column(
         String(32),
-        ForeignKey('workflow_run.run_id')
+        ForeignKey('workflow_run.run_id'),
+        index=True
     )
 
     UniqueConstraint('run_id', 'name')
@@ -704,6 +765,65 @@ class RunMessage(Base):
     run = relationship('RunObject', back_populates='log')
 
 
+# -- Run State Updates --------------------------------------------------------
+
+class RunStateUpdate(Base):
+    """Outbox for run state updates that are reported by workflow engines.
+    Updates are written by the engine callbacks and applied to the workflow
+    runs in order of their identifier by a single writer.
+    """
+    # -- Schema ---------------------------------------------------------------
+    __tablename__ = 'run_state_update'
+
+    update_id = Column(Integer, primary_key=True, autoincrement=True)
+    run_id = Column(String(32), nullable=False, index=True)
+    state = Column(JsonObject, nullable=False)
+    runstore = Column(JsonObject, nullable=True)
+    created_at = Column(String(32), default=util.utc_now, nullable=False)
+    attempts = Column(Integer, default=0, nullable=False)
+
+
+class RunStateLease(Base):
+    """Lease for tasks that only one of multiple API processes that share the
+    same database may perform at a time, e.g., the writer that applies the run
+    state updates in the outbox. Only the owner of an unexpired lease performs
+    the task. This ensures that each update is applied once and in order.
+    """
+    # -- Schema ---------------------------------------------------------------
+    __tablename__ = 'run_state_lease'
+
+    lease_id = Column(Integer, primary_key=True)
+    owner = Column(String(32), nullable=True)
+    expires = Column(String(32), nullable=True)
+
+
+class RunOwner(Base):
+    """Heartbeat for run schedulers that hold workflow runs. Pending runs of
+    a scheduler whose heartbeat has expired can be claimed by the scheduler
+    of a different process.
+    """
+    # -- Schema ---------------------------------------------------------------
+    __tablename__ = 'run_owner'
+
+    owner_id = Column(String(32), primary_key=True)
+    heartbeat = Column(String(32), nullable=False)
+
+
+# -- Schema Version -----------------------------------------------------------
+
+class SchemaVersion(Base):
+    """Log of schema migrations that have been applied to the database. The
+    current version of the database schema is the maximum version number in
+    the log.
+    """
+    # -- Schema ---------------------------------------------------------------
+    __tablename__ = 'schema_version'
+
+    version = Column(Integer, primary_key=True)
+    description = Column(String(512))
+    applied_at = Column(String(32), nullable=False)
+
+
 # -- Helper classes and functions ---------------------------------------------
 
 def by_pos(msg):
@@ -0,0 +1,200 @@
+# This file is part of the Reproducible and Reusable Data Analysis Workflow
+# Server (flowServ).
+#
+# Copyright (C) 2019-2021 NYU.
+#
+# flowServ is free software; you can redistribute it and/or modify it under the
+# terms of the MIT License; see LICENSE file for more details.
+
+"""Process-local caches for authentication and authorization information.
+
+The caches avoid repeated database queries for information that is needed for
+every API request, e.g., the user that is associated with an access token.
+Cache entries expire after a fixed time-to-live. This bounds the time for
+which changes that are made by other processes remain invisible. Changes that
+are made by the current process invalidate the affected entries explicitly
+once the database transaction that contains the change is committed.
+"""
+
+from collections import OrderedDict
+from sqlalchemy import event
+from threading import Lock
+from typing import Any, Iterable, Optional
+
+import datetime as dt
+
+
+"""Default maximum number of entries and time-to-live (in sec.) for cache
+entries.
+"""
+DEFAULT_MAXSIZE = 1024
+DEFAULT_TTL = 60
+
+"""Time-to-live (in sec.) for cached group memberships."""
+MEMBERSHIP_TTL = 10
+
+"""Key for users with changed group memberships in the session info."""
+SESSION_KEY = 'flowserv.memberships'
+
+"""Key for invalidated access tokens in the session info."""
+TOKENS_KEY = 'flowserv.tokens'
+
+
+class TTLCache(object):
+    """Bounded cache where each entry expires after a given time-to-live.
+    Entries are evicted in least-recently-used order once the maximum size is
+    reached.
+    """
+    def __init__(
+        self, maxsize: Optional[int] = DEFAULT_MAXSIZE,
+        ttl: Optional[int] = DEFAULT_TTL
+    ):
+        """Initialize the maximum cache size and the time-to-live for entries.
+
+        Parameters
+        ----------
+        maxsize: int, default=1024
+            Maximum number of entries in the cache.
+        ttl: int, default=60
+            Time-to-live for cache entries in seconds.
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = Lock()
+
+    def clear(self):
+        """Remove all entries from the cache."""
+        with self._lock:
+            self._entries.clear()
+
+    def get(self, key: Any) -> Optional[Any]:
+        """Get the cached value for the given key. Returns None if the key is
+        not in the cache or if the entry has expired.
+
+        Parameters
+        ----------
+        key: any
+            Cache key.
+
+        Returns
+        -------
+        any
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires = entry
+            if expires <= dt.datetime.now():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def put(self, key: Any, value: Any, expires: Optional[dt.datetime] = None):
+        """Add a value to the cache. The entry expires after the time-to-live
+        or at the given expiry date, whatever comes first.
+
+        Parameters
+        ----------
+        key: any
+            Cache key.
+        value: any
+            Cached value.
+        expires: datetime.datetime, default=None
+            Optional expiry date for the cached value.
+        """
+        deadline = dt.datetime.now() + dt.timedelta(seconds=self.ttl)
+        if expires is not None and expires < deadline:
+            deadline = expires
+        with self._lock:
+            self._entries[key] = (value, deadline)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def remove(self, key: Any):
+        """Remove the entry for the given key (if it exists).
+
+        Parameters
+        ----------
+        key: any
+            Cache key.
+        """
+        with self._lock:
+            self._entries.pop(key, None)
+
+
+"""Cache for validated access tokens. Maps the API key value to a tuple of
+user identifier and user name.
+"""
+tokens = TTLCache()
+
+"""Cache for group memberships. Maps the user identifier to the set of
+identifiers for the groups that the user is a member of.
+"""
+memberships = TTLCache(ttl=MEMBERSHIP_TTL)
+
+
+def invalidate_memberships(session, user_ids: Iterable[str]):
+    """Remove the cached group memberships for the given users when the
+    session is committed. Removing the entries before the commit would allow
+    a concurrent reader to cache the previous memberships again.
+
+    Parameters
+    ----------
+    session: sqlalchemy.orm.session.Session
+        Database session that contains the membership changes.
+    user_ids: iterable of string
+        Identifier of users whose group memberships changed.
+    """
+    session.info.setdefault(SESSION_KEY, set()).update(user_ids)
+
+
+def invalidate_tokens(session, api_keys: Iterable[str]):
+    """Remove the cached entries for the given access tokens when the session
+    is committed. Removing the entries before the commit would allow a
+    concurrent reader to cache the tokens again.
+
+    Parameters
+    ----------
+    session: sqlalchemy.orm.session.Session
+        Database session that contains the invalidation of the tokens.
+    api_keys: iterable of string
+        Invalidated access tokens.
+    """
+    session.info.setdefault(TOKENS_KEY, set()).update(api_keys)
+
+
+def track_memberships(session_factory):
+    """Register event listeners for the sessions that are created by the
+    given session factory. The listeners remove cached group memberships for
+    users whose memberships were changed and cached access tokens that were
+    invalidated when a session is committed.
+
+    Parameters
+    ----------
+    session_factory: sqlalchemy.orm.session.sessionmaker
+        Factory for database sessions.
+    """
+    event.listen(session_factory, 'after_commit', _remove_memberships)
+    event.listen(session_factory, 'after_rollback', _discard_memberships)
+
+
+def _discard_memberships(session):
+    """Discard the recorded membership changes and invalidated tokens when a
+    session is rolled back.
+    """
+    session.info.pop(SESSION_KEY, None)
+    session.info.pop(TOKENS_KEY, None)
+
+
+def _remove_memberships(session):
+    """Remove cached memberships for the recorded users and the cached
+    entries for invalidated access tokens when a session is committed.
+    """
+    for user_id in session.info.pop(SESSION_KEY, []):
+        memberships.remove(user_id)
+    for api_key in session.info.pop(TOKENS_KEY, []):
+        tokens.remove(api_key)
@@ -13,13 +13,16 @@ sessions as well as to create a fresh database.
 from __future__ import annotations
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker, scoped_session
-from typing import Optional
+from typing import List, Optional
 
 import os
 
 from flowserv.model.base import Base
+from flowserv.model.cache import track_memberships
+from flowserv.model.notify import track_run_states
 
 import flowserv.config as config
+import flowserv.model.migration as migration
 import flowserv.util as util
 
 
@@ -64,35 +67,68 @@ class DB(object):
             import logging
             logging.info('Connect to database Url %s' % (connect_url))
         self._engine = create_engine(connect_url, echo=echo)
+        # Notify threads that wait for run state changes and invalidate cached
+        # group memberships and access tokens when a session is committed.
+        factory = sessionmaker(bind=self._engine)
+        track_run_states(factory)
+        track_memberships(factory)
         if web_app:
-            self._session = scoped_session(sessionmaker(bind=self._engine))
+            self._session = scoped_session(factory)
         else:
-            self._session = sessionmaker(bind=self._engine)
+            self._session = factory
 
     def init(self) -> DB:
         """Create all tables in the database model schema. This will also
         register the default user. The password for the user is a random UUID
         since the default user is not expected to login (but be used only in
         open access policies).
+
+        Note that all existing tables are dropped. Use :meth:`upgrade` to
+        update the schema of an existing database without losing data.
         """
         # Add import for modules that contain ORM definitions.
         import flowserv.model.base  # noqa: F401
         # Drop all tables first before creating them
         Base.metadata.drop_all(self._engine)
         Base.metadata.create_all(self._engine)
-        # Create the default user.
+        # The created schema is up to date with the latest migration.
+        version = migration.latest_version()
+        if version > 0:
+            migration.set_version(self._engine, version, 'initial schema')
+        # Create the default user. The secret is a random unique identifier
+        # that is never used for login. A single hash round is sufficient.
         with self.session() as session:
             from passlib.hash import pbkdf2_sha256
             from flowserv.model.base import User
             user = User(
                 user_id=config.DEFAULT_USER,
                 name=config.DEFAULT_USER,
-                secret=pbkdf2_sha256.hash(util.get_unique_identifier()),
+                secret=pbkdf2_sha256.using(rounds=1).hash(util.get_unique_identifier()),
                 active=True
             )
             session.add(user)
         return self
 
+    def upgrade(self) -> List:
+        """Upgrade the schema of an existing database to the latest version.
+        Applies all pending schema migrations in place without dropping any
+        tables. Returns the list of migrations that were applied.
+
+        Returns
+        -------
+        list of flowserv.model.migration.Migration
+        """
+        return migration.upgrade(self._engine)
+
+    def version(self) -> int:
+        """Get the current version of the database schema.
+
+        Returns
+        -------
+        int
+        """
+        return migration.current_version(self._engine)
+
     def session(self):
         """Create a new database session instance. The sessoin is wrapped by a
         context manager to properly manage the session scope.
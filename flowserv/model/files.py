@@ -131,6 +131,23 @@ def io_file(data: Union[List, Dict], format: Optional[str] = None) -> IOBuffer:
     return IOBuffer(buf)
 
 
+def run_archivedir(workflow_id: str, run_id: str) -> str:
+    """Get path to the directory for cached archives of run result files.
+
+    Parameters
+    ----------
+    workflow_id: string
+        Unique workflow identifier
+    run_id: string
+        Unique run identifier
+
+    Returns
+    -------
+    string
+    """
+    return util.join(run_basedir(workflow_id, run_id), '.archive')
+
+
 def run_basedir(workflow_id: str, run_id: str) -> str:
     """Get path to the base directory for all files that are maintained for
     a workflow run.
@@ -195,6 +212,22 @@ def workflow_groupdir(workflow_id: str, group_id: str) -> str:
     return util.join(workflowdir, 'groups', group_id)
 
 
+def workflow_postprocdir(workflow_id: str) -> str:
+    """Get base directory for the staged input files of post-processing
+    workflow runs.
+
+    Parameters
+    ----------
+    workflow_id: string
+        Unique workflow identifier
+
+    Returns
+    -------
+    string
+    """
+    return util.join(workflow_basedir(workflow_id), 'postproc')
+
+
 def workflow_staticdir(workflow_id: str) -> str:
     """Get base directory containing static files that are associated with
     a workflow template.
@@ -13,10 +13,12 @@ database.
 
 import mimetypes
 
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import selectinload
 from sqlalchemy.orm.session import Session
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Optional
 
-from flowserv.model.base import UploadFile, GroupObject, WorkflowObject
+from flowserv.model.base import UploadFile, GroupObject, User, WorkflowObject
 from flowserv.model.files import FileHandle
 from flowserv.model.constraint import validate_identifier
 from flowserv.model.parameter.base import Parameter
@@ -25,11 +27,27 @@ from flowserv.util import get_unique_identifier as unique_identifier
 from flowserv.volume.base import IOHandle, StorageVolume
 
 import flowserv.error as err
+import flowserv.model.cache as cache
 import flowserv.model.constraint as constraint
 import flowserv.model.files as dirs
 import flowserv.util as util
 
 
+"""Default number of groups that are fetched by a single query when iterating
+over groups.
+"""
+DEFAULT_BATCHSIZE = 1000
+
+"""Loader options for group handles. The serialization of a group handle
+accesses the group members and the uploaded files. Both are loaded with the
+group to avoid separate lazy-load queries.
+"""
+GROUP_HANDLE_OPTIONS = [
+    selectinload(GroupObject.members),
+    selectinload(GroupObject.uploads)
+]
+
+
 class WorkflowGroupManager(object):
     """Manager for workflow groups that associate a set of users with a set of
     workflow runs. The manager provides functionality to interact with the
@@ -141,6 +159,7 @@ class WorkflowGroupManager(object):
             member_set.add(user_id)
         for member_id in member_set:
             group.members.append(self.users.get_user(member_id, active=True))
+        cache.invalidate_memberships(self.session, member_set)
         # Enter group information into the database.
         self.session.add(group)
         return group
@@ -192,6 +211,7 @@ class WorkflowGroupManager(object):
         # assume that the group does not exist and raise an error.
         group = self.get_group(group_id)
         groupdir = dirs.workflow_groupdir(group.workflow_id, group_id)
+        cache.invalidate_memberships(self.session, [m.user_id for m in group.members])
         # Delete the group and the base directory containing group files.
         # Commit changes before deleting the directory.
         self.session.delete(group)
@@ -215,6 +235,7 @@ class WorkflowGroupManager(object):
         flowserv.error.UnknownWorkflowGroupError
         """
         group = self.session.query(GroupObject)\
+            .options(*GROUP_HANDLE_OPTIONS)\
             .filter(GroupObject.group_id == group_id)\
             .one_or_none()
         if group is None:
@@ -256,11 +277,52 @@ class WorkflowGroupManager(object):
         # No file with matching identifier was found.
         raise err.UnknownFileError(file_id)
 
-    def list_groups(self, workflow_id=None, user_id=None):
+    def iter_groups(
+        self, workflow_id: Optional[str] = None, user_id: Optional[str] = None,
+        batch_size: Optional[int] = DEFAULT_BATCHSIZE
+    ) -> Iterator[GroupObject]:
+        """Iterate over group descriptors. The filters for user and workflow
+        are the same as for :meth:`list_groups`. Groups are fetched from the
+        database in pages of the given batch size using keyset pagination.
+
+        Parameters
+        ----------
+        workflow_id: string, optional
+            Unique workflow identifier
+        user_id: string, optional
+            Unique user identifier
+        batch_size: int, default=1000
+            Number of groups that are fetched with a single query.
+
+        Returns
+        -------
+        iterator of flowserv.model.base.GroupObject
+        """
+        after = None
+        while True:
+            groups = self.list_groups(
+                workflow_id=workflow_id,
+                user_id=user_id,
+                limit=batch_size,
+                after=after
+            )
+            yield from groups
+            if len(groups) < batch_size:
+                break
+            after = group_cursor(groups[-1])
+
+    def list_groups(
+        self, workflow_id: Optional[str] = None, user_id: Optional[str] = None,
+        limit: Optional[int] = None, after: Optional[str] = None
+    ) -> List[GroupObject]:
         """Get a listing of group descriptors. If the user identifier is given,
         only those groups are returned that the user is a member of. If the
         workflow identifier is given, only groups for the given workflow
-        are included.
+        are included. Groups are sorted by their name (and identifier).
+
+        The optional limit and cursor allow to retrieve the list in pages
+        (using keyset pagination). The cursor for the next page is created
+        from the last group on the current page using :func:`group_cursor`.
 
         Parameters
         ----------
@@ -268,31 +330,51 @@ class WorkflowGroupManager(object):
             Unique workflow identifier
         user_id: string, optional
             Unique user identifier
+        limit: int, default=None
+            Maximum number of groups in the returned list.
+        after: string, default=None
+            Cursor for the last group on the previous page.
 
         Returns
         -------
         list(flowserv.model.base.GroupObject)
+
+        Raises
+        ------
+        flowserv.error.InvalidArgumentError
+        flowserv.error.UnknownUserError
+        flowserv.error.UnknownWorkflowError
         """
-        # Generate query depending on whether a user and workflow filter is
-        # given or not.
-        if workflow_id is None and user_id is None:
-            # Return list of all groups.
-            return self.session.query(GroupObject).all()
-        elif workflow_id is None:
-            # Return all groups that a user is a member of.
-            return self.users.get_user(user_id, active=True).groups
-        elif user_id is None:
-            # Return all groups for a workflow template.
-            workflow = self.session.query(WorkflowObject)\
-                .filter(WorkflowObject.workflow_id == workflow_id)\
-                .one_or_none()
-            if workflow is None:
-                raise err.UnknownWorkflowError(workflow_id)
-            return workflow.groups
-        else:
-            # Filter user groups for a particular workflow.
-            user_groups = self.users.get_user(user_id, active=True).groups
-            return [g for g in user_groups if g.workflow_id == workflow_id]
+        query = self.session.query(GroupObject)
+        if user_id is not None:
+            # Filter groups that a user is a member of. Raises an error if the
+            # user does not exist or is not active.
+            self.users.get_user(user_id, active=True)
+            query = query\
+                .join(GroupObject.members)\
+                .filter(User.user_id == user_id)
+        if workflow_id is not None:
+            if user_id is None:
+                # Ensure that the workflow exists.
+                workflow = self.session.query(WorkflowObject.workflow_id)\
+                    .filter(WorkflowObject.workflow_id == workflow_id)\
+                    .one_or_none()
+                if workflow is None:
+                    raise err.UnknownWorkflowError(workflow_id)
+            query = query.filter(GroupObject.workflow_id == workflow_id)
+        if after is not None:
+            try:
+                name, group_id = util.decode_cursor(after)
+            except ValueError as ex:
+                raise err.InvalidArgumentError(str(ex))
+            query = query.filter(or_(
+                GroupObject.name > name,
+                and_(GroupObject.name == name, GroupObject.group_id > group_id)
+            ))
+        query = query.order_by(GroupObject.name, GroupObject.group_id)
+        if limit is not None:
+            query = query.limit(limit)
+        return query.all()
 
     def list_uploaded_files(self, group_id):
         """Get list of file handles for all files that have been uploaded to
@@ -344,9 +426,11 @@ class WorkflowGroupManager(object):
             constraint.validate_name(name)
             group.name = name
         if members is not None:
+            users = [m.user_id for m in group.members] + list(members)
             group.members = list()
             for user_id in members:
                 group.members.append(self.users.get_user(user_id, active=True))
+            cache.invalidate_memberships(self.session, users)
         return group
 
     def upload_file(self, group_id: str, file: IOHandle, name: str):
@@ -403,3 +487,21 @@ class WorkflowGroupManager(object):
         )
         group.uploads.append(fileobj)
         return fileobj
+
+
+# -- Helper Functions ---------------------------------------------------------
+
+def group_cursor(group: GroupObject) -> str:
+    """Get the pagination cursor for a group listing that ends with the given
+    group.
+
+    Parameters
+    ----------
+    group: flowserv.model.base.GroupObject
+        Last group on a page of a group listing.
+
+    Returns
+    -------
+    string
+    """
+    return util.encode_cursor([group.name, group.group_id])
@@ -0,0 +1,370 @@
+# This file is part of the Reproducible and Reusable Data Analysis Workflow
+# Server (flowServ).
+#
+# Copyright (C) 2019-2021 NYU.
+#
+# flowServ is free software; you can redistribute it and/or modify it under the
+# terms of the MIT License; see LICENSE file for more details.
+
+"""Versioned schema migrations for the flowServ database.
+
+Each migration has a unique (increasing) version number and an upgrade function
+that modifies the schema of an existing database in place. The version of the
+database schema is maintained in the *schema_version* table. Migrations are
+applied in the order of their version number for all versions that are greater
+than the current version of the database.
+
+The helper functions for adding columns and indexes are idempotent, i.e., they
+do not modify the database if the column or index exists already. This is
+necessary since tables that are missing in an existing database are created
+from the current ORM model (and will therefore contain all columns and indexes)
+before the migrations are applied.
+"""
+
+from sqlalchemy import Column, Integer, String, inspect, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.schema import CreateColumn
+from typing import Callable, List
+
+from flowserv.model.base import APIKey, Base, RunOwner, RunStateLease, RunStateUpdate, SchemaVersion
+
+import flowserv.util as util
+
+
+"""Query the validity flag for a PostgreSQL index. The result is empty if the
+index does not exist.
+"""
+PG_INDEX_VALID = (
+    'SELECT i.indisvalid FROM pg_index i '
+    'JOIN pg_class c ON c.oid = i.indexrelid '
+    'WHERE c.relname = :name'
+)
+
+
+class Migration(object):
+    """Migration step for the database schema. Each migration has a unique
+    version number, a short description, and an upgrade function that modifies
+    the schema of a given database.
+    """
+    def __init__(
+        self, version: int, description: str, upgrade: Callable[[Engine], None]
+    ):
+        """Initialize the object properties.
+
+        Parameters
+        ----------
+        version: int
+            Unique schema version number.
+        description: string
+            Short description of the schema changes.
+        upgrade: callable
+            Function that modifies the database schema. The function receives
+            the database engine as its only argument.
+        """
+        self.version = version
+        self.description = description
+        self.upgrade = upgrade
+
+
+# -- Migration helper functions -----------------------------------------------
+
+def add_column(engine: Engine, table: str, column: Column):
+    """Add a column to an existing table. The column is not added if the table
+    contains a column with the same name already.
+
+    Parameters
+    ----------
+    engine: sqlalchemy.engine.Engine
+        Database engine.
+    table: string
+        Name of the database table.
+    column: sqlalchemy.Column
+        Definition for the new table column.
+    """
+    columns = [c['name'] for c in inspect(engine).get_columns(table)]
+    if column.name in columns:
+        return
+    ddl = CreateColumn(column).compile(dialect=engine.dialect)
+    with engine.begin() as conn:
+        conn.execute(text('ALTER TABLE {} ADD COLUMN {}'.format(table, ddl)))
+
+
+def create_index(engine: Engine, table: str, name: str, columns: List[str]):
+    """Create an index on the given table columns. The index is not created if
+    an index with the same name exists for the table already.
+
+    For PostgreSQL databases the index is created concurrently in order to
+    avoid locking the table against writes while the index is being built. A
+    failed concurrent build leaves an invalid index behind. Invalid indexes
+    are dropped and created again.
+
+    Parameters
+    ----------
+    engine: sqlalchemy.engine.Engine
+        Database engine.
+    table: string
+        Name of the database table.
+    name: string
+        Unique index name.
+    columns: list of string
+        Names of the indexed table columns.
+    """
+    sql = 'CREATE INDEX {}{} ON {} ({})'
+    if engine.dialect.name == 'postgresql':
+        # Concurrent index creation cannot run inside a transaction block.
+        conn = engine.connect().execution_options(isolation_level='AUTOCOMMIT')
+        try:
+            valid = conn.execute(text(PG_INDEX_VALID), {'name': name}).scalar()
+            if valid:
+                return
+            elif valid is not None:
+                conn.execute(text('DROP INDEX CONCURRENTLY {}'.format(name)))
+            conn.execute(text(sql.format('CONCURRENTLY ', name, table, ', '.join(columns))))
+        finally:
+            conn.close()
+    else:
+        indexes = [ix['name'] for ix in inspect(engine).get_indexes(table)]
+        if name in indexes:
+            return
+        sql = sql.format('', name, table, ', '.join(columns))
+        with engine.begin() as conn:
+            conn.execute(text(sql))
+
+
+# -- Migrations ---------------------------------------------------------------
+
+def v1_foreign_key_indexes(engine: Engine):
+    """Create indexes for foreign key columns that are used to filter runs,
+    groups and files.
+    """
+    create_index(engine, 'workflow_group', 'ix_workflow_group_workflow_id', ['workflow_id'])
+    create_index(engine, 'group_upload_file', 'ix_group_upload_file_group_id', ['group_id'])
+    create_index(engine, 'workflow_run', 'ix_workflow_run_workflow_id', ['workflow_id'])
+    create_index(engine, 'workflow_run', 'ix_workflow_run_group_id', ['group_id'])
+    create_index(engine, 'run_file', 'ix_run_file_run_id', ['run_id'])
+
+
+def v2_template_version(engine: Engine):
+    """Add the version stamp for workflow templates that is used as part of
+    the key for the parsed template cache. Existing workflows are assigned a
+    unique version stamp.
+    """
+    add_column(engine, 'workflow_template', Column('template_version', String(32)))
+    select = 'SELECT workflow_id FROM workflow_template WHERE template_version IS NULL'
+    update = 'UPDATE workflow_template SET template_version = :version WHERE workflow_id = :id'
+    with engine.begin() as conn:
+        workflows = [row[0] for row in conn.execute(text(select))]
+        for workflow_id in workflows:
+            params = {'version': util.get_unique_identifier(), 'id': workflow_id}
+            conn.execute(text(update), params)
+
+
+def v3_run_listing_index(engine: Engine):
+    """Create index for keyset pagination of group run listings."""
+    create_index(
+        engine,
+        'workflow_run',
+        'ix_workflow_run_group_created',
+        ['group_id', 'created_at', 'run_id']
+    )
+
+
+def v4_run_state_updates(engine: Engine):
+    """Create the outbox table for run state updates.
+
+    Parameters
+    ----------
+    engine: sqlalchemy.engine.Engine
+        Database engine.
+    """
+    RunStateUpdate.__table__.create(engine, checkfirst=True)
+
+
+def v5_api_key_expiry(engine: Engine):
+    """Store the expiry date of API keys as a native timestamp. Existing
+    values are ISO-formatted strings.
+
+    For PostgreSQL the column type is changed in place. SQLite does not enforce
+    column types. The values are rewritten in the format that is expected for
+    timestamps instead. For other databases the API key table is re-created,
+    i.e., all users have to login again.
+    """
+    if engine.dialect.name == 'postgresql':
+        sql = 'ALTER TABLE api_key ALTER COLUMN expires TYPE TIMESTAMP USING expires::timestamp'
+        with engine.begin() as conn:
+            conn.execute(text(sql))
+    elif engine.dialect.name == 'sqlite':
+        select = 'SELECT user_id, expires FROM api_key'
+        table = APIKey.__table__
+        with engine.begin() as conn:
+            for user_id, expires in list(conn.execute(text(select))):
+                conn.execute(
+                    table.update()
+                    .where(table.c.user_id == user_id)
+                    .values(expires=util.to_datetime(expires))
+                )
+    else:
+        APIKey.__table__.drop(engine, checkfirst=True)
+        APIKey.__table__.create(engine)
+
+
+def v6_run_archive_key(engine: Engine):
+    """Add the key for cached run result archives."""
+    add_column(engine, 'workflow_run', Column('archive_key', String(1024)))
+
+
+def v7_run_priority(engine: Engine):
+    """Add the priority for workflow runs. Existing runs have normal
+    priority.
+    """
+    column = Column('priority', Integer, nullable=False, server_default='0')
+    add_column(engine, 'workflow_run', column)
+
+
+def v8_run_state_lease(engine: Engine):
+    """Create the table for the writer lease of the run state update outbox."""
+    RunStateLease.__table__.create(engine, checkfirst=True)
+
+
+def v9_run_owner(engine: Engine):
+    """Add the owner for workflow runs and create the table for the heartbeat
+    of run owners.
+    """
+    add_column(engine, 'workflow_run', Column('owner', String(32)))
+    RunOwner.__table__.create(engine, checkfirst=True)
+
+
+"""Ordered list of schema migrations."""
+MIGRATIONS = [
+    Migration(
+        version=1,
+        description='indexes for foreign key columns',
+        upgrade=v1_foreign_key_indexes
+    ),
+    Migration(
+        version=2,
+        description='workflow template version stamp',
+        upgrade=v2_template_version
+    ),
+    Migration(
+        version=3,
+        description='index for paginated run listings',
+        upgrade=v3_run_listing_index
+    ),
+    Migration(
+        version=4,
+        description='outbox for run state updates',
+        upgrade=v4_run_state_updates
+    ),
+    Migration(
+        version=5,
+        description='native timestamp for API key expiry',
+        upgrade=v5_api_key_expiry
+    ),
+    Migration(
+        version=6,
+        description='key for cached run result archives',
+        upgrade=v6_run_archive_key
+    ),
+    Migration(
+        version=7,
+        description='priority for workflow runs',
+        upgrade=v7_run_priority
+    ),
+    Migration(
+        version=8,
+        description='writer lease for run state updates',
+        upgrade=v8_run_state_lease
+    ),
+    Migration(
+        version=9,
+        description='owner and heartbeat for workflow runs',
+        upgrade=v9_run_owner
+    )
+]
+
+
+# -- Schema version -----------------------------------------------------------
+
+def current_version(engine: Engine) -> int:
+    """Get the current schema version for the database. The result is zero if
+    the database does not contain the schema version table or if the table is
+    empty.
+
+    Parameters
+    ----------
+    engine: sqlalchemy.engine.Engine
+        Database engine.
+
+    Returns
+    -------
+    int
+    """
+    if SchemaVersion.__tablename__ not in inspect(engine).get_table_names():
+        return 0
+    sql = 'SELECT MAX(version) FROM {}'.format(SchemaVersion.__tablename__)
+    with engine.connect() as conn:
+        version = conn.execute(text(sql)).scalar()
+    return version if version is not None else 0
+
+
+def latest_version() -> int:
+    """Get the version number of the latest schema migration.
+
+    Returns
+    -------
+    int
+    """
+    return max([m.version for m in MIGRATIONS]) if MIGRATIONS else 0
+
+
+def set_version(engine: Engine, version: int, description: str):
+    """Record the given version as the current version of the database schema.
+
+    Parameters
+    ----------
+    engine: sqlalchemy.engine.Engine
+        Database engine.
+    version: int
+        Schema version number.
+    description: string
+        Short description of the schema version.
+    """
+    with engine.begin() as conn:
+        conn.execute(
+            SchemaVersion.__table__.insert().values(
+                version=version,
+                description=description,
+                applied_at=util.utc_now()
+            )
+        )
+
+
+def upgrade(engine: Engine) -> List[Migration]:
+    """Upgrade the schema of the given database to the latest version. Tables
+    that do not exist in the database are created first. Then all migrations
+    with a version number greater than the current schema version are applied
+    in order. Existing data is not modified.
+
+    Returns the list of migrations that were applied.
+
+    Parameters
+    ----------
+    engine: sqlalchemy.engine.Engine
+        Database engine.
+
+    Returns
+    -------
+    list of flowserv.model.migration.Migration
+    """
+    version = current_version(engine)
+    # Create all tables that are missing (including the schema version table).
+    Base.metadata.create_all(engine)
+    applied = list()
+    for migration in sorted(MIGRATIONS, key=lambda m: m.version):
+        if migration.version <= version:
+            continue
+        migration.upgrade(engine)
+        set_version(engine, migration.version, migration.description)
+        applied.append(migration)
+    return applied
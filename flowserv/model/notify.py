@@ -0,0 +1,210 @@
+# This file is part of the Reproducible and Reusable Data Analysis Workflow
+# Server (flowServ).
+#
+# Copyright (C) 2019-2021 NYU.
+#
+# flowServ is free software; you can redistribute it and/or modify it under the
+# terms of the MIT License; see LICENSE file for more details.
+
+"""Notification channel for changes of the state of workflow runs. Database
+sessions record the identifier of all runs whose state was modified. When a
+session is committed, threads that wait for a change of one of these runs are
+woken up.
+
+Notifications are only delivered within a single process. Waiting threads
+therefore re-check the run state in the database at regular intervals to
+detect changes that were made by other processes.
+"""
+
+from __future__ import annotations
+from sqlalchemy import event, inspect
+from threading import Condition
+from typing import Iterable, Optional
+
+from flowserv.model.base import RunObject
+
+
+"""Key for the set of modified runs in the session info dictionary."""
+SESSION_KEY = 'flowserv.runstates'
+
+
+class RunStateChannel(object):
+    """Channel that wakes up threads that wait for state changes of workflow
+    runs. The channel maintains a change counter for each run that has at
+    least one waiting thread.
+    """
+    def __init__(self):
+        """Initialize the condition variable and the change counters."""
+        self._cond = Condition()
+        # Change counter and number of waiting threads for each run.
+        self._versions = dict()
+        self._waiting = dict()
+
+    def notify(self, run_ids: Iterable[str]):
+        """Notify waiting threads that the state of the given runs has changed.
+
+        Parameters
+        ----------
+        run_ids: iterable of string
+            Identifier of runs whose state has changed.
+        """
+        with self._cond:
+            changed = False
+            for run_id in run_ids:
+                if run_id in self._versions:
+                    self._versions[run_id] += 1
+                    changed = True
+            if changed:
+                self._cond.notify_all()
+
+    def watch(self, run_id: str) -> RunStateWatch:
+        """Get a watch for state changes of the given run. The watch has to be
+        closed when it is no longer needed. It is also a context manager.
+
+        Parameters
+        ----------
+        run_id: string
+            Unique run identifier.
+
+        Returns
+        -------
+        flowserv.model.notify.RunStateWatch
+        """
+        with self._cond:
+            self._waiting[run_id] = self._waiting.get(run_id, 0) + 1
+            version = self._versions.setdefault(run_id, 0)
+        return RunStateWatch(channel=self, run_id=run_id, version=version)
+
+    def _release(self, run_id: str):
+        """Remove a watch for the given run.
+
+        Parameters
+        ----------
+        run_id: string
+            Unique run identifier.
+        """
+        with self._cond:
+            self._waiting[run_id] -= 1
+            if self._waiting[run_id] == 0:
+                del self._waiting[run_id]
+                del self._versions[run_id]
+
+    def _wait(self, run_id: str, version: int, timeout: Optional[float] = None) -> int:
+        """Wait until the change counter for the given run differs from the
+        given version or until the timeout expires. Returns the current value
+        of the change counter.
+
+        Parameters
+        ----------
+        run_id: string
+            Unique run identifier.
+        version: int
+            Last known value of the change counter.
+        timeout: float, default=None
+            Maximum time (in sec.) to wait.
+
+        Returns
+        -------
+        int
+        """
+        with self._cond:
+            self._cond.wait_for(lambda: self._versions[run_id] != version, timeout=timeout)
+            return self._versions[run_id]
+
+
+class RunStateWatch(object):
+    """Watch for state changes of a single run. Changes that are committed
+    after the watch was created are not missed, even if they happen before
+    :meth:`wait` is called.
+    """
+    def __init__(self, channel: RunStateChannel, run_id: str, version: int):
+        """Initialize the channel, the run, and the last known value of the
+        change counter.
+
+        Parameters
+        ----------
+        channel: flowserv.model.notify.RunStateChannel
+            Notification channel.
+        run_id: string
+            Unique run identifier.
+        version: int
+            Value of the change counter when the watch was created.
+        """
+        self.channel = channel
+        self.run_id = run_id
+        self.version = version
+
+    def __enter__(self) -> RunStateWatch:
+        """Enter the runtime context."""
+        return self
+
+    def __exit__(self, type, value, traceback):
+        """Close the watch when leaving the runtime context."""
+        self.close()
+        return False
+
+    def close(self):
+        """Release the watch."""
+        self.channel._release(self.run_id)
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Wait until a state change of the run was committed or until the
+        timeout expires. Returns True if the run state has changed.
+
+        Parameters
+        ----------
+        timeout: float, default=None
+            Maximum time (in sec.) to wait.
+
+        Returns
+        -------
+        bool
+        """
+        version = self.channel._wait(run_id=self.run_id, version=self.version, timeout=timeout)
+        changed = version != self.version
+        self.version = version
+        return changed
+
+
+"""Notification channel for all database sessions in the process."""
+channel = RunStateChannel()
+
+
+def track_run_states(session_factory):
+    """Register event listeners for the sessions that are created by the
+    given session factory. The listeners notify the channel about changed
+    run states when a session is committed.
+
+    Parameters
+    ----------
+    session_factory: sqlalchemy.orm.session.sessionmaker
+        Factory for database sessions.
+    """
+    event.listen(session_factory, 'before_flush', _record_changes)
+    event.listen(session_factory, 'after_commit', _notify_changes)
+    event.listen(session_factory, 'after_rollback', _discard_changes)
+
+
+def _discard_changes(session):
+    """Discard the recorded run state changes when a session is rolled
+    back.
+    """
+    session.info.pop(SESSION_KEY, None)
+
+
+def _notify_changes(session):
+    """Notify the channel about the recorded run state changes when a
+    session is committed.
+    """
+    run_ids = session.info.pop(SESSION_KEY, None)
+    if run_ids:
+        channel.notify(run_ids)
+
+
+def _record_changes(session, flush_context, instances):
+    """Record the identifier of runs whose state is modified by the next
+    flush.
+    """
+    for obj in session.dirty:
+        if isinstance(obj, RunObject) and inspect(obj).attrs.state_type.history.has_changes():
+            session.info.setdefault(SESSION_KEY, set()).add(obj.run_id)
@@ -136,7 +136,7 @@ class RankingManager(object):
             )
         # Sort the ranking based on the order by clause. If no order by clause
         # is given use the schema default sort order..
-        result_schema = workflow.result_schema
+        result_schema = workflow.get_template().result_schema
         if order_by is None:
             order_by = result_schema.get_default_order()
         for sort_col in order_by[::-1]:
@@ -0,0 +1,342 @@
+# This file is part of the Reproducible and Reusable Data Analysis Workflow
+# Server (flowServ).
+#
+# Copyright (C) 2019-2021 NYU.
+#
+# flowServ is free software; you can redistribute it and/or modify it under the
+# terms of the MIT License; see LICENSE file for more details.
+
+"""Extraction of result values from the result files of workflow runs.
+
+The paths of all columns in a workflow result schema are compiled into a
+single path tree. Only the elements of the result document that are on one of
+the paths are visited. JSON result files are parsed incrementally if the
+optional package `ijson` is installed. Parsing stops as soon as values for all
+columns have been found. YAML result files are parsed with the C-based safe
+loader of PyYAML if it is available.
+"""
+
+from functools import lru_cache
+from typing import Any, Dict, IO, Iterator, List, Optional, Tuple
+
+import json
+import yaml
+
+from flowserv.model.template.schema import ResultSchema
+
+import flowserv.util as util
+
+try:
+    import ijson
+except ImportError:  # pragma: no cover
+    ijson = None
+
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:  # pragma: no cover
+    from yaml import SafeLoader
+
+
+"""Parser events for the start and end of JSON maps and arrays."""
+END_EVENTS = ('end_map', 'end_array')
+START_EVENTS = ('start_map', 'start_array')
+
+
+class PathNode(object):
+    """Node in the compiled path tree. Each node maps element keys to child
+    nodes. The list of column identifiers contains the columns for which the
+    node is the last element in the column path.
+    """
+    def __init__(self):
+        """Initialize the child nodes and the list of column identifiers."""
+        self.children = dict()
+        self.columns = list()
+
+    def add(self, path: List[str], column_id: str):
+        """Add the path for a result column to the tree.
+
+        Parameters
+        ----------
+        path: list of string
+            Path to the column value in nested result documents.
+        column_id: string
+            Unique column identifier.
+        """
+        node = self
+        for key in path:
+            node = node.children.setdefault(key, PathNode())
+        node.columns.append(column_id)
+
+
+class ResultExtractor(object):
+    """Extract result values for the columns of a result schema from nested
+    result documents.
+    """
+    def __init__(self, columns: List[Tuple[str, List[str]]]):
+        """Initialize the path tree for the given list of column identifiers
+        and column paths.
+
+        Parameters
+        ----------
+        columns: list of (string, list of string)
+            Column identifier and column path for all result columns.
+        """
+        self.root = PathNode()
+        for column_id, path in columns:
+            if path:
+                self.root.add(path=path, column_id=column_id)
+        self.size = len(columns)
+
+    def extract(self, doc: Dict, node: Optional[PathNode] = None) -> Dict[str, Any]:
+        """Extract column values from a result document. The result contains
+        the values for all columns that have a value in the given document.
+
+        The optional path node is used to extract values for the paths below
+        the node from a nested document that corresponds to the node.
+
+        Parameters
+        ----------
+        doc: dict
+            Result document.
+        node: flowserv.model.result.PathNode, default=None
+            Path tree node for the document. By default, the root node of the
+            compiled tree is used.
+
+        Returns
+        -------
+        dict
+        """
+        values = dict()
+        stack = [(node if node is not None else self.root, doc)]
+        while stack:
+            node, obj = stack.pop()
+            if not isinstance(obj, dict):
+                continue
+            for key, child in node.children.items():
+                if key not in obj:
+                    continue
+                val = obj[key]
+                if val is not None:
+                    for column_id in child.columns:
+                        values[column_id] = val
+                if child.children:
+                    stack.append((child, val))
+        return values
+
+    def read(self, file: IO, format: Optional[str] = None) -> Dict[str, Any]:
+        """Extract column values from a result file. The file is expected to
+        be in JSON format unless the format is given as YAML.
+
+        Parameters
+        ----------
+        file: file object
+            Binary file object for the result file.
+        format: string, default=None
+            Format identifier.
+
+        Returns
+        -------
+        dict
+        """
+        if format is not None and format.upper() == util.FORMAT_YAML:
+            return self.extract(yaml.load(file, Loader=SafeLoader))
+        elif ijson is not None:
+            return self.stream(ijson.basic_parse(file, use_float=True))
+        return self.extract(json.load(file))
+
+    def stream(self, events: Iterator[Tuple[str, Any]]) -> Dict[str, Any]:
+        """Extract column values from a stream of JSON parser events. The
+        events are generated by :func:`ijson.basic_parse`. Values are only
+        materialized for elements that are referenced by a column path.
+        Reading stops as soon as values for all columns have been found.
+
+        Parameters
+        ----------
+        events: iterator of (string, any)
+            JSON parser events.
+
+        Returns
+        -------
+        dict
+        """
+        values = dict()
+        # Stack of path nodes for the open JSON maps that are on one of the
+        # column paths.
+        stack = list()
+        # Path node for the value that follows the last map key.
+        current = None
+        for event, value in events:
+            if event == 'map_key':
+                current = stack[-1].children.get(value)
+            elif event == 'end_map':
+                stack.pop()
+                if not stack:
+                    break
+            elif not stack:
+                # Start of the document. The document has to be a map.
+                if event != 'start_map':
+                    break
+                stack.append(self.root)
+            else:
+                node, current = current, None
+                if self._consume(node, event, value, events, values):
+                    stack.append(node)
+                if len(values) == self.size:
+                    break
+        return values
+
+    def _consume(
+        self, node: PathNode, event: str, value: Any,
+        events: Iterator[Tuple[str, Any]], values: Dict[str, Any]
+    ) -> bool:
+        """Consume the value that follows a map key in a stream of JSON parser
+        events. Adds the values for all columns that end at the given path
+        node to the result dictionary. Returns True if the value is a map that
+        has to be read for values of columns with paths below the node.
+
+        Parameters
+        ----------
+        node: flowserv.model.result.PathNode
+            Path node for the value or None if the value is not on a path.
+        event: string
+            Parser event for the value.
+        value: any
+            Parser value for the event.
+        events: iterator of (string, any)
+            JSON parser events.
+        values: dict
+            Column values that have been found.
+
+        Returns
+        -------
+        bool
+        """
+        if node is None or (not node.columns and event == 'start_array'):
+            # Skip values that are not on any of the column paths.
+            if event in START_EVENTS:
+                skip_value(events)
+            return False
+        elif not node.columns:
+            return event == 'start_map'
+        # Materialize the value for the column(s).
+        if event in START_EVENTS:
+            value = build_value(event, events)
+        if value is not None:
+            for column_id in node.columns:
+                values[column_id] = value
+        if isinstance(value, dict) and node.children:
+            # Values nested in a materialized map.
+            values.update(self.extract(value, node=node))
+        return False
+
+
+def build_value(event: str, events: Iterator[Tuple[str, Any]]) -> Any:
+    """Build the map or array that starts with the given event from a stream
+    of JSON parser events.
+
+    Parameters
+    ----------
+    event: string
+        Start event for the value ('start_map' or 'start_array').
+    events: iterator of (string, any)
+        JSON parser events.
+
+    Returns
+    -------
+    dict or list
+    """
+    root = dict() if event == 'start_map' else list()
+    # Stack of open containers and the key for the next value in open maps.
+    stack = [root]
+    key = None
+    for event, value in events:
+        if event == 'map_key':
+            key = value
+            continue
+        if event in END_EVENTS:
+            stack.pop()
+            if not stack:
+                return root
+            continue
+        if event == 'start_map':
+            value = dict()
+        elif event == 'start_array':
+            value = list()
+        container = stack[-1]
+        if isinstance(container, dict):
+            container[key] = value
+        else:
+            container.append(value)
+        if event in START_EVENTS:
+            stack.append(value)
+    return root
+
+
+def skip_value(events: Iterator[Tuple[str, Any]]):
+    """Consume the parser events for a map or array whose start event has
+    already been read.
+
+    Parameters
+    ----------
+    events: iterator of (string, any)
+        JSON parser events.
+    """
+    depth = 1
+    for event, _ in events:
+        if event in START_EVENTS:
+            depth += 1
+        elif event in END_EVENTS:
+            depth -= 1
+            if depth == 0:
+                return
+
+
+@lru_cache(maxsize=128)
+def compile_columns(columns: Tuple[Tuple[str, Tuple[str]]]) -> ResultExtractor:
+    """Get the result extractor for a list of column identifiers and column
+    paths. Extractors are cached for the most recently used column lists.
+
+    Parameters
+    ----------
+    columns: tuple of (string, tuple of string)
+        Column identifier and column path for all result columns.
+
+    Returns
+    -------
+    flowserv.model.result.ResultExtractor
+    """
+    return ResultExtractor(columns=[(col, list(path)) for col, path in columns])
+
+
+def extractor(schema: ResultSchema) -> ResultExtractor:
+    """Get the result extractor for the columns of a result schema.
+
+    Parameters
+    ----------
+    schema: flowserv.model.template.schema.ResultSchema
+        Workflow result schema.
+
+    Returns
+    -------
+    flowserv.model.result.ResultExtractor
+    """
+    return compile_columns(tuple((c.column_id, tuple(c.jpath())) for c in schema.columns))
+
+
+def result_format(key: str) -> str:
+    """Get the format of a result file based on the file name. Files with
+    suffix '.yml' or '.yaml' are in YAML format. All other files are expected
+    to be in JSON format.
+
+    Parameters
+    ----------
+    key: string
+        Result file key.
+
+    Returns
+    -------
+    string
+    """
+    if key.lower().endswith(('.yml', '.yaml')):
+        return util.FORMAT_YAML
+    return util.FORMAT_JSON
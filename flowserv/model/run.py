@@ -10,23 +10,51 @@
 about workflow runs in an underlying database.
 """
 
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import timedelta
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import joinedload, selectinload
+from sqlalchemy.orm.query import Query
 from sqlalchemy.orm.session import Session
-from typing import List, Optional
+from typing import Callable, Iterator, List, Optional, Set, Union
 
-import io
+import logging
 import mimetypes
-import tarfile
 
-from flowserv.model.base import RunFile, RunObject, RunMessage, WorkflowRankingRun
+from flowserv.model.base import GroupObject, RunFile, RunObject, RunMessage, RunOwner, WorkflowRankingRun
+from flowserv.model.base import PRIORITY, PRIORITY_HIGH, PRIORITY_LOW, PRIORITY_NORMAL
 from flowserv.model.files import FileHandle
+from flowserv.model.result import extractor, result_format
 from flowserv.model.template.schema import ResultSchema
 from flowserv.model.workflow.state import WorkflowState
-from flowserv.volume.base import IOBuffer, StorageVolume
+from flowserv.volume.base import IOHandle, IOReader, StorageVolume
 
 import flowserv.error as err
 import flowserv.model.files as dirs
 import flowserv.model.workflow.state as st
 import flowserv.util as util
+import flowserv.volume.archive as archive
+
+
+"""Default batch size and number of threads for deleting obsolete runs and for
+copying run result files.
+"""
+DEFAULT_BATCHSIZE = 1000
+DEFAULT_MAXWORKERS = 4
+
+"""Name of the stored result archive (without suffix) for a run."""
+ARCHIVE_NAME = 'results'
+
+"""Loader options for run handles. The serialization of a run handle accesses
+the run files, log messages, workflow group and workflow. Loading them with
+the run avoids separate lazy-load queries for each relationship.
+"""
+RUN_HANDLE_OPTIONS = [
+    joinedload(RunObject.group),
+    joinedload(RunObject.workflow),
+    selectinload(RunObject.files),
+    selectinload(RunObject.log)
+]
 
 
 class RunManager(object):
@@ -34,7 +62,10 @@ class RunManager(object):
     delete, and retrieve runs. the manager also provides the functionality to
     update the state of workflow runs.
     """
-    def __init__(self, session: Session, fs: StorageVolume):
+    def __init__(
+        self, session: Session, fs: StorageVolume,
+        max_workers: Optional[int] = DEFAULT_MAXWORKERS
+    ):
         """Initialize the connection to the underlying database and the file
         system helper to get path names for run folders.
 
@@ -44,17 +75,71 @@ class RunManager(object):
             Database session.
         fs: flowserv.volume.base.StorageVolume
             File store for run input and output files.
+        max_workers: int, default=4
+            Maximum number of threads that copy result files of successful
+            runs to the file store.
         """
         self.session = session
         self.fs = fs
+        self.max_workers = max_workers
+
+    def claim_pending_runs(self, owner: str, timeout: float) -> List[RunObject]:
+        """Claim the runs in PENDING state that are held by a run scheduler
+        whose heartbeat has expired. Runs that are held by the given owner are
+        included as well. These runs remain from a previous process that used
+        the same owner identifier. Runs are sorted by decreasing priority and
+        by their creation time.
+
+        Runs without an owner were handed to the workflow engine directly and
+        are not claimed. Runs of an owner that has no heartbeat are claimed if
+        they were created before the timeout.
+
+        Parameters
+        ----------
+        owner: string
+            Identifier of the run scheduler that claims the runs.
+        timeout: float
+            Time (in sec.) after which the heartbeat of a run owner expires.
+
+        Returns
+        -------
+        list(flowserv.model.base.RunObject)
+        """
+        cutoff = (util.to_datetime(util.utc_now()) - timedelta(seconds=timeout)).isoformat()
+        alive = self.session.query(RunOwner.owner_id).filter(RunOwner.heartbeat > cutoff)
+        known = self.session.query(RunOwner.owner_id)
+        runs = self.session\
+            .query(RunObject)\
+            .filter(RunObject.state_type == st.STATE_PENDING)\
+            .filter(RunObject.owner.isnot(None))\
+            .filter(or_(
+                RunObject.owner == owner,
+                and_(
+                    ~RunObject.owner.in_(alive),
+                    or_(RunObject.owner.in_(known), RunObject.created_at < cutoff)
+                )
+            ))\
+            .order_by(RunObject.priority.desc(), RunObject.created_at, RunObject.run_id)\
+            .all()
+        for run in runs:
+            run.owner = owner
+        # Remove the expired heartbeats of other owners.
+        self.session.query(RunOwner)\
+            .filter(RunOwner.owner_id != owner)\
+            .filter(RunOwner.heartbeat <= cutoff)\
+            .delete(synchronize_session=False)
+        self.session.commit()
+        return runs
 
-    def create_run(self, workflow=None, group=None, arguments=None, runs=None):
+    def create_run(self, workflow=None, group=None, arguments=None, runs=None, owner=None):
         """Create a new entry for a run that is in pending state. Returns a
         handle for the created run.
 
         A run is either created for a group (i.e., a grop submission run) or
         for a workflow (i.e., a post-processing run). Only one of the two
-        parameters is expected to be None.
+        parameters is expected to be None. Post-processing runs have a high
+        priority. The priority of group submission runs is taken from the
+        engine configuration of the group or the workflow.
 
         Parameters
         ----------
@@ -67,6 +152,8 @@ class RunManager(object):
         runs: list(string), default=None
             List of run identifier that define the input for a post-processing
             run.
+        owner: string, default=None
+            Identifier of the run scheduler that holds the run.
 
         Returns
         -------
@@ -90,16 +177,20 @@ class RunManager(object):
         if workflow is None:
             workflow_id = group.workflow_id
             group_id = group.group_id
+            priority = run_priority(group)
         else:
             workflow_id = workflow.workflow_id
             group_id = None
+            priority = PRIORITY_HIGH
         # Return handle for the created run.
         run = RunObject(
             run_id=run_id,
             workflow_id=workflow_id,
             group_id=group_id,
             arguments=arguments if arguments is not None else list(),
-            state_type=st.STATE_PENDING
+            state_type=st.STATE_PENDING,
+            priority=priority,
+            owner=owner
         )
         self.session.add(run)
         # Update the workflow handle if this is a post-processing run.
@@ -113,6 +204,44 @@ class RunManager(object):
         self.session.commit()
         return run
 
+    def create_runs(self, group, arguments, owner=None):
+        """Create new entries for a list of runs of a workflow group that are
+        in pending state. All runs are inserted in a single transaction.
+        Returns the handles for the created runs in the order of the given
+        argument lists.
+
+        Parameters
+        ----------
+        group: flowserv.model.base.GroupObject
+            Group handle for the submission runs.
+        arguments: list(list)
+            List of argument value lists. Creates one run for each list.
+        owner: string, default=None
+            Identifier of the run scheduler that holds the runs.
+
+        Returns
+        -------
+        list(flowserv.model.base.RunObject)
+        """
+        priority = run_priority(group)
+        runs = list()
+        for args in arguments:
+            runs.append(
+                RunObject(
+                    run_id=util.get_unique_identifier(),
+                    workflow_id=group.workflow_id,
+                    group_id=group.group_id,
+                    arguments=args,
+                    state_type=st.STATE_PENDING,
+                    priority=priority,
+                    owner=owner
+                )
+            )
+        self.session.add_all(runs)
+        # Commit changes in case run monitors need to access the run state.
+        self.session.commit()
+        return runs
+
     def delete_run(self, run_id):
         """Delete the entry for the given run from the underlying database.
 
@@ -137,30 +266,80 @@ class RunManager(object):
         self.fs.delete(key=rundir)
 
     def delete_obsolete_runs(
-        self, date: str, state: Optional[str] = None
+        self, date: str, state: Optional[str] = None,
+        batch_size: Optional[int] = DEFAULT_BATCHSIZE,
+        max_workers: Optional[int] = DEFAULT_MAXWORKERS,
+        callback: Optional[Callable[[int, int], None]] = None
     ) -> int:
         """Delete all workflow runs that were created before the given date.
         The optional state parameter allows to further restrict the list of
         deleted runs to those that were created before the given date and
         that are in the give state.
 
+        Runs are deleted in batches using bulk delete statements for the runs
+        and their files and log messages. Each batch is committed separately.
+        The run folders in the file store are removed in parallel by a pool of
+        background threads while the next batch is deleted from the database.
+
+        The optional callback is called after each committed batch with the
+        number of deleted runs so far and the total number of runs that are
+        being deleted.
+
         Parameters
         ----------
         date: string
             Filter for run creation date.
         state: string, default=None
             Filter for run state.
+        batch_size: int, default=1000
+            Maximum number of runs that are deleted in a single transaction.
+        max_workers: int, default=4
+            Maximum number of threads for removing run folders.
+        callback: callable, default=None
+            Progress callback for deleted runs.
 
         Returns
         -------
         int
         """
-        # Get list of obsolete runs and delete each run separately. Count the
-        # number of runs to return the total number of deleted runs.
+        query = self._obsolete_runs_query(
+            columns=[RunObject.run_id, RunObject.workflow_id],
+            date=date,
+            state=state
+        )
+        total = query.count()
         count = 0
-        for run in self.list_obsolete_runs(date=date, state=state):
-            self.delete_run(run.run_id)
-            count += 1
+        futures = dict()
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            while count < total:
+                runs = query.limit(batch_size).all()
+                if not runs:
+                    break
+                run_ids = [run_id for run_id, _ in runs]
+                self.session.query(RunFile)\
+                    .filter(RunFile.run_id.in_(run_ids))\
+                    .delete(synchronize_session=False)
+                self.session.query(RunMessage)\
+                    .filter(RunMessage.run_id.in_(run_ids))\
+                    .delete(synchronize_session=False)
+                self.session.query(RunObject)\
+                    .filter(RunObject.run_id.in_(run_ids))\
+                    .delete(synchronize_session=False)
+                # Commit changes before deleting the run directories.
+                self.session.commit()
+                for run_id, workflow_id in runs:
+                    rundir = dirs.run_basedir(workflow_id, run_id)
+                    futures[executor.submit(self.fs.delete, key=rundir)] = rundir
+                count += len(runs)
+                if callback is not None:
+                    callback(count, total)
+            # Log run folders that could not be removed. The runs have been
+            # deleted from the database already.
+            for f in as_completed(futures):
+                try:
+                    f.result()
+                except Exception as ex:
+                    logging.error('cannot delete run folder {}: {}'.format(futures[f], ex), exc_info=True)
         return count
 
     def get_run(self, run_id: str) -> RunObject:
@@ -184,20 +363,33 @@ class RunManager(object):
         # is unknown..
         run = self.session\
             .query(RunObject)\
+            .options(*RUN_HANDLE_OPTIONS)\
             .filter(RunObject.run_id == run_id)\
             .one_or_none()
         if run is None:
             raise err.UnknownRunError(run_id)
         return run
 
-    def get_runarchive(self, run_id: str) -> FileHandle:
+    def get_runarchive(
+        self, run_id: str, format: Optional[str] = archive.DEFAULT_FORMAT,
+        level: Optional[int] = None
+    ) -> FileHandle:
         """Get tar archive containing all result files for a given workflow
         run. Raises UnknownRunError if the run is not in SUCCESS state.
 
+        Archives in the default format are built once, on first access, and
+        stored in the file store. The key of the stored archive is recorded
+        with the run. Archives in other formats are generated from the files
+        in the file store while they are being read from the returned handle.
+
         Parameters
         ----------
         run_id: string
             Unique run identifier.
+        format: string, default='gzip'
+            Archive compression format. One of 'gzip', 'zstd', or 'none'.
+        level: int, default=None
+            Compression level. Uses the default for the format if not given.
 
         Returns
         -------
@@ -205,33 +397,30 @@ class RunManager(object):
 
         Raises
         ------
+        flowserv.error.InvalidArgumentError
         flowserv.error.UnknownRunError
         """
         # Get the run handle and ensure that the run is in SUCCESS state.
         run = self.get_run(run_id)
         if not run.is_success():
             raise err.UnknownRunError(run_id)
-        # Create a memory buffer for the tar file.
-        io_buffer = io.BytesIO()
-        tar_handle = tarfile.open(fileobj=io_buffer, mode='w:gz')
-        # Get file objects for all run result files.
+        # Get file handles for all run result files. The file handles are
+        # independent of the database session.
         workflow_id = run.workflow.workflow_id
         rundir = dirs.run_basedir(workflow_id=workflow_id, run_id=run_id)
-        for f in run.files:
-            file = self.fs.load(util.join(rundir, f.key)).open()
-            info = tarfile.TarInfo(name=f.key)
-            info.size = file.getbuffer().nbytes
-            tar_handle.addfile(tarinfo=info, fileobj=file)
-        tar_handle.close()
-        io_buffer.seek(0)
-        # Create file handle for the archive. The file name includes the run
-        # identifier. The mime type is 'application/gzip' based on
-        # https://superuser.com/questions/901962.
-        return FileHandle(
-            name='run.{}.tar.gz'.format(run_id),
-            mime_type='application/gzip',
-            fileobj=IOBuffer(io_buffer)
+        fileobj = archive.archive(
+            store=self.fs,
+            files=[(f.key, util.join(rundir, f.key)) for f in run.files],
+            format=format,
+            level=level
         )
+        # Create file handle for the archive. The file name includes the run
+        # identifier and the suffix for the archive format.
+        name = 'run.{}{}'.format(run_id, fileobj.suffix)
+        mime_type = fileobj.mime_type
+        if format == archive.DEFAULT_FORMAT and level is None:
+            fileobj = IOReader(self._cached_runarchive(run=run, fileobj=fileobj))
+        return FileHandle(name=name, mime_type=mime_type, fileobj=fileobj)
 
     def get_runfile(
         self, run_id: str, file_id: str = None, key: str = None
@@ -277,9 +466,86 @@ class RunManager(object):
             fileobj=self.fs.load(util.join(rundir, fh.key))
         )
 
-    def list_runs(self, group_id, state=None):
+    def iter_runs(
+        self, group_id: str, state: Optional[Union[str, List[str]]] = None,
+        batch_size: Optional[int] = DEFAULT_BATCHSIZE
+    ) -> Iterator[RunObject]:
+        """Iterate over all runs that are associated with a given workflow
+        group. Runs are fetched from the database in pages of the given batch
+        size using keyset pagination.
+
+        Parameters
+        ----------
+        group_id: string
+            Unique workflow group identifier
+        state: string or list(string), default=None
+            Run state query. If given, only those runs that are in the given
+            state(s) will be returned.
+        batch_size: int, default=1000
+            Number of runs that are fetched with a single query.
+
+        Returns
+        -------
+        iterator of flowserv.model.base.RunObject
+        """
+        after = None
+        while True:
+            runs = self.list_runs(
+                group_id=group_id,
+                state=state,
+                limit=batch_size,
+                after=after
+            )
+            yield from runs
+            if len(runs) < batch_size:
+                break
+            after = run_cursor(runs[-1])
+
+    def heartbeat(self, owner: str):
+        """Record the heartbeat for a run scheduler that holds runs.
+
+        Parameters
+        ----------
+        owner: string
+            Identifier of the run scheduler.
+        """
+        obj = self.session.query(RunOwner).get(owner)
+        if obj is None:
+            self.session.add(RunOwner(owner_id=owner, heartbeat=util.utc_now()))
+        else:
+            obj.heartbeat = util.utc_now()
+        self.session.commit()
+
+    def list_active_runs(self, run_ids: List[str]) -> Set[str]:
+        """Get the identifier of those runs in the given list that exist and
+        that are in an active state.
+
+        Parameters
+        ----------
+        run_ids: list of string
+            List of unique run identifier.
+
+        Returns
+        -------
+        set of string
+        """
+        query = self.session\
+            .query(RunObject.run_id)\
+            .filter(RunObject.run_id.in_(run_ids))\
+            .filter(RunObject.state_type.in_(st.ACTIVE_STATES))
+        return {run_id for run_id, in query.all()}
+
+    def list_runs(
+        self, group_id: str, state: Optional[Union[str, List[str]]] = None,
+        limit: Optional[int] = None, after: Optional[str] = None
+    ) -> List[RunObject]:
         """Get list of run handles for all runs that are associated with a
-        given workflow group.
+        given workflow group. Runs are sorted by their creation time (and
+        identifier).
+
+        The optional limit and cursor allow to retrieve the list in pages
+        (using keyset pagination). The cursor for the next page is created
+        from the last run on the current page using :func:`run_cursor`.
 
         Parameters
         ----------
@@ -288,10 +554,18 @@ class RunManager(object):
         state: string or list(string), default=None
             Run state query. If given, only those runs that are in the given
             state(s) will be returned.
+        limit: int, default=None
+            Maximum number of runs in the returned list.
+        after: string, default=None
+            Cursor for the last run on the previous page.
 
         Returns
         -------
         list(flowserv.model.base.RunObject)
+
+        Raises
+        ------
+        flowserv.error.InvalidArgumentError
         """
         # Generate query that returns the handles of all runs. If the state
         # conditions are given, we add further filters.
@@ -303,6 +577,18 @@ class RunManager(object):
                 query = query.filter(RunObject.state_type.in_(state))
             else:
                 query = query.filter(RunObject.state_type == state)
+        if after is not None:
+            try:
+                created_at, run_id = util.decode_cursor(after)
+            except ValueError as ex:
+                raise err.InvalidArgumentError(str(ex))
+            query = query.filter(or_(
+                RunObject.created_at > created_at,
+                and_(RunObject.created_at == created_at, RunObject.run_id > run_id)
+            ))
+        query = query.order_by(RunObject.created_at, RunObject.run_id)
+        if limit is not None:
+            query = query.limit(limit)
         return query.all()
 
     def list_obsolete_runs(
@@ -324,10 +610,34 @@ class RunManager(object):
         -------
         list(flowserv.model.base.RunObject)
         """
-        # Get handles for all runs before the given date. Ensure to exclude
-        # runs that are part of a current workflow ranking result.
+        return self._obsolete_runs_query(
+            columns=[RunObject],
+            date=date,
+            state=state
+        ).all()
+
+    def _obsolete_runs_query(
+        self, columns: List, date: str, state: Optional[str] = None
+    ) -> Query:
+        """Get query for all workflow runs that were created before the given
+        date and that are optionally in the given state. Runs that are part of
+        a current workflow ranking result are excluded.
+
+        Parameters
+        ----------
+        columns: list
+            Entities or columns that are selected by the query.
+        date: string
+            Filter for run creation date.
+        state: string, default=None
+            Filter for run state.
+
+        Returns
+        -------
+        sqlalchemy.orm.query.Query
+        """
         query = self.session\
-            .query(RunObject)\
+            .query(*columns)\
             .filter(RunObject.created_at < date)\
             .filter(RunObject.run_id.notin_(
                 self.session.query(WorkflowRankingRun.run_id)
@@ -335,7 +645,37 @@ class RunManager(object):
         # Add filter for run state if given.
         if state is not None:
             query = query.filter(RunObject.state_type == state)
-        return query.all()
+        return query
+
+    def _cached_runarchive(self, run: RunObject, fileobj: IOHandle) -> IOHandle:
+        """Get handle for the stored result archive of a successful run. The
+        archive is written to the file store if it does not exist.
+
+        The stored archive has a fixed key in the archive folder of the run.
+        Concurrent requests that both build the archive overwrite the same
+        object instead of leaving orphaned copies in the file store. The key
+        is recorded with the run when the session is committed.
+
+        Parameters
+        ----------
+        run: flowserv.model.base.RunObject
+            Handle for a successful workflow run.
+        fileobj: flowserv.volume.archive.ArchiveFile
+            Generator for the archive.
+
+        Returns
+        -------
+        flowserv.volume.base.IOHandle
+        """
+        archivedir = dirs.run_archivedir(workflow_id=run.workflow_id, run_id=run.run_id)
+        key = util.join(archivedir, ARCHIVE_NAME + fileobj.suffix)
+        # Storage volumes like S3 and GCS load file handles lazily. Check for
+        # the archive explicitly since a missing file would otherwise only be
+        # detected when the returned handle is opened.
+        if run.archive_key != key or not file_exists(store=self.fs, key=key):
+            self.fs.store(file=fileobj, dst=key)
+            run.archive_key = key
+        return self.fs.load(key)
 
     def update_run(
         self, run_id: str, state: WorkflowState,
@@ -397,23 +737,34 @@ class RunManager(object):
             validate_state_transition(current_state, state.type_id, st.ACTIVE_STATES)
             assert runstore is not None
             # Archive run files (and remove all other files from the run
-            # directory).
+            # directory). The current transaction is committed before copying
+            # the files to avoid holding database locks while the files are
+            # copied. The run is updated after all files have been copied.
             storedir = dirs.run_basedir(
                 workflow_id=run.workflow.workflow_id,
                 run_id=run_id
             )
-            run.files = store_run_files(
-                run=run,
-                files=state.files,
+            files = run_result_files(run=run, files=state.files)
+            self.session.commit()
+            runfiles = store_run_files(
+                files=files,
                 source=runstore,
-                target=self.fs.get_store_for_folder(key=storedir)
+                target=self.fs.get_store_for_folder(key=storedir),
+                max_workers=self.max_workers
             )
+            # The run may have been canceled while the files were copied.
+            try:
+                validate_state_transition(run.state_type, state.type_id, st.ACTIVE_STATES)
+            except err.ConstraintViolationError:
+                self.fs.delete(key=storedir)
+                raise
+            run.files = runfiles
             run.started_at = state.started_at
             run.ended_at = state.finished_at
             # Parse run result if the associated workflow has a result schema.
             # We only expect a result file for runs that are group submissions
             # and not post-processing runs.
-            result_schema = run.workflow.result_schema
+            result_schema = run.workflow.get_template().result_schema
             if result_schema is not None and run.group_id is not None:
                 # Make sure to catch any exceptions in case the run result
                 # file is not present or corrupted.
@@ -432,10 +783,71 @@ class RunManager(object):
 
 # -- Helper Functions ---------------------------------------------------------
 
-def store_run_files(
-    run: RunObject, files: List[str], source: StorageVolume, target: StorageVolume
-) -> List[RunFile]:
-    """Create list of output files for a successful run. The list of files
+def file_exists(store: StorageVolume, key: str) -> bool:
+    """Test if a file with the given key exists in a storage volume.
+
+    Parameters
+    ----------
+    store: flowserv.volume.base.StorageVolume
+        Storage volume.
+    key: string
+        Unique file key.
+
+    Returns
+    -------
+    bool
+    """
+    # Storage volumes that are backed by object stores return the keys of
+    # files in a folder with the volume prefix.
+    folder, _, name = key.rpartition('/')
+    return any(k == name or k.endswith('/' + name) for k, _ in store.walk(src=folder))
+
+
+def run_cursor(run: RunObject) -> str:
+    """Get the pagination cursor for a run listing that ends with the given
+    run.
+
+    Parameters
+    ----------
+    run: flowserv.model.base.RunObject
+        Last run on a page of a run listing.
+
+    Returns
+    -------
+    string
+    """
+    return util.encode_cursor([run.created_at, run.run_id])
+
+
+def run_priority(group: GroupObject) -> int:
+    """Get the priority for submission runs of a workflow group. The priority
+    is taken from the engine configuration of the group. If the group does
+    not define a priority, the priority from the engine configuration of the
+    workflow is used. The default is normal priority.
+
+    Submission runs cannot have a priority above normal priority. Values that
+    are not integers between low and normal priority are ignored.
+
+    Parameters
+    ----------
+    group: flowserv.model.base.GroupObject
+        Workflow group handle.
+
+    Returns
+    -------
+    int
+    """
+    for config in [group.engine_config, group.workflow.engine_config]:
+        if config and config.get(PRIORITY) is not None:
+            priority = config[PRIORITY]
+            if isinstance(priority, int) and PRIORITY_LOW <= priority <= PRIORITY_NORMAL:
+                return priority
+            logging.warning('ignore invalid priority {} for group {}'.format(priority, group.group_id))
+    return PRIORITY_NORMAL
+
+
+def run_result_files(run: RunObject, files: List[str]) -> List[str]:
+    """Get the list of output files for a successful run. The list of files
     depends on whether files are specified in the workflow specification or not.
     If files are specified only those files are included in the returned lists.
     Otherwise, all result files that are listed in the run state are returned.
@@ -446,15 +858,10 @@ def store_run_files(
         Handle for a workflow run.
     files: list of string
         List of result files for a successful workflow run.
-    source: flowserv.volume.base.StorageVolume
-        Storage volume containing the run (result) files for a successful
-        workflow run.
-    target: flowserv.volume.base.StorageVolume
-        Storage volume for persiting run result files.
 
     Returns
     -------
-    list of RunObject, list of string
+    list of string
     """
     outputs = run.outputs()
     if outputs:
@@ -462,21 +869,46 @@ def store_run_files(
         # workflow handle. Note that (i) the result of run.outputs() is
         # always a dictionary and (ii) that the keys in the returned
         # dictionary are not necessary equal to the file sources.
-        files = [f.source for f in run.outputs().values()]
-    # Copy files to the target volume.
-    runfiles = list()
-    for key in files:
+        return [f.source for f in outputs.values()]
+    return files
+
+
+def store_run_files(
+    files: List[str], source: StorageVolume, target: StorageVolume,
+    max_workers: Optional[int] = DEFAULT_MAXWORKERS
+) -> List[RunFile]:
+    """Copy the output files for a successful run from the run store to the
+    target volume. Returns the list of run file objects for the copied files.
+
+    Files are copied in parallel by a pool of threads. Each file is streamed
+    from the source to the target volume.
+
+    Parameters
+    ----------
+    files: list of string
+        List of output files for a successful workflow run.
+    source: flowserv.volume.base.StorageVolume
+        Storage volume containing the run (result) files for a successful
+        workflow run.
+    target: flowserv.volume.base.StorageVolume
+        Storage volume for persiting run result files.
+    max_workers: int, default=4
+        Maximum number of threads that copy files.
+
+    Returns
+    -------
+    list of flowserv.model.base.RunFile
+    """
+    def copy_file(key: str) -> RunFile:
         f = source.load(key)
-        target.store(file=f, dst=key)
+        target.store(file=IOReader(f), dst=key)
         mime_type, _ = mimetypes.guess_type(url=key)
-        runfile = RunFile(
-            key=key,
-            name=key,
-            mime_type=mime_type,
-            size=f.size()
-        )
-        runfiles.append(runfile)
-    return runfiles
+        return RunFile(key=key, name=key, mime_type=mime_type, size=f.size())
+
+    if len(files) <= 1 or max_workers <= 1:
+        return [copy_file(key) for key in files]
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(files))) as executor:
+        return list(executor.map(copy_file, files))
 
 
 def read_run_results(run: RunObject, schema: ResultSchema, runstore: StorageVolume):
@@ -494,12 +926,14 @@ def read_run_results(run: RunObject, schema: ResultSchema, runstore: StorageVolu
         Storage volume containing the run (result) files for a successful
         workflow run.
     """
-    with runstore.load(schema.result_file).open() as f:
-        results = util.read_object(f)
+    # Extract the values for all result columns. Only the elements that are
+    # referenced by the column paths are read from the result file.
+    with runstore.load(schema.result_file).reader() as f:
+        results = extractor(schema).read(f, format=result_format(schema.result_file))
     # Create a dictionary of result values.
     values = dict()
     for col in schema.columns:
-        val = util.jquery(doc=results, path=col.jpath())
+        val = results.get(col.column_id)
         col_id = col.column_id
         if val is None and col.required:
             msg = "missing value for '{}'".format(col_id)
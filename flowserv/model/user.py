@@ -17,17 +17,20 @@ requests to the API. Each key has a fixed lifespan after which it becomes
 invalid. If a user logs out the API key is invalidated immediately.
 """
 
+from concurrent.futures import ThreadPoolExecutor
 from passlib.hash import pbkdf2_sha256
+from threading import Lock
 from typing import Optional
 
 import datetime as dt
 import dateutil.parser
 
-from flowserv.config import DEFAULT_LOGINTTL
+from flowserv.config import DEFAULT_HASHROUNDS, DEFAULT_HASHWORKERS, DEFAULT_LOGINTTL
 from flowserv.model.base import APIKey, PasswordRequest, User
 
 import flowserv.config as config
 import flowserv.error as err
+import flowserv.model.cache as cache
 import flowserv.util as util
 
 
@@ -38,8 +41,13 @@ class UserManager(object):
     valid until a timeout period has passed. When the user logs out the API key
     is invalidated. API keys are stored in an underlying database.
     """
-    def __init__(self, session, token_timeout: Optional[int] = DEFAULT_LOGINTTL):
-        """Initialize the database connection and the login timeout.
+    def __init__(
+        self, session, token_timeout: Optional[int] = DEFAULT_LOGINTTL,
+        hash_rounds: Optional[int] = DEFAULT_HASHROUNDS,
+        hash_workers: Optional[int] = DEFAULT_HASHWORKERS
+    ):
+        """Initialize the database connection, the login timeout, and the
+        settings for password hashing.
 
         Parameters
         ----------
@@ -48,9 +56,17 @@ class UserManager(object):
         token_timeout: int, default=24h
             Specifies the period (in seconds) for which an API keys and request
             tokens are valid.
+        hash_rounds: int, default=29000
+            Number of rounds for new password hashes.
+        hash_workers: int, default=2
+            Number of threads in the worker pool that computes and verifies
+            password hashes. The value is only used when the worker pool is
+            created for the first time.
         """
         self.session = session
         self.token_timeout = token_timeout
+        self.hash_rounds = hash_rounds
+        self.hash_workers = hash_workers
 
     def activate_user(self, user_id):
         """Activate the user with the given identifier. A user is active if the
@@ -155,25 +171,29 @@ class UserManager(object):
         if user is None:
             raise err.UnknownUserError(username)
         # Validate that given credentials match the stored user secret
-        if not pbkdf2_sha256.verify(password, user.secret):
+        if not verify_password(password, user.secret, workers=self.hash_workers):
             raise err.UnknownUserError(username)
+        # Re-hash the password if the hash was created with a different
+        # number of rounds than the current setting.
+        if pbkdf2_sha256.using(rounds=self.hash_rounds).needs_update(user.secret):
+            user.secret = self._hash(password)
         user_id = user.user_id
         ttl = dt.datetime.now() + dt.timedelta(seconds=self.token_timeout)
         # Check if a valid access token is currently associated with the user.
         api_key = user.api_key
         if api_key is not None:
-            expires = dateutil.parser.parse(api_key.expires)
-            if expires < dt.datetime.now():
+            if api_key.expires < dt.datetime.now():
                 # The key has expired. Set a new key value.
+                cache.invalidate_tokens(self.session, [api_key.value])
                 api_key.value = util.get_unique_identifier()
-            api_key.expires = ttl.isoformat()
+            api_key.expires = ttl
         else:
             # Create a new API key for the user and set the expiry date. The
             # key expires token_timeout seconds from now.
             user.api_key = APIKey(
                 user_id=user_id,
                 value=util.get_unique_identifier(),
-                expires=ttl.isoformat()
+                expires=ttl
             )
         return user
 
@@ -197,6 +217,7 @@ class UserManager(object):
         if user is not None:
             # Invalidate the API key by setting it to None.
             user.api_key = None
+        cache.invalidate_tokens(self.session, [api_key])
         return user
 
     def register_user(self, username, password, verify=False):
@@ -249,7 +270,7 @@ class UserManager(object):
         user = User(
             user_id=util.get_unique_identifier(),
             name=username,
-            secret=pbkdf2_sha256.hash(password.strip()),
+            secret=self._hash(password.strip()),
             active=False if verify else True
         )
         self.session.add(user)
@@ -325,18 +346,87 @@ class UserManager(object):
         if expires < dt.datetime.now():
             raise err.UnknownRequestError(request_id)
         # Update password hash for the identifier user
-        user.secret = pbkdf2_sha256.hash(password.strip())
+        user.secret = self._hash(password.strip())
         # Invalidate all current API keys for the user after password is
         # updated.
+        if user.api_key is not None:
+            cache.invalidate_tokens(self.session, [user.api_key.value])
         user.api_key = None
         # Remove the request
         user.password_request = None
         # Return handle for user
         return user
 
+    def _hash(self, password: str) -> str:
+        """Compute hash for the given password using the configured number of
+        rounds.
+
+        Parameters
+        ----------
+        password: string
+            User password in plain text.
+
+        Returns
+        -------
+        string
+        """
+        return hash_password(password, rounds=self.hash_rounds, workers=self.hash_workers)
+
 
 # -- Helper Methods -----------------------------------------------------------
 
+"""Worker pool for password hash computations. The size of the pool bounds the
+number of concurrent hash computations in the process. Hash computations in
+passlib release the global interpreter lock, i.e., the threads in the pool run
+in parallel.
+"""
+_pool = None
+_pool_lock = Lock()
+
+
+def hash_password(
+    password: str, rounds: Optional[int] = DEFAULT_HASHROUNDS,
+    workers: Optional[int] = DEFAULT_HASHWORKERS
+) -> str:
+    """Compute hash for a password in the worker pool.
+
+    Parameters
+    ----------
+    password: string
+        User password in plain text.
+    rounds: int, default=29000
+        Number of rounds for the hash computation.
+    workers: int, default=2
+        Size of the worker pool if the pool does not exist yet.
+
+    Returns
+    -------
+    string
+    """
+    hasher = pbkdf2_sha256.using(rounds=rounds)
+    return hashing_pool(workers).submit(hasher.hash, password).result()
+
+
+def hashing_pool(workers: Optional[int] = DEFAULT_HASHWORKERS) -> ThreadPoolExecutor:
+    """Get the worker pool for password hash computations. The pool is
+    created on first access with the given number of threads.
+
+    Parameters
+    ----------
+    workers: int, default=2
+        Number of threads in the worker pool.
+
+    Returns
+    -------
+    concurrent.futures.ThreadPoolExecutor
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ThreadPoolExecutor(max_workers=workers)
+        return _pool
+
+
 def validate_password(password):
     """Validate a given password. Raises constraint violation error if an
     invalid password is given.
@@ -355,3 +445,24 @@ def validate_password(password):
     # Raise error if password is invalid
     if password is None or password.strip() == '':
         raise err.ConstraintViolationError('empty password')
+
+
+def verify_password(
+    password: str, secret: str, workers: Optional[int] = DEFAULT_HASHWORKERS
+) -> bool:
+    """Verify a password against a stored password hash in the worker pool.
+
+    Parameters
+    ----------
+    password: string
+        User password in plain text.
+    secret: string
+        Stored password hash.
+    workers: int, default=2
+        Size of the worker pool if the pool does not exist yet.
+
+    Returns
+    -------
+    bool
+    """
+    return hashing_pool(workers).submit(pbkdf2_sha256.verify, password, secret).result()
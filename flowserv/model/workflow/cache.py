@@ -0,0 +1,111 @@
+# This file is part of the Reproducible and Reusable Data Analysis Workflow
+# Server (flowServ).
+#
+# Copyright (C) 2019-2021 NYU.
+#
+# flowServ is free software; you can redistribute it and/or modify it under the
+# terms of the MIT License; see LICENSE file for more details.
+
+"""Process-local cache for parsed workflow templates.
+
+The template components of a workflow (workflow specification, parameter
+declarations, parameter groups, output files, post-processing specification
+and result schema) are stored as serialized Json objects in the database.
+Parsing them is expensive for large templates. The cache maintains the parsed
+templates keyed by the workflow identifier and the template version stamp.
+The version stamp is unique for each created workflow. Cache entries therefore
+never become stale, even if a workflow is deleted and a new workflow with the
+same identifier is created.
+
+Templates in the cache are shared between database sessions and must not be
+modified.
+"""
+
+from collections import OrderedDict
+from threading import Lock
+from typing import Optional
+
+from flowserv.model.template.base import WorkflowTemplate
+
+
+"""Default maximum number of templates in the cache."""
+DEFAULT_MAXSIZE = 256
+
+
+class TemplateCache(object):
+    """Bounded cache for parsed workflow templates. Entries are evicted in
+    least-recently-used order once the maximum size is reached.
+    """
+    def __init__(self, maxsize: Optional[int] = DEFAULT_MAXSIZE):
+        """Initialize the maximum cache size.
+
+        Parameters
+        ----------
+        maxsize: int, default=256
+            Maximum number of templates in the cache.
+        """
+        self.maxsize = maxsize
+        self._templates = OrderedDict()
+        self._lock = Lock()
+
+    def clear(self):
+        """Remove all entries from the cache."""
+        with self._lock:
+            self._templates.clear()
+
+    def get(self, workflow_id: str, version: str) -> Optional[WorkflowTemplate]:
+        """Get the cached template for the given workflow version. Returns
+        None if no template is cached for the workflow version.
+
+        Parameters
+        ----------
+        workflow_id: string
+            Unique workflow identifier.
+        version: string
+            Unique workflow template version stamp.
+
+        Returns
+        -------
+        flowserv.model.template.base.WorkflowTemplate
+        """
+        key = (workflow_id, version)
+        with self._lock:
+            template = self._templates.get(key)
+            if template is not None:
+                self._templates.move_to_end(key)
+            return template
+
+    def put(self, workflow_id: str, version: str, template: WorkflowTemplate):
+        """Add the parsed template for the given workflow version to the cache.
+
+        Parameters
+        ----------
+        workflow_id: string
+            Unique workflow identifier.
+        version: string
+            Unique workflow template version stamp.
+        template: flowserv.model.template.base.WorkflowTemplate
+            Parsed workflow template.
+        """
+        key = (workflow_id, version)
+        with self._lock:
+            self._templates[key] = template
+            self._templates.move_to_end(key)
+            while len(self._templates) > self.maxsize:
+                self._templates.popitem(last=False)
+
+    def remove(self, workflow_id: str):
+        """Remove all cached template versions for the given workflow.
+
+        Parameters
+        ----------
+        workflow_id: string
+            Unique workflow identifier.
+        """
+        with self._lock:
+            for key in [k for k in self._templates if k[0] == workflow_id]:
+                del self._templates[key]
+
+
+"""Cache for parsed workflow templates in the current process."""
+templates = TemplateCache()
@@ -29,6 +29,7 @@ from flowserv.volume.fs import FileSystemStorage
 
 import flowserv.error as err
 import flowserv.model.constraint as constraint
+import flowserv.model.workflow.cache as cache
 import flowserv.model.files as dirs
 
 
@@ -189,6 +190,7 @@ class WorkflowManager(object):
         # Delete the workflow from the database and commit changes.
         self.session.delete(workflow)
         self.session.commit()
+        cache.templates.remove(workflow_id)
         # Delete all files that are associated with the workflow if the changes
         # to the database were successful.
         self.fs.delete(key=dirs.workflow_basedir(workflow_id))
@@ -11,16 +11,18 @@ managed by different components of the API.
 """
 
 from abc import ABCMeta
-from typing import Dict
+from typing import Dict, Optional
 
 from flowserv.config import Config
 from flowserv.controller.base import WorkflowController
+from flowserv.model.workflow.state import WorkflowState
 from flowserv.service.group import WorkflowGroupService
 from flowserv.service.files import UploadFileService
 from flowserv.service.run import RunService
 from flowserv.service.descriptor import ServiceDescriptor
 from flowserv.service.user import UserService
 from flowserv.service.workflow import WorkflowService
+from flowserv.volume.base import StorageVolume
 
 import flowserv.config as config
 import flowserv.view.user as userlabels
@@ -153,3 +155,24 @@ class APIFactory(WorkflowController, Config, metaclass=ABCMeta):
             with self() as api:
                 api.users().logout_user(self[config.FLOWSERV_ACCESS_TOKEN])
             del self[config.FLOWSERV_ACCESS_TOKEN]
+
+    def update_run(
+        self, run_id: str, state: WorkflowState,
+        runstore: Optional[StorageVolume] = None
+    ):
+        """Update the state of a workflow run. This method is used by workflow
+        engines to report state changes for the runs that they execute. The
+        default implementation updates the run state synchronously.
+
+        Parameters
+        ----------
+        run_id: string
+            Unique run identifier.
+        state: flowserv.model.workflow.state.WorkflowState
+            New workflow state.
+        runstore: flowserv.volume.base.StorageVolume, default=None
+            Storage volume containing the run (result) files for a successful
+            workflow run.
+        """
+        with self() as api:
+            api.runs().update_run(run_id=run_id, state=state, runstore=runstore)
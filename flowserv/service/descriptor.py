@@ -38,6 +38,7 @@ RUNS_DOWNLOAD_ARCHIVE = 'runs:download:archive'
 RUNS_DOWNLOAD_FILE = 'runs:download:file'
 RUNS_GET = 'runs:get'
 RUNS_START = 'runs:start'
+RUNS_WAIT = 'runs:wait'
 
 SERVICE_DESCRIPTOR = 'service'
 
@@ -76,6 +77,7 @@ ROUTES = {
     RUNS_DOWNLOAD_FILE: 'runs/{runId}/downloads/files/{fileId}',
     RUNS_GET: 'runs/{runId}',
     RUNS_START: 'groups/{userGroupId}/runs',
+    RUNS_WAIT: 'runs/{runId}/wait',
     SERVICE_DESCRIPTOR: '',
     USERS_ACTIVATE: 'users/activate',
     USERS_LIST: 'users',
@@ -10,11 +10,11 @@
 upload files at a remote RESTful API.
 """
 
-from typing import Dict, IO
+from typing import Callable, Dict, IO, Optional
 
 from flowserv.service.descriptor import ServiceDescriptor
 from flowserv.service.files.base import UploadFileService
-from flowserv.service.remote import delete, download_file, get, post
+from flowserv.service.remote import delete, download_file, get, upload_file
 from flowserv.volume.base import IOHandle
 
 import flowserv.service.descriptor as route
@@ -103,8 +103,12 @@ class RemoteUploadFileService(UploadFileService):
         """
         return get(url=self.urls(route.FILES_LIST, userGroupId=group_id))
 
-    def upload_file(self, group_id: str, file: IOHandle, name: str) -> Dict:
-        """Create a file for a given workflow group.
+    def upload_file(
+        self, group_id: str, file: IOHandle, name: str,
+        progress: Optional[Callable[[int, int], None]] = None
+    ) -> Dict:
+        """Create a file for a given workflow group. The file is uploaded in
+        chunks.
 
         Parameters
         ----------
@@ -114,6 +118,9 @@ class RemoteUploadFileService(UploadFileService):
             File object (e.g., uploaded via HTTP request)
         name: string
             Name of the file
+        progress: callable, default=None
+            Function that receives the number of bytes that have been sent and
+            the file size.
 
         Returns
         -------
@@ -125,6 +132,5 @@ class RemoteUploadFileService(UploadFileService):
         flowserv.error.UnauthorizedAccessError
         flowserv.error.UnknownWorkflowGroupError
         """
-        files = {'files': (name, file.open())}
         url = self.urls(route.FILES_UPLOAD, userGroupId=group_id)
-        return post(url=url, files=files)
+        return upload_file(url=url, file=file, name=name, progress=progress)
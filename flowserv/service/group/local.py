@@ -14,7 +14,7 @@ from typing import Dict, List, Optional
 
 from flowserv.controller.base import WorkflowController
 from flowserv.model.auth import Auth
-from flowserv.model.group import WorkflowGroupManager
+from flowserv.model.group import WorkflowGroupManager, group_cursor
 from flowserv.model.parameter.base import Parameter
 from flowserv.model.run import RunManager
 from flowserv.model.workflow.manager import WorkflowManager
@@ -153,26 +153,50 @@ class LocalWorkflowGroupService(WorkflowGroupService):
             runs = self.run_manager.list_runs(group_id=group_id)
         return self.serialize.group_handle(group=group, runs=runs)
 
-    def list_groups(self, workflow_id: Optional[str] = None) -> Dict:
+    def list_groups(
+        self, workflow_id: Optional[str] = None, limit: Optional[int] = None,
+        after: Optional[str] = None
+    ) -> Dict:
         """Get a listing of all workflow groups. The result contains only those
         groups that the user is a member of. If the workflow identifier is given
         as an additional filter, then the result contains a user's groups for
         that workflow only.
 
+        If a limit is given the listing contains at most the given number of
+        groups. If more groups exist the listing includes a cursor for the next
+        page that can be passed as the *after* argument.
+
         Parameters
         ----------
         workflow_id: string, optional
             Unique workflow identifier
+        limit: int, default=None
+            Maximum number of groups in the listing.
+        after: string, default=None
+            Cursor for the next page of a paginated listing.
 
         Returns
         -------
         dict
+
+        Raises
+        ------
+        flowserv.error.InvalidArgumentError
         """
+        if limit is not None and limit < 1:
+            raise err.InvalidArgumentError("invalid limit '{}'".format(limit))
+        # Fetch one additional group to determine whether there is a next page.
         groups = self.group_manager.list_groups(
             workflow_id=workflow_id,
-            user_id=self.user_id
+            user_id=self.user_id,
+            limit=limit + 1 if limit is not None else None,
+            after=after
         )
-        return self.serialize.group_listing(groups)
+        next_page = None
+        if limit is not None and len(groups) > limit:
+            groups = groups[:limit]
+            next_page = group_cursor(groups[-1])
+        return self.serialize.group_listing(groups, next_page=next_page)
 
     def update_group(
         self, group_id: str, name: Optional[str] = None,
@@ -121,27 +121,40 @@ class RemoteWorkflowGroupService(WorkflowGroupService):
         """
         return get(url=self.urls(route.GROUPS_GET, userGroupId=group_id))
 
-    def list_groups(self, workflow_id: Optional[str] = None) -> Dict:
+    def list_groups(
+        self, workflow_id: Optional[str] = None, limit: Optional[int] = None,
+        after: Optional[str] = None
+    ) -> Dict:
         """Get a listing of all workflow groups. The result contains only those
         groups that the user is a member of. If the workflow identifier is given
         as an additional filter, then the result contains a user's groups for
         that workflow only.
 
+        If a limit is given the listing contains at most the given number of
+        groups. If more groups exist the listing includes a cursor for the next
+        page that can be passed as the *after* argument.
+
         Parameters
         ----------
         workflow_id: string, optional
             Unique workflow identifier
+        limit: int, default=None
+            Maximum number of groups in the listing.
+        after: string, default=None
+            Cursor for the next page of a paginated listing.
 
         Returns
         -------
         dict
         """
+        params = {'limit': limit, 'after': after}
         # The request Url depends on whether a workflow identifier is given
         # or not.
         if workflow_id is not None:
-            return get(url=self.urls(route.WORKFLOWS_GROUPS, workflowId=workflow_id))
+            url = self.urls(route.WORKFLOWS_GROUPS, workflowId=workflow_id)
         else:
-            return get(url=self.urls(route.GROUPS_LIST))
+            url = self.urls(route.GROUPS_LIST)
+        return get(url=url, params=params)
 
     def update_group(
         self, group_id: str, name: Optional[str] = None,
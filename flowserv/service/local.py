@@ -16,13 +16,14 @@ object is under the control of of a context manager to ensure that the
 connection is closed properly after every API request has been handled.
 """
 
+from sqlalchemy.orm.session import Session
 from typing import Dict, Optional, Tuple
 
 import logging
 import os
 
 from flowserv.controller.base import WorkflowController
-from flowserv.model.auth import DefaultAuthPolicy, OpenAccessAuth
+from flowserv.model.auth import Auth, DefaultAuthPolicy, OpenAccessAuth
 from flowserv.model.base import RunObject
 from flowserv.model.database import DB
 from flowserv.model.group import WorkflowGroupManager
@@ -35,7 +36,10 @@ from flowserv.service.api import API, APIFactory
 from flowserv.service.descriptor import ServiceDescriptor
 from flowserv.service.files.local import LocalUploadFileService
 from flowserv.service.group.local import LocalWorkflowGroupService
+from flowserv.service.postproc.scheduler import PostprocScheduler
 from flowserv.service.run.local import LocalRunService
+from flowserv.service.run.queue import DEFAULT_LEASETIME, RECOVERY_LEASE, StateUpdateQueue, acquire_lease, release_lease
+from flowserv.service.run.scheduler import RunScheduler
 from flowserv.service.user.local import LocalUserService
 from flowserv.service.workflow.local import LocalWorkflowService
 from flowserv.volume.base import StorageVolume
@@ -100,6 +104,34 @@ class LocalAPIFactory(APIFactory):
         # Authenticated default user. The initial value depends on the given
         # value for the user_id or authentication policy.
         self._user_id = config.DEFAULT_USER if not user_id and self[AUTH] == config.AUTH_OPEN else user_id
+        # Queue for run state updates that are reported by the workflow engine.
+        self.updates = StateUpdateQueue(db=self._db, service=self)
+        # Scheduler for post-processing runs. Post-processing runs are started
+        # synchronously if no quiet period is configured.
+        self.postproc = None
+        delay = self.get(config.FLOWSERV_POSTPROC_DELAY)
+        if delay:
+            self.postproc = PostprocScheduler(
+                service=self,
+                delay=delay,
+                max_delay=self.get(config.FLOWSERV_POSTPROC_MAXDELAY, config.DEFAULT_POSTPROC_MAXDELAY)
+            )
+        # Scheduler for admission control of workflow runs. Runs are handed to
+        # the workflow engine directly if no limit is configured.
+        self.scheduler = None
+        max_runs = self.get(config.FLOWSERV_RUNS_MAX)
+        group_quota = self.get(config.FLOWSERV_RUNS_GROUPQUOTA)
+        workflow_quota = self.get(config.FLOWSERV_RUNS_WORKFLOWQUOTA)
+        if max_runs is not None or group_quota is not None or workflow_quota is not None:
+            self.scheduler = RunScheduler(
+                service=self,
+                engine=self._engine,
+                max_runs=max_runs,
+                group_quota=group_quota,
+                workflow_quota=workflow_quota,
+                weights=self.get(config.FLOWSERV_RUNS_WEIGHTS),
+                owner=self.get(config.FLOWSERV_RUNS_OWNER)
+            )
 
     def __call__(self, user_id: Optional[str] = None, access_token: Optional[str] = None):
         """Get an instance of the context manager that creates the local service
@@ -121,13 +153,19 @@ class LocalAPIFactory(APIFactory):
         -------
         flowserv.service.local.SessionManager
         """
+        # Apply run state updates that remained in the outbox when the previous
+        # process stopped. This is done on first use since the database may not
+        # have been initialized when the factory was created.
+        self.updates.resume()
         return SessionManager(
             env=self,
             db=self._db,
             engine=self._engine,
             fs=self._fs,
             user_id=user_id if user_id is not None else self._user_id,
-            access_token=access_token
+            access_token=access_token,
+            postproc=self.postproc,
+            scheduler=self.scheduler
         )
 
     def cancel_run(self, run_id: str):
@@ -144,6 +182,57 @@ class LocalAPIFactory(APIFactory):
         """
         self._engine.cancel_run(run_id=run_id)
 
+    def recover_runs(self, fail: Optional[bool] = False) -> int:
+        """Recover the pending runs of run schedulers whose heartbeat has
+        expired, e.g., because their process stopped. The recovered runs are
+        queued by the scheduler of this factory (or set to error state if the
+        fail flag is True). Returns the number of recovered runs.
+
+        Recovery is an explicit start-up step for the API server or an
+        administrator. Only one process recovers runs at a time. The method
+        returns zero if another process holds the recovery lease or if
+        admission control is not enabled.
+
+        Parameters
+        ----------
+        fail: bool, default=False
+            Set recovered runs to error state instead of queuing them.
+
+        Returns
+        -------
+        int
+        """
+        if self.scheduler is None:
+            return 0
+        owner = self.scheduler.owner
+        if not acquire_lease(db=self._db, lease_id=RECOVERY_LEASE, owner=owner, lease_time=DEFAULT_LEASETIME):
+            logging.info('runs are recovered by another process')
+            return 0
+        try:
+            with self() as api:
+                return api.runs().recover_runs(fail=fail)
+        finally:
+            release_lease(db=self._db, lease_id=RECOVERY_LEASE, owner=owner)
+
+    def update_run(
+        self, run_id: str, state: WorkflowState,
+        runstore: Optional[StorageVolume] = None
+    ):
+        """Add a state update for the given run to the state update queue. The
+        update is applied asynchronously by the queue writer.
+
+        Parameters
+        ----------
+        run_id: string
+            Unique run identifier.
+        state: flowserv.model.workflow.state.WorkflowState
+            New workflow state.
+        runstore: flowserv.volume.base.StorageVolume, default=None
+            Storage volume containing the run (result) files for a successful
+            workflow run.
+        """
+        self.updates.enqueue(run_id=run_id, state=state, runstore=runstore)
+
     def exec_workflow(
         self, run: RunObject, template: WorkflowTemplate, arguments: Dict,
         staticfs: StorageVolume, config: Optional[Dict] = None
@@ -186,13 +275,244 @@ class LocalAPIFactory(APIFactory):
         )
 
 
+class LocalAPI(API):
+    """Local API that operates directly on a database session. The managers
+    and service components are created on first access. This keeps the cost
+    of creating an API instance for every request low, since most requests
+    only use a single service component. All components share the same
+    database session.
+    """
+    def __init__(
+        self, env: Dict, session: Session, engine: WorkflowController,
+        fs: StorageVolume, auth: Auth, user_id: Optional[str] = None,
+        username: Optional[str] = None, postproc: Optional[PostprocScheduler] = None,
+        scheduler: Optional[RunScheduler] = None
+    ):
+        """Initialize the shared resources for the API components.
+
+        Parameters
+        ----------
+        env: dict
+            Dictionary that provides access to configuration parameter values.
+        session: sqlalchemy.orm.session.Session
+            Database session that is shared by all API components.
+        engine: flowserv.controller.base.WorkflowController
+            Workflow controller used by the API for workflow execution.
+        fs: flowserv.volume.base.StorageVolume
+            File store for accessing and maintaining files for workflows,
+            groups and workflow runs.
+        auth: flowserv.model.auth.Auth
+            Authorization policy for the API components.
+        user_id: string, default=None
+            Identifier of the authenticated user.
+        username: string, default=None
+            Name of the authenticated user.
+        postproc: flowserv.service.postproc.scheduler.PostprocScheduler
+            Scheduler for post-processing runs.
+        scheduler: flowserv.service.run.scheduler.RunScheduler
+            Scheduler for admission control of workflow runs.
+        """
+        super(LocalAPI, self).__init__(
+            service=None,
+            workflow_service=None,
+            group_service=None,
+            upload_service=None,
+            run_service=None,
+            user_service=None
+        )
+        self.env = env
+        self.session = session
+        self.engine = engine
+        self.fs = fs
+        self.auth = auth
+        self.user_id = user_id
+        self.username = username
+        self.postproc = postproc
+        self.scheduler = scheduler
+        # Managers are created on first access.
+        self._user_manager = None
+        self._run_manager = None
+        self._group_manager = None
+        self._ranking_manager = None
+        self._workflow_repo = None
+
+    def group_manager(self) -> WorkflowGroupManager:
+        """Get the manager for workflow groups.
+
+        Returns
+        -------
+        flowserv.model.group.WorkflowGroupManager
+        """
+        if self._group_manager is None:
+            self._group_manager = WorkflowGroupManager(
+                session=self.session,
+                fs=self.fs,
+                users=self.user_manager()
+            )
+        return self._group_manager
+
+    def groups(self) -> LocalWorkflowGroupService:
+        """Get API service component that provides functionality to access and
+        manipulate workflows groups.
+
+        Returns
+        -------
+        flowserv.service.group.local.LocalWorkflowGroupService
+        """
+        if self._groups is None:
+            self._groups = LocalWorkflowGroupService(
+                group_manager=self.group_manager(),
+                workflow_repo=self.workflow_repo(),
+                backend=self.engine,
+                run_manager=self.run_manager(),
+                auth=self.auth,
+                user_id=self.user_id
+            )
+        return self._groups
+
+    def ranking_manager(self) -> RankingManager:
+        """Get the manager for workflow evaluation rankings.
+
+        Returns
+        -------
+        flowserv.model.ranking.RankingManager
+        """
+        if self._ranking_manager is None:
+            self._ranking_manager = RankingManager(session=self.session)
+        return self._ranking_manager
+
+    def run_manager(self) -> RunManager:
+        """Get the manager for workflow runs.
+
+        Returns
+        -------
+        flowserv.model.run.RunManager
+        """
+        if self._run_manager is None:
+            self._run_manager = RunManager(session=self.session, fs=self.fs)
+        return self._run_manager
+
+    def runs(self) -> LocalRunService:
+        """Get API service component that provides functionality to access
+        workflows runs.
+
+        Returns
+        -------
+        flowserv.service.run.local.LocalRunService
+        """
+        if self._runs is None:
+            self._runs = LocalRunService(
+                run_manager=self.run_manager(),
+                group_manager=self.group_manager(),
+                ranking_manager=self.ranking_manager(),
+                backend=self.engine,
+                fs=self.fs,
+                auth=self.auth,
+                user_id=self.user_id,
+                postproc=self.postproc,
+                scheduler=self.scheduler
+            )
+        return self._runs
+
+    def server(self) -> ServiceDescriptor:
+        """Get API component for the service descriptor.
+
+        Returns
+        -------
+        flowserv.service.descriptor.ServiceDescriptor
+        """
+        if self._service is None:
+            self._service = ServiceDescriptor.from_config(
+                env=self.env,
+                username=self.username
+            )
+        return self._service
+
+    def uploads(self) -> LocalUploadFileService:
+        """Get API service component that provides functionality to access,
+        delete, and upload files for workflows groups.
+
+        Returns
+        -------
+        flowserv.service.files.local.LocalUploadFileService
+        """
+        if self._uploads is None:
+            self._uploads = LocalUploadFileService(
+                group_manager=self.group_manager(),
+                auth=self.auth,
+                user_id=self.user_id
+            )
+        return self._uploads
+
+    def user_manager(self) -> UserManager:
+        """Get the manager for registered users.
+
+        Returns
+        -------
+        flowserv.model.user.UserManager
+        """
+        if self._user_manager is None:
+            env = self.env
+            self._user_manager = UserManager(
+                session=self.session,
+                token_timeout=env.get(config.FLOWSERV_AUTH_LOGINTTL, config.DEFAULT_LOGINTTL),
+                hash_rounds=env.get(config.FLOWSERV_AUTH_HASHROUNDS, config.DEFAULT_HASHROUNDS),
+                hash_workers=env.get(config.FLOWSERV_AUTH_HASHWORKERS, config.DEFAULT_HASHWORKERS)
+            )
+        return self._user_manager
+
+    def users(self) -> LocalUserService:
+        """Get instance of the user service component.
+
+        Returns
+        -------
+        flowserv.service.user.local.LocalUserService
+        """
+        if self._users is None:
+            self._users = LocalUserService(
+                manager=self.user_manager(),
+                auth=self.auth
+            )
+        return self._users
+
+    def workflow_repo(self) -> WorkflowManager:
+        """Get the manager for workflow templates.
+
+        Returns
+        -------
+        flowserv.model.workflow.manager.WorkflowManager
+        """
+        if self._workflow_repo is None:
+            self._workflow_repo = WorkflowManager(session=self.session, fs=self.fs)
+        return self._workflow_repo
+
+    def workflows(self) -> LocalWorkflowService:
+        """Get API service component that provides functionality to access
+        workflows and workflow leader boards.
+
+        Returns
+        -------
+        flowserv.service.workflow.local.LocalWorkflowService
+        """
+        if self._workflows is None:
+            self._workflows = LocalWorkflowService(
+                workflow_repo=self.workflow_repo(),
+                ranking_manager=self.ranking_manager(),
+                group_manager=self.group_manager(),
+                run_manager=self.run_manager(),
+                user_id=self.user_id
+            )
+        return self._workflows
+
+
 class SessionManager(object):
     """Context manager that creates a local API and controls the database
     session that is used by all the API components.
     """
     def __init__(
         self, env: Dict, db: DB, engine: WorkflowController, fs: StorageVolume,
-        user_id: str, access_token: str
+        user_id: str, access_token: str, postproc: Optional[PostprocScheduler] = None,
+        scheduler: Optional[RunScheduler] = None
     ):
         """Initialize the object.
 
@@ -214,6 +534,10 @@ class SessionManager(object):
             Access token that is used to authenticate the user. The value may
             be None. This will override the value in the respective environment
             variable but not the user identifier if given.
+        postproc: flowserv.service.postproc.scheduler.PostprocScheduler, default=None
+            Scheduler for post-processing runs.
+        scheduler: flowserv.service.run.scheduler.RunScheduler, default=None
+            Scheduler for admission control of workflow runs.
         """
         self._env = env
         self._db = db
@@ -221,6 +545,8 @@ class SessionManager(object):
         self._fs = fs
         self._user_id = user_id
         self._access_token = access_token
+        self._postproc = postproc
+        self._scheduler = scheduler
         self._session = None
 
     def __enter__(self) -> API:
@@ -257,52 +583,17 @@ class SessionManager(object):
                     user_id = user.user_id
                 except err.UnauthenticatedAccessError:
                     pass
-        # Create the individual components of the API.
-        ttl = env.get(config.FLOWSERV_AUTH_LOGINTTL, config.DEFAULT_LOGINTTL)
-        user_manager = UserManager(session=session, token_timeout=ttl)
-        run_manager = RunManager(session=session, fs=fs)
-        group_manager = WorkflowGroupManager(
+        # The individual components of the API are created on first access.
+        return LocalAPI(
+            env=env,
             session=session,
+            engine=engine,
             fs=fs,
-            users=user_manager
-        )
-        ranking_manager = RankingManager(session=session)
-        workflow_repo = WorkflowManager(session=session, fs=fs)
-        return API(
-            service=ServiceDescriptor.from_config(env=env, username=username),
-            workflow_service=LocalWorkflowService(
-                workflow_repo=workflow_repo,
-                ranking_manager=ranking_manager,
-                group_manager=group_manager,
-                run_manager=run_manager,
-                user_id=user_id
-            ),
-            group_service=LocalWorkflowGroupService(
-                group_manager=group_manager,
-                workflow_repo=workflow_repo,
-                backend=engine,
-                run_manager=run_manager,
-                auth=auth,
-                user_id=user_id
-            ),
-            upload_service=LocalUploadFileService(
-                group_manager=group_manager,
-                auth=auth,
-                user_id=user_id
-            ),
-            run_service=LocalRunService(
-                run_manager=run_manager,
-                group_manager=group_manager,
-                ranking_manager=ranking_manager,
-                backend=engine,
-                fs=fs,
-                auth=auth,
-                user_id=user_id
-            ),
-            user_service=LocalUserService(
-                manager=user_manager,
-                auth=auth
-            )
+            auth=auth,
+            user_id=user_id,
+            username=username,
+            postproc=self._postproc,
+            scheduler=self._scheduler
         )
 
     def __exit__(self, exc_type, exc_value, exc_traceback):
@@ -384,6 +675,10 @@ def init_db(env: Dict) -> DB:
             # references the default database and the database file does
             # not exist.
             db.init()
+        else:
+            # Apply any pending schema migrations to the existing default
+            # database.
+            db.upgrade()
     else:
         # If the database Url is specified in the configuration we create the
         # database object for that Url. In this case we assume that the referenced
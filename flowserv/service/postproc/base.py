@@ -11,14 +11,14 @@ contains helper functions that prepare the input data for post-porcessing
 workflows.
 """
 
-from typing import List
+from typing import Dict, List, Optional
 
 from flowserv.model.files import io_file
 from flowserv.model.parameter.files import File
 from flowserv.model.ranking import RunResult
 from flowserv.model.run import RunManager
 from flowserv.model.template.parameter import ParameterIndex
-from flowserv.volume.base import StorageVolume
+from flowserv.volume.base import IOHandle, StorageVolume
 
 
 import flowserv.util as util
@@ -30,6 +30,13 @@ RUNS_DIR = 'runs'
 RUNS_FILE = 'runs.json'
 
 
+"""Name of the folder in the post-processing staging area that contains the
+staging pool for run result files. Run identifier are hexadecimal strings and
+therefore never collide with the folder name.
+"""
+POOL_DIR = 'pool'
+
+
 """Labels for metadata objects in the run listing."""
 LABEL_ID = 'id'
 LABEL_NAME = 'name'
@@ -53,7 +60,7 @@ PARAMETERS[PARAMETER.name] = PARAMETER
 
 def prepare_postproc_data(
     input_files: List[str], ranking: List[RunResult], run_manager: RunManager,
-    store: StorageVolume
+    store: StorageVolume, pool: Optional[StorageVolume] = None
 ):
     """Create input files for post-processing steps for a given set of runs.
 
@@ -65,6 +72,15 @@ def prepare_postproc_data(
     ``runs.json`` in the base directory lists the runs in the ranking together
     with their group name.
 
+    Result files of successful runs do not change. A result file is therefore
+    identified by the run identifier and the file key. If a staging pool is
+    given, the files are first staged in the pool. Files that are already in
+    the pool (with matching size) are reused, new files are linked (or copied)
+    into the pool, and runs and files that are no longer part of the input are
+    removed from the pool. The files in the base directory are then linked
+    from the pool. Without a pool the base directory itself is updated
+    incrementally.
+
     Parameters
     ----------
     input_files: list(string)
@@ -77,23 +93,65 @@ def prepare_postproc_data(
     store: flowserv.volume.base.StorageVolume
         Target storage volume where the created post-processing files are
         stored.
+    pool: flowserv.volume.base.StorageVolume, default=None
+        Persistent staging pool for run result files that is shared by
+        consecutive post-processing runs.
     """
-    # Collect information about runs and their result files.
+    # Collect information about runs and their result files. Each run has a
+    # sub-folder in the output directory.
     runs = list()
+    files = dict()
     for entry in ranking:
         run_id = entry.run_id
-        group_name = entry.group_name
-        # Create a sub-folder for the run in the output directory. Then copy
-        # all given files into the created directory.
-        rundir = run_id
         for key in input_files:
-            # Copy run file to target file.
             file = run_manager.get_runfile(run_id=run_id, key=key)
-            dst = util.join(rundir, key)
-            store.store(file=file, dst=dst)
+            files[util.join(run_id, key)] = file.fileobj
         runs.append({
             LABEL_ID: run_id,
-            LABEL_NAME: group_name,
+            LABEL_NAME: entry.group_name,
             LABEL_FILES: input_files
         })
+    if pool is not None:
+        update_staging_area(files=files, store=pool)
+        for key in files:
+            store.link(file=pool.load(key), dst=key)
+    else:
+        update_staging_area(files=files, store=store)
     store.store(file=io_file(runs), dst=RUNS_FILE)
+
+
+def update_staging_area(files: Dict[str, IOHandle], store: StorageVolume):
+    """Update the run result files in a staging area.
+
+    Files that are already staged (with matching size) are reused. New files
+    are linked (or copied) into the staging area. Run folders and files that
+    are not in the given set of files are removed.
+
+    Parameters
+    ----------
+    files: dict
+        Mapping of file keys (run identifier and result file key) to the
+        handles of the run result files.
+    store: flowserv.volume.base.StorageVolume
+        Storage volume for the staging area.
+    """
+    # Index of files that are currently in the staging area.
+    staged = {key: file for key, file in store.walk(src=None)}
+    for key, file in files.items():
+        current = staged.get(key)
+        if current is None or current.size() != file.size():
+            store.link(file=file, dst=key)
+    # Remove folders for runs that are no longer in the ranking and files that
+    # are no longer in the list of input files.
+    run_ids = {key.partition('/')[0] for key in files}
+    removed = set()
+    for key in staged:
+        if key == RUNS_FILE or key in files:
+            continue
+        run_id = key.partition('/')[0]
+        if run_id not in run_ids:
+            if run_id not in removed:
+                store.delete(key=run_id)
+                removed.add(run_id)
+        else:
+            store.delete(key=key)
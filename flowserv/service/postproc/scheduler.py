@@ -0,0 +1,174 @@
+# This file is part of the Reproducible and Reusable Data Analysis Workflow
+# Server (flowServ).
+#
+# Copyright (C) 2019-2021 NYU.
+#
+# flowServ is free software; you can redistribute it and/or modify it under the
+# terms of the MIT License; see LICENSE file for more details.
+
+"""Scheduler for post-processing workflow runs.
+
+Every successful run of a workflow with a post-processing step may change the
+workflow ranking and therefore require a new post-processing run. When many
+runs finish at the same time this leads to many redundant post-processing
+runs. The scheduler coalesces these requests. A successful run marks the
+workflow as dirty. The post-processing step is executed once no further runs
+have finished for the workflow within a quiet period, or when the maximum
+delay since the workflow was first marked as dirty has passed.
+"""
+
+from threading import Event, Lock, Thread
+from typing import Dict, List, Optional, Tuple
+
+import logging
+import time
+
+from flowserv.service.api import APIFactory
+
+import flowserv.util as util
+
+
+"""Default quiet period and maximum delay (in sec.)."""
+DEFAULT_DELAY = 1
+DEFAULT_MAXDELAY = 60
+
+
+class PostprocScheduler(object):
+    """Coalescing scheduler for post-processing runs. A background thread is
+    started on demand. The thread executes the post-processing step for dirty
+    workflows when they are due.
+    """
+    def __init__(
+        self, service: APIFactory, delay: Optional[float] = DEFAULT_DELAY,
+        max_delay: Optional[float] = DEFAULT_MAXDELAY
+    ):
+        """Initialize the API factory and the scheduling delays.
+
+        Parameters
+        ----------
+        service: flowserv.service.local.LocalAPIFactory
+            Factory for local API instances that execute the post-processing
+            step.
+        delay: float, default=1
+            Quiet period (in sec.) after the last request for a workflow
+            before the post-processing step is executed.
+        max_delay: float, default=60
+            Maximum time (in sec.) between the first request for a workflow
+            and the execution of the post-processing step.
+        """
+        self.service = service
+        self.delay = delay
+        self.max_delay = max_delay
+        # Dirty workflows. Maps the workflow identifier to the time of the
+        # first and the last request.
+        self._dirty = dict()
+        # Worker thread and synchronization. Post-processing steps are executed
+        # one at a time.
+        self._event = Event()
+        self._lock = Lock()
+        self._runlock = Lock()
+        self._worker = None
+
+    def due(self, now: float) -> Tuple[List[str], Optional[float]]:
+        """Remove all workflows from the dirty list that are due at the given
+        time. Returns the identifiers of the removed workflows and the time
+        when the next workflow is due (or None if no other workflow is dirty).
+
+        Parameters
+        ----------
+        now: float
+            Current time (monotonic clock).
+
+        Returns
+        -------
+        list of string, float
+        """
+        workflows, wakeup = list(), None
+        with self._lock:
+            for workflow_id, (first, last) in list(self._dirty.items()):
+                deadline = min(last + self.delay, first + self.max_delay)
+                if deadline <= now:
+                    workflows.append(workflow_id)
+                    del self._dirty[workflow_id]
+                elif wakeup is None or deadline < wakeup:
+                    wakeup = deadline
+        return workflows, wakeup
+
+    def flush(self) -> int:
+        """Execute the post-processing step for all dirty workflows
+        immediately. Returns the number of workflows that were processed.
+
+        Returns
+        -------
+        int
+        """
+        with self._lock:
+            workflows = list(self._dirty)
+            self._dirty.clear()
+        for workflow_id in workflows:
+            self.run(workflow_id)
+        return len(workflows)
+
+    def pending(self) -> Dict[str, Tuple[float, float]]:
+        """Get the dirty workflows together with the time of the first and the
+        last request.
+
+        Returns
+        -------
+        dict
+        """
+        with self._lock:
+            return dict(self._dirty)
+
+    def request(self, workflow_id: str):
+        """Mark the given workflow as dirty. The post-processing step for the
+        workflow is executed by the worker thread once it is due.
+
+        Parameters
+        ----------
+        workflow_id: string
+            Unique workflow identifier.
+        """
+        now = time.monotonic()
+        with self._lock:
+            first, _ = self._dirty.get(workflow_id, (now, now))
+            self._dirty[workflow_id] = (first, now)
+            if self._worker is None:
+                self._worker = Thread(target=self._run, daemon=True)
+                self._worker.start()
+        self._event.set()
+
+    def run(self, workflow_id: str):
+        """Execute the post-processing step for the given workflow. Errors are
+        logged but not raised.
+
+        Parameters
+        ----------
+        workflow_id: string
+            Unique workflow identifier.
+        """
+        try:
+            with self._runlock, self.service() as api:
+                workflow = api.workflow_repo().get_workflow(workflow_id)
+                api.runs().update_postproc(workflow)
+        except Exception as ex:
+            logging.error(ex, exc_info=True)
+            logging.debug('\n'.join(util.stacktrace(ex)))
+
+    def _run(self):
+        """Worker thread that executes the post-processing step for workflows
+        when they are due.
+        """
+        wakeup = None
+        while True:
+            timeout = max(0, wakeup - time.monotonic()) if wakeup is not None else None
+            self._event.wait(timeout=timeout)
+            self._event.clear()
+            # New requests may arrive while running the post-processing steps.
+            # Repeat until no workflow is due.
+            while True:
+                workflows, wakeup = self.due(time.monotonic())
+                if not workflows:
+                    break
+                for workflow_id in workflows:
+                    self.run(workflow_id)
@@ -6,18 +6,394 @@
 # flowServ is free software; you can redistribute it and/or modify it under the
 # terms of the MIT License; see LICENSE file for more details.
 
-"""Helper functions for the remote service client."""
+"""Helper functions for the remote service client. All requests are sent
+using a shared HTTP session. The session maintains a pool of persistent
+(keep-alive) connections to the remote API.
 
-from typing import Dict, IO, List, Optional
+File downloads and uploads are streamed in chunks. Interrupted downloads are
+resumed with HTTP range requests. Uploads are restarted if the connection
+fails before the request body is sent. Both accept an optional callback that
+receives the progress of the transfer.
 
-from flowserv.config import env, FLOWSERV_ACCESS_TOKEN
+The module also contains a wrapper for service API objects that makes all
+service methods awaitable. Clients that send many requests can use the
+wrapper to run them concurrently with asyncio.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from threading import Lock
+from typing import Any, Callable, Dict, IO, Iterator, List, Optional
 
+import asyncio
+import io
+import logging
 import requests
+import urllib3
+
+from requests.adapters import HTTPAdapter
+
+from flowserv.config import env, FLOWSERV_ACCESS_TOKEN
+from flowserv.service.api import API
+from flowserv.volume.base import IOHandle
+
+import flowserv.util as util
 
 
 """Name of the header element that contains the access token."""
 HEADER_TOKEN = 'api_key'
 
+"""Default maximum number of persistent connections per host."""
+DEFAULT_POOLSIZE = 10
+
+"""Default chunk size (in bytes) for file uploads and the default number of
+attempts to resume an interrupted file transfer.
+"""
+DEFAULT_CHUNKSIZE = 1024 * 1024
+DEFAULT_RETRIES = 3
+
+"""Errors that indicate an interrupted file transfer."""
+TRANSFER_ERRORS = (requests.exceptions.ConnectionError, urllib3.exceptions.HTTPError)
+
+
+"""Shared HTTP session for all requests."""
+_session = None
+_session_lock = Lock()
+
+
+class AsyncService(object):
+    """Wrapper for a service API component. Returns an awaitable version for
+    each method of the wrapped component. Calls are executed by a thread pool
+    that shares the persistent connections of the HTTP session.
+    """
+    def __init__(self, service: Any, executor: ThreadPoolExecutor):
+        """Initialize the wrapped service component and the thread pool.
+
+        Parameters
+        ----------
+        service: any
+            Service API component, e.g., flowserv.service.run.base.RunService.
+        executor: concurrent.futures.ThreadPoolExecutor
+            Thread pool for executing service calls.
+        """
+        self._service = service
+        self._executor = executor
+
+    def __getattr__(self, name: str) -> Callable:
+        """Get awaitable version of the service method with the given name.
+
+        Parameters
+        ----------
+        name: string
+            Method name.
+
+        Returns
+        -------
+        callable
+        """
+        method = getattr(self._service, name)
+
+        async def call(*args, **kwargs):
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, partial(method, *args, **kwargs))
+
+        return call
+
+
+class AsyncAPI(object):
+    """Asyncio variant of the service API. Wraps the API components such that
+    their methods can be awaited, e.g.,
+
+        await api.runs().get_run(run_id)
+
+    The number of concurrent calls is limited by the number of workers. The
+    default matches the size of the connection pool.
+    """
+    def __init__(self, api: API, max_workers: Optional[int] = DEFAULT_POOLSIZE):
+        """Initialize the wrapped service API and the thread pool.
+
+        Parameters
+        ----------
+        api: flowserv.service.api.API
+            Service API.
+        max_workers: int, default=10
+            Maximum number of concurrent service calls.
+        """
+        self._api = api
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+
+    def __enter__(self):
+        """Enter the runtime context."""
+        return self
+
+    def __exit__(self, type, value, traceback):
+        """Shut down the thread pool when leaving the runtime context."""
+        self.close()
+        return False
+
+    def close(self):
+        """Shut down the thread pool for service calls."""
+        self._executor.shutdown(wait=True)
+
+    def groups(self) -> AsyncService:
+        """Get awaitable workflow group service component."""
+        return AsyncService(self._api.groups(), self._executor)
+
+    def runs(self) -> AsyncService:
+        """Get awaitable run service component."""
+        return AsyncService(self._api.runs(), self._executor)
+
+    def uploads(self) -> AsyncService:
+        """Get awaitable file upload service component."""
+        return AsyncService(self._api.uploads(), self._executor)
+
+    def users(self) -> AsyncService:
+        """Get awaitable user service component."""
+        return AsyncService(self._api.users(), self._executor)
+
+    def workflows(self) -> AsyncService:
+        """Get awaitable workflow service component."""
+        return AsyncService(self._api.workflows(), self._executor)
+
+
+class MultipartBody(object):
+    """Streaming body for a multipart/form-data request that uploads a single
+    file. The body is generated in chunks when it is iterated. The length of
+    the body is known in advance so that the request is not sent with chunked
+    transfer encoding.
+
+    Files that are opened in text mode are encoded using UTF-8. The size of
+    the encoded file is computed by reading the file once in advance.
+    """
+    def __init__(
+        self, file: IOHandle, name: str, field: Optional[str] = 'files',
+        progress: Optional[Callable[[int, int], None]] = None,
+        chunk_size: Optional[int] = DEFAULT_CHUNKSIZE
+    ):
+        """Initialize the uploaded file and the multipart boundaries.
+
+        Parameters
+        ----------
+        file: flowserv.volume.base.IOHandle
+            Handle for the uploaded file.
+        name: string
+            Name of the uploaded file.
+        field: string, default='files'
+            Name of the form field for the file.
+        progress: callable, default=None
+            Function that receives the number of bytes of the file that have
+            been sent and the file size.
+        chunk_size: int, default=1MB
+            Size of chunks that are read from the file.
+        """
+        self.file = file
+        self.progress = progress
+        self.chunk_size = chunk_size
+        self.boundary = util.get_unique_identifier()
+        name = name.replace('"', '%22')
+        self.head = (
+            '--{}\r\n'
+            'Content-Disposition: form-data; name="{}"; filename="{}"\r\n'
+            'Content-Type: application/octet-stream\r\n\r\n'
+        ).format(self.boundary, field, name).encode('utf-8')
+        self.tail = '\r\n--{}--\r\n'.format(self.boundary).encode('utf-8')
+        # The size of a file in text mode is the size of the encoded text.
+        with file.reader() as f:
+            self.text = isinstance(f.read(0), str)
+        self.size = sum(len(chunk) for chunk in self.chunks()) if self.text else file.size()
+        # Flag that is set when the request body is being sent.
+        self.started = False
+
+    def __iter__(self) -> Iterator[bytes]:
+        """Generate the chunks of the request body. The file is read from the
+        start each time the body is iterated.
+
+        Returns
+        -------
+        iterator of bytes
+        """
+        self.started = True
+        yield self.head
+        sent = 0
+        for chunk in self.chunks():
+            sent += len(chunk)
+            yield chunk
+            if self.progress is not None:
+                self.progress(sent, self.size)
+        yield self.tail
+
+    def __len__(self) -> int:
+        """Get the length of the request body in bytes.
+
+        Returns
+        -------
+        int
+        """
+        return len(self.head) + self.size + len(self.tail)
+
+    def chunks(self) -> Iterator[bytes]:
+        """Read the file in chunks. Text chunks are encoded using UTF-8.
+
+        Returns
+        -------
+        iterator of bytes
+        """
+        with self.file.reader() as f:
+            while True:
+                chunk = f.read(self.chunk_size)
+                if not chunk:
+                    break
+                yield chunk.encode('utf-8') if self.text else chunk
+
+    @property
+    def content_type(self) -> str:
+        """Get the content type header value for the request body.
+
+        Returns
+        -------
+        string
+        """
+        return 'multipart/form-data; boundary={}'.format(self.boundary)
+
+
+class RemoteFile(io.RawIOBase):
+    """Readable stream for a file that is downloaded from a remote API. If the
+    connection is interrupted, the download is resumed using a range request
+    for the remaining bytes. The file content is requested without content
+    encoding so that byte offsets are valid. If the server encodes the content
+    anyway, the content is decoded and interrupted downloads are not resumed.
+
+    Range requests contain the entity tag (or the modification date) of the
+    file in the If-Range header. If the file changed since the download
+    started, the download fails instead of mixing the contents of different
+    file versions.
+    """
+    def __init__(
+        self, url: str, progress: Optional[Callable[[int, int], None]] = None,
+        retries: Optional[int] = DEFAULT_RETRIES, params: Optional[Dict] = None
+    ):
+        """Send the download request for the file.
+
+        Parameters
+        ----------
+        url: string
+            Request URL.
+        progress: callable, default=None
+            Function that receives the number of bytes that have been read and
+            the file size (or None if the size is unknown).
+        retries: int, default=3
+            Number of attempts to resume an interrupted download.
+        params: dict, default=None
+            Optional query parameters. Parameters with value None are omitted.
+        """
+        self.url = url
+        self.params = params
+        self.progress = progress
+        self.retries = retries
+        self.offset = 0
+        self.size = None
+        self.resumable = True
+        self.validator = None
+        self._response = self._open()
+
+    def close(self):
+        """Close the response for the download request."""
+        if not self.closed:
+            self._response.close()
+        super(RemoteFile, self).close()
+
+    def readable(self) -> bool:
+        """The remote file is readable.
+
+        Returns
+        -------
+        bool
+        """
+        return True
+
+    def readinto(self, buf) -> int:
+        """Read bytes from the remote file into the given buffer. Returns the
+        number of bytes that were read.
+
+        Parameters
+        ----------
+        buf: bytearray or memoryview
+            Buffer for the read bytes.
+
+        Returns
+        -------
+        int
+        """
+        attempt = 0
+        while True:
+            try:
+                data = self._response.raw.read(len(buf), decode_content=True)
+                if not data and self.size is not None and self.offset < self.size:
+                    raise urllib3.exceptions.ProtocolError('incomplete download')
+                break
+            except TRANSFER_ERRORS as ex:
+                if not self.resumable or attempt >= self.retries:
+                    raise
+                attempt += 1
+                logging.info('resume download of {} at {} ({})'.format(self.url, self.offset, ex))
+                self._response.close()
+                self._response = self._open()
+        size = len(data)
+        buf[:size] = data
+        self.offset += size
+        if size and self.progress is not None:
+            self.progress(self.offset, self.size)
+        return size
+
+    def _open(self) -> requests.Response:
+        """Send the download request for the remaining bytes of the file.
+
+        Returns
+        -------
+        requests.Response
+        """
+        request_headers = headers()
+        request_headers['Accept-Encoding'] = 'identity'
+        if self.offset:
+            request_headers['Range'] = 'bytes={}-'.format(self.offset)
+            if self.validator is not None:
+                request_headers['If-Range'] = self.validator
+        r = session().get(self.url, params=self.params, headers=request_headers, stream=True)
+        r.raise_for_status()
+        if r.headers.get('Content-Encoding', 'identity') != 'identity':
+            self.resumable = False
+        if self.offset == 0:
+            length = r.headers.get('Content-Length')
+            self.size = int(length) if length is not None and self.resumable else None
+            self.validator = range_validator(r.headers)
+        elif r.status_code != 206:
+            if self.validator is not None:
+                # The server sends the full file if the file changed.
+                r.close()
+                raise IOError('remote file {} changed during download'.format(self.url))
+            # The server ignored the range request. Skip the bytes that have
+            # already been read.
+            skip = self.offset
+            while skip > 0:
+                chunk = r.raw.read(min(skip, DEFAULT_CHUNKSIZE))
+                if not chunk:
+                    raise urllib3.exceptions.ProtocolError('incomplete download')
+                skip -= len(chunk)
+        return r
+
+
+# -- Helper functions ---------------------------------------------------------
+
+def close():
+    """Close the shared HTTP session and all persistent connections. A new
+    session is created for the next request.
+    """
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+            _session = None
+
 
 def delete(url: str):
     """Send DELETE request to given URL.
@@ -27,40 +403,54 @@ def delete(url: str):
     url: string
         Request URL.
     """
-    r = requests.delete(url, headers=headers())
+    r = session().delete(url, headers=headers())
     r.raise_for_status()
 
 
-def download_file(url: str) -> IO:
-    """Download a remote file.
+def download_file(
+    url: str, progress: Optional[Callable[[int, int], None]] = None,
+    retries: Optional[int] = DEFAULT_RETRIES, params: Optional[Dict] = None
+) -> IO:
+    """Download a remote file. Returns a buffered stream for the file content.
+    Interrupted downloads are resumed.
 
     Parameters
     ----------
     url: string
         Request URL.
+    progress: callable, default=None
+        Function that receives the number of bytes that have been read and the
+        file size (or None if the size is unknown).
+    retries: int, default=3
+        Number of attempts to resume an interrupted download.
+    params: dict, default=None
+        Optional query parameters. Parameters with value None are omitted.
 
     Returns
     -------
-    io.BytesIO
+    io.BufferedReader
     """
-    r = requests.get(url, stream=True)
-    r.raise_for_status()
-    return r.raw
+    return io.BufferedReader(
+        RemoteFile(url=url, progress=progress, retries=retries, params=params),
+        buffer_size=DEFAULT_CHUNKSIZE
+    )
 
 
-def get(url: str) -> Dict:
+def get(url: str, params: Optional[Dict] = None) -> Dict:
     """Send GET request to given URL and return the JSON body.
 
     Parameters
     ----------
     url: string
         Request URL.
+    params: dict, default=None
+        Optional query parameters. Parameters with value None are omitted.
 
     Returns
     -------
     dict
     """
-    r = requests.get(url, headers=headers())
+    r = session().get(url, params=params, headers=headers())
     r.raise_for_status()
     return r.json()
 
@@ -90,7 +480,7 @@ def post(url: str, files: Optional[List] = None, data: Optional[Dict] = None) ->
     -------
     dict
     """
-    r = requests.post(url, files=files, json=data, headers=headers())
+    r = session().post(url, files=files, json=data, headers=headers())
     r.raise_for_status()
     return r.json()
 
@@ -110,6 +500,94 @@ def put(url: str, data: Optional[Dict] = None) -> Dict:
     -------
     dict
     """
-    r = requests.put(url, json=data, headers=headers())
+    r = session().put(url, json=data, headers=headers())
+    r.raise_for_status()
+    return r.json()
+
+
+def range_validator(response_headers: Dict) -> Optional[str]:
+    """Get the value for the If-Range header of range requests from the
+    headers of a download response. Uses the strong entity tag of the file or
+    the modification date. The result is None if the response contains
+    neither.
+
+    Parameters
+    ----------
+    response_headers: dict
+        Headers of the download response.
+
+    Returns
+    -------
+    string
+    """
+    etag = response_headers.get('ETag')
+    if etag is not None and not etag.startswith('W/'):
+        return etag
+    return response_headers.get('Last-Modified')
+
+
+def session() -> requests.Session:
+    """Get the shared HTTP session for requests to the remote API. The session
+    is created on first access.
+
+    Returns
+    -------
+    requests.Session
+    """
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = requests.Session()
+            adapter = HTTPAdapter(pool_maxsize=DEFAULT_POOLSIZE)
+            _session.mount('http://', adapter)
+            _session.mount('https://', adapter)
+        return _session
+
+
+def upload_file(
+    url: str, file: IOHandle, name: str,
+    progress: Optional[Callable[[int, int], None]] = None,
+    retries: Optional[int] = DEFAULT_RETRIES
+) -> Dict:
+    """Upload a file to the given URL in a multipart/form-data POST request.
+    The file is streamed in chunks. If the connection is interrupted, the
+    upload is restarted if the request body has not been sent yet. Uploads
+    that fail while the body is sent are not repeated since the request may
+    already have been processed by the server. Returns the JSON body from the
+    response.
+
+    Parameters
+    ----------
+    url: string
+        Request URL.
+    file: flowserv.volume.base.IOHandle
+        Handle for the uploaded file. The file may be opened in binary or in
+        text mode.
+    name: string
+        Name of the uploaded file.
+    progress: callable, default=None
+        Function that receives the number of bytes of the file that have been
+        sent and the file size.
+    retries: int, default=3
+        Number of attempts to restart an upload that failed before the request
+        body was sent.
+
+    Returns
+    -------
+    dict
+    """
+    body = MultipartBody(file=file, name=name, progress=progress)
+    request_headers = headers()
+    request_headers['Content-Type'] = body.content_type
+    attempt = 0
+    while True:
+        try:
+            r = session().post(url, data=body, headers=request_headers)
+            break
+        except TRANSFER_ERRORS as ex:
+            if body.started or attempt >= retries:
+                raise
+            attempt += 1
+            logging.info('restart upload of {} ({})'.format(name, ex))
     r.raise_for_status()
     return r.json()
@@ -55,7 +55,9 @@ class RunService(metaclass=ABCMeta):  # pragma: no cover
         raise NotImplementedError()
 
     @abstractmethod
-    def get_result_archive(self, run_id: str) -> IO:
+    def get_result_archive(
+        self, run_id: str, format: Optional[str] = None, level: Optional[int] = None
+    ) -> IO:
         """Get compressed tar-archive containing all result files that were
         generated by a given workflow run. If the run is not in sucess state
         a unknown resource error is raised.
@@ -67,6 +69,11 @@ class RunService(metaclass=ABCMeta):  # pragma: no cover
         ----------
         run_id: string
             Unique run identifier
+        format: string, default=None
+            Archive compression format. One of 'gzip', 'zstd', or 'none'. Uses
+            the default format 'gzip' if not given.
+        level: int, default=None
+            Compression level. Uses the default for the format if not given.
 
         Returns
         -------
@@ -114,9 +121,16 @@ class RunService(metaclass=ABCMeta):  # pragma: no cover
         raise NotImplementedError()
 
     @abstractmethod
-    def list_runs(self, group_id: str, state: Optional[str] = None):
+    def list_runs(
+        self, group_id: str, state: Optional[str] = None,
+        limit: Optional[int] = None, after: Optional[str] = None
+    ):
         """Get a listing of all run handles for the given workflow group.
 
+        If a limit is given the listing contains at most the given number of
+        runs. If more runs exist the listing includes a cursor for the next
+        page that can be passed as the *after* argument.
+
         Raises an unauthorized access error if the user does not have read
         access to the workflow group.
 
@@ -126,6 +140,10 @@ class RunService(metaclass=ABCMeta):  # pragma: no cover
             Unique workflow group identifier
         state: string, default=None
             State identifier query
+        limit: int, default=None
+            Maximum number of runs in the listing.
+        after: string, default=None
+            Cursor for the next page of a paginated listing.
 
         Returns
         -------
@@ -162,3 +180,62 @@ class RunService(metaclass=ABCMeta):  # pragma: no cover
         dict
         """
         raise NotImplementedError()
+
+    @abstractmethod
+    def start_runs(
+        self, group_id: str, argument_sets: List[List[Dict]],
+        config: Optional[Dict] = None
+    ) -> List[Dict]:
+        """Start a new workflow run for each of the given argument lists. The
+        arguments for all runs are validated before any run is started.
+
+        Returns a list of serialized handles for the started runs.
+
+        Raises an unauthorized access error if the user does not have the
+        necessary access to modify the workflow group.
+
+        Parameters
+        ----------
+        group_id: string
+            Unique workflow group identifier
+        argument_sets: list(list(dict))
+            List of argument lists. Each argument list contains the user
+            provided arguments for template parameters of one run.
+        config: dict, default=None
+            Optional implementation-specific configuration settings that can be
+            used to overwrite settings that were initialized at object creation.
+
+        Returns
+        -------
+        list(dict)
+        """
+        raise NotImplementedError()
+
+    @abstractmethod
+    def wait_for_run(
+        self, run_id: str, state: Optional[str] = None,
+        timeout: Optional[float] = None
+    ) -> Dict:
+        """Wait until the state of the given run differs from the given state
+        or until the timeout expires. If no state is given, the current state
+        of the run is used. Returns the handle for the run after the state has
+        changed or the timeout has expired.
+
+        Raises an unauthorized access error if the user does not have read
+        access to the run.
+
+        Parameters
+        ----------
+        run_id: string
+            Unique run identifier
+        state: string, default=None
+            Last known state of the run.
+        timeout: float, default=None
+            Maximum time (in sec.) to wait. Wait until the run state changes
+            if no timeout is given.
+
+        Returns
+        -------
+        dict
+        """
+        raise NotImplementedError()
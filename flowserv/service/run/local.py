@@ -11,30 +11,41 @@ manipulate workflow runs and their results. The local run service accesses all
 resources directly via a the database model.
 """
 
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
 import logging
+import time
 
 from flowserv.controller.base import WorkflowController
 from flowserv.model.auth import Auth
-from flowserv.model.base import WorkflowObject
-from flowserv.model.files import FileHandle, run_tmpdir
+from flowserv.model.base import GroupObject, RunObject, WorkflowObject
+from flowserv.model.files import FileHandle
 from flowserv.model.group import WorkflowGroupManager
 from flowserv.model.parameter.actor import ActorValue
 from flowserv.model.parameter.files import InputDirectory
 from flowserv.model.ranking import RankingManager, RunResult
-from flowserv.model.run import RunManager
+from flowserv.model.run import RunManager, run_cursor
 from flowserv.model.template.base import WorkflowTemplate
 from flowserv.model.workflow.state import WorkflowState
-from flowserv.service.postproc.base import PARAMETERS, PARA_RUNS, RUNS_DIR, prepare_postproc_data
+from flowserv.service.postproc.base import PARAMETERS, PARA_RUNS, POOL_DIR, RUNS_DIR, prepare_postproc_data
+from flowserv.service.postproc.scheduler import PostprocScheduler
 from flowserv.service.run.argument import deserialize_arg, deserialize_fh, is_fh, serialize_arg
 from flowserv.service.run.base import RunService
+from flowserv.service.run.scheduler import QueuedRun, RunScheduler, group_weight
 from flowserv.view.run import RunSerializer
 from flowserv.volume.base import StorageVolume
 
 import flowserv.error as err
 import flowserv.model.files as dirs
+import flowserv.model.notify as notify
 import flowserv.util as util
+import flowserv.volume.archive as archive
+
+
+"""Interval (in sec.) for re-checking the state of a run in the database while
+waiting for a state change that is committed by another process.
+"""
+RECHECK_INTERVAL = 5
 
 
 class LocalRunService(RunService):
@@ -46,7 +57,9 @@ class LocalRunService(RunService):
         self, run_manager: RunManager, group_manager: WorkflowGroupManager,
         ranking_manager: RankingManager, backend: WorkflowController,
         fs: StorageVolume, auth: Auth, user_id: Optional[str] = None,
-        serializer: Optional[RunSerializer] = None
+        serializer: Optional[RunSerializer] = None,
+        postproc: Optional[PostprocScheduler] = None,
+        scheduler: Optional[RunScheduler] = None
     ):
         """Initialize the internal reference to the workflow controller, the
         runa and group managers, and to the serializer.
@@ -69,6 +82,12 @@ class LocalRunService(RunService):
             Identifier of an authenticated user.
         serializer: flowserv.view.run.RunSerializer
             Override the default serializer
+        postproc: flowserv.service.postproc.scheduler.PostprocScheduler
+            Scheduler for post-processing runs. If not given, post-processing
+            runs are started synchronously when a run finishes successfully.
+        scheduler: flowserv.service.run.scheduler.RunScheduler
+            Scheduler for admission control of workflow runs. If not given,
+            runs are handed to the workflow controller immediately.
         """
         self.run_manager = run_manager
         self.group_manager = group_manager
@@ -78,6 +97,8 @@ class LocalRunService(RunService):
         self.auth = auth
         self.user_id = user_id
         self.serialize = serializer if serializer is not None else RunSerializer()
+        self.postproc = postproc
+        self.scheduler = scheduler
 
     def cancel_run(self, run_id: str, reason: Optional[str] = None) -> Dict:
         """Cancel the run with the given identifier. Returns a serialization of
@@ -112,8 +133,10 @@ class LocalRunService(RunService):
         run = self.run_manager.get_run(run_id)
         if not run.is_active():
             raise err.InvalidRunStateError(run.state)
-        # Cancel execution at the backend
-        self.backend.cancel_run(run_id)
+        # Cancel execution at the backend. Runs that are still queued by the
+        # scheduler have not been handed to the backend.
+        if self.scheduler is None or not self.scheduler.release(run_id):
+            self.backend.cancel_run(run_id)
         # Update the run state and return the run handle
         messages = None
         if reason is not None:
@@ -152,7 +175,9 @@ class LocalRunService(RunService):
         # and to delete all run files
         self.run_manager.delete_run(run_id)
 
-    def get_result_archive(self, run_id: str) -> FileHandle:
+    def get_result_archive(
+        self, run_id: str, format: Optional[str] = None, level: Optional[int] = None
+    ) -> FileHandle:
         """Get compressed tar-archive containing all result files that were
         generated by a given workflow run. If the run is not in sucess state
         a unknown resource error is raised.
@@ -164,6 +189,11 @@ class LocalRunService(RunService):
         ----------
         run_id: string
             Unique run identifier
+        format: string, default=None
+            Archive compression format. One of 'gzip', 'zstd', or 'none'. Uses
+            the default format 'gzip' if not given.
+        level: int, default=None
+            Compression level. Uses the default for the format if not given.
 
         Returns
         -------
@@ -171,6 +201,7 @@ class LocalRunService(RunService):
 
         Raises
         ------
+        flowserv.error.InvalidArgumentError
         flowserv.error.UnauthorizedAccessError
         flowserv.error.UnknownRunError
         flowserv.error.UnknownFileError
@@ -187,8 +218,12 @@ class LocalRunService(RunService):
                 raise err.UnauthorizedAccessError()
         # Get the run handle. If the run is not in success state raise an
         # unknown run error. The files in the handle are keyed by their unique
-        # name. All files are added to an im-memory tar archive.
-        return self.run_manager.get_runarchive(run_id=run_id)
+        # name. All files are added to a streaming tar archive.
+        return self.run_manager.get_runarchive(
+            run_id=run_id,
+            format=format if format is not None else archive.DEFAULT_FORMAT,
+            level=level
+        )
 
     def get_result_file(self, run_id: str, file_id: str) -> FileHandle:
         """Get file handle for a resource file that was generated as the result
@@ -255,11 +290,18 @@ class LocalRunService(RunService):
         # Get the run and the workflow group it belongs to. The group is needed
         # to serialize the result.
         run = self.run_manager.get_run(run_id)
-        return self.serialize.run_handle(run=run, group=run.group)
+        return self._run_handle(run=run, group=run.group)
 
-    def list_runs(self, group_id: str, state: Optional[str] = None):
+    def list_runs(
+        self, group_id: str, state: Optional[str] = None,
+        limit: Optional[int] = None, after: Optional[str] = None
+    ):
         """Get a listing of all run handles for the given workflow group.
 
+        If a limit is given the listing contains at most the given number of
+        runs. If more runs exist the listing includes a cursor for the next
+        page that can be passed as the *after* argument.
+
         Raises an unauthorized access error if the user does not have read
         access to the workflow group.
 
@@ -267,6 +309,12 @@ class LocalRunService(RunService):
         ----------
         group_id: string
             Unique workflow group identifier
+        state: string, default=None
+            State identifier query
+        limit: int, default=None
+            Maximum number of runs in the listing.
+        after: string, default=None
+            Cursor for the next page of a paginated listing.
 
         Returns
         -------
@@ -274,6 +322,7 @@ class LocalRunService(RunService):
 
         Raises
         ------
+        flowserv.error.InvalidArgumentError
         flowserv.error.UnauthorizedAccessError
         flowserv.error.UnknownWorkflowGroupError
         """
@@ -281,9 +330,20 @@ class LocalRunService(RunService):
         # workflow group runs or if the workflow group does not exist.
         if not self.auth.is_group_member(group_id=group_id, user_id=self.user_id):
             raise err.UnauthorizedAccessError()
-        return self.serialize.run_listing(
-            runs=self.run_manager.list_runs(group_id=group_id, state=state)
+        if limit is not None and limit < 1:
+            raise err.InvalidArgumentError("invalid limit '{}'".format(limit))
+        # Fetch one additional run to determine whether there is a next page.
+        runs = self.run_manager.list_runs(
+            group_id=group_id,
+            state=state,
+            limit=limit + 1 if limit is not None else None,
+            after=after
         )
+        next_page = None
+        if limit is not None and len(runs) > limit:
+            runs = runs[:limit]
+            next_page = run_cursor(runs[-1])
+        return self.serialize.run_listing(runs=runs, next_page=next_page)
 
     def start_run(
         self, group_id: str, arguments: List[Dict], config: Optional[Dict] = None
@@ -328,77 +388,204 @@ class LocalRunService(RunService):
         # Get handle for the given user group to enable access to uploaded
         # files and the identifier of the associated workflow.
         group = self.group_manager.get_group(group_id)
-        # Get the template from the workflow that the workflow group belongs
-        # to. Get a modified copy of the template based on  the (potentially)
-        # modified workflow specification and parameters of the workflow group.
-        template = group.workflow.get_template(
-            workflow_spec=group.workflow_spec,
-            parameters=group.parameters
+        template = get_template(group)
+        run_args, serialized_args = self._run_arguments(
+            group=group,
+            template=template,
+            arguments=arguments
         )
-        # Create instances of the template arguments from the given list of
-        # values. At this point we only distinguish between scalar values and
-        # input files. Also create a mapping from he argument list that is used
-        # stored in the database.
-        run_args = dict()
-        serialized_args = list()
-        for arg in arguments:
-            arg_id, arg_val = deserialize_arg(arg)
-            # Raise an error if multiple values are given for the same argument
-            if arg_id in run_args:
-                raise err.DuplicateArgumentError(arg_id)
-            para = template.parameters.get(arg_id)
-            if para is None:
-                raise err.UnknownParameterError(arg_id)
-            if is_fh(arg_val):
-                file_id, target = deserialize_fh(arg_val)
-                # The argument value is expected to be the identifier of an
-                # previously uploaded file. This will raise an exception if the
-                # file identifier is unknown.
-                fileobj = self.group_manager.get_uploaded_file(
-                    group_id=group_id,
-                    file_id=file_id
-                ).fileobj
-                run_args[arg_id] = para.cast(value=(fileobj, target))
-            else:
-                run_args[arg_id] = para.cast(arg_val)
-            # Actor values as parameter values canno be serialized. for now,
-            # we only store the serialized workflow step but no information
-            # about the additional input files.
-            if isinstance(arg_val, ActorValue):
-                arg_val = arg_val.spec
-            serialized_args.append(serialize_arg(name=arg_id, value=arg_val))
-        # Before we start creating directories and copying files make sure that
-        # there are values for all template parameters (either in the arguments
-        # dictionary or set as default values)
-        template.validate_arguments(run_args)
         # Start the run.
         run = self.run_manager.create_run(
             group=group,
-            arguments=serialized_args
+            arguments=serialized_args,
+            owner=self.scheduler.owner if self.scheduler is not None else None
         )
         run_id = run.run_id
-        # Use default engine configuration if the configuration argument was
-        # not given.
-        config = config if config else group.engine_config
-        staticdir = dirs.workflow_staticdir(group.workflow.workflow_id)
-        state, runstore = self.backend.exec_workflow(
-            run=run,
+        result = self._execute(
+            group=group,
             template=template,
-            arguments=run_args,
-            staticfs=self.fs.get_store_for_folder(key=staticdir),
+            runs=[(run, run_args)],
             config=config
-        )
+        )[0]
         # Update the run state if it is no longer pending for execution. Make
         # sure to call the update run method for the server to ensure that
-        # results are inserted and post-processing workflows started.
-        if not state.is_pending():
+        # results are inserted and post-processing workflows started. The
+        # result is None if the run was queued by the scheduler.
+        if result is not None and not result[0].is_pending():
+            state, runstore = result
             self.update_run(
                 run_id=run_id,
                 state=state,
                 runstore=runstore
             )
             return self.get_run(run_id)
-        return self.serialize.run_handle(run, group)
+        return self._run_handle(run, group)
+
+    def start_runs(
+        self, group_id: str, argument_sets: List[List[Dict]],
+        config: Optional[Dict] = None
+    ) -> List[Dict]:
+        """Start a new workflow run for each of the given argument lists. The
+        arguments for all runs are validated before any run is created. All
+        runs are created in a single transaction and are then handed to the
+        workflow engine together.
+
+        Returns a list of serialized handles for the started runs.
+
+        Raises an unauthorized access error if the user does not have the
+        necessary access to modify the workflow group.
+
+        Parameters
+        ----------
+        group_id: string
+            Unique workflow group identifier
+        argument_sets: list(list(dict))
+            List of argument lists. Each argument list contains the user
+            provided arguments for template parameters of one run.
+        config: dict, default=None
+            Optional implementation-specific configuration settings that can be
+            used to overwrite settings that were initialized at object creation.
+
+        Returns
+        -------
+        list(dict)
+
+        Raises
+        ------
+        flowserv.error.InvalidArgumentError
+        flowserv.error.MissingArgumentError
+        flowserv.error.UnauthorizedAccessError
+        flowserv.error.UnknownFileError
+        flowserv.error.UnknownParameterError
+        flowserv.error.UnknownWorkflowGroupError
+        """
+        if not self.auth.is_group_member(group_id=group_id, user_id=self.user_id):
+            raise err.UnauthorizedAccessError()
+        # Get the group and the modified workflow template once for all runs.
+        # Uploaded files that are referenced by multiple runs are only looked
+        # up once.
+        group = self.group_manager.get_group(group_id)
+        template = get_template(group)
+        files = dict()
+        run_args, serialized_args = list(), list()
+        for arguments in argument_sets:
+            args, serialized = self._run_arguments(
+                group=group,
+                template=template,
+                arguments=arguments,
+                files=files
+            )
+            run_args.append(args)
+            serialized_args.append(serialized)
+        runs = self.run_manager.create_runs(
+            group=group,
+            arguments=serialized_args,
+            owner=self.scheduler.owner if self.scheduler is not None else None
+        )
+        results = self._execute(
+            group=group,
+            template=template,
+            runs=list(zip(runs, run_args)),
+            config=config
+        )
+        # Update the state of runs that are no longer pending for execution.
+        for run, result in zip(runs, results):
+            if result is not None and not result[0].is_pending():
+                state, runstore = result
+                self.update_run(
+                    run_id=run.run_id,
+                    state=state,
+                    runstore=runstore
+                )
+        positions = self.scheduler.positions() if self.scheduler is not None else None
+        return [self._run_handle(run, group, positions=positions) for run in runs]
+
+    def recover_runs(self, fail: Optional[bool] = False) -> int:
+        """Recover the runs in PENDING state that are held by a run scheduler
+        whose heartbeat has expired, e.g., because the process stopped. The
+        runs are claimed by the scheduler of this service and queued again.
+        Runs are executed with the engine configuration of their group.
+        Returns the number of recovered runs.
+
+        If the fail flag is True, the recovered runs are set to error state
+        instead. Post-processing runs and runs whose arguments cannot be
+        restored are always set to error state. A new post-processing run is
+        started once the ranking of the workflow changes.
+
+        This method is intended to be called once at start-up. Runs are only
+        recovered if admission control is enabled.
+
+        Parameters
+        ----------
+        fail: bool, default=False
+            Set recovered runs to error state instead of queuing them.
+
+        Returns
+        -------
+        int
+        """
+        if self.scheduler is None:
+            return 0
+        held = self.scheduler.run_ids()
+        runs = self.run_manager.claim_pending_runs(
+            owner=self.scheduler.owner,
+            timeout=self.scheduler.owner_timeout
+        )
+        count = 0
+        for run in runs:
+            if run.run_id not in held:
+                self._recover_run(run=run, fail=fail)
+                count += 1
+        return count
+
+    def update_postproc(self, workflow: WorkflowObject):
+        """Run the post-processing workflow for the given workflow if the
+        current post-processing results were generated for a different set of
+        runs than those in the current ranking.
+
+        A post-processing run that is still active when a new post-processing
+        run is started is canceled since its results are outdated.
+
+        Parameters
+        ----------
+        workflow: flowserv.model.base.WorkflowObject
+            Handle for the workflow.
+        """
+        # Get the latest ranking for the workflow and create a sorted list of
+        # run identifier to compare agains the current post-processing key for
+        # the workflow.
+        ranking = self.ranking_manager.get_ranking(workflow=workflow)
+        runs = sorted([r.run_id for r in ranking])
+        if runs == workflow.ranking():
+            return
+        # Cancel the current post-processing run if it is still active.
+        if workflow.postproc_run_id is not None:
+            postproc_run = self.run_manager.get_run(workflow.postproc_run_id)
+            if postproc_run.is_active():
+                logging.info(f'Cancel outdated post-processing run {postproc_run.run_id}')
+                if self.scheduler is None or not self.scheduler.release(postproc_run.run_id):
+                    self.backend.cancel_run(postproc_run.run_id)
+                self.run_manager.update_run(
+                    run_id=postproc_run.run_id,
+                    state=postproc_run.state().cancel(messages=['outdated ranking'])
+                )
+        # Stage the post-processing input files in a run folder within the
+        # staging area for the workflow.
+        logging.info(f'Run post-processing workflow for {workflow.workflow_id}')
+        run_postproc_workflow(
+            workflow=workflow,
+            ranking=ranking,
+            keys=runs,
+            run_manager=self.run_manager,
+            store=self.fs.get_store_for_folder(
+                key=dirs.workflow_postprocdir(workflow.workflow_id)
+            ),
+            staticfs=self.fs.get_store_for_folder(
+                key=dirs.workflow_staticdir(workflow.workflow_id)
+            ),
+            backend=self.backend,
+            scheduler=self.scheduler
+        )
 
     def update_run(
         self, run_id: str, state: WorkflowState,
@@ -435,45 +622,294 @@ class LocalRunService(RunService):
             state=state,
             runstore=runstore
         )
+        # Start queued runs when an active run finishes.
+        if self.scheduler is not None and not state.is_active():
+            self.scheduler.release(run_id)
         if run is not None and state.is_success():
             logging.info(f'run {run_id} is a success')
             workflow = run.workflow
             if workflow.run_postproc:
-                # Get the latest ranking for the workflow and create a
-                # sorted list of run identifier to compare agains the
-                # current post-processing key for the workflow.
-                ranking = self.ranking_manager.get_ranking(workflow=workflow)
-                runs = sorted([r.run_id for r in ranking])
-                # Run post-processing task synchronously if the current
-                # post-processing resources where generated for a different
-                # set of runs than those in the ranking.
-                if runs != workflow.ranking():
-                    # Create temporary post-processing folder for static
-                    # workflow files.
-                    # postproc_store = self.fs.get_store_for_folder(key=run_tmpdir())
-                    logging.info(f'Run post-processing workflow for {workflow.workflow_id}')
-                    run_postproc_workflow(
-                        workflow=workflow,
-                        ranking=ranking,
-                        keys=runs,
-                        run_manager=self.run_manager,
-                        tmpstore=self.fs.get_store_for_folder(key=run_tmpdir()),
-                        staticfs=self.fs.get_store_for_folder(
-                            key=dirs.workflow_staticdir(workflow.workflow_id)
-                        ),
-                        backend=self.backend
-                    )
+                # Coalesce post-processing requests if a scheduler is given.
+                # Otherwise, update the post-processing results synchronously.
+                if self.postproc is not None:
+                    self.postproc.request(workflow.workflow_id)
+                else:
+                    self.update_postproc(workflow)
+
+    def wait_for_run(
+        self, run_id: str, state: Optional[str] = None,
+        timeout: Optional[float] = None
+    ) -> Dict:
+        """Wait until the state of the given run differs from the given state
+        or until the timeout expires. If no state is given, the current state
+        of the run is used. Returns the handle for the run after the state has
+        changed or the timeout has expired.
+
+        The method blocks on the run state notification channel. The run state
+        is re-checked in the database at least every few seconds to detect
+        changes that are committed by other processes. Each re-check starts a
+        new database transaction.
+
+        Raises an unauthorized access error if the user does not have read
+        access to the run.
+
+        Parameters
+        ----------
+        run_id: string
+            Unique run identifier
+        state: string, default=None
+            Last known state of the run.
+        timeout: float, default=None
+            Maximum time (in sec.) to wait. Wait until the run state changes
+            if no timeout is given.
+
+        Returns
+        -------
+        dict
+
+        Raises
+        ------
+        flowserv.error.UnauthorizedAccessError
+        flowserv.error.UnknownRunError
+        """
+        if not self.auth.is_group_member(run_id=run_id, user_id=self.user_id):
+            raise err.UnauthorizedAccessError()
+        # Start watching the run before reading its state to ensure that no
+        # state change is missed.
+        with notify.channel.watch(run_id) as watch:
+            run = self.run_manager.get_run(run_id)
+            state = state if state is not None else run.state_type
+            deadline = time.monotonic() + timeout if timeout is not None else None
+            while run.state_type == state:
+                interval = RECHECK_INTERVAL
+                if deadline is not None:
+                    interval = min(interval, deadline - time.monotonic())
+                    if interval <= 0:
+                        break
+                watch.wait(timeout=interval)
+                # End the current transaction before reading the run state
+                # again. Otherwise, the database may return the state from the
+                # snapshot of the running transaction. The transaction is
+                # committed to keep changes from earlier calls in the same
+                # service context. Raises UnknownRunError if the run was
+                # deleted in the meantime.
+                self.run_manager.session.commit()
+                run = self.run_manager.get_run(run_id)
+        return self.serialize.run_handle(run=run, group=run.group)
+
+    def _execute(
+        self, group: GroupObject, template: WorkflowTemplate,
+        runs: List[Tuple[RunObject, Dict]], config: Optional[Dict] = None
+    ) -> List[Optional[Tuple[WorkflowState, StorageVolume]]]:
+        """Hand the given runs to the workflow controller. Runs are submitted
+        to the scheduler if admission control is enabled. Returns the state
+        and run store for each run. The result is None for runs that were
+        queued by the scheduler.
+
+        Parameters
+        ----------
+        group: flowserv.model.base.GroupObject
+            Workflow group handle.
+        template: flowserv.model.template.base.WorkflowTemplate
+            Workflow template for the group.
+        runs: list of (flowserv.model.base.RunObject, dict)
+            Handles and argument values for the runs.
+        config: dict, default=None
+            Optional implementation-specific configuration settings.
+
+        Returns
+        -------
+        list
+        """
+        # Use default engine configuration if the configuration argument was
+        # not given.
+        config = config if config else group.engine_config
+        staticdir = dirs.workflow_staticdir(group.workflow.workflow_id)
+        staticfs = self.fs.get_store_for_folder(key=staticdir)
+        if self.scheduler is None:
+            return self.backend.exec_workflows(
+                runs=runs,
+                template=template,
+                staticfs=staticfs,
+                config=config
+            )
+        results = self.scheduler.submit([
+            QueuedRun(
+                run_id=run.run_id,
+                group_id=group.group_id,
+                workflow_id=group.workflow_id,
+                template=template,
+                arguments=arguments,
+                staticfs=staticfs,
+                config=config,
+                priority=run.priority,
+                weight=group_weight(group)
+            ) for run, arguments in runs
+        ])
+        return [results.get(run.run_id) for run, _ in runs]
+
+    def _recover_run(self, run: RunObject, fail: bool):
+        """Queue a recovered run or set it to error state.
+
+        Parameters
+        ----------
+        run: flowserv.model.base.RunObject
+            Handle for a run in PENDING state.
+        fail: bool
+            Set the run to error state instead of queuing it.
+        """
+        group = run.group
+        if fail or group is None:
+            logging.info('fail pending run {}'.format(run.run_id))
+            messages = ['run was not started before the service stopped']
+            self.update_run(run_id=run.run_id, state=run.state().error(messages=messages))
+            return
+        try:
+            template = get_template(group)
+            run_args, _ = self._run_arguments(group=group, template=template, arguments=run.arguments)
+        except err.FlowservError as ex:
+            logging.error(ex, exc_info=True)
+            self.update_run(run_id=run.run_id, state=run.state().error(messages=util.stacktrace(ex)))
+            return
+        logging.info('queue pending run {}'.format(run.run_id))
+        result = self._execute(group=group, template=template, runs=[(run, run_args)])[0]
+        if result is not None and not result[0].is_pending():
+            state, runstore = result
+            self.update_run(run_id=run.run_id, state=state, runstore=runstore)
+
+    def _run_arguments(
+        self, group: GroupObject, template: WorkflowTemplate,
+        arguments: List[Dict], files: Optional[Dict] = None
+    ) -> Tuple[Dict, List[Dict]]:
+        """Get instances of the template arguments from the given list of
+        user provided arguments. Returns a dictionary of argument values that
+        is passed to the workflow engine and the list of serialized arguments
+        that is stored in the database.
+
+        Parameters
+        ----------
+        group: flowserv.model.base.GroupObject
+            Workflow group handle.
+        template: flowserv.model.template.base.WorkflowTemplate
+            Workflow template for the group.
+        arguments: list(dict)
+            List of user provided arguments for template parameters.
+        files: dict, default=None
+            Optional cache for uploaded files. Maps the file identifier to
+            the file object.
+
+        Returns
+        -------
+        dict, list(dict)
+
+        Raises
+        ------
+        flowserv.error.DuplicateArgumentError
+        flowserv.error.InvalidArgumentError
+        flowserv.error.MissingArgumentError
+        flowserv.error.UnknownFileError
+        flowserv.error.UnknownParameterError
+        """
+        files = files if files is not None else dict()
+        # At this point we only distinguish between scalar values and input
+        # files.
+        run_args = dict()
+        serialized_args = list()
+        for arg in arguments:
+            arg_id, arg_val = deserialize_arg(arg)
+            # Raise an error if multiple values are given for the same argument
+            if arg_id in run_args:
+                raise err.DuplicateArgumentError(arg_id)
+            para = template.parameters.get(arg_id)
+            if para is None:
+                raise err.UnknownParameterError(arg_id)
+            if is_fh(arg_val):
+                file_id, target = deserialize_fh(arg_val)
+                # The argument value is expected to be the identifier of an
+                # previously uploaded file. This will raise an exception if the
+                # file identifier is unknown.
+                if file_id not in files:
+                    files[file_id] = self.group_manager.get_uploaded_file(
+                        group_id=group.group_id,
+                        file_id=file_id
+                    ).fileobj
+                run_args[arg_id] = para.cast(value=(files[file_id], target))
+            else:
+                run_args[arg_id] = para.cast(arg_val)
+            # Actor values as parameter values canno be serialized. for now,
+            # we only store the serialized workflow step but no information
+            # about the additional input files.
+            if isinstance(arg_val, ActorValue):
+                arg_val = arg_val.spec
+            serialized_args.append(serialize_arg(name=arg_id, value=arg_val))
+        # Before we start creating directories and copying files make sure that
+        # there are values for all template parameters (either in the arguments
+        # dictionary or set as default values)
+        template.validate_arguments(run_args)
+        return run_args, serialized_args
+
+    def _run_handle(
+        self, run: RunObject, group: Optional[GroupObject] = None,
+        positions: Optional[Dict[str, int]] = None
+    ) -> Dict:
+        """Get serialization for a run handle. Includes the queue position
+        for runs that are queued by the scheduler.
+
+        Parameters
+        ----------
+        run: flowserv.model.base.RunObject
+            Workflow run handle
+        group: flowserv.model.base.GroupObject, default=None
+            Workflow group handle.
+        positions: dict, default=None
+            Queue positions for all queued runs. The positions are taken from
+            the scheduler if not given.
+
+        Returns
+        -------
+        dict
+        """
+        position = None
+        if self.scheduler is not None and run.is_pending():
+            positions = positions if positions is not None else self.scheduler.positions()
+            position = positions.get(run.run_id)
+        return self.serialize.run_handle(run=run, group=group, position=position)
 
 
 # -- Helper functions ---------------------------------------------------------
 
+def get_template(group: GroupObject) -> WorkflowTemplate:
+    """Get the template from the workflow that the workflow group belongs to.
+    Returns a modified copy of the template based on the (potentially)
+    modified workflow specification and parameters of the workflow group.
+
+    Parameters
+    ----------
+    group: flowserv.model.base.GroupObject
+        Workflow group handle.
+
+    Returns
+    -------
+    flowserv.model.template.base.WorkflowTemplate
+    """
+    return group.workflow.get_template(
+        workflow_spec=group.workflow_spec,
+        parameters=group.parameters
+    )
+
+
 def run_postproc_workflow(
     workflow: WorkflowObject, ranking: List[RunResult],
-    keys: List[str], run_manager: RunManager, tmpstore: StorageVolume,
-    staticfs: StorageVolume, backend: WorkflowController
+    keys: List[str], run_manager: RunManager, store: StorageVolume,
+    staticfs: StorageVolume, backend: WorkflowController,
+    scheduler: Optional[RunScheduler] = None
 ):
     """Run post-processing workflow for a workflow template.
 
+    If a run scheduler is given the post-processing run is queued together
+    with the runs of the workflow groups. Post-processing runs have a high
+    priority by default.
+
     Parameters
     ----------
     workflow: flowserv.model.base.WorkflowObject
@@ -484,47 +920,58 @@ def run_postproc_workflow(
         Sorted list of run identifier for runs in the ranking.
     run_manager: flowserv.model.run.RunManager
         Manager for workflow runs
-    tmpstore: flowserv.volume.base.StorageVolume
-        Temporary storage volume where the created post-processing files are
-        stored. This volume will be erased after the workflow is started.
+    store: flowserv.volume.base.StorageVolume
+        Staging area for the post-processing input files. The files for each
+        post-processing run are staged in a folder that is named after the
+        run identifier. Run result files are kept in a persistent pool folder
+        from which they are linked into the run folders.
     staticfs: flowserv.volume.base.StorageVolume
         Storage volume that contains the static files from the workflow
         template.
     backend: flowserv.controller.base.WorkflowController
         Backend that is used to execute the post-processing workflow.
+    scheduler: flowserv.service.run.scheduler.RunScheduler, default=None
+        Optional scheduler for admission control of workflow runs.
     """
     # Get workflow specification and the list of input files from the
     # post-processing statement.
-    postproc_spec = workflow.postproc_spec
+    postproc_spec = workflow.get_template().postproc_spec
     workflow_spec = postproc_spec.get('workflow')
     pp_inputs = postproc_spec.get('inputs', {})
     pp_files = pp_inputs.get('files', [])
-    # Prepare temporary directory with result files for all
-    # runs in the ranking. The created directory is the only
-    # run argument
+    # Create a new run for the workflow. The identifier for the run group is
+    # None. The staging directory with the result files for all runs in the
+    # ranking is the only run argument.
+    previous_run_id = workflow.postproc_run_id
+    run = run_manager.create_run(
+        workflow=workflow,
+        arguments=[serialize_arg(PARA_RUNS, pp_inputs.get('runs', RUNS_DIR))],
+        runs=keys,
+        owner=scheduler.owner if scheduler is not None else None
+    )
+    # Prepare the staging directory in a separate folder for the new run. A
+    # post-processing run that is still reading its input files is therefore
+    # not affected by the next run. The result files are staged in a pool that
+    # is shared by all post-processing runs of the workflow and linked from
+    # there into the run folder. Only the folder of the previous run is
+    # removed.
     strace = None
+    runsfs = store.get_store_for_folder(key=run.run_id)
     try:
         prepare_postproc_data(
             input_files=pp_files,
             ranking=ranking,
             run_manager=run_manager,
-            store=tmpstore
+            store=runsfs,
+            pool=store.get_store_for_folder(key=POOL_DIR)
         )
-        dst = pp_inputs.get('runs', RUNS_DIR)
-        run_args = {PARA_RUNS: InputDirectory(store=tmpstore, target=RUNS_DIR)}
-        arg_list = [serialize_arg(PARA_RUNS, dst)]
+        run_args = {PARA_RUNS: InputDirectory(store=runsfs, target=RUNS_DIR)}
     except Exception as ex:
         logging.error(ex, exc_info=True)
         strace = util.stacktrace(ex)
-        run_args = dict()
-        arg_list = []
-    # Create a new run for the workflow. The identifier for the run group is
-    # None.
-    run = run_manager.create_run(
-        workflow=workflow,
-        arguments=arg_list,
-        runs=keys
-    )
+        store.delete(key=run.run_id)
+    if previous_run_id is not None:
+        store.delete(key=previous_run_id)
     if strace is not None:
         # If there were data preparation errors set the created run into an
         # error state and return.
@@ -535,21 +982,41 @@ def run_postproc_workflow(
     else:
         # Execute the post-processing workflow asynchronously if
         # there were no data preparation errors.
-        try:
-            postproc_state, runstore = backend.exec_workflow(
-                run=run,
-                template=WorkflowTemplate(
-                    workflow_spec=workflow_spec,
-                    parameters=PARAMETERS
-                ),
-                arguments=run_args,
-                staticfs=staticfs,
-                config=workflow.engine_config
-            )
-        except Exception as ex:
-            # Make sure to catch exceptions and set the run into an error state.
-            postproc_state = run.state().error(messages=util.stacktrace(ex))
-            runstore = None
+        template = WorkflowTemplate(
+            workflow_spec=workflow_spec,
+            parameters=PARAMETERS
+        )
+        if scheduler is not None:
+            # The result is None if the run was queued by the scheduler.
+            result = scheduler.submit([
+                QueuedRun(
+                    run_id=run.run_id,
+                    group_id=None,
+                    workflow_id=workflow.workflow_id,
+                    template=template,
+                    arguments=run_args,
+                    staticfs=staticfs,
+                    config=workflow.engine_config,
+                    priority=run.priority
+                )
+            ]).get(run.run_id)
+            if result is None:
+                return
+            postproc_state, runstore = result
+        else:
+            try:
+                postproc_state, runstore = backend.exec_workflow(
+                    run=run,
+                    template=template,
+                    arguments=run_args,
+                    staticfs=staticfs,
+                    config=workflow.engine_config
+                )
+            except Exception as ex:
+                # Make sure to catch exceptions and set the run into an error
+                # state.
+                postproc_state = run.state().error(messages=util.stacktrace(ex))
+                runstore = None
         # Update the post-processing workflow run state if it is
         # no longer pending for execution.
         if not postproc_state.is_pending():
@@ -558,5 +1025,5 @@ def run_postproc_workflow(
                 state=postproc_state,
                 runstore=runstore
             )
-        # Erase the temporary storage volume.
-        tmpstore.erase()
+            if scheduler is not None and not postproc_state.is_active():
+                scheduler.release(run.run_id)
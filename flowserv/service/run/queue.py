@@ -0,0 +1,488 @@
+# This file is part of the Reproducible and Reusable Data Analysis Workflow
+# Server (flowServ).
+#
+# Copyright (C) 2019-2021 NYU.
+#
+# flowServ is free software; you can redistribute it and/or modify it under the
+# terms of the MIT License; see LICENSE file for more details.
+
+"""Queue for run state updates that are reported by workflow engines.
+
+Workflow engines report state changes from callback functions or monitor
+threads. Instead of updating the run state synchronously in a separate API
+context, the updates are written to an outbox table in the database. A single
+writer thread applies the pending updates in batches. Updates that fail due to
+a database conflict are retried. Updates that are rejected by the API (e.g.,
+invalid state transitions for canceled runs) are discarded.
+
+Multiple API processes may share the same database. The writer has to hold a
+lease that is maintained in the database in order to apply updates. The lease
+is renewed for every update and released when the outbox is empty. Updates
+are removed from the outbox in the transaction that renews the lease, so that
+a writer whose lease expired during a slow update stops. This ensures
+that each update is applied by one process only and that updates for the same
+run are applied in order. If the lease is held by another process the writer
+retries after a wait time. Updates that remain in the outbox when a process
+stops are applied once the API factory of the next process is used.
+"""
+
+from datetime import timedelta
+from sqlalchemy.exc import IntegrityError, OperationalError, ProgrammingError
+from threading import Event, Lock, Thread
+from typing import Dict, Optional, Tuple
+
+import logging
+import time
+
+from flowserv.model.base import RunStateLease, RunStateUpdate
+from flowserv.model.database import DB
+from flowserv.model.workflow.state import WorkflowState
+from flowserv.service.api import APIFactory
+from flowserv.volume.base import StorageVolume
+from flowserv.volume.factory import Volume
+
+import flowserv.model.workflow.state as serialize
+import flowserv.util as util
+
+
+"""Default values for the writer configuration."""
+DEFAULT_BATCHSIZE = 100
+DEFAULT_LEASETIME = 30
+DEFAULT_MAXATTEMPTS = 5
+DEFAULT_RETRYINTERVAL = 0.1
+
+
+"""Identifier of the writer lease and of the lease for recovering pending
+runs in the lease table.
+"""
+WRITER_LEASE = 1
+RECOVERY_LEASE = 2
+
+
+class StateUpdateQueue(object):
+    """Durable queue for run state updates. Updates are persisted in the
+    database outbox table when they are enqueued. A background writer thread
+    is started on demand and applies all pending updates in the order in which
+    they were enqueued.
+
+    The queue keeps track of the number of applied and discarded updates and
+    of the time (in seconds) between enqueueing and applying an update.
+    """
+    def __init__(
+        self, db: DB, service: APIFactory,
+        batch_size: Optional[int] = DEFAULT_BATCHSIZE,
+        max_attempts: Optional[int] = DEFAULT_MAXATTEMPTS,
+        retry_interval: Optional[float] = DEFAULT_RETRYINTERVAL,
+        lease_time: Optional[float] = DEFAULT_LEASETIME
+    ):
+        """Initialize the database and the API factory that is used to apply
+        the state updates.
+
+        Parameters
+        ----------
+        db: flowserv.model.database.DB
+            Database that contains the outbox table.
+        service: flowserv.service.local.LocalAPIFactory
+            Factory for local API instances that are used to apply updates.
+        batch_size: int, default=100
+            Maximum number of updates that are applied in a single API context.
+        max_attempts: int, default=5
+            Maximum number of attempts to apply an update that fails due to a
+            database conflict.
+        retry_interval: float, default=0.1
+            Initial wait time (in sec.) before retrying a failed update. The
+            wait time doubles with every attempt.
+        lease_time: float, default=30
+            Time (in sec.) after which the writer lease expires if it is not
+            renewed.
+        """
+        self.db = db
+        self.service = service
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.retry_interval = retry_interval
+        self.lease_time = lease_time
+        # Unique identifier for the owner of the writer lease.
+        self.owner = util.get_unique_identifier()
+        # Statistics for applied updates.
+        self.applied = 0
+        self.discarded = 0
+        self.latency = 0.0
+        self.max_latency = 0.0
+        # Writer thread and synchronization.
+        self._event = Event()
+        self._lock = Lock()
+        self._writer = None
+        self._resumed = False
+
+    def drain(self) -> int:
+        """Apply all pending updates in the outbox. Returns the number of
+        updates that were applied.
+
+        Only one thread drains the queue at a time. Updates are only applied
+        if the writer lease can be acquired, i.e., if no other process is
+        currently draining the queue. A failed update stops the draining of
+        the queue to ensure that updates for the same run are applied in
+        order. The update is retried after a wait time until the maximum
+        number of attempts is reached.
+
+        Returns
+        -------
+        int
+        """
+        count, _ = self._drain()
+        return count
+
+    def enqueue(
+        self, run_id: str, state: WorkflowState,
+        runstore: Optional[StorageVolume] = None
+    ):
+        """Add a state update for the given run to the queue. The update is
+        applied asynchronously by the writer thread.
+
+        Parameters
+        ----------
+        run_id: string
+            Unique run identifier.
+        state: flowserv.model.workflow.state.WorkflowState
+            New workflow state.
+        runstore: flowserv.volume.base.StorageVolume, default=None
+            Storage volume containing the run (result) files for a successful
+            workflow run.
+        """
+        with self.db.session() as session:
+            session.add(
+                RunStateUpdate(
+                    run_id=run_id,
+                    state=serialize.serialize_state(state),
+                    runstore=runstore.to_dict() if runstore is not None else None
+                )
+            )
+        self._event.set()
+        self._start()
+
+    def resume(self) -> bool:
+        """Start the writer thread if the outbox contains updates that were
+        not applied when the previous process stopped. The outbox is checked
+        only once. Returns True if the writer was started.
+
+        Returns
+        -------
+        bool
+        """
+        if self._resumed:
+            return False
+        self._resumed = True
+        try:
+            with self.db.session() as session:
+                pending = session.query(RunStateUpdate).count()
+        except (OperationalError, ProgrammingError) as ex:
+            # The database has not been initialized yet. Check again on the
+            # next call.
+            logging.debug('cannot check outbox: {}'.format(ex))
+            self._resumed = False
+            return False
+        if not pending:
+            return False
+        logging.info('apply {} pending run state updates'.format(pending))
+        self._event.set()
+        self._start()
+        return True
+
+    def stats(self) -> Dict:
+        """Get statistics for the updates that were applied by the queue. The
+        latency is the average time in seconds between enqueueing and applying
+        an update.
+
+        Returns
+        -------
+        dict
+        """
+        return {
+            'applied': self.applied,
+            'discarded': self.discarded,
+            'latency': self.latency / self.applied if self.applied else 0.0,
+            'maxLatency': self.max_latency
+        }
+
+    def _acquire(self) -> bool:
+        """Acquire or renew the writer lease. Returns False if the lease is
+        held by a different writer and has not expired.
+
+        Returns
+        -------
+        bool
+        """
+        return acquire_lease(db=self.db, lease_id=WRITER_LEASE, owner=self.owner, lease_time=self.lease_time)
+
+    def _apply_batch(self) -> Tuple[int, bool]:
+        """Apply the next batch of pending updates. Returns the number of
+        applied updates and a flag indicating whether draining stops, i.e.,
+        the queue is empty or the writer lost the lease. The flag is False if
+        an update has to be retried.
+
+        The lease is renewed before each update. The update is removed from
+        the outbox in the same transaction that renews the lease again. A
+        writer that lost the lease therefore stops without modifying the
+        outbox.
+
+        Returns
+        -------
+        int, bool
+        """
+        count = 0
+        with self.service() as api:
+            session = api.session
+            updates = session.query(RunStateUpdate)\
+                .order_by(RunStateUpdate.update_id)\
+                .limit(self.batch_size)\
+                .all()
+            for update in updates:
+                # Commit the renewed lease before applying the update to avoid
+                # holding a database lock while the run is updated.
+                if not self._renew(session):
+                    return count, True
+                session.commit()
+                run_id = update.run_id
+                created_at = update.created_at
+                try:
+                    api.runs().update_run(
+                        run_id=run_id,
+                        state=serialize.deserialize_state(update.state),
+                        runstore=Volume(doc=update.runstore) if update.runstore else None
+                    )
+                    # Remove the update from the outbox after the run state
+                    # was updated. The run manager commits the transaction
+                    # before copying the files of successful runs. If the
+                    # update is applied again (e.g., after a crash) it is
+                    # rejected as an invalid state transition and discarded.
+                    if not self._renew(session):
+                        return count, True
+                    session.delete(update)
+                    session.commit()
+                    self._record(created_at)
+                    count += 1
+                except OperationalError as ex:
+                    # Database conflict. Keep the update in the outbox and
+                    # retry after a wait time.
+                    session.rollback()
+                    logging.error('conflict updating run {}: {}'.format(run_id, ex))
+                    if not self._renew(session):
+                        return count, True
+                    update.attempts += 1
+                    attempts = update.attempts
+                    if attempts >= self.max_attempts:
+                        self._discard(session, update)
+                    else:
+                        session.commit()
+                    time.sleep(self.retry_interval * (2 ** (attempts - 1)))
+                    return count, False
+                except Exception as ex:
+                    # The update is rejected by the API. Discard it.
+                    session.rollback()
+                    logging.error('update for run {} rejected: {}'.format(run_id, ex))
+                    if not self._renew(session):
+                        return count, True
+                    self._discard(session, update)
+        return count, len(updates) < self.batch_size
+
+    def _discard(self, session, update: RunStateUpdate):
+        """Remove an update that cannot be applied from the outbox and commit
+        the session. If the discarded update contains a final run state, the
+        run is released by the run scheduler. Otherwise, the run would block
+        a slot of the scheduler until the process stops.
+
+        Parameters
+        ----------
+        session: sqlalchemy.orm.session.Session
+            Database session.
+        update: flowserv.model.base.RunStateUpdate
+            Discarded update.
+        """
+        run_id = update.run_id
+        state = serialize.deserialize_state(update.state)
+        logging.error('discard update for run {}'.format(run_id))
+        session.delete(update)
+        session.commit()
+        self.discarded += 1
+        scheduler = getattr(self.service, 'scheduler', None)
+        if scheduler is not None and not state.is_active():
+            scheduler.release(run_id)
+
+    def _drain(self) -> Tuple[int, bool]:
+        """Apply all pending updates in the outbox if the writer lease can be
+        acquired. Returns the number of applied updates and a flag indicating
+        whether the writer lease was acquired.
+
+        Returns
+        -------
+        int, bool
+        """
+        count = 0
+        with self._lock:
+            if not self._acquire():
+                return count, False
+            try:
+                while True:
+                    applied, done = self._apply_batch()
+                    count += applied
+                    # Renew the lease before the next batch. Stop if the lease
+                    # expired and was acquired by another writer.
+                    if done or not self._acquire():
+                        break
+            finally:
+                self._release()
+        return count, True
+
+    def _record(self, created_at: str):
+        """Record the time between enqueueing and applying an update.
+
+        Parameters
+        ----------
+        created_at: string
+            Timestamp for when the update was enqueued.
+        """
+        latency = (
+            util.to_datetime(util.utc_now()) - util.to_datetime(created_at)
+        ).total_seconds()
+        logging.debug('applied run state update after {}s'.format(latency))
+        self.applied += 1
+        self.latency += latency
+        self.max_latency = max(self.max_latency, latency)
+
+    def _release(self):
+        """Release the writer lease if it is held by this writer."""
+        release_lease(db=self.db, lease_id=WRITER_LEASE, owner=self.owner)
+
+    def _renew(self, session) -> bool:
+        """Renew the writer lease as part of the current transaction in the
+        given session. Returns False if the lease has expired or is held by
+        another writer. In this case the transaction is rolled back.
+
+        Parameters
+        ----------
+        session: sqlalchemy.orm.session.Session
+            Database session for the transaction that applies an update.
+
+        Returns
+        -------
+        bool
+        """
+        now = util.to_datetime(util.utc_now())
+        expires = (now + timedelta(seconds=self.lease_time)).isoformat()
+        table = RunStateLease.__table__
+        result = session.execute(
+            table.update()
+            .where(table.c.lease_id == WRITER_LEASE)
+            .where(table.c.owner == self.owner)
+            .where(table.c.expires > now.isoformat())
+            .values(expires=expires)
+        )
+        if result.rowcount == 1:
+            return True
+        session.rollback()
+        logging.warning('writer lease expired; stop applying updates')
+        return False
+
+    def _run(self):
+        """Writer thread that waits for new updates and drains the queue."""
+        while True:
+            self._event.wait()
+            self._event.clear()
+            try:
+                _, acquired = self._drain()
+                if not acquired:
+                    # The queue is drained by another process. Check again
+                    # after the retry interval in case the other writer has
+                    # finished before our updates were committed.
+                    time.sleep(self.retry_interval)
+                    self._event.set()
+            except Exception as ex:
+                logging.error(ex, exc_info=True)
+                logging.debug('\n'.join(util.stacktrace(ex)))
+                # Pending updates remain in the outbox. Try again after the
+                # retry interval.
+                time.sleep(self.retry_interval)
+                self._event.set()
+
+    def _start(self):
+        """Start the writer thread if it is not running."""
+        if self._writer is None:
+            with self._lock:
+                if self._writer is None:
+                    self._writer = Thread(target=self._run, daemon=True)
+                    self._writer.start()
+
+
+# -- Helper functions ---------------------------------------------------------
+
+def acquire_lease(db: DB, lease_id: int, owner: str, lease_time: float) -> bool:
+    """Acquire or renew a lease in the lease table. Returns False if the
+    lease is held by a different owner and has not expired.
+
+    Parameters
+    ----------
+    db: flowserv.model.database.DB
+        Database that contains the lease table.
+    lease_id: int
+        Unique lease identifier.
+    owner: string
+        Unique identifier for the owner of the lease.
+    lease_time: float
+        Time (in sec.) after which the lease expires if it is not renewed.
+
+    Returns
+    -------
+    bool
+    """
+    now = util.to_datetime(util.utc_now())
+    expires = (now + timedelta(seconds=lease_time)).isoformat()
+    try:
+        with db.session() as session:
+            lease = session.query(RunStateLease).get(lease_id)
+            if lease is None:
+                session.add(RunStateLease(lease_id=lease_id, owner=owner, expires=expires))
+                return True
+            if lease.owner not in [None, owner] and util.to_datetime(lease.expires) > now:
+                return False
+            # Update the lease only if it was not modified by another owner
+            # in the meantime.
+            table = RunStateLease.__table__
+            result = session.execute(
+                table.update()
+                .where(table.c.lease_id == lease_id)
+                .where(table.c.owner == lease.owner)
+                .where(table.c.expires == lease.expires)
+                .values(owner=owner, expires=expires)
+            )
+            return result.rowcount == 1
+    except (IntegrityError, OperationalError) as ex:
+        # Concurrent attempt to create or update the lease.
+        logging.debug('cannot acquire lease {}: {}'.format(lease_id, ex))
+        return False
+
+
+def release_lease(db: DB, lease_id: int, owner: str):
+    """Release a lease if it is held by the given owner.
+
+    Parameters
+    ----------
+    db: flowserv.model.database.DB
+        Database that contains the lease table.
+    lease_id: int
+        Unique lease identifier.
+    owner: string
+        Unique identifier for the owner of the lease.
+    """
+    table = RunStateLease.__table__
+    try:
+        with db.session() as session:
+            session.execute(
+                table.update()
+                .where(table.c.lease_id == lease_id)
+                .where(table.c.owner == owner)
+                .values(owner=None, expires=None)
+            )
+    except OperationalError as ex:
+        # The lease expires eventually.
+        logging.error('cannot release lease {}: {}'.format(lease_id, ex))
@@ -11,7 +11,10 @@ access, and manipulate workflow runs and their results. The remote service API
 provides access to run resources at a RESTful API.
 """
 
-from typing import Dict, IO, List, Optional
+from typing import Callable, Dict, IO, List, Optional
+
+import requests
+import time
 
 from flowserv.service.descriptor import ServiceDescriptor
 from flowserv.service.remote import delete, download_file, get, post, put
@@ -21,6 +24,17 @@ import flowserv.service.descriptor as route
 import flowserv.view.run as default_labels
 
 
+"""Maximum time (in sec.) that a single long-polling request waits for a run
+state change.
+"""
+LONGPOLL_TIMEOUT = 30
+
+"""Interval (in sec.) for polling the run state if the remote API does not
+support long-polling requests.
+"""
+POLL_INTERVAL = 1
+
+
 class RemoteRunService(RunService):
     """API component that provides methods to start, access, and manipulate
     workflow runs and their resources at a remote RESTful API.
@@ -84,10 +98,14 @@ class RemoteRunService(RunService):
         """
         return delete(url=self.urls(route.RUNS_DELETE, runId=run_id))
 
-    def get_result_archive(self, run_id: str) -> IO:
+    def get_result_archive(
+        self, run_id: str, format: Optional[str] = None, level: Optional[int] = None,
+        progress: Optional[Callable[[int, int], None]] = None
+    ) -> IO:
         """Get compressed tar-archive containing all result files that were
         generated by a given workflow run. If the run is not in sucess state
-        a unknown resource error is raised.
+        a unknown resource error is raised. The archive is streamed from the
+        remote API.
 
         Raises an unauthorized access error if the user does not have read
         access to the run.
@@ -96,13 +114,22 @@ class RemoteRunService(RunService):
         ----------
         run_id: string
             Unique run identifier
+        format: string, default=None
+            Archive compression format. One of 'gzip', 'zstd', or 'none'. Uses
+            the default format of the remote API if not given.
+        level: int, default=None
+            Compression level. Uses the default for the format if not given.
+        progress: callable, default=None
+            Function that receives the number of bytes that have been read and
+            the archive size (or None if the size is unknown).
 
         Returns
         -------
-        io.BytesIO
+        io.BufferedReader
         """
         url = self.urls(route.RUNS_DOWNLOAD_ARCHIVE, runId=run_id)
-        return download_file(url=url)
+        params = {'format': format, 'level': level}
+        return download_file(url=url, progress=progress, params=params)
 
     def get_result_file(self, run_id: str, file_id: str) -> IO:
         """Get file handle for a resource file that was generated as the result
@@ -142,9 +169,16 @@ class RemoteRunService(RunService):
         """
         return get(url=self.urls(route.RUNS_GET, runId=run_id))
 
-    def list_runs(self, group_id: str, state: Optional[str] = None):
+    def list_runs(
+        self, group_id: str, state: Optional[str] = None,
+        limit: Optional[int] = None, after: Optional[str] = None
+    ):
         """Get a listing of all run handles for the given workflow group.
 
+        If a limit is given the listing contains at most the given number of
+        runs. If more runs exist the listing includes a cursor for the next
+        page that can be passed as the *after* argument.
+
         Raises an unauthorized access error if the user does not have read
         access to the workflow group.
 
@@ -154,13 +188,17 @@ class RemoteRunService(RunService):
             Unique workflow group identifier
         state: string, default=None
             State identifier query
+        limit: int, default=None
+            Maximum number of runs in the listing.
+        after: string, default=None
+            Cursor for the next page of a paginated listing.
 
         Returns
         -------
         dict
         """
         url = self.urls(route.GROUPS_RUNS, userGroupId=group_id, state=state)
-        return get(url=url)
+        return get(url=url, params={'limit': limit, 'after': after})
 
     def start_run(self, group_id: str, arguments: List[Dict]) -> Dict:
         """Start a new workflow run for the given group. The user provided
@@ -187,3 +225,112 @@ class RemoteRunService(RunService):
         data = {self.labels['RUN_ARGUMENTS']: arguments}
         url = self.urls(route.RUNS_START, userGroupId=group_id)
         return post(url=url, data=data)
+
+    def start_runs(
+        self, group_id: str, argument_sets: List[List[Dict]],
+        config: Optional[Dict] = None
+    ) -> List[Dict]:
+        """Start a new workflow run for each of the given argument lists.
+
+        The remote API does not provide a route for starting multiple runs
+        with a single request. Runs are therefore started one at a time.
+
+        Returns a list of serialized handles for the started runs.
+
+        Parameters
+        ----------
+        group_id: string
+            Unique workflow group identifier
+        argument_sets: list(list(dict))
+            List of argument lists. Each argument list contains the user
+            provided arguments for template parameters of one run.
+        config: dict, default=None
+            Configuration settings are currently ignored. Included for API
+            completeness.
+
+        Returns
+        -------
+        list(dict)
+        """
+        return [self.start_run(group_id=group_id, arguments=args) for args in argument_sets]
+
+    def wait_for_run(
+        self, run_id: str, state: Optional[str] = None,
+        timeout: Optional[float] = None
+    ) -> Dict:
+        """Wait until the state of the given run differs from the given state
+        or until the timeout expires. If no state is given, the current state
+        of the run is used. Returns the handle for the run after the state has
+        changed or the timeout has expired.
+
+        Uses long-polling requests. The server holds each request until the
+        run state changes or the request timeout expires. Requests are repeated
+        until the state has changed or the total timeout has expired. If the
+        remote API does not support long-polling requests, the run state is
+        polled at a fixed interval instead.
+
+        Raises an unauthorized access error if the user does not have read
+        access to the run.
+
+        Parameters
+        ----------
+        run_id: string
+            Unique run identifier
+        state: string, default=None
+            Last known state of the run.
+        timeout: float, default=None
+            Maximum time (in sec.) to wait. Wait until the run state changes
+            if no timeout is given.
+
+        Returns
+        -------
+        dict
+        """
+        if state is None:
+            state = self.get_run(run_id=run_id)[default_labels.RUN_STATE]
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        url = self.urls(route.RUNS_WAIT, runId=run_id)
+        while True:
+            interval = LONGPOLL_TIMEOUT
+            if deadline is not None:
+                interval = max(0, min(interval, deadline - time.monotonic()))
+            try:
+                run = get(url=url, params={'state': state, 'timeout': interval})
+            except requests.exceptions.HTTPError as ex:
+                # Older versions of the remote API do not have the route for
+                # long-polling requests.
+                if ex.response is None or ex.response.status_code not in [404, 405]:
+                    raise
+                return self._poll_run(run_id=run_id, state=state, deadline=deadline)
+            if run[default_labels.RUN_STATE] != state:
+                return run
+            if deadline is not None and time.monotonic() >= deadline:
+                return run
+
+    def _poll_run(self, run_id: str, state: str, deadline: Optional[float] = None) -> Dict:
+        """Poll the run state at a fixed interval until the state differs
+        from the given state or until the deadline has passed.
+
+        Parameters
+        ----------
+        run_id: string
+            Unique run identifier
+        state: string
+            Last known state of the run.
+        deadline: float, default=None
+            Time (monotonic clock) when to stop polling.
+
+        Returns
+        -------
+        dict
+        """
+        while True:
+            run = self.get_run(run_id=run_id)
+            if run[default_labels.RUN_STATE] != state:
+                return run
+            interval = POLL_INTERVAL
+            if deadline is not None:
+                interval = min(interval, deadline - time.monotonic())
+                if interval <= 0:
+                    return run
+            time.sleep(interval)
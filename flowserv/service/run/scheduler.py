@@ -0,0 +1,510 @@
+# This file is part of the Reproducible and Reusable Data Analysis Workflow
+# Server (flowServ).
+#
+# Copyright (C) 2019-2021 NYU.
+#
+# flowServ is free software; you can redistribute it and/or modify it under the
+# terms of the MIT License; see LICENSE file for more details.
+
+"""Admission control for workflow runs.
+
+The run scheduler sits between the run service and the workflow controller.
+New runs are queued per workflow group. A queued run is handed to the workflow
+controller only if the total number of active runs, the number of active runs
+of its group, and the number of active runs of its workflow are below the
+configured limits. Whenever a run finishes, the next runs are selected by
+priority first. Among runs of the same priority, weighted fair-share is used:
+the group with the fewest active runs relative to its weight goes first. A
+group that submits many runs therefore does not delay the runs of other
+groups. Post-processing runs (that do not belong to a group) have a high
+priority and are not subject to the per-group limit. The fair-share weight of
+a group is set by the operator (see *FLOWSERV_RUNS_WEIGHTS*) or with the
+*weight* element in the engine configuration of the workflow. Weights in the
+engine configuration of a group are ignored since they are controlled by the
+group members.
+
+The queue is kept in memory. Each scheduler has a unique owner identifier
+that is stored with the runs that it holds. While the scheduler holds runs it
+records a heartbeat in the database. Pending runs of a scheduler whose
+heartbeat has expired (e.g., because the process stopped) are not started by
+any process until they are recovered explicitly at start-up (see
+:meth:`flowserv.service.local.LocalAPIFactory.recover_runs`).
+"""
+
+from dataclasses import dataclass, field
+from threading import Lock, Thread
+from typing import Dict, List, Optional, Set, Tuple
+
+import itertools
+import logging
+import time
+
+from flowserv.controller.base import WorkflowController
+from flowserv.model.base import GroupObject, PRIORITY_NORMAL
+from flowserv.model.template.base import WorkflowTemplate
+from flowserv.model.workflow.state import WorkflowState
+from flowserv.service.api import APIFactory
+from flowserv.volume.base import StorageVolume
+
+import flowserv.util as util
+
+
+"""Default interval (in sec.) for heartbeats of a scheduler that holds runs
+and the time after which the heartbeat expires.
+"""
+DEFAULT_HEARTBEAT = 10
+DEFAULT_OWNERTIMEOUT = 60
+
+
+"""Element in the engine configuration of a workflow that defines the
+fair-share weight for the runs of the workflow groups.
+"""
+WEIGHT = 'weight'
+
+
+@dataclass
+class QueuedRun:
+    """Run that is waiting to be handed to the workflow controller. Contains
+    everything that is needed to start the run.
+    """
+    run_id: str
+    group_id: Optional[str]
+    workflow_id: str
+    template: WorkflowTemplate
+    arguments: Dict
+    staticfs: StorageVolume
+    config: Optional[Dict] = None
+    priority: int = PRIORITY_NORMAL
+    # Fair-share weight of the group (uses the current weight if None).
+    weight: Optional[float] = None
+    # Submission order (assigned by the scheduler).
+    seq: int = field(default=0, compare=False)
+
+
+class RunScheduler(object):
+    """Scheduler that enforces concurrency limits for workflow runs and that
+    selects queued runs using weighted fair-share between workflow groups.
+    """
+    def __init__(
+        self, service: APIFactory, engine: WorkflowController,
+        max_runs: Optional[int] = None, group_quota: Optional[int] = None,
+        workflow_quota: Optional[int] = None, weights: Optional[Dict[str, float]] = None,
+        owner: Optional[str] = None, heartbeat: Optional[float] = DEFAULT_HEARTBEAT,
+        owner_timeout: Optional[float] = DEFAULT_OWNERTIMEOUT
+    ):
+        """Initialize the API factory, the workflow controller, and the
+        concurrency limits. A limit of None means that there is no limit.
+
+        Parameters
+        ----------
+        service: flowserv.service.local.LocalAPIFactory
+            Factory for local API instances. Used to access queued runs when
+            they are started and to report their state.
+        engine: flowserv.controller.base.WorkflowController
+            Workflow controller that executes the runs.
+        max_runs: int, default=None
+            Maximum number of active runs.
+        group_quota: int, default=None
+            Maximum number of active runs per workflow group.
+        workflow_quota: int, default=None
+            Maximum number of active runs per workflow.
+        weights: dict, default=None
+            Fair-share weights for workflow groups. These weights take
+            precedence over the weights of submitted runs. The default weight
+            for each group is 1.
+        owner: string, default=None
+            Unique identifier of the scheduler that is stored with the runs it
+            holds. A new identifier is created if not given.
+        heartbeat: float, default=10
+            Interval (in sec.) for recording the heartbeat of the scheduler.
+        owner_timeout: float, default=60
+            Time (in sec.) after which the heartbeat of a scheduler expires.
+        """
+        self.service = service
+        self.engine = engine
+        self.max_runs = max_runs
+        self.group_quota = group_quota
+        self.workflow_quota = workflow_quota
+        self.owner = owner if owner else util.get_unique_identifier()
+        self.heartbeat = heartbeat
+        self.owner_timeout = owner_timeout
+        self.weights = dict()
+        for group_id, weight in (weights if weights is not None else dict()).items():
+            if is_weight(weight):
+                self.weights[group_id] = float(weight)
+            else:
+                logging.warning('ignore invalid weight {} for group {}'.format(weight, group_id))
+        # Weights of submitted runs that are taken from the workflow.
+        self._weights = dict()
+        # Queued runs per group and active runs. Active runs are mapped to the
+        # group and workflow identifier.
+        self._queues = dict()
+        self._active = dict()
+        self._groups = dict()
+        self._workflows = dict()
+        self._seq = itertools.count()
+        self._lock = Lock()
+        self._heartbeat = None
+
+    def active(self) -> int:
+        """Get the number of runs that were handed to the workflow controller
+        and that have not finished yet.
+
+        Returns
+        -------
+        int
+        """
+        with self._lock:
+            return len(self._active)
+
+    def dispatch(self, run_ids: Optional[List[str]] = None) -> Dict[str, Tuple[WorkflowState, StorageVolume]]:
+        """Start queued runs until no further run can be admitted. Returns the
+        workflow state and run store for those of the given runs that were
+        started. The state of all other started runs is reported to the API
+        factory.
+
+        Parameters
+        ----------
+        run_ids: list of string, default=None
+            Identifier of runs for which the caller handles the returned state.
+
+        Returns
+        -------
+        dict
+        """
+        run_ids = set(run_ids) if run_ids is not None else set()
+        self._reconcile()
+        results = dict()
+        while True:
+            with self._lock:
+                run = self._next()
+            if run is None:
+                return results
+            state, runstore = self._exec(run)
+            if run.run_id in run_ids:
+                results[run.run_id] = (state, runstore)
+            elif not state.is_pending():
+                self.service.update_run(run_id=run.run_id, state=state, runstore=runstore)
+
+    def position(self, run_id: str) -> Optional[int]:
+        """Get the position of a queued run, i.e., the number of queued runs
+        that will be started before the given run. Returns None if the run is
+        not queued.
+
+        Use :meth:`positions` to get the positions of multiple runs.
+
+        Parameters
+        ----------
+        run_id: string
+            Unique run identifier.
+
+        Returns
+        -------
+        int
+        """
+        return self.positions().get(run_id)
+
+    def positions(self) -> Dict[str, int]:
+        """Get the positions of all queued runs. The result maps the run
+        identifier to the number of queued runs that will be started before
+        the run.
+
+        The positions are an estimate. They reflect the current fair-share
+        order but not the limits that may delay the start of individual runs.
+
+        Returns
+        -------
+        dict
+        """
+        with self._lock:
+            # Simulate the fair-share selection of all queued runs.
+            counts = {g: self._groups.get(g, 0) for g in self._queues}
+            heads = {g: 0 for g in self._queues}
+            result = dict()
+            while heads:
+                group_id = min(heads, key=lambda g: self._rank(g, counts[g], self._queues[g][heads[g]]))
+                result[self._queues[group_id][heads[group_id]].run_id] = len(result)
+                counts[group_id] += 1
+                heads[group_id] += 1
+                if heads[group_id] == len(self._queues[group_id]):
+                    del heads[group_id]
+        return result
+
+    def release(self, run_id: str) -> bool:
+        """Remove a run that has finished or that was canceled. Starts queued
+        runs if the run was active. Returns True if the run was still queued,
+        i.e., it was never handed to the workflow controller.
+
+        Parameters
+        ----------
+        run_id: string
+            Unique run identifier.
+
+        Returns
+        -------
+        bool
+        """
+        with self._lock:
+            if run_id not in self._active:
+                return self._dequeue(run_id)
+            group_id, workflow_id = self._active.pop(run_id)
+            decrement(self._groups, group_id)
+            decrement(self._workflows, workflow_id)
+        self.dispatch()
+        return False
+
+    def run_ids(self) -> Set[str]:
+        """Get the identifier of all runs that are queued or active.
+
+        Returns
+        -------
+        set of string
+        """
+        with self._lock:
+            run_ids = set(self._active)
+            for queue in self._queues.values():
+                run_ids.update(run.run_id for run in queue)
+            return run_ids
+
+    def submit(self, runs: List[QueuedRun]) -> Dict[str, Tuple[WorkflowState, StorageVolume]]:
+        """Add the given runs to the queue and start queued runs that can be
+        admitted. Returns the workflow state and run store for those of the
+        given runs that were started immediately. All other runs remain
+        queued.
+
+        Parameters
+        ----------
+        runs: list of flowserv.service.run.scheduler.QueuedRun
+            Runs that are ready to be started.
+
+        Returns
+        -------
+        dict
+        """
+        with self._lock:
+            for run in runs:
+                run.seq = next(self._seq)
+                if run.group_id is not None and run.weight is not None:
+                    self._weights[run.group_id] = run.weight
+                # Keep the group queue ordered by priority. Runs of the same
+                # priority are ordered by submission.
+                queue = self._queues.setdefault(run.group_id, list())
+                pos = len(queue)
+                while pos > 0 and queue[pos - 1].priority < run.priority:
+                    pos -= 1
+                queue.insert(pos, run)
+            # Record the heartbeat while the scheduler holds runs.
+            if self._heartbeat is None:
+                self._heartbeat = Thread(target=self._beat, daemon=True)
+                self._heartbeat.start()
+        return self.dispatch(run_ids=[run.run_id for run in runs])
+
+    def _admissible(self, run: QueuedRun) -> bool:
+        """Test if the given run can be started without exceeding the group
+        or workflow limits.
+
+        Parameters
+        ----------
+        run: flowserv.service.run.scheduler.QueuedRun
+            Queued run.
+
+        Returns
+        -------
+        bool
+        """
+        if run.group_id is not None and self.group_quota is not None and self._groups.get(run.group_id, 0) >= self.group_quota:
+            return False
+        if self.workflow_quota is not None and self._workflows.get(run.workflow_id, 0) >= self.workflow_quota:
+            return False
+        return True
+
+    def _beat(self):
+        """Record the heartbeat of the scheduler until it no longer holds
+        queued or active runs.
+        """
+        while True:
+            with self._lock:
+                if not self._queues and not self._active:
+                    self._heartbeat = None
+                    return
+            try:
+                with self.service() as api:
+                    api.run_manager().heartbeat(self.owner)
+            except Exception as ex:
+                logging.error('cannot record heartbeat: {}'.format(ex))
+            time.sleep(self.heartbeat)
+
+    def _dequeue(self, run_id: str) -> bool:
+        """Remove a run from the queue. Returns True if the run was queued.
+        Expects that the caller holds the lock.
+
+        Parameters
+        ----------
+        run_id: string
+            Unique run identifier.
+
+        Returns
+        -------
+        bool
+        """
+        for group_id, queue in self._queues.items():
+            for run in queue:
+                if run.run_id == run_id:
+                    queue.remove(run)
+                    if not queue:
+                        del self._queues[group_id]
+                    return True
+        return False
+
+    def _exec(self, run: QueuedRun) -> Tuple[WorkflowState, StorageVolume]:
+        """Hand a run to the workflow controller. Returns the workflow state
+        and the run store. Errors are returned as an error state.
+
+        Parameters
+        ----------
+        run: flowserv.service.run.scheduler.QueuedRun
+            Run that is started.
+
+        Returns
+        -------
+        flowserv.model.workflow.state.WorkflowState, flowserv.volume.base.StorageVolume
+        """
+        with self.service() as api:
+            obj = api.run_manager().get_run(run.run_id)
+            try:
+                return self.engine.exec_workflow(
+                    run=obj,
+                    template=run.template,
+                    arguments=run.arguments,
+                    staticfs=run.staticfs,
+                    config=run.config
+                )
+            except Exception as ex:
+                logging.error(ex, exc_info=True)
+                return obj.state().error(messages=util.stacktrace(ex)), None
+
+    def _next(self) -> Optional[QueuedRun]:
+        """Remove the next run that can be admitted from the queue and mark it
+        as active. Returns None if no run can be admitted. Expects that the
+        caller holds the lock.
+
+        Returns
+        -------
+        flowserv.service.run.scheduler.QueuedRun
+        """
+        if self.max_runs is not None and len(self._active) >= self.max_runs:
+            return None
+        candidates = [q[0] for q in self._queues.values() if self._admissible(q[0])]
+        if not candidates:
+            return None
+        run = min(candidates, key=lambda r: self._rank(r.group_id, self._groups.get(r.group_id, 0), r))
+        queue = self._queues[run.group_id]
+        queue.pop(0)
+        if not queue:
+            del self._queues[run.group_id]
+        self._active[run.run_id] = (run.group_id, run.workflow_id)
+        self._groups[run.group_id] = self._groups.get(run.group_id, 0) + 1
+        self._workflows[run.workflow_id] = self._workflows.get(run.workflow_id, 0) + 1
+        return run
+
+    def _rank(self, group_id: str, count: int, run: QueuedRun) -> Tuple[int, float, int]:
+        """Get the rank for the next run of a group. Runs with higher priority
+        rank first. Among runs of the same priority, groups with fewer active
+        runs relative to their weight rank first. Ties are broken by
+        submission order.
+
+        Parameters
+        ----------
+        group_id: string
+            Unique workflow group identifier.
+        count: int
+            Number of active runs for the group.
+        run: flowserv.service.run.scheduler.QueuedRun
+            Next queued run of the group.
+
+        Returns
+        -------
+        tuple of int, float and int
+        """
+        weight = self.weights.get(group_id, self._weights.get(group_id, 1))
+        return -run.priority, count / weight, run.seq
+
+    def _reconcile(self):
+        """Release active runs that are no longer active in the database. A
+        run may not have been released if its final state update was discarded
+        or if the run was deleted, e.g., by a different process.
+
+        Runs are only reconciled if there are queued runs that are waiting for
+        an active run to finish.
+        """
+        with self._lock:
+            if not self._queues or not self._active:
+                return
+            run_ids = list(self._active)
+        with self.service() as api:
+            active = api.run_manager().list_active_runs(run_ids)
+        with self._lock:
+            for run_id in run_ids:
+                if run_id not in active and run_id in self._active:
+                    logging.warning('release run {} that is no longer active'.format(run_id))
+                    group_id, workflow_id = self._active.pop(run_id)
+                    decrement(self._groups, group_id)
+                    decrement(self._workflows, workflow_id)
+
+
+# -- Helper functions ---------------------------------------------------------
+
+def decrement(counts: Dict[str, int], key: str):
+    """Decrement the counter for the given key. Removes the key when the
+    counter reaches zero.
+
+    Parameters
+    ----------
+    counts: dict
+        Dictionary of counters.
+    key: string
+        Counter key.
+    """
+    counts[key] -= 1
+    if counts[key] == 0:
+        del counts[key]
+
+
+def group_weight(group: GroupObject) -> Optional[float]:
+    """Get the fair-share weight for the runs of a workflow group. The weight
+    is taken from the engine configuration of the workflow. The engine
+    configuration of the group is not considered since it is defined by the
+    group members. The result is None if the workflow does not define a
+    (positive) weight.
+
+    Parameters
+    ----------
+    group: flowserv.model.base.GroupObject
+        Workflow group handle.
+
+    Returns
+    -------
+    float
+    """
+    config = group.workflow.engine_config
+    if config and config.get(WEIGHT) is not None:
+        if is_weight(config[WEIGHT]):
+            return float(config[WEIGHT])
+        logging.warning('ignore invalid weight {} for group {}'.format(config[WEIGHT], group.group_id))
+    return None
+
+
+def is_weight(value) -> bool:
+    """Test if the given value is a valid fair-share weight, i.e., a positive
+    number.
+
+    Parameters
+    ----------
+    value: any
+        Weight value.
+
+    Returns
+    -------
+    bool
+    """
+    return isinstance(value, (int, float)) and not isinstance(value, bool) and value > 0
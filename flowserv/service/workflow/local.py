@@ -170,7 +170,7 @@ class LocalWorkflowService(WorkflowService):
         # Get the workflow handle to ensure that the workflow exists
         workflow = self.workflow_repo.get_workflow(workflow_id)
         # Return None if the workflow has no result schema defined.
-        if workflow.result_schema is None:
+        if workflow.get_template().result_schema is None:
             return None
         # Only if the workflow has a defined result schema we get theranking of
         # run results. Otherwise, the ranking is empty.
@@ -87,7 +87,7 @@ def validate_group_listing(doc):
     ------
     ValueError
     """
-    util.validate_doc(doc=doc, mandatory=['groups'])
+    util.validate_doc(doc=doc, mandatory=['groups'], optional=['next'])
     for g in doc['groups']:
         util.validate_doc(doc=g, mandatory=['id', 'name', 'workflow'])
 
@@ -171,7 +171,7 @@ def validate_run_handle(doc, state):
     util.validate_doc(
         doc=doc,
         mandatory=labels,
-        optional=['parameters', 'groupId']
+        optional=['parameters', 'groupId', 'queuePosition', 'priority']
     )
     if 'parameters' in doc:
         for p in doc['parameters']:
@@ -198,7 +198,7 @@ def validate_run_listing(doc):
     ------
     ValueError
     """
-    util.validate_doc(doc=doc, mandatory=['runs'])
+    util.validate_doc(doc=doc, mandatory=['runs'], optional=['next'])
     for r in doc['runs']:
         validate_run_descriptor(doc=r)
 
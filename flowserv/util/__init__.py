@@ -6,6 +6,7 @@
 # flowServ is free software; you can redistribute it and/or modify it under the
 # terms of the MIT License; see LICENSE file for more details.
 
+from flowserv.util.core import decode_cursor, encode_cursor
 from flowserv.util.core import get_unique_identifier, import_obj, jquery, stacktrace, validate_doc
 from flowserv.util.datetime import to_datetime, utc_now
 from flowserv.util.files import cleardir, read_buffer, read_object, write_object
@@ -8,6 +8,8 @@
 
 """Collection of general utility functions."""
 
+import base64
+import binascii
 import json
 import traceback
 import uuid
@@ -16,6 +18,45 @@ from importlib import import_module
 from typing import Any, Callable, Dict, List, Optional, Type, Union
 
 
+def decode_cursor(cursor: str) -> List:
+    """Decode the list of key values from a pagination cursor that was created
+    by :func:`encode_cursor`. Raises a ValueError if the cursor is invalid.
+
+    Parameters
+    ----------
+    cursor: string
+        Pagination cursor.
+
+    Returns
+    -------
+    list
+    """
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+    except (AttributeError, UnicodeError, binascii.Error, ValueError):
+        raise ValueError("invalid cursor '{}'".format(cursor))
+    if not isinstance(values, list):
+        raise ValueError("invalid cursor '{}'".format(cursor))
+    return values
+
+
+def encode_cursor(values: List) -> str:
+    """Get an opaque pagination cursor for a list of (Json serializable) key
+    values. The key values identify the last element on a page in a listing
+    that is sorted by these keys.
+
+    Parameters
+    ----------
+    values: list
+        List of key values for the last element on a page.
+
+    Returns
+    -------
+    string
+    """
+    return base64.urlsafe_b64encode(json.dumps(values).encode('utf-8')).decode('ascii')
+
+
 def get_unique_identifier() -> str:
     """Create a new unique identifier.
 
@@ -21,6 +21,7 @@ GROUP_ID = 'id'
 GROUP_LIST = 'groups'
 GROUP_MEMBERS = 'members'
 GROUP_NAME = 'name'
+GROUP_NEXT = 'next'
 GROUP_PARAMETERS = 'parameters'
 GROUP_UPLOADS = 'files'
 USER_ID = 'id'
@@ -107,16 +108,23 @@ class WorkflowGroupSerializer(object):
             doc.update(self.runs.run_listing(runs=runs))
         return doc
 
-    def group_listing(self, groups: List[GroupObject]) -> Dict:
+    def group_listing(
+        self, groups: List[GroupObject], next_page: Optional[str] = None
+    ) -> Dict:
         """Get serialization of a workflow group descriptor list.
 
         Parameters
         ----------
         groups: list(flowserv.model.base.GroupObject)
             List of descriptors for workflow groups
+        next_page: string, default=None
+            Optional cursor for the next page of a paginated group listing.
 
         Returns
         -------
         dict
         """
-        return {GROUP_LIST: [self.group_descriptor(g) for g in groups]}
+        doc = {GROUP_LIST: [self.group_descriptor(g) for g in groups]}
+        if next_page is not None:
+            doc[GROUP_NEXT] = next_page
+        return doc
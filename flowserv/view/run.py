@@ -34,7 +34,10 @@ RUN_FINISHED = 'finishedAt'
 RUN_GROUP = 'groupId'
 RUN_ID = 'id'
 RUN_LIST = 'runs'
+RUN_NEXT = 'next'
 RUN_PARAMETERS = 'parameters'
+RUN_POSITION = 'queuePosition'
+RUN_PRIORITY = 'priority'
 RUN_FILES = 'files'
 RUN_STARTED = 'startedAt'
 RUN_STATE = 'state'
@@ -63,7 +66,10 @@ class RunSerializer(object):
             RUN_CREATED: run.created_at
         }
 
-    def run_handle(self, run: RunObject, group: Optional[GroupObject] = None) -> Dict:
+    def run_handle(
+        self, run: RunObject, group: Optional[GroupObject] = None,
+        position: Optional[int] = None
+    ) -> Dict:
         """Get serialization for a run handle. The run handle extends the run
         descriptor with the run arguments, the parameter declaration taken from
         the workflow group handle (since it may differ from the parameter list
@@ -76,6 +82,8 @@ class RunSerializer(object):
             Workflow run handle
         group: flowserv.model.base.GroupObject, default=None
             Workflow group handle. Missing for post-processing workflows
+        position: int, default=None
+            Position of a pending run in the run queue.
 
         Returns
         -------
@@ -86,8 +94,9 @@ class RunSerializer(object):
         doc[RUN_WORKFLOW] = run.workflow_id
         if run.group_id is not None:
             doc[RUN_GROUP] = run.group_id
-        # Add run arguments
+        # Add run arguments and priority
         doc[RUN_ARGUMENTS] = run.arguments
+        doc[RUN_PRIORITY] = run.priority
         # Add group specific parameters
         if group is not None:
             parameters = group.parameters.values()
@@ -95,44 +104,66 @@ class RunSerializer(object):
         # Add additional information from the run state
         if not run.is_pending():
             doc[RUN_STARTED] = run.state().started_at
+        elif position is not None:
+            doc[RUN_POSITION] = position
         if run.is_canceled() or run.is_error():
             doc[RUN_FINISHED] = run.state().stopped_at
             doc[RUN_ERRORS] = run.state().messages
         elif run.is_success():
             doc[RUN_FINISHED] = run.state().finished_at
-            output_spec = run.outputs()
-            # Serialize file resources. The default serialization contains the
-            # file identifier and name. If an output specification is present
-            # for the file the values for that specification will be added
-            # to the serialization.
-            files = list()
-            for f in run.files:
-                obj = {FILE_ID: f.file_id, FILE_NAME: f.name}
-                if f.name in output_spec:
-                    fspec = output_spec[f.name]
-                    obj[FILE_NAME] = fspec.key
-                    if fspec.title is not None:
-                        obj[FILE_TITLE] = fspec.title
-                    if fspec.caption is not None:
-                        obj[FILE_CAPTION] = fspec.caption
-                    if fspec.widget is not None:
-                        obj[FILE_WIDGET] = fspec.widget
-                    if fspec.format is not None:
-                        obj[FILE_FORMAT] = fspec.format
-                files.append(obj)
-            doc[RUN_FILES] = files
+            doc[RUN_FILES] = self.run_files(run)
         return doc
 
-    def run_listing(self, runs: List[RunObject]) -> Dict:
+    def run_files(self, run: RunObject) -> List[Dict]:
+        """Get serialization for the result files of a successful run. The
+        default serialization contains the file identifier and name. If an
+        output specification is present for the file the values for that
+        specification will be added to the serialization.
+
+        Parameters
+        ----------
+        run: flowserv.model.base.RunObject
+            Workflow run handle
+
+        Returns
+        -------
+        list
+        """
+        output_spec = run.outputs()
+        files = list()
+        for f in run.files:
+            obj = {FILE_ID: f.file_id, FILE_NAME: f.name}
+            if f.name in output_spec:
+                fspec = output_spec[f.name]
+                obj[FILE_NAME] = fspec.key
+                if fspec.title is not None:
+                    obj[FILE_TITLE] = fspec.title
+                if fspec.caption is not None:
+                    obj[FILE_CAPTION] = fspec.caption
+                if fspec.widget is not None:
+                    obj[FILE_WIDGET] = fspec.widget
+                if fspec.format is not None:
+                    obj[FILE_FORMAT] = fspec.format
+            files.append(obj)
+        return files
+
+    def run_listing(
+        self, runs: List[RunObject], next_page: Optional[str] = None
+    ) -> Dict:
         """Get serialization for a list of run handles.
 
         Parameters
         ----------
         runs: list(flowserv.model.base.RunObject)
             List of run handles
+        next_page: string, default=None
+            Optional cursor for the next page of a paginated run listing.
 
         Returns
         -------
         dict
         """
-        return {RUN_LIST: [self.run_descriptor(r) for r in runs]}
+        doc = {RUN_LIST: [self.run_descriptor(r) for r in runs]}
+        if next_page is not None:
+            doc[RUN_NEXT] = next_page
+        return doc
@@ -112,11 +112,12 @@ class WorkflowSerializer(object):
         dict
         """
         obj = self.workflow_descriptor(workflow)
+        template = workflow.get_template()
         # Add parameter declarations to the serialized workflow descriptor
-        parameters = workflow.parameters.values() if workflow.parameters is not None else []
+        parameters = template.parameters.values() if template.parameters is not None else []
         obj[WORKFLOW_PARAMETERS] = [p.to_dict() for p in parameters]
         # Add parameter group definitions if defined for the workflow.
-        parameter_groups = workflow.parameter_groups
+        parameter_groups = template.parameter_groups
         if parameter_groups is not None:
             obj[WORKFLOW_PARAGROUPS] = [
                 {
@@ -175,7 +176,7 @@ class WorkflowSerializer(object):
             })
         # Add schema information for the leaderboard.
         schema = list()
-        for c in workflow.result_schema.columns:
+        for c in workflow.get_template().result_schema.columns:
             schema.append({
                 COLUMN_NAME: c.column_id,
                 COLUMN_TITLE: c.name,
@@ -0,0 +1,333 @@
+# This file is part of the Reproducible and Reusable Data Analysis Workflow
+# Server (flowServ).
+#
+# Copyright (C) 2019-2021 NYU.
+#
+# flowServ is free software; you can redistribute it and/or modify it under the
+# terms of the MIT License; see LICENSE file for more details.
+
+"""Streaming generator for tar archives of files in a storage volume.
+
+The archive is generated incrementally while it is being read. File contents
+are read from the storage volume in chunks and each chunk is compressed and
+passed on to the reader. At no point is the full archive (or a full file) kept
+in memory. The archive is either uncompressed or compressed using gzip or
+zstd. The zstd compression requires the optional package `zstandard`.
+"""
+
+from typing import Callable, IO, Iterator, List, Optional, Tuple
+
+import io
+import tarfile
+import zlib
+
+from flowserv.volume.base import IOHandle, StorageVolume
+
+import flowserv.error as err
+
+
+"""Identifier for supported archive formats."""
+GZIP = 'gzip'
+NONE = 'none'
+ZSTD = 'zstd'
+
+"""Default compression format and compression levels."""
+DEFAULT_FORMAT = GZIP
+DEFAULT_GZIP_LEVEL = 6
+DEFAULT_ZSTD_LEVEL = 3
+
+"""Size of chunks (in bytes) that are read from archived files."""
+CHUNKSIZE = 1024 * 1024
+
+"""File suffix and mime type for each archive format. The mime type for gzip
+is 'application/gzip' based on https://superuser.com/questions/901962.
+"""
+FORMATS = {
+    GZIP: ('.tar.gz', 'application/gzip'),
+    NONE: ('.tar', 'application/x-tar'),
+    ZSTD: ('.tar.zst', 'application/zstd')
+}
+
+
+# -- Compression --------------------------------------------------------------
+
+"""Type alias for compressors. A compressor is a pair of functions. The first
+function compresses a chunk of data and the second function flushes any data
+that remains in the compressor at the end of the stream.
+"""
+Compressor = Tuple[Callable[[bytes], bytes], Callable[[], bytes]]
+
+
+def compressor(format: str, level: Optional[int] = None) -> Compressor:
+    """Get a new compressor for the given archive format.
+
+    Parameters
+    ----------
+    format: string
+        Archive format identifier.
+    level: int, default=None
+        Compression level. Uses the default level of the respective format if
+        no value is given.
+
+    Returns
+    -------
+    tuple of callable
+
+    Raises
+    ------
+    flowserv.error.InvalidArgumentError
+    """
+    if format == GZIP:
+        level = level if level is not None else DEFAULT_GZIP_LEVEL
+        # Use wbits=16+MAX_WBITS to write a gzip header and trailer.
+        try:
+            obj = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+        except (TypeError, ValueError, zlib.error):
+            raise err.InvalidArgumentError("invalid compression level '{}'".format(level))
+        return obj.compress, obj.flush
+    elif format == ZSTD:
+        # Import zstandard here to avoid errors for installations that do not
+        # use the zstd format and therefore did not install the package.
+        try:
+            import zstandard
+        except ImportError:
+            raise err.InvalidArgumentError("archive format 'zstd' requires package 'zstandard'")
+        level = level if level is not None else DEFAULT_ZSTD_LEVEL
+        try:
+            obj = zstandard.ZstdCompressor(level=level).compressobj()
+        except (TypeError, ValueError, zstandard.ZstdError):
+            raise err.InvalidArgumentError("invalid compression level '{}'".format(level))
+        return obj.compress, obj.flush
+    elif format == NONE:
+        return (lambda data: data), (lambda: b'')
+    raise err.InvalidArgumentError("unknown archive format '{}'".format(format))
+
+
+# -- Archive generator --------------------------------------------------------
+
+def tar_blocks(files: List[Tuple[str, IOHandle]]) -> Iterator[bytes]:
+    """Generate the blocks of an uncompressed tar archive for the given list
+    of files. Each file is represented by a pair of archive member name and
+    file handle.
+
+    Parameters
+    ----------
+    files: list of (string, flowserv.volume.base.IOHandle)
+        Archive member names and handles for the archived files.
+
+    Returns
+    -------
+    iterator of bytes
+    """
+    written = 0
+    for name, file in files:
+        info = tarfile.TarInfo(name=name)
+        info.size = file.size()
+        header = info.tobuf(format=tarfile.DEFAULT_FORMAT)
+        yield header
+        written += len(header)
+        # Copy the file content in chunks. The number of copied bytes has to
+        # match the size that is recorded in the file header.
+        remaining = info.size
+        f = file.reader()
+        try:
+            while remaining > 0:
+                chunk = f.read(min(CHUNKSIZE, remaining))
+                if not chunk:
+                    raise IOError("unexpected end of file '{}'".format(name))
+                remaining -= len(chunk)
+                yield chunk
+        finally:
+            f.close()
+        written += info.size
+        # Pad the file content to a multiple of the block size.
+        padding = -info.size % tarfile.BLOCKSIZE
+        if padding:
+            yield tarfile.NUL * padding
+            written += padding
+    # The end of the archive is marked by two empty blocks. The archive is
+    # padded to a multiple of the record size.
+    trailer = 2 * tarfile.BLOCKSIZE
+    trailer += -(written + trailer) % tarfile.RECORDSIZE
+    yield tarfile.NUL * trailer
+
+
+def archive_blocks(
+    files: List[Tuple[str, IOHandle]], format: Optional[str] = DEFAULT_FORMAT,
+    level: Optional[int] = None
+) -> Iterator[bytes]:
+    """Generate the blocks of a (compressed) tar archive for the given list of
+    files.
+
+    Parameters
+    ----------
+    files: list of (string, flowserv.volume.base.IOHandle)
+        Archive member names and handles for the archived files.
+    format: string, default='gzip'
+        Archive format identifier.
+    level: int, default=None
+        Compression level.
+
+    Returns
+    -------
+    iterator of bytes
+
+    Raises
+    ------
+    flowserv.error.InvalidArgumentError
+    """
+    # Create the compressor before the generator is returned to raise errors
+    # for invalid formats and levels when the archive is requested and not
+    # when the first block is read.
+    compress, flush = compressor(format=format, level=level)
+
+    def blocks() -> Iterator[bytes]:
+        for block in tar_blocks(files):
+            data = compress(block)
+            if data:
+                yield data
+        data = flush()
+        if data:
+            yield data
+
+    return blocks()
+
+
+# -- File handle --------------------------------------------------------------
+
+class ArchiveReader(io.RawIOBase):
+    """Read-only, non-seekable file object for the blocks that are generated
+    by an archive generator.
+    """
+    def __init__(self, blocks: Iterator[bytes]):
+        """Initialize the block generator.
+
+        Parameters
+        ----------
+        blocks: iterator of bytes
+            Generator for archive blocks.
+        """
+        self.blocks = blocks
+        self._buf = b''
+
+    def readable(self) -> bool:
+        """The archive stream is readable."""
+        return True
+
+    def readinto(self, b) -> int:
+        """Read bytes from the next archive block(s) into the given buffer.
+        Returns the number of bytes that were read. The result is zero at the
+        end of the archive.
+        """
+        while not self._buf:
+            try:
+                self._buf = next(self.blocks)
+            except StopIteration:
+                return 0
+        n = min(len(b), len(self._buf))
+        b[:n] = self._buf[:n]
+        self._buf = self._buf[n:]
+        return n
+
+
+class ArchiveFile(IOHandle):
+    """File handle for a tar archive that is generated from a list of files in
+    a storage volume. Every call to :meth:`open` returns a new stream that
+    generates the archive while it is being read.
+    """
+    def __init__(
+        self, files: List[Tuple[str, IOHandle]], format: Optional[str] = DEFAULT_FORMAT,
+        level: Optional[int] = None
+    ):
+        """Initialize the archived files and the archive format.
+
+        Parameters
+        ----------
+        files: list of (string, flowserv.volume.base.IOHandle)
+            Archive member names and handles for the archived files.
+        format: string, default='gzip'
+            Archive format identifier.
+        level: int, default=None
+            Compression level.
+
+        Raises
+        ------
+        flowserv.error.InvalidArgumentError
+        """
+        # Create a compressor to validate the format and compression level
+        # (and the availability of the optional compression package).
+        compressor(format=format, level=level)
+        self.files = files
+        self.format = format
+        self.level = level
+
+    @property
+    def mime_type(self) -> str:
+        """Get the mime type for the archive format.
+
+        Returns
+        -------
+        string
+        """
+        return FORMATS[self.format][1]
+
+    def open(self) -> IO:
+        """Get a buffered stream for the generated archive.
+
+        Returns
+        -------
+        io.BufferedReader
+        """
+        blocks = archive_blocks(files=self.files, format=self.format, level=self.level)
+        return io.BufferedReader(ArchiveReader(blocks), buffer_size=CHUNKSIZE)
+
+    def size(self) -> int:
+        """Get size of the archive in the number of bytes. The size of a
+        compressed archive is only known after the archive was generated.
+        Computing the size is therefore as expensive as generating the archive.
+
+        Returns
+        -------
+        int
+        """
+        return sum(len(b) for b in archive_blocks(self.files, self.format, self.level))
+
+    @property
+    def suffix(self) -> str:
+        """Get the file name suffix for the archive format.
+
+        Returns
+        -------
+        string
+        """
+        return FORMATS[self.format][0]
+
+
+def archive(
+    store: StorageVolume, files: List[Tuple[str, str]],
+    format: Optional[str] = DEFAULT_FORMAT, level: Optional[int] = None
+) -> ArchiveFile:
+    """Get a streaming archive for files in the given storage volume. Files are
+    given as pairs of archive member name and the key of the file in the
+    storage volume.
+
+    Parameters
+    ----------
+    store: flowserv.volume.base.StorageVolume
+        Storage volume containing the archived files.
+    files: list of (string, string)
+        Archive member names and file keys.
+    format: string, default='gzip'
+        Archive format identifier.
+    level: int, default=None
+        Compression level.
+
+    Returns
+    -------
+    flowserv.volume.archive.ArchiveFile
+    """
+    return ArchiveFile(
+        files=[(name, store.load(key)) for name, key in files],
+        format=format,
+        level=level
+    )
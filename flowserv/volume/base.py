@@ -12,6 +12,8 @@ from __future__ import annotations
 from abc import ABCMeta, abstractmethod
 from typing import Dict, IO, List, Optional, Tuple, Union
 
+import io
+
 import flowserv.util as util
 
 
@@ -36,6 +38,19 @@ class IOHandle(metaclass=ABCMeta):
         """
         raise NotImplementedError()  # pragma: no cover
 
+    def reader(self) -> IO:
+        """Get a binary file object for reading the file contents in chunks.
+
+        The default implementation returns the buffer from :meth:`open`.
+        Implementations for which the file contents can be streamed should
+        override this method to avoid loading the whole file into memory.
+
+        Returns
+        -------
+        io.RawIOBase or io.BufferedIOBase
+        """
+        return self.open()
+
     @abstractmethod
     def size(self) -> int:
         """Get size of the file in the number of bytes.
@@ -69,6 +84,18 @@ class IOBuffer(IOHandle):
         self.buf.seek(0)
         return self.buf
 
+    def reader(self) -> IO:
+        """Get a new file object for reading the buffer contents. Closing the
+        returned file object does not close the buffer.
+
+        Returns
+        -------
+        io.BytesIO or io.StringIO
+        """
+        if isinstance(self.buf, io.TextIOBase):
+            return io.StringIO(self.buf.getvalue())
+        return io.BytesIO(self.buf.getvalue())
+
     def size(self) -> int:
         """Get size of the file in the number of bytes.
 
@@ -79,6 +106,39 @@ class IOBuffer(IOHandle):
         return self.buf.getbuffer().nbytes
 
 
+class IOReader(IOHandle):
+    """Wrapper for a file handle that opens the file for streaming using the
+    :meth:`reader` of the wrapped handle.
+    """
+    def __init__(self, file: IOHandle):
+        """Initialize the wrapped file handle.
+
+        Parameters
+        ----------
+        file: flowserv.volume.base.IOHandle
+            Handle for the wrapped file.
+        """
+        self.file = file
+
+    def open(self) -> IO:
+        """Get a binary file object for reading the file contents.
+
+        Returns
+        -------
+        io.RawIOBase or io.BufferedIOBase
+        """
+        return self.file.reader()
+
+    def size(self) -> int:
+        """Get size of the file in the number of bytes.
+
+        Returns
+        -------
+        int
+        """
+        return self.file.size()
+
+
 # -- Storage volumes ----------------------------------------------------------
 
 class StorageVolume(metaclass=ABCMeta):
@@ -184,6 +244,23 @@ class StorageVolume(metaclass=ABCMeta):
         """
         raise NotImplementedError()  # pragma: no cover
 
+    def link(self, file: IOHandle, dst: str):
+        """Store a given file object at the destination path of this volume
+        store without copying the file content if possible.
+
+        The default implementation copies the file. Volumes that are able to
+        share the file content between the source and the destination (e.g.,
+        by creating a hard link) override this method.
+
+        Parameters
+        ----------
+        file: flowserv.volume.base.IOHandle
+            File-like object that is being stored.
+        dst: str
+            Destination path for the stored object.
+        """
+        self.store(file=file, dst=dst)
+
     @abstractmethod
     def load(self, key: str) -> IOHandle:
         """Load a file object at the source path of this volume store.
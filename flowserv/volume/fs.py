@@ -61,6 +61,22 @@ class FSFile(IOHandle):
         """
         return util.read_buffer(self.filename)
 
+    def reader(self) -> IO:
+        """Get a binary file object for reading the file contents.
+
+        Returns
+        -------
+        io.BufferedReader
+
+        Raises
+        ------
+        flowserv.error.UnknownFileError
+        """
+        try:
+            return open(self.filename, 'rb')
+        except FileNotFoundError:
+            raise err.UnknownFileError(self.filename)
+
     def size(self) -> int:
         """Get size of the file in the number of bytes.
 
@@ -182,6 +198,32 @@ class FileSystemStorage(StorageVolume):
         dirname = os.path.join(self.basedir, util.filepath(key=path))
         os.makedirs(dirname, exist_ok=True)
 
+    def link(self, file: IOHandle, dst: str):
+        """Create a hard link at the destination path of this volume store
+        for a given file on the local file system. The file is copied if it
+        is not a file on disk or if the link cannot be created (e.g., because
+        the file is on a different device).
+
+        Parameters
+        ----------
+        file: flowserv.volume.base.IOHandle
+            File-like object that is being stored.
+        dst: str
+            Destination path for the stored object.
+        """
+        if isinstance(file, FSFile):
+            filename = os.path.join(self.basedir, util.filepath(key=dst))
+            tmpfile = tmpname(filename)
+            try:
+                os.makedirs(os.path.dirname(filename), exist_ok=True)
+                os.link(file.filename, tmpfile)
+                os.replace(tmpfile, filename)
+                return
+            except OSError:
+                if os.path.isfile(tmpfile):
+                    os.remove(tmpfile)
+        self.store(file=file, dst=dst)
+
     def load(self, key: str) -> IOHandle:
         """Load a file object at the source path of this volume store.
 
@@ -234,10 +276,18 @@ class FileSystemStorage(StorageVolume):
         # The file key is a path expression that uses '/' as the path separator.
         # If the local OS uses a different separator we need to replace it.
         filename = os.path.join(self.basedir, util.filepath(key=dst))
-        os.makedirs(os.path.dirname(filename), exist_ok=True)
-        with open(filename, 'wb') as fout:
-            with file.open() as fin:
-                fout.write(fin.read())
+        # Write the file content to a temporary file first and then replace
+        # the destination file. Readers never see a partially written file and
+        # an existing hard link at the destination is not written through.
+        tmpfile = tmpname(filename)
+        try:
+            with open(tmpfile, 'wb') as fout:
+                with file.open() as fin:
+                    shutil.copyfileobj(fin, fout)
+            os.replace(tmpfile, filename)
+        finally:
+            if os.path.isfile(tmpfile):
+                os.remove(tmpfile)
 
     def to_dict(self) -> Dict:
         """Get dictionary serialization for the storage volume.
@@ -306,6 +356,24 @@ def FStore(basedir: str, identifier: Optional[str] = None) -> Dict:
     }
 
 
+def tmpname(filename: str) -> str:
+    """Get a unique name for a temporary file in the same directory as the
+    given file. Creates the parent directory if it does not exist.
+
+    Parameters
+    ----------
+    filename: string
+        Path to a file on the local file system.
+
+    Returns
+    -------
+    string
+    """
+    dirname, name = os.path.split(filename)
+    os.makedirs(dirname, exist_ok=True)
+    return os.path.join(dirname, '.{}.{}'.format(name, util.get_unique_identifier()))
+
+
 def walkdir(dirname: str, prefix: str, files: List[Tuple[str, IOHandle]]) -> List[Tuple[str, IOHandle]]:
     """Recursively add all files in a given source folder to a file upload list.
     The elements in the list are tuples of file object and relative target
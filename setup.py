@@ -32,8 +32,10 @@ aws_requires = ['boto3']
 docker_requires = ['docker']
 gc_requires = ['google-cloud-storage']
 gui_requires = ['streamlit']
+ijson_requires = ['ijson']
 notebooks_requires = ['jupyter', 'papermill']
 postgres_requires = ['psycopg2-binary']
+zstd_requires = ['zstandard']
 
 
 tests_require = [
@@ -59,8 +61,10 @@ extras_require = {
     'gc': gc_requires,
     'notebooks': notebooks_requires,
     'postgres': postgres_requires,
+    'zstd': zstd_requires,
     'gui': gui_requires,
-    'full': aws_requires + docker_requires + gc_requires + notebooks_requires + postgres_requires + gui_requires
+    'ijson': ijson_requires,
+    'full': aws_requires + docker_requires + gc_requires + notebooks_requires + postgres_requires + gui_requires + ijson_requires + zstd_requires
 }
 
 
@@ -142,3 +142,24 @@ def test_run_helloworld_with_postproc(tmpdir):
     # Access the data object again to receive the buffered data
     doc = postproc.get_file('results/compare.json').json()
     assert doc == [{'avg_count': 12.0, 'total_count': 36, 'max_len': 14, 'max_line': 'Hello Yolanda!'}]
+
+
+def test_run_helloworld_sweep(tmpdir):
+    """Run the hello world workflow for multiple sets of arguments."""
+    basedir = os.path.join(tmpdir, 'flowserv')
+    db = Flowserv(basedir=basedir, open_access=True, clear=True)
+    app_id = db.install(
+        source=BENCHMARK_DIR,
+        specfile=BENCHMARK_FILE,
+        ignore_postproc=True
+    )
+    wf = db.open(app_id)
+    greetings = ['Hi', 'Hello', 'Hey']
+    runs = wf.start_runs([
+        {'names': StringIO('Alice\nBob'), 'greeting': g, 'sleeptime': 0}
+        for g in greetings
+    ])
+    assert len(runs) == 3
+    for greeting, run in zip(greetings, runs):
+        assert run.is_success()
+        assert '{} Alice'.format(greeting) in run.get_file('greetings').text()
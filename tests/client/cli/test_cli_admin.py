@@ -67,6 +67,13 @@ def test_init_db(flowserv_cli):
     assert result.exit_code == 0
 
 
+def test_upgrade_db(flowserv_cli):
+    """Test upgrading the database schema."""
+    result = flowserv_cli.invoke(cli, ['upgrade'])
+    assert result.exit_code == 0
+    assert 'Database schema is at version' in result.output
+
+
 def test_init_without_force(flowserv_cli):
     """Test init without force option. Will terminate after printing confirm
     message.
@@ -29,6 +29,8 @@ class MockClient:
     def __init__(self):
         self._logs = None
         self._result = None
+        self.id = '0000'
+        self.labels = dict()
 
     def build(self, path, tag, nocache):
         return FakeImage(tag=tag), list()
@@ -44,14 +46,20 @@ class MockClient:
     def images(self):
         return self
 
+    def list(self, all, filters):
+        """Mock listing of containers with a given label."""
+        key, value = filters['label'].split('=')
+        return [self] if self.labels.get(key) == value else []
+
     def logs(self):
         return self._logs
 
-    def remove(self):
+    def remove(self, force=False):
         pass
 
-    def run(self, image, command, volumes, remove, environment, detach):
+    def run(self, image, command, volumes, remove, environment, labels, detach):
         """Mock run for docker container."""
+        self.labels = labels
         if command == 'error':
             raise docker.errors.ContainerError(
                 exit_status=1,
@@ -82,7 +90,9 @@ class MockClient:
 def mock_docker(monkeypatch):
     """Raise error in subprocess.run()."""
 
+    client = MockClient()
+
     def mock_client(*args, **kwargs):
-        return MockClient()
+        return client
 
     monkeypatch.setattr(docker, "from_env", mock_client)
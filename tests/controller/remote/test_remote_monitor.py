@@ -8,12 +8,97 @@
 
 """Unit test for the remote workflow monitor."""
 
-from flowserv.controller.remote.monitor import monitor_workflow
-from flowserv.controller.remote.client import RemoteWorkflowHandle
+import time
+
+from flowserv.controller.remote.monitor import WorkflowPoller, monitor_workflow
+from flowserv.controller.remote.client import PollingPolicy, RemoteWorkflowHandle
 from flowserv.model.workflow.state import StatePending
 from flowserv.tests.remote import RemoteTestClient
 from flowserv.volume.fs import FileSystemStorage
 
+import flowserv.model.workflow.state as st
+
+
+class BatchTestClient(RemoteTestClient):
+    """Remote client that simulates the execution of multiple workflows. Each
+    workflow is running for the given number of status requests before it
+    finishes successfully. Records the size of all batched status requests.
+    """
+    def __init__(self, runcount=2, fail=None):
+        super(BatchTestClient, self).__init__(runcount=runcount)
+        self.fail = fail
+        self.batches = list()
+        self.pollcounts = dict()
+
+    def get_workflow_states(self, workflows):
+        self.batches.append(len(workflows))
+        return super(BatchTestClient, self).get_workflow_states(workflows)
+
+    def get_workflow_state(self, workflow_id, current_state):
+        if workflow_id == self.fail:
+            raise ValueError('unknown workflow')
+        count = self.pollcounts.get(workflow_id, 0)
+        self.pollcounts[workflow_id] = count + 1
+        if count == 0:
+            return current_state.start()
+        elif count > self.runcount:
+            return current_state.success()
+        return current_state
+
+
+class DummyService(object):
+    """Service API factory that records run state updates."""
+    def __init__(self):
+        self.updates = list()
+
+    def update_run(self, run_id, state, runstore=None):
+        self.updates.append((run_id, state.type_id))
+
+
+def test_polling_policy():
+    """Test computing polling intervals with backoff and jitter."""
+    policy = PollingPolicy(interval=1)
+    assert policy.next(interval=1, changed=False) == 1
+    assert policy.delay(1) == 1
+    policy = PollingPolicy(interval=1, max_interval=5, backoff=2, jitter=0.1)
+    assert policy.next(interval=1, changed=False) == 2
+    assert policy.next(interval=4, changed=False) == 5
+    assert policy.next(interval=5, changed=True) == 1
+    for _ in range(100):
+        assert 4.5 <= policy.delay(5) <= 5.5
+
+
+def test_remote_poller_backoff(tmpdir):
+    """Test the polling schedule for workflows with unchanged state."""
+    client = BatchTestClient(runcount=100)
+    policy = PollingPolicy(interval=1, max_interval=4, backoff=2)
+    poller = WorkflowPoller(client=client, policy=policy, service=DummyService(), tasks=dict())
+    # Set the monitored workflow explicitly (without starting the worker).
+    poller._workflows['R0'] = RemoteWorkflowHandle(
+        run_id='R0',
+        workflow_id='W0',
+        state=StatePending(),
+        output_files=list(),
+        runstore=FileSystemStorage(basedir=tmpdir),
+        client=client
+    )
+    poller._schedule['R0'] = (1, 1)
+    assert poller.poll(now=0.5) == 1
+    assert client.batches == []
+    # The first poll changes the state to running. The interval remains at
+    # the initial value.
+    poller.poll(now=1)
+    assert poller._schedule['R0'] == (1, 2)
+    # The interval increases while the state is unchanged.
+    poller.poll(now=2)
+    assert poller._schedule['R0'] == (2, 4)
+    poller.poll(now=4)
+    assert poller._schedule['R0'] == (4, 8)
+    poller.poll(now=8)
+    assert poller._schedule['R0'] == (4, 12)
+    assert poller.wakeup() == 12
+    assert client.batches == [1, 1, 1, 1]
+
 
 def test_remote_run_error(tmpdir):
     """Test monitoring an erroneous workflow run."""
@@ -44,3 +129,124 @@ def test_remote_run_success(tmpdir):
     )
     state = monitor_workflow(workflow=workflow, poll_interval=0.1)
     assert state.is_success()
+
+
+def test_remote_poller_batches(tmpdir):
+    """Test polling the state of multiple workflows with a single poller."""
+    client = BatchTestClient(fail='W3')
+    service = DummyService()
+    tasks = dict()
+    poller = WorkflowPoller(
+        client=client,
+        policy=PollingPolicy(interval=0.01),
+        service=service,
+        tasks=tasks,
+        batch_size=4,
+        max_workers=2
+    )
+    for i in range(10):
+        tasks['R{}'.format(i)] = 'W{}'.format(i)
+        poller.add(RemoteWorkflowHandle(
+            run_id='R{}'.format(i),
+            workflow_id='W{}'.format(i),
+            state=StatePending(),
+            output_files=['a.txt'],
+            runstore=FileSystemStorage(basedir=tmpdir),
+            client=client
+        ))
+    watch_dog = 500
+    while poller.size() and watch_dog:
+        time.sleep(0.01)
+        watch_dog -= 1
+    assert poller.size() == 0
+    assert tasks == dict()
+    assert max(client.batches) == 4
+    # The failed workflow is in error state. All other workflows are running
+    # first and then successful.
+    assert ('R3', st.STATE_ERROR) in service.updates
+    for i in [0, 1, 2, 4, 5, 6, 7, 8, 9]:
+        run_id = 'R{}'.format(i)
+        updates = [s for r, s in service.updates if r == run_id]
+        assert updates == [st.STATE_RUNNING, st.STATE_SUCCESS]
+
+
+def test_remote_poller_batch_failure(tmpdir):
+    """Test polling workflows individually if the batched status request
+    fails. Workflows are set to error state only after repeated failures.
+    """
+    class FailingBatchClient(BatchTestClient):
+        def __init__(self):
+            super(FailingBatchClient, self).__init__(runcount=100)
+            self.errors = {'W0': 2, 'W1': 3}
+
+        def get_workflow_states(self, workflows):
+            raise ConnectionError('service unavailable')
+
+        def get_workflow_state(self, workflow_id, current_state):
+            if self.errors.get(workflow_id, 0) > 0:
+                self.errors[workflow_id] -= 1
+                raise ConnectionError('service unavailable')
+            return super(FailingBatchClient, self).get_workflow_state(workflow_id, current_state)
+
+    client = FailingBatchClient()
+    service = DummyService()
+    policy = PollingPolicy(interval=1, max_interval=4, backoff=2)
+    poller = WorkflowPoller(client=client, policy=policy, service=service, tasks=dict())
+    for i in range(2):
+        run_id = 'R{}'.format(i)
+        poller._workflows[run_id] = RemoteWorkflowHandle(
+            run_id=run_id,
+            workflow_id='W{}'.format(i),
+            state=StatePending(),
+            output_files=list(),
+            runstore=FileSystemStorage(basedir=tmpdir),
+            client=client
+        )
+        poller._schedule[run_id] = (1, 1)
+    # Failed polls keep the current state and increase the polling interval.
+    assert poller.poll(now=1) == 2
+    assert poller._schedule['R0'] == (2, 3)
+    assert poller.poll(now=3) == 2
+    assert service.updates == []
+    # The third poll succeeds for the first workflow. The second workflow is
+    # set to error state.
+    assert poller.poll(now=7) == 1
+    assert service.updates == [('R0', st.STATE_RUNNING), ('R1', st.STATE_ERROR)]
+    assert poller._failures == dict()
+
+
+def test_remote_poller_transient_error(tmpdir):
+    """Test that a single failed status request in the default batch
+    implementation does not set the workflow to error state.
+    """
+    class TransientErrorClient(BatchTestClient):
+        def __init__(self):
+            super(TransientErrorClient, self).__init__(runcount=100)
+            self.errors = 1
+
+        def get_workflow_state(self, workflow_id, current_state):
+            if self.errors > 0:
+                self.errors -= 1
+                raise ConnectionError('service unavailable')
+            return super(TransientErrorClient, self).get_workflow_state(workflow_id, current_state)
+
+    client = TransientErrorClient()
+    assert client.get_workflow_states({'W0': StatePending()}) == dict()
+    service = DummyService()
+    poller = WorkflowPoller(client=client, policy=PollingPolicy(interval=1), service=service, tasks=dict())
+    poller._workflows['R0'] = RemoteWorkflowHandle(
+        run_id='R0',
+        workflow_id='W0',
+        state=StatePending(),
+        output_files=list(),
+        runstore=FileSystemStorage(basedir=tmpdir),
+        client=client
+    )
+    poller._schedule['R0'] = (1, 1)
+    client.errors = 1
+    assert poller.poll(now=1) == 1
+    assert service.updates == []
+    assert poller._failures == {'R0': 1}
+    assert poller.poll(now=3) == 1
+    assert service.updates == [('R0', st.STATE_RUNNING)]
+    assert poller._failures == dict()
@@ -0,0 +1,120 @@
+# This file is part of the Reproducible and Reusable Data Analysis Workflow
+# Server (flowServ).
+#
+# Copyright (C) 2019-2021 NYU.
+#
+# flowServ is free software; you can redistribute it and/or modify it under the
+# terms of the MIT License; see LICENSE file for more details.
+
+"""Unit tests for push notifications of remote workflow state changes."""
+
+from urllib.error import HTTPError
+from urllib.request import Request, urlopen
+
+import json
+import pytest
+
+from flowserv.controller.remote.client import PollingPolicy, RemoteWorkflowHandle
+from flowserv.controller.remote.engine import FALLBACK_INTERVAL, RemoteWorkflowController
+from flowserv.controller.remote.monitor import WorkflowPoller
+from flowserv.controller.remote.notify import HEADER_TOKEN, NotificationServer, message
+from flowserv.model.workflow.state import StatePending
+from flowserv.tests.remote import RemoteTestClient
+from flowserv.volume.fs import FileSystemStorage
+
+import flowserv.model.workflow.state as st
+
+
+class PushTestClient(RemoteTestClient):
+    """Remote client that supports push notifications."""
+    def subscribe(self, callback):
+        self.callback = callback
+        return True
+
+
+class DummyService(object):
+    """Service API factory that records run state updates."""
+    def __init__(self):
+        self.updates = list()
+
+    def update_run(self, run_id, state, runstore=None):
+        self.updates.append((run_id, state.type_id))
+
+
+def post(url, doc, token=None):
+    """Send a notification to the given URL. Returns the response status."""
+    headers = {HEADER_TOKEN: token} if token is not None else dict()
+    request = Request(url, data=json.dumps(doc).encode('utf-8'), headers=headers, method='POST')
+    try:
+        with urlopen(request) as response:
+            return response.status
+    except HTTPError as ex:
+        return ex.code
+
+
+def test_push_notifications(tmpdir):
+    """Test receiving pushed state changes via the HTTP endpoint."""
+    client = PushTestClient()
+    service = DummyService()
+    poller = WorkflowPoller(
+        client=client,
+        policy=PollingPolicy(interval=100),
+        service=service,
+        tasks={'R0': 'W0'}
+    )
+    # Set the monitored workflow explicitly (without starting the worker).
+    state = StatePending()
+    poller._workflows['R0'] = RemoteWorkflowHandle(
+        run_id='R0',
+        workflow_id='W0',
+        state=state,
+        output_files=['a.txt'],
+        runstore=FileSystemStorage(basedir=tmpdir),
+        client=client
+    )
+    poller._index['W0'] = 'R0'
+    poller._schedule['R0'] = (100, 100)
+    server = NotificationServer(callback=poller.notify, token='secret').start()
+    try:
+        state = state.start()
+        # Requests without a valid token are rejected.
+        assert post(server.url, message('W0', state)) == 401
+        assert post(server.url, message('W0', state), token='guess') == 403
+        assert service.updates == []
+        assert post(server.url, message('W0', state), token='secret') == 204
+        assert post(server.url, message('W0', state), token='secret') == 204
+        assert post(server.url, message('W1', state), token='secret') == 404
+        assert post(server.url, {'workflowId': 'W0'}, token='secret') == 400
+        assert post(server.url, message('W0', state.success()), token='secret') == 204
+    finally:
+        server.stop()
+    assert service.updates == [('R0', st.STATE_RUNNING), ('R0', st.STATE_SUCCESS)]
+    assert poller.size() == 0
+    assert poller.wakeup() is None
+    assert not poller.notify('W0', state.success())
+
+
+@pytest.mark.parametrize(
+    'client,push,max_interval',
+    [(RemoteTestClient(), False, 1), (PushTestClient(), True, FALLBACK_INTERVAL)]
+)
+def test_push_fallback_polling(client, push, max_interval):
+    """Test the polling policy for clients with and without push support."""
+    engine = RemoteWorkflowController(client=client, poll_interval=1, is_async=True)
+    assert engine.push == push
+    assert engine.poller.policy.interval == 1
+    assert engine.polling_policy().next(interval=max_interval, changed=False) == max_interval
+    if push:
+        assert client.callback == engine.notify
+
+
+def test_notification_server_token():
+    """Test generating a random shared secret for the notification server."""
+    server_1 = NotificationServer(callback=lambda w, s: True)
+    server_2 = NotificationServer(callback=lambda w, s: True)
+    try:
+        assert server_1.token and server_2.token
+        assert server_1.token != server_2.token
+    finally:
+        server_1.stop()
+        server_2.stop()
@@ -28,6 +28,24 @@ DIR = os.path.dirname(os.path.realpath(__file__))
 BENCHMARK_DIR = os.path.join(DIR, '..', '..', '..', '.files', 'benchmark', 'helloworld')
 
 
+def run_processes(run_id):
+    """Get identifier of all live processes that have their working directory
+    in the folder of the given run. Only supported on systems that provide the
+    proc file system.
+    """
+    pids = list()
+    for pid in os.listdir('/proc'):
+        try:
+            cwd = os.readlink(os.path.join('/proc', pid, 'cwd'))
+            with open(os.path.join('/proc', pid, 'stat')) as f:
+                state = f.read().rsplit(')', 1)[1].split()[0]
+        except (OSError, IndexError):
+            continue
+        if run_id in cwd and state != 'Z':
+            pids.append(pid)
+    return pids
+
+
 def test_cancel_run_helloworld(async_service):
     """Test cancelling a helloworld run."""
     # -- Setup ----------------------------------------------------------------
@@ -51,6 +69,9 @@ def test_cancel_run_helloworld(async_service):
     with async_service(user_id=user_id) as api:
         run = api.runs().get_run(run_id=run_id)
     assert run['state'] in st.ACTIVE_STATES
+    has_proc = os.path.isdir('/proc')
+    if has_proc:
+        assert run_processes(run_id)
     # -- Cancel the active run ------------------------------------------------
     with async_service(user_id=user_id) as api:
         run = api.runs().cancel_run(
@@ -59,6 +80,15 @@ def test_cancel_run_helloworld(async_service):
         )
         assert run['state'] == st.STATE_CANCELED
         assert run['messages'][0] == 'done'
+        engine = api.engine
+    # The sub-processes of the workflow steps were terminated and the run
+    # folder was removed.
+    if has_proc:
+        assert not run_processes(run_id)
+    assert not os.path.exists(os.path.join(engine.fs.basedir, engine.runsdir, run_id))
+    stats = engine.cancel_stats()
+    assert stats['canceled'] == 1
+    assert 0 < stats['latency'] <= stats['maxLatency']
     with async_service(user_id=user_id) as api:
         run = api.runs().get_run(run_id=run_id)
         assert run['state'] == st.STATE_CANCELED
@@ -16,12 +16,14 @@ import time
 from flowserv.config import Config
 from flowserv.model.files import io_file
 from flowserv.service.local import LocalAPIFactory
+from flowserv.service.postproc.base import POOL_DIR
 from flowserv.service.run.argument import serialize_arg, serialize_fh
 from flowserv.tests.service import (
     create_group, create_user, create_workflow, start_run, upload_file
 )
 from flowserv.volume.manager import FStore
 
+import flowserv.model.files as dirs
 import flowserv.util as util
 import flowserv.model.workflow.state as st
 import flowserv.tests.serialize as serialize
@@ -131,6 +133,10 @@ def test_postproc_workflow(tmpdir):
             )
         compare = util.read_object(fh.open())
         assert len(compare) == (i + 1)
+        # The input files are staged in a folder for the post-processing run.
+        # Folders of previous post-processing runs are removed.
+        stagingdir = os.path.join(tmpdir, dirs.workflow_postprocdir(workflow_id))
+        assert sorted(os.listdir(stagingdir)) == sorted([POOL_DIR, prev_postproc])
     # Access the post-processing result files.
     with service() as api:
         fh = api.workflows().get_result_archive(workflow_id=workflow_id)
@@ -0,0 +1,48 @@
+# This file is part of the Reproducible and Reusable Data Analysis Workflow
+# Server (flowServ).
+#
+# Copyright (C) 2019-2021 NYU.
+#
+# flowServ is free software; you can redistribute it and/or modify it under the
+# terms of the MIT License; see LICENSE file for more details.
+
+"""Unit tests for the cancellation of processes and containers of a workflow
+run.
+"""
+
+import os
+import pytest
+import subprocess
+
+from flowserv.controller.worker.cancel import LABEL_RUN, kill_process_group, run_labels, stop_containers
+from flowserv.controller.worker.docker import DockerWorker
+from flowserv.model.workflow.step import ContainerStep
+
+import flowserv.controller.worker.cancel as cancel
+
+
+# Test files directory
+DIR = os.path.dirname(os.path.realpath(__file__))
+RUN_DIR = os.path.join(DIR, '../../.files')
+
+
+@pytest.mark.skipif(not hasattr(os, 'killpg'), reason='process groups not supported')
+def test_kill_process_group():
+    """Test terminating all processes in a process group."""
+    proc = subprocess.Popen('sleep 30 & sleep 30', shell=True, start_new_session=True)
+    assert kill_process_group(proc.pid)
+    assert proc.wait(timeout=5) != 0
+    assert not kill_process_group(proc.pid)
+    assert not kill_process_group(0)
+
+
+def test_stop_run_containers(mock_docker, monkeypatch):
+    """Test labeling and stopping the containers of a workflow run."""
+    assert run_labels() == dict()
+    monkeypatch.setattr(cancel, '_run_id', 'R1')
+    assert run_labels() == {LABEL_RUN: 'R1'}
+    env = {'TEST_ENV_1': ('Hello', 0)}
+    step = ContainerStep(identifier='test', image='test', commands=['TEST_ENV_1'])
+    DockerWorker().run(step=step, env=env, rundir=RUN_DIR)
+    assert stop_containers('R0') == 0
+    assert stop_containers('R1') == 1
@@ -10,7 +10,7 @@
 
 import pytest
 
-from flowserv.model.group import WorkflowGroupManager
+from flowserv.model.group import WorkflowGroupManager, group_cursor
 from flowserv.model.template.parameter import ParameterIndex
 from flowserv.volume.fs import FileSystemStorage
 
@@ -177,12 +177,14 @@ def test_list_groups(database, tmpdir):
         assert len(manager.list_groups(workflow_1)) == 2
         assert len(manager.list_groups(workflow_2)) == 1
     # -- Test list groups for users -------------------------------------------
+    #
+    # Groups are sorted by their name.
     with database.session() as session:
         manager = WorkflowGroupManager(session=session, fs=fs)
         # User 1 is member of group 1 and 3.
         groups = manager.list_groups(user_id=user_1)
         assert len(groups) == 2
-        assert [g.name for g in groups] == [group_1, group_3]
+        assert [g.name for g in groups] == sorted([group_1, group_3])
         # User 2 is member of group 2.
         groups = manager.list_groups(user_id=user_2)
         assert len(groups) == 1
@@ -190,7 +192,18 @@ def test_list_groups(database, tmpdir):
         # User 3 is member of group 2 and 3.
         groups = manager.list_groups(user_id=user_3)
         assert len(groups) == 2
-        assert [g.name for g in groups] == [group_2, group_3]
+        assert [g.name for g in groups] == sorted([group_2, group_3])
+    # -- Test keyset pagination -----------------------------------------------
+    with database.session() as session:
+        manager = WorkflowGroupManager(session=session, fs=fs)
+        page_1 = manager.list_groups(limit=2)
+        page_2 = manager.list_groups(limit=2, after=group_cursor(page_1[-1]))
+        assert len(page_1) == 2
+        assert len(page_2) == 1
+        names = [g.name for g in page_1 + page_2]
+        assert names == sorted([group_1, group_2, group_3])
+        groups = manager.iter_groups(user_id=user_3, batch_size=1)
+        assert [g.name for g in groups] == sorted([group_2, group_3])
 
 
 def test_update_groups(database, tmpdir):
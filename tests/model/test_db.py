@@ -8,12 +8,13 @@
 
 """Unit tests for the database manager."""
 
+import datetime as dt
 import os
 import pytest
 
 from sqlalchemy.exc import IntegrityError
 
-from flowserv.model.base import User
+from flowserv.model.base import APIKey, User
 from flowserv.model.database import DB, TEST_DB, TEST_URL
 
 
@@ -64,3 +65,45 @@ def test_session_scope():
     # Query all users. Still expects two object in the resulting list.
     with db.session() as session:
         assert len(session.query(User).all()) == 2
+
+
+def test_db_upgrade(tmpdir):
+    """Test upgrading the schema of an existing database without losing data."""
+    from sqlalchemy import inspect, text
+    import flowserv.model.migration as migration
+    db = DB(connect_url=TEST_DB(tmpdir)).init()
+    assert db.version() == migration.latest_version()
+    with db.session() as session:
+        session.add(User(user_id='U', name='U', secret='U', active=True))
+    # Simulate a database that was created before schema versioning was
+    # introduced.
+    with db._engine.begin() as conn:
+        conn.execute(text('DROP INDEX ix_workflow_run_group_id'))
+        conn.execute(text('DROP TABLE schema_version'))
+        sql = "INSERT INTO api_key(user_id, value, expires) VALUES('U', 'K', '{}')"
+        conn.execute(text(sql.format('2021-01-01T10:00:00.123456')))
+    assert db.version() == 0
+    applied = db.upgrade()
+    assert [m.version for m in applied] == [m.version for m in migration.MIGRATIONS]
+    assert db.version() == migration.latest_version()
+    indexes = [ix['name'] for ix in inspect(db._engine).get_indexes('workflow_run')]
+    assert 'ix_workflow_run_group_id' in indexes
+    with db.session() as session:
+        assert len(session.query(User).all()) == 2
+        key = session.query(APIKey).one()
+        assert key.expires == dt.datetime(2021, 1, 1, 10, 0, 0, 123456)
+    # Upgrading an up-to-date database does not apply any migrations.
+    assert db.upgrade() == []
+
+
+def test_migration_helpers(tmpdir):
+    """Test idempotent helper functions for schema migrations."""
+    from sqlalchemy import Column, Integer, inspect
+    from flowserv.model.migration import add_column, create_index
+    db = DB(connect_url=TEST_DB(tmpdir)).init()
+    for _ in range(2):
+        add_column(db._engine, 'workflow_run', Column('priority', Integer))
+        create_index(db._engine, 'workflow_run', 'ix_run_priority', ['priority'])
+    inspector = inspect(db._engine)
+    assert 'priority' in [c['name'] for c in inspector.get_columns('workflow_run')]
+    assert 'ix_run_priority' in [ix['name'] for ix in inspector.get_indexes('workflow_run')]
@@ -27,3 +27,5 @@ def test_file_path_structure():
     assert 'G01' in groupdir
     assert 'WF01' in files.workflow_staticdir('WF01')
     assert files.workflow_staticdir('WF01') != files.workflow_basedir('WF01')
+    assert files.workflow_postprocdir('WF01').startswith(files.workflow_basedir('WF01'))
+    assert files.workflow_postprocdir('WF01') != files.workflow_staticdir('WF01')
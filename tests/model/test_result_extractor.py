@@ -0,0 +1,117 @@
+# This file is part of the Reproducible and Reusable Data Analysis Workflow
+# Server (flowServ).
+#
+# Copyright (C) 2019-2021 NYU.
+#
+# flowServ is free software; you can redistribute it and/or modify it under the
+# terms of the MIT License; see LICENSE file for more details.
+
+"""Unit tests for extracting result values from run result files."""
+
+from io import BytesIO
+
+import json
+import pytest
+import yaml
+
+from flowserv.model.parameter.numeric import PARA_FLOAT, PARA_INT
+from flowserv.model.parameter.string import PARA_STRING
+from flowserv.model.result import extractor, result_format
+from flowserv.model.template.schema import ResultColumn, ResultSchema
+
+import flowserv.util as util
+
+
+SCHEMA = ResultSchema(
+    result_file='results.json',
+    columns=[
+        ResultColumn('count', 'Total Count', PARA_INT),
+        ResultColumn('min', 'min', PARA_INT, path='values/min'),
+        ResultColumn('max', 'max', PARA_INT, path='values/max'),
+        ResultColumn('values', 'values', PARA_STRING, path='values'),
+        ResultColumn('avg', 'avg', PARA_FLOAT, path='stats/avg/value')
+    ]
+)
+
+
+DOCS = [
+    {'count': 1, 'values': {'min': 0, 'max': 10}, 'stats': {'avg': {'value': 1.5}}},
+    {'stats': {'avg': {'value': None}, 'other': [1, {'value': 2}]}, 'count': 2},
+    {'skip': {'values': {'min': 1}}, 'values': [1, 2], 'count': [{'a': 1}]},
+    {'values': {'max': 5, 'min': {'a': [1, {'b': 2}]}}, 'stats': {'avg': 1}},
+    {'stats': 1},
+    {}
+]
+
+
+def events(doc):
+    """Generate JSON parser events for a document in the same format as the
+    basic_parse function of ijson.
+    """
+    if isinstance(doc, dict):
+        yield 'start_map', None
+        for key, value in doc.items():
+            yield 'map_key', key
+            yield from events(value)
+        yield 'end_map', None
+    elif isinstance(doc, list):
+        yield 'start_array', None
+        for value in doc:
+            yield from events(value)
+        yield 'end_array', None
+    elif doc is None:
+        yield 'null', None
+    elif isinstance(doc, bool):
+        yield 'boolean', doc
+    elif isinstance(doc, str):
+        yield 'string', doc
+    else:
+        yield 'number', doc
+
+
+def jquery(doc):
+    """Extract column values with the generic Json query function."""
+    values = dict()
+    for col in SCHEMA.columns:
+        val = util.jquery(doc=doc, path=col.jpath())
+        if val is not None:
+            values[col.column_id] = val
+    return values
+
+
+@pytest.mark.parametrize('doc', DOCS)
+def test_extract_result_values(doc):
+    """Test extracting column values from parsed documents and from streams
+    of parser events.
+    """
+    values = extractor(SCHEMA).extract(doc)
+    assert values == jquery(doc)
+    assert extractor(SCHEMA).stream(events(doc)) == values
+
+
+def test_extract_stops_early():
+    """Test that reading a stream of parser events stops once values for all
+    columns were found.
+    """
+    schema = ResultSchema(
+        result_file='results.json',
+        columns=[ResultColumn('count', 'Total Count', PARA_INT)]
+    )
+    stream = events({'count': 1, 'other': list(range(10))})
+    assert extractor(schema).stream(stream) == {'count': 1}
+    assert next(stream) == ('map_key', 'other')
+
+
+def test_extractor_cache():
+    """Test that extractors are compiled once per list of columns."""
+    schema = ResultSchema(result_file='results.json', columns=list(SCHEMA.columns))
+    assert extractor(schema) is extractor(SCHEMA)
+
+
+def test_read_result_file():
+    """Test reading result values from JSON and YAML files."""
+    doc = DOCS[0]
+    buf = BytesIO(json.dumps(doc).encode('utf-8'))
+    assert extractor(SCHEMA).read(buf, format=result_format('results.json')) == jquery(doc)
+    buf = BytesIO(yaml.dump(doc).encode('utf-8'))
+    assert extractor(SCHEMA).read(buf, format=result_format('results.YAML')) == jquery(doc)
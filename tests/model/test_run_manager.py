@@ -13,13 +13,17 @@ import os
 import pytest
 import time
 
+from flowserv.model.base import RunFile, RunMessage, PRIORITY_HIGH, PRIORITY_LOW, PRIORITY_NORMAL
+from flowserv.model.database import DB, TEST_DB
+from flowserv.model.files import io_file
 from flowserv.model.group import WorkflowGroupManager
-from flowserv.model.run import RunManager
+from flowserv.model.run import RunManager, run_cursor
 from flowserv.model.workflow.manager import WorkflowManager
 from flowserv.tests.model import success_run
 from flowserv.volume.fs import FileSystemStorage
 
 import flowserv.error as err
+import flowserv.model.files as dirs
 import flowserv.util as util
 import flowserv.model.workflow.state as st
 import flowserv.tests.model as model
@@ -203,6 +207,20 @@ def test_list_runs(database, tmpdir):
         assert len(runs.list_runs(group_id)) == 2
         assert len(runs.list_runs(group_id, state=st.STATE_ERROR)) == 1
         assert len(runs.list_runs(group_id, state=st.STATE_SUCCESS)) == 0
+    # -- Test keyset pagination -----------------------------------------------
+    with database.session() as session:
+        runs = RunManager(session=session, fs=fs)
+        page_1 = runs.list_runs(group_id, limit=1)
+        assert len(page_1) == 1
+        page_2 = runs.list_runs(group_id, limit=1, after=run_cursor(page_1[0]))
+        assert len(page_2) == 1
+        assert runs.list_runs(group_id, after=run_cursor(page_2[0])) == []
+        assert {page_1[0].run_id, page_2[0].run_id} == {run_1, run_2}
+        # Iterate over all runs in batches of one.
+        run_ids = [run.run_id for run in runs.iter_runs(group_id, batch_size=1)]
+        assert run_ids == [page_1[0].run_id, page_2[0].run_id]
+        with pytest.raises(err.InvalidArgumentError):
+            runs.list_runs(group_id, after='abc')
 
 
 def test_obsolete_runs(database, tmpdir):
@@ -235,6 +253,60 @@ def test_obsolete_runs(database, tmpdir):
         runs.get_run(run_id=run_3)
 
 
+def test_obsolete_runs_in_batches(database, tmpdir):
+    """Test deleting obsolete runs in multiple batches."""
+    # -- Setup ----------------------------------------------------------------
+    fs = FileSystemStorage(basedir=tmpdir)
+    runs = [success_run(database, fs, tmpdir)[::2] for _ in range(3)]
+    runs.append(error_run(database, fs, ['There were errors'])[::2])
+    run_ids = [run_id for _, run_id in runs]
+    time.sleep(1)
+    t1 = util.utc_now()
+    _, _, run_5, _ = success_run(database, fs, tmpdir)
+    # -- Test delete runs in batches of two -----------------------------------
+    progress = list()
+    with database.session() as session:
+        count = RunManager(session=session, fs=fs).delete_obsolete_runs(
+            date=t1,
+            batch_size=2,
+            callback=lambda count, total: progress.append((count, total))
+        )
+        assert count == 4
+    assert progress == [(2, 4), (4, 4)]
+    with database.session() as session:
+        manager = RunManager(session=session, fs=fs)
+        for run_id in run_ids:
+            with pytest.raises(err.UnknownRunError):
+                manager.get_run(run_id=run_id)
+        assert len(manager.get_run(run_id=run_5).files) > 0
+        # Run files and messages of deleted runs are removed as well.
+        assert session.query(RunFile).filter(RunFile.run_id.in_(run_ids)).count() == 0
+        assert session.query(RunMessage).filter(RunMessage.run_id.in_(run_ids)).count() == 0
+    for workflow_id, run_id in runs:
+        assert not os.path.exists(os.path.join(tmpdir, dirs.run_basedir(workflow_id, run_id)))
+
+
+def test_obsolete_runs_delete_error(database, tmpdir, caplog, monkeypatch):
+    """Test that errors when removing run folders are logged."""
+    # -- Setup ----------------------------------------------------------------
+    fs = FileSystemStorage(basedir=tmpdir)
+    _, _, run_id, _ = success_run(database, fs, tmpdir)
+    time.sleep(1)
+    t1 = util.utc_now()
+
+    def delete(key):
+        raise OSError('cannot delete')
+
+    monkeypatch.setattr(fs, 'delete', delete)
+    # -- Test delete run ------------------------------------------------------
+    with database.session() as session:
+        assert RunManager(session=session, fs=fs).delete_obsolete_runs(date=t1) == 1
+    assert 'cannot delete run folder' in caplog.text
+    with database.session() as session:
+        with pytest.raises(err.UnknownRunError):
+            RunManager(session=session, fs=fs).get_run(run_id=run_id)
+
+
 def test_run_parameters(database, tmpdir):
     """Test creating run with template arguments."""
     # -- Setup ----------------------------------------------------------------
@@ -262,6 +334,36 @@ def test_run_parameters(database, tmpdir):
         assert run.arguments == arguments
 
 
+def test_run_priority(database, tmpdir):
+    """Test the priority for group runs and post-processing runs."""
+    # -- Setup ----------------------------------------------------------------
+    fs = FileSystemStorage(basedir=tmpdir)
+    with database.session() as session:
+        user_id = model.create_user(session, active=True)
+        workflow_id = model.create_workflow(session)
+        group_id = model.create_group(session, workflow_id, users=[user_id])
+    # -- Test default priorities ----------------------------------------------
+    with database.session() as session:
+        groups = WorkflowGroupManager(session=session, fs=fs)
+        runs = RunManager(session=session, fs=fs)
+        group = groups.get_group(group_id)
+        assert runs.create_run(group=group).priority == PRIORITY_NORMAL
+        assert runs.create_run(workflow=group.workflow, runs=[]).priority == PRIORITY_HIGH
+    # -- Test priority from the engine configuration --------------------------
+    with database.session() as session:
+        groups = WorkflowGroupManager(session=session, fs=fs)
+        runs = RunManager(session=session, fs=fs)
+        group = groups.get_group(group_id)
+        group.workflow.engine_config = {'priority': PRIORITY_LOW}
+        assert runs.create_run(group=group).priority == PRIORITY_LOW
+        group.engine_config = {'priority': PRIORITY_NORMAL}
+        assert [r.priority for r in runs.create_runs(group=group, arguments=[[], []])] == [0, 0]
+        # Invalid values and priorities above normal are ignored.
+        for priority in [PRIORITY_HIGH, 1000, 'abc', 0.5]:
+            group.engine_config = {'priority': priority}
+            assert runs.create_run(group=group).priority == PRIORITY_LOW
+
+
 def test_success_run(database, tmpdir):
     """Test life cycle for a successful run."""
     # -- Setup ----------------------------------------------------------------
@@ -282,3 +384,45 @@ def test_success_run(database, tmpdir):
             assert json.load(f) == {'A': 1}
         with runs.get_runfile(run_id=run_id, key='results/B.json').open() as f:
             assert json.load(f) == {'B': 1}
+
+
+def test_success_run_canceled_during_copy(tmpdir):
+    """Test that a run that is canceled while the result files are copied is
+    not set to success state.
+    """
+    # -- Setup ----------------------------------------------------------------
+    #
+    # The run is canceled in a separate session. Use a database file instead
+    # of an in-memory database.
+    database = DB(connect_url=TEST_DB(str(tmpdir)))
+    database.init()
+    fs = FileSystemStorage(basedir=os.path.join(tmpdir, 'fs'))
+    with database.session() as session:
+        user_id = model.create_user(session, active=True)
+        workflow_id = model.create_workflow(session)
+        group_id = model.create_group(session, workflow_id, users=[user_id])
+        groups = WorkflowGroupManager(session=session, fs=fs)
+        run = RunManager(session=session, fs=fs).create_run(group=groups.get_group(group_id))
+        run_id = run.run_id
+        state = run.state()
+
+    class CancelOnLoad(FileSystemStorage):
+        """Run store that cancels the run when the first file is loaded."""
+        def load(self, key):
+            with database.session() as session:
+                RunManager(session=session, fs=fs).update_run(run_id, state.cancel())
+            return super().load(key)
+
+    runfs = CancelOnLoad(basedir=os.path.join(tmpdir, 'tmprun'))
+    runfs.store(file=io_file({'A': 1}), dst='A.json')
+    # -- Update run to success state ------------------------------------------
+    with database.session() as session:
+        runs = RunManager(session=session, fs=fs, max_workers=1)
+        with pytest.raises(err.ConstraintViolationError):
+            runs.update_run(run_id, state.success(files=['A.json']), runstore=runfs)
+    with database.session() as session:
+        run = RunManager(session=session, fs=fs).get_run(run_id)
+        assert run.state().is_canceled()
+        assert run.files == []
+    rundir = dirs.run_basedir(workflow_id=workflow_id, run_id=run_id)
+    assert not os.path.exists(os.path.join(fs.basedir, rundir))
@@ -10,10 +10,13 @@
 
 import pytest
 
+from sqlalchemy import event
+
 from flowserv.model.auth import DefaultAuthPolicy, OpenAccessAuth
 from flowserv.model.user import UserManager
 
 import flowserv.error as err
+import flowserv.model.cache as cache
 import flowserv.tests.model as model
 
 
@@ -85,3 +88,67 @@ def test_authenticate_user(database, authcls):
         # An error is raised when using an invalid API key.
         with pytest.raises(err.UnauthenticatedAccessError):
             assert auth.authenticate('UNKNOWN')
+
+
+def test_authenticate_cached_token(database):
+    """Test authentication for cached access tokens."""
+    # -- Setup ----------------------------------------------------------------
+    with database.session() as session:
+        user_id = model.create_user(session, active=True)
+    with database.session() as session:
+        token = UserManager(session).login_user(user_id, user_id).api_key.value
+    # Count the executed SQL statements.
+    queries = list()
+
+    def count_queries(conn, cursor, statement, parameters, context, executemany):
+        queries.append(statement)
+
+    event.listen(database._engine, 'before_cursor_execute', count_queries)
+    # -- Authenticate with cached token ---------------------------------------
+    with database.session() as session:
+        assert DefaultAuthPolicy(session).authenticate(token).user_id == user_id
+    count = len(queries)
+    assert count > 0
+    with database.session() as session:
+        user = DefaultAuthPolicy(session).authenticate(token)
+        assert user.user_id == user_id
+        assert user.name == user_id
+        assert len(queries) == count
+        # Accessing the API key of the user loads the key from the database.
+        assert user.api_key.value == token
+    # -- Logout invalidates the cached token ----------------------------------
+    with database.session() as session:
+        UserManager(session).logout_user(token)
+    with database.session() as session:
+        with pytest.raises(err.UnauthenticatedAccessError):
+            DefaultAuthPolicy(session).authenticate(token)
+    event.remove(database._engine, 'before_cursor_execute', count_queries)
+
+
+def test_invalidate_cached_token_on_commit(database):
+    """Test that a token that is cached by a concurrent session while the
+    logout is not committed is removed from the cache on commit.
+    """
+    with database.session() as session:
+        user_id = model.create_user(session, active=True)
+    with database.session() as session:
+        token = UserManager(session).login_user(user_id, user_id).api_key.value
+    with database.session() as session:
+        UserManager(session).logout_user(token)
+        with database.session() as reader:
+            assert DefaultAuthPolicy(reader).authenticate(token).user_id == user_id
+        assert cache.tokens.get(token) is not None
+    assert cache.tokens.get(token) is None
+    with database.session() as session:
+        with pytest.raises(err.UnauthenticatedAccessError):
+            DefaultAuthPolicy(session).authenticate(token)
+    # Rolling back a logout keeps the cached token.
+    with database.session() as session:
+        token = UserManager(session).login_user(user_id, user_id).api_key.value
+    with database.session() as session:
+        assert DefaultAuthPolicy(session).authenticate(token).user_id == user_id
+    with pytest.raises(ValueError):
+        with database.session() as session:
+            UserManager(session).logout_user(token)
+            raise ValueError('abort')
+    assert cache.tokens.get(token) is not None
@@ -11,8 +11,12 @@
 import pytest
 
 from flowserv.model.auth import DefaultAuthPolicy, OpenAccessAuth
+from flowserv.model.group import WorkflowGroupManager
+from flowserv.model.template.parameter import ParameterIndex
+from flowserv.volume.fs import FileSystemStorage
 
 import flowserv.error as err
+import flowserv.model.cache as cache
 import flowserv.tests.model as model
 
 
@@ -57,3 +61,47 @@ def test_group_and_run_membership(database, authcls, open_access):
             auth.group_or_run_exists()
         with pytest.raises(ValueError):
             auth.group_or_run_exists(group_id=group_id, run_id=run_id)
+
+
+def test_membership_cache_invalidation(database, tmpdir):
+    """Test that cached group memberships are invalidated when the members of
+    a group change.
+    """
+    # -- Setup ----------------------------------------------------------------
+    fs = FileSystemStorage(basedir=str(tmpdir))
+    with database.session() as session:
+        user_1 = model.create_user(session, active=True)
+        user_2 = model.create_user(session, active=True)
+        workflow_id = model.create_workflow(session)
+    with database.session() as session:
+        manager = WorkflowGroupManager(session=session, fs=fs)
+        group_id = manager.create_group(
+            workflow_id=workflow_id,
+            name='G',
+            user_id=user_1,
+            parameters=ParameterIndex(),
+            workflow_spec=dict()
+        ).group_id
+    # -- Membership changes are visible immediately ---------------------------
+    with database.session() as session:
+        auth = DefaultAuthPolicy(session)
+        assert auth.is_group_member(user_1, group_id=group_id)
+        assert not auth.is_group_member(user_2, group_id=group_id)
+        WorkflowGroupManager(session=session, fs=fs).update_group(
+            group_id,
+            members=[user_2]
+        )
+        # Cached memberships are removed after the change is committed. The
+        # session that made the change does not use the cached memberships.
+        session.flush()
+        assert cache.memberships.get(user_1) is not None
+        assert not auth.is_group_member(user_1, group_id=group_id)
+        assert auth.is_group_member(user_2, group_id=group_id)
+    assert cache.memberships.get(user_1) is None
+    with database.session() as session:
+        auth = DefaultAuthPolicy(session)
+        assert not auth.is_group_member(user_1, group_id=group_id)
+        assert auth.is_group_member(user_2, group_id=group_id)
+        WorkflowGroupManager(session=session, fs=fs).delete_group(group_id)
+    with database.session() as session:
+        assert DefaultAuthPolicy(session).user_groups(user_2) == frozenset()
@@ -8,6 +8,8 @@
 
 """Unit tests for registration and password reset in the user manager."""
 
+from passlib.hash import pbkdf2_sha256
+
 import pytest
 import time
 
@@ -187,3 +189,26 @@ def test_reset_request_timeout(database):
         time.sleep(2)
         with pytest.raises(err.UnknownRequestError):
             users.reset_password(request_id=request_id, password='mypwd')
+
+
+def test_password_hash_rounds(database):
+    """Test configuring the number of rounds for password hashes."""
+    # -- Setup ----------------------------------------------------------------
+    #
+    # Register a user with a password hash that uses 1000 rounds.
+    with database.session() as session:
+        users = UserManager(session, hash_rounds=1000)
+        user_id = users.register_user('myuser', 'mypwd').user_id
+        secret = users.get_user(user_id).secret
+    assert pbkdf2_sha256.from_string(secret).rounds == 1000
+    # -- Login re-hashes the password with the configured rounds --------------
+    with database.session() as session:
+        UserManager(session, hash_rounds=1200).login_user('myuser', 'mypwd')
+    with database.session() as session:
+        users = UserManager(session, hash_rounds=1200)
+        secret = users.get_user(user_id).secret
+        assert pbkdf2_sha256.from_string(secret).rounds == 1200
+        # The password is still valid.
+        users.login_user('myuser', 'mypwd')
+        with pytest.raises(err.UnknownUserError):
+            users.login_user('myuser', 'otherpwd')
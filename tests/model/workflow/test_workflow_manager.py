@@ -19,6 +19,7 @@ from flowserv.model.workflow.manager import WorkflowManager
 
 import flowserv.error as err
 import flowserv.model.files as dirs
+import flowserv.model.workflow.cache as cache
 
 
 DIR = os.path.dirname(os.path.realpath(__file__))
@@ -239,6 +240,54 @@ def test_list_workflow(database, tmpdir):
         manager = WorkflowManager(session=session, fs=fs)
         workflows = manager.list_workflows()
         assert len(workflows) == 3
+        # Template components are not loaded for workflow listings.
+        for wf in workflows:
+            assert 'parameters' not in wf.__dict__
+            assert 'result_schema' not in wf.__dict__
+
+
+def test_workflow_template_cache(database, tmpdir):
+    """Test caching parsed workflow templates."""
+    # -- Setup ----------------------------------------------------------------
+    fs = FileSystemStorage(basedir=tmpdir)
+    with database.session() as session:
+        manager = WorkflowManager(session=session, fs=fs)
+        workflow_id = manager.create_workflow(source=BENCHMARK_DIR).workflow_id
+    # -- Test template cache --------------------------------------------------
+    cache.templates.clear()
+    with database.session() as session:
+        manager = WorkflowManager(session=session, fs=fs)
+        template = manager.get_workflow(workflow_id).get_template()
+    with database.session() as session:
+        manager = WorkflowManager(session=session, fs=fs)
+        wf = manager.get_workflow(workflow_id)
+        assert wf.get_template() is template
+        # The template components are not loaded from the database.
+        assert 'parameters' not in wf.__dict__
+        # Overriding template components does not modify the cached object.
+        modified = wf.get_template(workflow_spec={'A': 1})
+        assert modified.workflow_spec == {'A': 1}
+        assert modified.parameters is template.parameters
+        assert wf.get_template().workflow_spec != {'A': 1}
+    # Deleting the workflow removes the template from the cache.
+    with database.session() as session:
+        manager = WorkflowManager(session=session, fs=fs)
+        version = manager.get_workflow(workflow_id).template_version
+        manager.delete_workflow(workflow_id)
+    assert cache.templates.get(workflow_id, version) is None
+
+
+def test_template_cache_eviction():
+    """Test evicting least recently used templates from a bounded cache."""
+    templates = cache.TemplateCache(maxsize=2)
+    templates.put('W1', 'V1', 1)
+    templates.put('W2', 'V1', 2)
+    assert templates.get('W1', 'V1') == 1
+    templates.put('W3', 'V1', 3)
+    assert templates.get('W2', 'V1') is None
+    assert templates.get('W1', 'V1') == 1
+    assert templates.get('W3', 'V1') == 3
+    assert templates.get('W1', 'V2') is None
 
 
 def test_update_workflow_description(database, tmpdir):
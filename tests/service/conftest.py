@@ -12,6 +12,8 @@ import os
 import pytest
 import requests
 
+from sqlalchemy import event
+
 from flowserv.config import Config
 from flowserv.model.database import DB, TEST_URL
 from flowserv.service.api import API
@@ -40,11 +42,13 @@ class MockResponse:
     """Mock response object for API requests. Adopted from the online documentation
     at: https://docs.pytest.org/en/stable/monkeypatch.html
     """
-    def __init__(self, url, files=None, json=None, headers=None):
+    def __init__(self, url, files=None, json=None, data=None, headers=None):
         """Keep track of the request Url, and the optional request body and
         headers.
         """
         self.body = dict()
+        self.headers = dict()
+        self.status_code = 200
         if url == 'test/users/login':
             # Add user token to simulate successful login.
             self.body[USER_TOKEN] = '0000'
@@ -59,26 +63,61 @@ class MockResponse:
         """Never raise error for failed requests."""
         pass
 
+    def close(self):
+        """Nothing to release for mocked responses."""
+        pass
+
     @property
     def raw(self):
         """Raw response for file downloads."""
-        return None
+        return MockRaw()
+
+
+class MockRaw:
+    """Mock for the raw response stream of file downloads."""
+    def read(self, size=-1, decode_content=False):
+        """The downloaded files are empty."""
+        return b''
 
 
 @pytest.fixture
 def mock_response(monkeypatch):
-    """Requests.get() mocked to return {'mock_key':'mock_response'}."""
+    """Requests of the HTTP session mocked to return a MockResponse."""
 
-    def mock_get(*args, **kwargs):
+    def mock_get(session, *args, **kwargs):
         return MockResponse(*args)
 
-    def mock_post(*args, **kwargs):
+    def mock_post(session, *args, **kwargs):
         return MockResponse(*args, **kwargs)
 
-    monkeypatch.setattr(requests, "delete", mock_get)
-    monkeypatch.setattr(requests, "get", mock_get)
-    monkeypatch.setattr(requests, "post", mock_post)
-    monkeypatch.setattr(requests, "put", mock_post)
+    monkeypatch.setattr(requests.Session, "delete", mock_get)
+    monkeypatch.setattr(requests.Session, "get", mock_get)
+    monkeypatch.setattr(requests.Session, "post", mock_post)
+    monkeypatch.setattr(requests.Session, "put", mock_post)
+
+
+# -- Query counter ------------------------------------------------------------
+
+class QueryCounter:
+    """Count the number of SQL statements that are executed by a database
+    engine.
+    """
+    def __init__(self):
+        """Initialize the statement counter."""
+        self.count = 0
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        """Increment the counter for every executed statement."""
+        self.count += 1
+
+
+@pytest.fixture
+def query_counter(database):
+    """Counter for SQL statements that are executed by the test database."""
+    counter = QueryCounter()
+    event.listen(database._engine, 'before_cursor_execute', counter)
+    yield counter
+    event.remove(database._engine, 'before_cursor_execute', counter)
 
 
 # -- Service API --------------------------------------------------------------
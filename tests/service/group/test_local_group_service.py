@@ -10,7 +10,7 @@
 
 import pytest
 
-from flowserv.tests.service import create_user
+from flowserv.tests.service import create_group, create_user, start_hello_world
 
 import flowserv.error as err
 import flowserv.tests.serialize as serialize
@@ -142,6 +142,17 @@ def test_list_groups_view(local_service, hello_world):
     with local_service(user_id=user_2) as api:
         r = api.groups().list_groups()
         assert len(r['groups']) == 1
+    # -- Get paginated group listing ------------------------------------------
+    with local_service(user_id=user_1) as api:
+        r = api.groups().list_groups(limit=1)
+        serialize.validate_group_listing(r)
+        assert [g['name'] for g in r['groups']] == ['G1']
+        r = api.groups().list_groups(limit=1, after=r['next'])
+        assert [g['name'] for g in r['groups']] == ['G2']
+        assert 'next' not in r
+        # Error for invalid limit.
+        with pytest.raises(err.InvalidArgumentError):
+            api.groups().list_groups(limit=0)
 
 
 def test_update_group_view(local_service, hello_world):
@@ -170,3 +181,33 @@ def test_update_group_view(local_service, hello_world):
         # Update persists when retrieving the group handle.
         r = api.groups().get_group(group_id)
         assert r['name'] == 'ABC'
+
+
+def test_get_group_query_count(local_service, hello_world, query_counter):
+    """Test that the number of queries for retrieving a group handle does not
+    depend on the number of group members, uploaded files, and runs.
+    """
+    # -- Setup ----------------------------------------------------------------
+    #
+    # Create two groups. The first group has one member and no uploaded files.
+    # The second group has three members, and three uploaded files and runs.
+    with local_service() as api:
+        users = [create_user(api) for _ in range(3)]
+        workflow_id = hello_world(api, name='W1').workflow_id
+    with local_service(user_id=users[0]) as api:
+        group_1 = create_group(api, workflow_id=workflow_id)
+        group_2 = create_group(api, workflow_id=workflow_id, users=users)
+        for _ in range(3):
+            start_hello_world(api, group_2)
+    # -- Count queries for group handles --------------------------------------
+    counts = list()
+    for group_id in [group_1, group_2]:
+        with local_service(user_id=users[0]) as api:
+            query_counter.count = 0
+            r = api.groups().get_group(group_id)
+            counts.append(query_counter.count)
+    assert len(r['members']) == 3
+    assert len(r['files']) == 3
+    assert len(r['runs']) == 3
+    assert counts[0] == counts[1]
+    assert counts[1] <= 4
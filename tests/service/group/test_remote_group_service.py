@@ -55,6 +55,7 @@ def test_list_groups_remote(remote_service, mock_response):
     """Test getting a group listing from the remote service."""
     remote_service.groups().list_groups()
     remote_service.groups().list_groups(workflow_id='0000')
+    remote_service.groups().list_groups(limit=10, after='abc')
 
 
 def test_update_group_remote(remote_service, mock_response):
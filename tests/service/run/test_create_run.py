@@ -11,7 +11,8 @@
 import pytest
 import tempfile
 
-from flowserv.service.run.argument import is_fh
+from flowserv.model.files import io_file
+from flowserv.service.run.argument import is_fh, serialize_fh
 from flowserv.tests.service import create_group, create_user, start_hello_world, write_results
 from flowserv.volume.fs import FileSystemStorage
 
@@ -79,3 +80,50 @@ def test_start_run_remote(remote_service, mock_response):
     """Test starting a workflow run at the remote service."""
     remote_service.runs().start_run(group_id='0000', arguments=[{'arg': 1}])
     remote_service.runs().get_run(run_id='0000')
+
+
+def test_start_runs_local(local_service, hello_world):
+    """Test starting multiple runs with a single call to the local service."""
+    # -- Setup ----------------------------------------------------------------
+    with local_service() as api:
+        user_id = create_user(api)
+        workflow_id = hello_world(api).workflow_id
+    with local_service(user_id=user_id) as api:
+        group_id = create_group(api, workflow_id=workflow_id, users=[user_id])
+        file_id = api.uploads().upload_file(
+            group_id=group_id,
+            file=io_file(data=['Alice', 'Bob'], format='txt/plain'),
+            name='n.txt'
+        )['id']
+    # -- Start runs for a parameter sweep -------------------------------------
+    argument_sets = [
+        [
+            {'name': 'names', 'value': serialize_fh(file_id=file_id)},
+            {'name': 'sleeptime', 'value': i}
+        ] for i in range(3)
+    ]
+    with local_service(user_id=user_id) as api:
+        runs = api.runs().start_runs(group_id=group_id, argument_sets=argument_sets)
+        assert len(runs) == 3
+        for i, r in enumerate(runs):
+            serialize.validate_run_handle(r, st.STATE_PENDING)
+            assert r['arguments'][1] == {'name': 'sleeptime', 'value': i}
+    with local_service(user_id=user_id) as api:
+        listing = api.runs().list_runs(group_id=group_id)
+        assert {r['id'] for r in listing['runs']} == {r['id'] for r in runs}
+    # -- No run is created if any argument set is invalid ---------------------
+    argument_sets.append([{'name': 'sleeptime', 'value': 1}])
+    with local_service(user_id=user_id) as api:
+        with pytest.raises(err.MissingArgumentError):
+            api.runs().start_runs(group_id=group_id, argument_sets=argument_sets)
+    with local_service(user_id=user_id) as api:
+        assert len(api.runs().list_runs(group_id=group_id)['runs']) == 3
+
+
+def test_start_runs_remote(remote_service, mock_response):
+    """Test starting multiple workflow runs at the remote service."""
+    runs = remote_service.runs().start_runs(
+        group_id='0000',
+        argument_sets=[[{'arg': 1}], [{'arg': 2}]]
+    )
+    assert len(runs) == 2
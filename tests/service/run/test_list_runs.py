@@ -63,7 +63,75 @@ def test_list_runs_local(local_service, hello_world):
             api.runs().list_runs(group_1)
 
 
+def test_list_runs_paginated(local_service, hello_world):
+    """Test listing runs in pages of fixed size."""
+    # -- Setup ----------------------------------------------------------------
+    #
+    # Start five runs for a group of the 'Hello World' workflow.
+    with local_service() as api:
+        user_id = create_user(api)
+        workflow_id = hello_world(api).workflow_id
+    with local_service(user_id=user_id) as api:
+        group_id = create_group(api, workflow_id=workflow_id)
+        run_ids = [start_hello_world(api, group_id)[0] for _ in range(5)]
+    # -- Get run listing in pages of two runs ---------------------------------
+    runs, after = list(), None
+    with local_service(user_id=user_id) as api:
+        while True:
+            r = api.runs().list_runs(group_id, limit=2, after=after)
+            serialize.validate_run_listing(r)
+            assert len(r['runs']) <= 2
+            runs.extend([run['id'] for run in r['runs']])
+            after = r.get('next')
+            if after is None:
+                break
+    assert sorted(runs) == sorted(run_ids)
+    assert len(runs) == 5
+    # -- Listing without limit has no cursor ----------------------------------
+    with local_service(user_id=user_id) as api:
+        r = api.runs().list_runs(group_id)
+        assert len(r['runs']) == 5
+        assert 'next' not in r
+        # Error for invalid cursor.
+        with pytest.raises(err.InvalidArgumentError):
+            api.runs().list_runs(group_id, limit=2, after='abc')
+        # Error for invalid limit.
+        for limit in [0, -1]:
+            with pytest.raises(err.InvalidArgumentError):
+                api.runs().list_runs(group_id, limit=limit)
+
+
 def test_list_runs_remote(remote_service, mock_response):
     """Test listing workflow run from the remote service."""
     remote_service.runs().list_runs(group_id='0000')
     remote_service.runs().list_runs(group_id='0000', state='RUNNING')
+    remote_service.runs().list_runs(group_id='0000', limit=10, after='abc')
+
+
+def test_get_run_query_count(local_service, hello_world, query_counter):
+    """Test that the number of queries for retrieving a run handle does not
+    depend on the number of log messages for the run.
+    """
+    # -- Setup ----------------------------------------------------------------
+    #
+    # Create two runs in error state with a different number of messages.
+    with local_service() as api:
+        user_id = create_user(api)
+        workflow_id = hello_world(api).workflow_id
+    run_ids = list()
+    with local_service(user_id=user_id) as api:
+        group_id = create_group(api, workflow_id=workflow_id)
+        for messages in [['error'], ['error {}'.format(i) for i in range(5)]]:
+            run_id, _ = start_hello_world(api, group_id)
+            api.runs().update_run(run_id, api.runs().backend.error(run_id, messages))
+            run_ids.append(run_id)
+    # -- Count queries for run handles ----------------------------------------
+    counts = list()
+    for run_id in run_ids:
+        with local_service(user_id=user_id) as api:
+            query_counter.count = 0
+            r = api.runs().get_run(run_id)
+            counts.append(query_counter.count)
+    assert len(r['messages']) == 5
+    assert counts[0] == counts[1]
+    assert counts[1] <= 5
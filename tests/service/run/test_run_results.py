@@ -12,6 +12,7 @@ import pytest
 import tarfile
 
 from flowserv.config import Config, FLOWSERV_FILESTORE
+from flowserv.model.base import RunObject
 from flowserv.tests.controller import StateEngine
 from flowserv.tests.model import create_user, success_run
 from flowserv.service.local import LocalAPIFactory
@@ -76,6 +77,55 @@ def test_result_archive_local(database, tmpdir):
         assert len(members) == 2
         assert 'A.json' in members
         assert 'results/B.json' in members
+    # -- The archive is cached in the file store ------------------------------
+    with database.session() as session:
+        archive_key = session.query(RunObject).get(run_id).archive_key
+    assert archive_key is not None
+    assert fs.load(archive_key).size() > 0
+    with local_service(user_id=user_id) as api:
+        archive = api.runs().get_result_archive(run_id=run_id)
+        with tarfile.open(fileobj=archive.open(), mode='r|gz') as tar:
+            assert sorted(t.name for t in tar) == ['A.json', 'results/B.json']
+    with database.session() as session:
+        assert session.query(RunObject).get(run_id).archive_key == archive_key
+    # -- Rebuild the archive if it was removed --------------------------------
+    fs.delete(archive_key)
+    with local_service(user_id=user_id) as api:
+        archive = api.runs().get_result_archive(run_id=run_id)
+        assert archive.size() > 0
+    with database.session() as session:
+        assert session.query(RunObject).get(run_id).archive_key == archive_key
+    assert fs.load(archive_key).size() > 0
+    # -- Rebuilding the archive does not leave orphaned archive files ---------
+    with database.session() as session:
+        session.query(RunObject).get(run_id).archive_key = None
+    with local_service(user_id=user_id) as api:
+        api.runs().get_result_archive(run_id=run_id)
+    archivedir = archive_key.rpartition('/')[0]
+    assert [key for key, _ in fs.walk(archivedir)] == [archive_key]
+
+
+def test_result_archive_formats_local(database, tmpdir):
+    """Test getting run result archives in different formats."""
+    # -- Setup ----------------------------------------------------------------
+    env = Config().basedir(tmpdir).volume(FStore(basedir=str(tmpdir))).auth()
+    fs = Volume(doc=env.get(FLOWSERV_FILESTORE))
+    workflow_id, group_id, run_id, user_id = success_run(database, fs, tmpdir)
+    local_service = LocalAPIFactory(env=env, db=database, engine=StateEngine())
+    # -- Uncompressed archive is not cached -----------------------------------
+    with local_service(user_id=user_id) as api:
+        archive = api.runs().get_result_archive(run_id=run_id, format='none')
+        assert archive.name == 'run.{}.tar'.format(run_id)
+        with tarfile.open(fileobj=archive.open(), mode='r|') as tar:
+            assert sorted(t.name for t in tar) == ['A.json', 'results/B.json']
+    with database.session() as session:
+        assert session.query(RunObject).get(run_id).archive_key is None
+    # -- Error for invalid format or compression level ------------------------
+    with local_service(user_id=user_id) as api:
+        with pytest.raises(err.InvalidArgumentError):
+            api.runs().get_result_archive(run_id=run_id, format='zip')
+        with pytest.raises(err.InvalidArgumentError):
+            api.runs().get_result_archive(run_id=run_id, format='gzip', level=42)
 
 
 def test_result_archive_remote(remote_service, mock_response):
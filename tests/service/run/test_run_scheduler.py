@@ -0,0 +1,256 @@
+# This file is part of the Reproducible and Reusable Data Analysis Workflow
+# Server (flowServ).
+#
+# Copyright (C) 2019-2021 NYU.
+#
+# flowServ is free software; you can redistribute it and/or modify it under the
+# terms of the MIT License; see LICENSE file for more details.
+
+"""Unit tests for admission control and fair-share scheduling of runs."""
+
+from sqlalchemy.exc import OperationalError
+
+import time
+
+from flowserv.config import Config
+from flowserv.model.base import RunOwner, RunStateUpdate
+from flowserv.model.database import DB, TEST_DB
+from flowserv.model.files import io_file
+from flowserv.service.local import LocalAPIFactory
+from flowserv.service.run.argument import serialize_fh
+from flowserv.service.run.local import LocalRunService
+from flowserv.service.run.queue import StateUpdateQueue
+from flowserv.tests.controller import StateEngine
+from flowserv.tests.service import create_group, create_user
+from flowserv.volume.fs import FStore
+
+import flowserv.config as config
+import flowserv.model.workflow.state as st
+
+
+def init(hello_world, tmpdir, **limits):
+    """Create API factory with the given run limits and two workflow groups.
+    Returns the factory, the engine, the user, and the two groups together
+    with the identifier of an uploaded file for each group.
+    """
+    db = DB(connect_url=TEST_DB(str(tmpdir)))
+    db.init()
+    env = Config().basedir(tmpdir).volume(FStore(basedir=str(tmpdir))).auth().run_quota(**limits)
+    engine = StateEngine()
+    service = LocalAPIFactory(env=env, db=db, engine=engine)
+    with service() as api:
+        user_id = create_user(api)
+        workflow_id = hello_world(api).workflow_id
+    groups = list()
+    with service(user_id=user_id) as api:
+        for _ in range(2):
+            group_id = create_group(api, workflow_id=workflow_id)
+            file_id = api.uploads().upload_file(
+                group_id=group_id,
+                file=io_file(data=['Alice', 'Bob'], format='txt/plain'),
+                name='n.txt'
+            )['id']
+            groups.append((group_id, file_id))
+    return service, engine, user_id, groups
+
+
+def start_runs(api, group, count):
+    """Start the given number of runs for a group. Returns the run handles."""
+    group_id, file_id = group
+    args = [{'name': 'names', 'value': serialize_fh(file_id=file_id)}]
+    return api.runs().start_runs(group_id=group_id, argument_sets=[args] * count)
+
+
+def test_run_scheduler_config(tmpdir):
+    """Test initializing the run scheduler for the API factory."""
+    env = Config().basedir(tmpdir).volume(FStore(basedir=str(tmpdir)))
+    assert LocalAPIFactory(env=env).scheduler is None
+    env = Config().basedir(tmpdir).volume(FStore(basedir=str(tmpdir))).run_quota(max_runs=4, group=2, workflow=3)
+    scheduler = LocalAPIFactory(env=env).scheduler
+    assert scheduler.max_runs == 4
+    assert scheduler.group_quota == 2
+    assert scheduler.workflow_quota == 3
+    assert scheduler.weights == dict()
+    env = env.run_weights({'G1': 2, 'G2': 0, 'G3': 'abc'})
+    assert LocalAPIFactory(env=env).scheduler.weights == {'G1': 2}
+
+
+def test_run_scheduler_fair_share(hello_world, tmpdir):
+    """Test that runs of a group that submits later are started before the
+    queued runs of a group that already has active runs.
+    """
+    service, engine, user_id, (g1, g2) = init(hello_world, tmpdir, max_runs=2)
+    with service(user_id=user_id) as api:
+        runs_1 = start_runs(api, g1, 4)
+        runs_2 = start_runs(api, g2, 1)
+    # The first two runs were started. All other runs are queued.
+    assert set(engine.runs) == {r['id'] for r in runs_1[:2]}
+    assert [r.get('queuePosition') for r in runs_1] == [None, None, 0, 1]
+    assert runs_2[0]['queuePosition'] == 0
+    # The run of the second group goes first.
+    with service(user_id=user_id) as api:
+        assert api.runs().get_run(runs_2[0]['id'])['queuePosition'] == 0
+        assert api.runs().get_run(runs_1[2]['id'])['queuePosition'] == 1
+        assert api.runs().get_run(runs_1[3]['id'])['queuePosition'] == 2
+    # Finish one run of the first group.
+    run_id = runs_1[0]['id']
+    with service(user_id=user_id) as api:
+        api.runs().update_run(run_id=run_id, state=engine.error(run_id, ['some error']))
+    assert runs_2[0]['id'] in engine.runs
+    assert runs_1[2]['id'] not in engine.runs
+    assert service.scheduler.active() == 2
+    with service(user_id=user_id) as api:
+        assert api.runs().get_run(runs_1[2]['id'])['queuePosition'] == 0
+        # Canceling an active run starts the next queued run.
+        api.runs().cancel_run(runs_1[1]['id'])
+    assert runs_1[2]['id'] in engine.runs
+    assert runs_1[3]['id'] not in engine.runs
+
+
+def test_run_scheduler_fair_share_weights(hello_world, tmpdir):
+    """Test that the fair-share weight of a group is taken from the run
+    configuration or from the engine configuration of the workflow. Weights
+    in the engine configuration of a group are ignored.
+    """
+    service, engine, user_id, (g1, g2) = init(hello_world, tmpdir, max_runs=1)
+    service.scheduler.weights = {g2[0]: 1}
+    with service() as api:
+        group = api.group_manager().get_group(g1[0])
+        group.workflow.engine_config = {'weight': 3}
+        api.group_manager().get_group(g2[0]).engine_config = {'weight': 1e9}
+    with service(user_id=user_id) as api:
+        runs_1 = start_runs(api, g1, 4)
+        runs_2 = start_runs(api, g2, 2)
+    assert service.scheduler._weights == {g1[0]: 3, g2[0]: 3}
+    positions = service.scheduler.positions()
+    assert [positions.get(r['id']) for r in runs_1] == [None, 1, 2, 3]
+    assert [positions.get(r['id']) for r in runs_2] == [0, 4]
+    with service(user_id=user_id) as api:
+        assert api.runs().get_run(runs_2[1]['id'])['queuePosition'] == 4
+
+
+def test_run_scheduler_group_quota(hello_world, tmpdir):
+    """Test the per-group limit and canceling queued runs."""
+    service, engine, user_id, (g1, g2) = init(hello_world, tmpdir, group=1)
+    with service(user_id=user_id) as api:
+        runs_1 = start_runs(api, g1, 2)
+        runs_2 = start_runs(api, g2, 2)
+    assert set(engine.runs) == {runs_1[0]['id'], runs_2[0]['id']}
+    # Canceling a queued run does not involve the workflow engine.
+    with service(user_id=user_id) as api:
+        r = api.runs().cancel_run(runs_1[1]['id'])
+        assert r['state'] == st.STATE_CANCELED
+        assert 'queuePosition' not in r
+    assert runs_1[1]['id'] not in engine.runs
+    # Finish the active run of the second group.
+    run_id = runs_2[0]['id']
+    with service(user_id=user_id) as api:
+        api.runs().update_run(run_id=run_id, state=engine.error(run_id))
+    assert runs_2[1]['id'] in engine.runs
+    assert service.scheduler.active() == 2
+
+
+def test_run_scheduler_priority(hello_world, tmpdir):
+    """Test that queued runs of a group with a higher priority are started
+    before the queued runs of other groups.
+    """
+    service, engine, user_id, (g1, g2) = init(hello_world, tmpdir, max_runs=1)
+    with service() as api:
+        api.group_manager().get_group(g1[0]).engine_config = {'priority': -1}
+        api.group_manager().get_group(g2[0]).engine_config = {'priority': 1000}
+    with service(user_id=user_id) as api:
+        runs_1 = start_runs(api, g1, 3)
+        runs_2 = start_runs(api, g2, 2)
+    assert [r['priority'] for r in runs_1] == [-1, -1, -1]
+    assert [r['priority'] for r in runs_2] == [0, 0]
+    # The high priority runs of the second group are ahead in the queue.
+    assert [r['queuePosition'] for r in runs_2] == [0, 1]
+    with service(user_id=user_id) as api:
+        assert api.runs().get_run(runs_1[1]['id'])['queuePosition'] == 2
+    run_id = runs_1[0]['id']
+    with service(user_id=user_id) as api:
+        api.runs().update_run(run_id=run_id, state=engine.error(run_id))
+    assert runs_2[0]['id'] in engine.runs
+    assert runs_1[1]['id'] not in engine.runs
+
+
+def test_run_scheduler_recover(hello_world, tmpdir):
+    """Test recovering the pending runs of a scheduler whose heartbeat has
+    expired.
+    """
+    service, engine, user_id, (g1, g2) = init(hello_world, tmpdir, max_runs=1)
+    with service(user_id=user_id) as api:
+        runs = start_runs(api, g1, 3)
+    owner = service.scheduler.owner
+    watch_dog = 100
+    while watch_dog:
+        with service._db.session() as session:
+            if session.query(RunOwner).get(owner) is not None:
+                break
+        time.sleep(0.05)
+        watch_dog -= 1
+    # Runs are not recovered implicitly when a new factory is used.
+    engine_2 = StateEngine()
+    service_2 = LocalAPIFactory(env=service, db=service._db, engine=engine_2)
+    with service_2(user_id=user_id) as api:
+        api.runs().get_run(runs[0]['id'])
+    assert engine_2.runs == dict()
+    # Runs of a scheduler with a live heartbeat are not recovered.
+    assert service.recover_runs() == 0
+    assert service_2.recover_runs() == 0
+    # Simulate that the first process stopped.
+    with service._db.session() as session:
+        session.query(RunOwner).get(owner).heartbeat = '2000-01-01T00:00:00+00:00'
+    assert service_2.recover_runs() == 3
+    assert set(engine_2.runs) == {runs[0]['id']}
+    with service_2(user_id=user_id) as api:
+        assert api.runs().get_run(runs[1]['id'])['queuePosition'] == 0
+        assert api.runs().get_run(runs[2]['id'])['queuePosition'] == 1
+    assert service_2.recover_runs() == 0
+    # A restarted process with the same owner identifier recovers its runs.
+    # The recovered runs are set to error state.
+    env = Config(service_2)
+    env[config.FLOWSERV_RUNS_OWNER] = service_2.scheduler.owner
+    service_3 = LocalAPIFactory(env=env, db=service._db, engine=StateEngine())
+    assert service_3.recover_runs(fail=True) == 3
+    with service_3(user_id=user_id) as api:
+        for r in runs:
+            assert api.runs().get_run(r['id'])['state'] == st.STATE_ERROR
+
+
+def test_run_scheduler_release_discarded_update(hello_world, tmpdir, monkeypatch):
+    """Test that a run whose final state update is discarded by the state
+    update queue does not block the scheduler.
+    """
+    service, engine, user_id, (g1, g2) = init(hello_world, tmpdir, max_runs=1)
+    with service(user_id=user_id) as api:
+        runs = start_runs(api, g1, 2)
+    assert set(engine.runs) == {runs[0]['id']}
+
+    def update_run(self, *args, **kwargs):
+        raise OperationalError('UPDATE', dict(), Exception('database is locked'))
+
+    monkeypatch.setattr(LocalRunService, 'update_run', update_run)
+    queue = StateUpdateQueue(db=service._db, service=service, max_attempts=1, retry_interval=0)
+    with service._db.session() as session:
+        state = engine.error(runs[0]['id'])
+        session.add(RunStateUpdate(run_id=runs[0]['id'], state=st.serialize_state(state)))
+    queue.drain()
+    assert queue.discarded == 1
+    assert runs[1]['id'] in engine.runs
+    assert service.scheduler.active() == 1
+
+
+def test_run_scheduler_reconcile_deleted_run(hello_world, tmpdir):
+    """Test that an active run that was deleted without a final state update
+    is released when queued runs are dispatched.
+    """
+    service, engine, user_id, (g1, g2) = init(hello_world, tmpdir, max_runs=1)
+    with service(user_id=user_id) as api:
+        runs = start_runs(api, g1, 2)
+    assert set(engine.runs) == {runs[0]['id']}
+    with service() as api:
+        api.run_manager().delete_run(runs[0]['id'])
+    service.scheduler.dispatch()
+    assert runs[1]['id'] in engine.runs
+    assert service.scheduler.active() == 1
@@ -0,0 +1,187 @@
+# This file is part of the Reproducible and Reusable Data Analysis Workflow
+# Server (flowServ).
+#
+# Copyright (C) 2019-2021 NYU.
+#
+# flowServ is free software; you can redistribute it and/or modify it under the
+# terms of the MIT License; see LICENSE file for more details.
+
+"""Unit tests for the run state update queue."""
+
+import time
+
+from flowserv.config import Config
+from flowserv.model.base import RunStateLease, RunStateUpdate
+from flowserv.model.database import DB, TEST_DB
+from flowserv.service.local import LocalAPIFactory
+from flowserv.service.run.local import LocalRunService
+from flowserv.service.run.queue import StateUpdateQueue
+from flowserv.tests.controller import StateEngine
+from flowserv.tests.service import create_group, create_user, start_hello_world
+from flowserv.volume.fs import FStore
+
+import flowserv.model.workflow.state as st
+
+
+def test_state_update_queue(hello_world, tmpdir):
+    """Test applying run state updates via the state update queue."""
+    # -- Setup ----------------------------------------------------------------
+    #
+    # The queue writer runs in a separate thread. Use a database file instead
+    # of an in-memory database.
+    db = DB(connect_url=TEST_DB(str(tmpdir)))
+    db.init()
+    env = Config().basedir(tmpdir).volume(FStore(basedir=str(tmpdir))).auth()
+    engine = StateEngine()
+    service = LocalAPIFactory(env=env, db=db, engine=engine)
+    with service() as api:
+        user_id = create_user(api)
+        workflow_id = hello_world(api).workflow_id
+    with service(user_id=user_id) as api:
+        group_id = create_group(api, workflow_id=workflow_id)
+        run_id, _ = start_hello_world(api, group_id)
+    # -- Enqueue state updates ------------------------------------------------
+    state = engine.runs[run_id]
+    service.update_run(run_id=run_id, state=state)
+    service.update_run(run_id=run_id, state=state.error(messages=['some error']))
+    service.updates.drain()
+    with service(user_id=user_id) as api:
+        r = api.runs().get_run(run_id)
+    assert r['state'] == st.STATE_ERROR
+    assert r['messages'] == ['some error']
+    stats = service.updates.stats()
+    assert stats['applied'] == 2
+    assert stats['discarded'] == 0
+    assert stats['latency'] >= 0
+    # -- Invalid updates are discarded ----------------------------------------
+    service.update_run(run_id=run_id, state=state)
+    service.update_run(run_id='UNKNOWN', state=state)
+    service.updates.drain()
+    stats = service.updates.stats()
+    assert stats['applied'] == 2
+    assert stats['discarded'] == 2
+    with db.session() as session:
+        assert session.query(RunStateUpdate).count() == 0
+    with service(user_id=user_id) as api:
+        assert api.runs().get_run(run_id)['state'] == st.STATE_ERROR
+
+
+def test_state_update_queue_lease(hello_world, tmpdir):
+    """Test that only the writer that holds the lease applies updates when
+    multiple writers share the same database.
+    """
+    # -- Setup ----------------------------------------------------------------
+    db = DB(connect_url=TEST_DB(str(tmpdir)))
+    db.init()
+    env = Config().basedir(tmpdir).volume(FStore(basedir=str(tmpdir))).auth()
+    engine = StateEngine()
+    service = LocalAPIFactory(env=env, db=db, engine=engine)
+    with service() as api:
+        user_id = create_user(api)
+        workflow_id = hello_world(api).workflow_id
+    with service(user_id=user_id) as api:
+        group_id = create_group(api, workflow_id=workflow_id)
+        run_id, _ = start_hello_world(api, group_id)
+    # Writer of a second process that shares the database.
+    other = StateUpdateQueue(db=db, service=service, lease_time=0.5)
+    assert other._acquire()
+    # -- Updates are not applied while the lease is held by the other writer --
+    state = engine.runs[run_id]
+    with db.session() as session:
+        session.add(RunStateUpdate(run_id=run_id, state=st.serialize_state(state)))
+    assert service.updates.drain() == 0
+    with db.session() as session:
+        assert session.query(RunStateUpdate).count() == 1
+    # -- Updates are applied once the lease was released ----------------------
+    other._release()
+    assert service.updates.drain() == 1
+    with db.session() as session:
+        assert session.query(RunStateUpdate).count() == 0
+        assert session.query(RunStateLease).one().owner is None
+    # -- Expired leases are taken over ----------------------------------------
+    assert other._acquire()
+    assert not service.updates._acquire()
+    time.sleep(0.6)
+    assert service.updates._acquire()
+    assert not other._acquire()
+
+
+def test_state_update_queue_resume(hello_world, tmpdir):
+    """Test applying updates that remained in the outbox when a new API
+    factory is used for the first time.
+    """
+    db = DB(connect_url=TEST_DB(str(tmpdir)))
+    db.init()
+    env = Config().basedir(tmpdir).volume(FStore(basedir=str(tmpdir))).auth()
+    engine = StateEngine()
+    service = LocalAPIFactory(env=env, db=db, engine=engine)
+    with service() as api:
+        user_id = create_user(api)
+        workflow_id = hello_world(api).workflow_id
+    with service(user_id=user_id) as api:
+        group_id = create_group(api, workflow_id=workflow_id)
+        run_id, _ = start_hello_world(api, group_id)
+    # Simulate an update that was not applied before the process stopped.
+    state = engine.runs[run_id].error(messages=['some error'])
+    with db.session() as session:
+        session.add(RunStateUpdate(run_id=run_id, state=st.serialize_state(state)))
+    service = LocalAPIFactory(env=env, db=db, engine=engine)
+    assert service.updates._writer is None
+    with service(user_id=user_id) as api:
+        pass
+    assert service.updates._writer is not None
+    assert not service.updates.resume()
+    watch_dog = 100
+    while service.updates.stats()['applied'] == 0 and watch_dog:
+        time.sleep(0.05)
+        watch_dog -= 1
+    with service(user_id=user_id) as api:
+        assert api.runs().get_run(run_id)['state'] == st.STATE_ERROR
+
+
+def test_state_update_queue_lease_renewal(hello_world, tmpdir, monkeypatch):
+    """Test that the writer lease is renewed for every update and that a
+    writer that lost the lease does not remove updates from the outbox.
+    """
+    db = DB(connect_url=TEST_DB(str(tmpdir)))
+    db.init()
+    env = Config().basedir(tmpdir).volume(FStore(basedir=str(tmpdir))).auth()
+    engine = StateEngine()
+    service = LocalAPIFactory(env=env, db=db, engine=engine)
+    with service() as api:
+        user_id = create_user(api)
+        workflow_id = hello_world(api).workflow_id
+    with service(user_id=user_id) as api:
+        group_id = create_group(api, workflow_id=workflow_id)
+        run_1, _ = start_hello_world(api, group_id)
+        run_2, _ = start_hello_world(api, group_id)
+    updates = [(run_id, st.serialize_state(engine.runs[run_id].error())) for run_id in [run_1, run_2]]
+    with db.session() as session:
+        for run_id, state in updates:
+            session.add(RunStateUpdate(run_id=run_id, state=state))
+    update_run = LocalRunService.update_run
+    # -- Slow updates do not exceed the lease time ----------------------------
+    queue = StateUpdateQueue(db=db, service=service, lease_time=0.5)
+
+    def slow_update(self, *args, **kwargs):
+        time.sleep(0.3)
+        return update_run(self, *args, **kwargs)
+
+    monkeypatch.setattr(LocalRunService, 'update_run', slow_update)
+    assert queue.drain() == 2
+    # -- A writer that loses the lease stops ----------------------------------
+    with db.session() as session:
+        for run_id, state in updates:
+            session.add(RunStateUpdate(run_id=run_id, state=state))
+
+    def takeover(self, *args, **kwargs):
+        with db.session() as session:
+            lease = session.query(RunStateLease).one()
+            lease.owner = 'OTHER'
+        return update_run(self, *args, **kwargs)
+
+    monkeypatch.setattr(LocalRunService, 'update_run', takeover)
+    assert queue.drain() == 0
+    assert queue.discarded == 0
+    with db.session() as session:
+        assert session.query(RunStateUpdate).count() == 2
@@ -0,0 +1,99 @@
+# This file is part of the Reproducible and Reusable Data Analysis Workflow
+# Server (flowServ).
+#
+# Copyright (C) 2019-2021 NYU.
+#
+# flowServ is free software; you can redistribute it and/or modify it under the
+# terms of the MIT License; see LICENSE file for more details.
+
+"""Unit tests for waiting on run state changes."""
+
+from threading import Timer
+
+import pytest
+import time
+
+from flowserv.config import Config
+from flowserv.model.database import DB, TEST_DB
+from flowserv.model.run import RunManager
+from flowserv.service.local import LocalAPIFactory
+from flowserv.tests.controller import StateEngine
+from flowserv.tests.service import create_group, create_user, start_hello_world
+from flowserv.volume.fs import FileSystemStorage, FStore
+
+import flowserv.error as err
+import flowserv.model.workflow.state as st
+import flowserv.service.run.local as local
+
+
+def test_wait_for_run_state_change(hello_world, tmpdir):
+    """Test waiting for the state change of a run that is committed by a
+    different thread.
+    """
+    # -- Setup ----------------------------------------------------------------
+    db = DB(connect_url=TEST_DB(str(tmpdir)))
+    db.init()
+    env = Config().basedir(tmpdir).volume(FStore(basedir=str(tmpdir))).auth()
+    engine = StateEngine()
+    service = LocalAPIFactory(env=env, db=db, engine=engine)
+    with service() as api:
+        user_id = create_user(api)
+        workflow_id = hello_world(api).workflow_id
+    with service(user_id=user_id) as api:
+        group_id = create_group(api, workflow_id=workflow_id)
+        run_id, _ = start_hello_world(api, group_id)
+    # -- Timeout without state change -----------------------------------------
+    with service(user_id=user_id) as api:
+        start = time.monotonic()
+        r = api.runs().wait_for_run(run_id, timeout=0.2)
+        assert r['state'] == st.STATE_PENDING
+        assert time.monotonic() - start >= 0.2
+    # -- Wake up on state change ----------------------------------------------
+    state = engine.runs[run_id]
+
+    def update_run():
+        with service() as api:
+            api.runs().update_run(run_id=run_id, state=state)
+
+    timer = Timer(0.2, update_run)
+    timer.start()
+    with service(user_id=user_id) as api:
+        start = time.monotonic()
+        r = api.runs().wait_for_run(run_id, state=st.STATE_PENDING, timeout=10)
+        assert r['state'] == st.STATE_RUNNING
+        assert time.monotonic() - start < 5
+    timer.join()
+    # -- Return immediately if the state differs ------------------------------
+    with service(user_id=user_id) as api:
+        r = api.runs().wait_for_run(run_id, state=st.STATE_PENDING)
+        assert r['state'] == st.STATE_RUNNING
+
+
+def test_wait_for_deleted_run(hello_world, tmpdir, monkeypatch):
+    """Test error when a run is deleted by a different thread while waiting
+    for a state change.
+    """
+    # -- Setup ----------------------------------------------------------------
+    monkeypatch.setattr(local, 'RECHECK_INTERVAL', 0.1)
+    db = DB(connect_url=TEST_DB(str(tmpdir)))
+    db.init()
+    env = Config().basedir(tmpdir).volume(FStore(basedir=str(tmpdir))).auth()
+    service = LocalAPIFactory(env=env, db=db, engine=StateEngine())
+    with service() as api:
+        user_id = create_user(api)
+        workflow_id = hello_world(api).workflow_id
+    with service(user_id=user_id) as api:
+        group_id = create_group(api, workflow_id=workflow_id)
+        run_id, _ = start_hello_world(api, group_id)
+    # -- Delete run while waiting ---------------------------------------------
+
+    def delete_run():
+        with db.session() as session:
+            RunManager(session=session, fs=FileSystemStorage(basedir=str(tmpdir))).delete_run(run_id)
+
+    timer = Timer(0.2, delete_run)
+    timer.start()
+    with service(user_id=user_id) as api:
+        with pytest.raises(err.UnknownRunError):
+            api.runs().wait_for_run(run_id, timeout=10)
+    timer.join()
@@ -20,3 +20,17 @@ def test_api_components(local_service):
         assert api.uploads() is not None
         assert api.users() is not None
         assert api.workflows() is not None
+
+
+def test_api_components_lazy(local_service):
+    """Test that API components are created on first access and share their
+    managers.
+    """
+    with local_service() as api:
+        assert api._runs is None
+        assert api._groups is None
+        assert api._run_manager is None
+        runs = api.runs()
+        assert api.runs() is runs
+        assert api._groups is None
+        assert api.groups().run_manager is runs.run_manager
@@ -60,3 +60,92 @@ def test_workflow_postproc_client(local_service, hello_world, tmpdir):
             assert run.get_file(name='results/analytics.json') is not None
             assert os.path.isfile(run.get_file(name='results/analytics.json'))
             assert run.get_file(name='results/greeting.txt') is None
+
+
+def test_workflow_postproc_staging(local_service, hello_world, tmpdir):
+    """Test incremental updates of the post-processing staging area."""
+    with local_service() as api:
+        user_1 = create_user(api)
+        workflow_id = hello_world(api).workflow_id
+    with local_service(user_id=user_1) as api:
+        create_ranking(api, workflow_id, 3)
+    basedir = os.path.join(tmpdir, 'postproc_run')
+    with local_service(user_id=user_1) as api:
+        workflow = api.workflows().workflow_repo.get_workflow(workflow_id)
+        ranking = api.workflows().ranking_manager.get_ranking(workflow)
+        run_manager = api.runs().run_manager
+        store = FileSystemStorage(basedir=basedir)
+        prepare_postproc_data(
+            input_files=['results/analytics.json'],
+            ranking=ranking,
+            run_manager=run_manager,
+            store=store
+        )
+        filename = os.path.join(basedir, ranking[0].run_id, 'results', 'analytics.json')
+        inode = os.stat(filename).st_ino
+        # Add a stale folder and remove one run from the ranking. Files for
+        # the remaining runs are reused.
+        os.makedirs(os.path.join(basedir, 'R0000'))
+        util.write_object(filename=os.path.join(basedir, 'R0000', 'a.json'), obj={})
+        prepare_postproc_data(
+            input_files=['results/analytics.json'],
+            ranking=ranking[:2],
+            run_manager=run_manager,
+            store=store
+        )
+        assert os.stat(filename).st_ino == inode
+        assert sorted(os.listdir(basedir)) == sorted([RUNS_FILE] + [r.run_id for r in ranking[:2]])
+        runs = Runs(basedir)
+        assert [r.run_id for r in runs] == [r.run_id for r in ranking[:2]]
+        # Remove files that are no longer in the list of input files.
+        prepare_postproc_data(
+            input_files=[],
+            ranking=ranking[:2],
+            run_manager=run_manager,
+            store=store
+        )
+        for run in Runs(basedir):
+            assert run.get_file(name='results/analytics.json') is None
+            assert not os.path.isfile(os.path.join(basedir, run.run_id, 'results', 'analytics.json'))
+
+
+def test_workflow_postproc_staging_pool(local_service, hello_world, tmpdir):
+    """Test linking run folders from a persistent staging pool."""
+    with local_service() as api:
+        user_1 = create_user(api)
+        workflow_id = hello_world(api).workflow_id
+    with local_service(user_id=user_1) as api:
+        create_ranking(api, workflow_id, 3)
+    pooldir = os.path.join(tmpdir, 'pool')
+    with local_service(user_id=user_1) as api:
+        workflow = api.workflows().workflow_repo.get_workflow(workflow_id)
+        ranking = api.workflows().ranking_manager.get_ranking(workflow)
+        run_manager = api.runs().run_manager
+        pool = FileSystemStorage(basedir=pooldir)
+        prepare_postproc_data(
+            input_files=['results/analytics.json'],
+            ranking=ranking,
+            run_manager=run_manager,
+            store=FileSystemStorage(basedir=os.path.join(tmpdir, 'run1')),
+            pool=pool
+        )
+        filename = os.path.join(ranking[0].run_id, 'results', 'analytics.json')
+        inode = os.stat(os.path.join(pooldir, filename)).st_ino
+        assert os.stat(os.path.join(tmpdir, 'run1', filename)).st_ino == inode
+        assert RUNS_FILE not in os.listdir(pooldir)
+        # The second run reuses the pool files. Runs that are no longer in the
+        # ranking are removed from the pool but not from the first run folder.
+        prepare_postproc_data(
+            input_files=['results/analytics.json'],
+            ranking=ranking[:2],
+            run_manager=run_manager,
+            store=FileSystemStorage(basedir=os.path.join(tmpdir, 'run2')),
+            pool=pool
+        )
+        assert os.stat(os.path.join(pooldir, filename)).st_ino == inode
+        assert os.stat(os.path.join(tmpdir, 'run2', filename)).st_ino == inode
+        assert sorted(os.listdir(pooldir)) == sorted([r.run_id for r in ranking[:2]])
+        assert len(Runs(os.path.join(tmpdir, 'run1'))) == 3
+        runs = Runs(os.path.join(tmpdir, 'run2'))
+        assert [r.run_id for r in runs] == [r.run_id for r in ranking[:2]]
+        assert os.path.isfile(os.path.join(tmpdir, 'run1', ranking[2].run_id, 'results', 'analytics.json'))
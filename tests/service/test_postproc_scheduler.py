@@ -0,0 +1,111 @@
+# This file is part of the Reproducible and Reusable Data Analysis Workflow
+# Server (flowServ).
+#
+# Copyright (C) 2019-2021 NYU.
+#
+# flowServ is free software; you can redistribute it and/or modify it under the
+# terms of the MIT License; see LICENSE file for more details.
+
+"""Unit tests for the post-processing run scheduler."""
+
+from contextlib import contextmanager
+
+import time
+
+from flowserv.config import Config
+from flowserv.service.local import LocalAPIFactory
+from flowserv.service.postproc.scheduler import PostprocScheduler
+from flowserv.volume.fs import FStore
+
+
+class DummyAPI(object):
+    """Dummy API that records the workflows for which the post-processing
+    step was executed.
+    """
+    def __init__(self):
+        self.calls = list()
+
+    def runs(self):
+        return self
+
+    def update_postproc(self, workflow):
+        self.calls.append(workflow)
+
+    def get_workflow(self, workflow_id):
+        return workflow_id
+
+    def workflow_repo(self):
+        return self
+
+
+def dummy_service(api):
+    """Get API factory for the dummy API."""
+    @contextmanager
+    def service():
+        yield api
+
+    return service
+
+
+def wait_for(condition, timeout=5):
+    """Wait until the given condition is satisfied."""
+    start = time.monotonic()
+    while not condition():
+        if time.monotonic() - start > timeout:
+            raise RuntimeError('timeout')
+        time.sleep(0.01)
+
+
+def test_postproc_scheduler_config(tmpdir):
+    """Test initializing the post-processing scheduler for the API factory."""
+    env = Config().basedir(tmpdir).volume(FStore(basedir=str(tmpdir)))
+    assert LocalAPIFactory(env=env).postproc is None
+    env = Config().basedir(tmpdir).volume(FStore(basedir=str(tmpdir))).postproc_delay(1, 10)
+    scheduler = LocalAPIFactory(env=env).postproc
+    assert scheduler.delay == 1
+    assert scheduler.max_delay == 10
+
+
+def test_postproc_scheduler_coalesce():
+    """Test that a burst of requests for a workflow results in a single
+    execution of the post-processing step.
+    """
+    api = DummyAPI()
+    scheduler = PostprocScheduler(service=dummy_service(api), delay=0.2, max_delay=10)
+    for _ in range(50):
+        scheduler.request('W1')
+        scheduler.request('W2')
+    wait_for(lambda: len(api.calls) == 2)
+    time.sleep(0.3)
+    assert sorted(api.calls) == ['W1', 'W2']
+    assert scheduler.pending() == dict()
+
+
+def test_postproc_scheduler_deadlines():
+    """Test the quiet period and the maximum delay for dirty workflows."""
+    api = DummyAPI()
+    scheduler = PostprocScheduler(service=dummy_service(api), delay=10, max_delay=20)
+    # Set the request times explicitly (without starting the worker).
+    scheduler._dirty = {'W1': (0, 5), 'W2': (0, 15)}
+    assert scheduler.due(now=14) == ([], 15)
+    assert scheduler.due(now=15) == (['W1'], 20)
+    assert scheduler.due(now=20) == (['W2'], None)
+    assert scheduler.pending() == dict()
+    # Flush all dirty workflows.
+    scheduler._dirty = {'W1': (0, 5)}
+    assert scheduler.flush() == 1
+    assert api.calls == ['W1']
+
+
+def test_postproc_scheduler_max_delay():
+    """Test that the post-processing step is executed after the maximum delay
+    even if new requests keep arriving.
+    """
+    api = DummyAPI()
+    scheduler = PostprocScheduler(service=dummy_service(api), delay=0.2, max_delay=0.4)
+    start = time.monotonic()
+    while not api.calls:
+        scheduler.request('W1')
+        time.sleep(0.05)
+        assert time.monotonic() - start < 5
+    assert api.calls == ['W1']
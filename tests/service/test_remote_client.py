@@ -0,0 +1,307 @@
+# This file is part of the Reproducible and Reusable Data Analysis Workflow
+# Server (flowServ).
+#
+# Copyright (C) 2019-2021 NYU.
+#
+# flowServ is free software; you can redistribute it and/or modify it under the
+# terms of the MIT License; see LICENSE file for more details.
+
+"""Unit tests for the HTTP session and the asyncio wrapper of the remote
+service client using a local stand-in server.
+"""
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import BytesIO, StringIO
+from threading import Thread
+
+import asyncio
+import json
+import pytest
+import requests
+
+from flowserv.service.api import API
+from flowserv.service.descriptor import ServiceDescriptor
+from flowserv.service.remote import AsyncAPI
+from flowserv.service.run.remote import RemoteRunService
+from flowserv.volume.base import IOBuffer
+
+import flowserv.config as config
+import flowserv.service.remote as remote
+import flowserv.service.run.remote as remote_run
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """Request handler that returns the request path and records the client
+    port for each request.
+    """
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        self.server.ports.append(self.client_address[1])
+        body = json.dumps({'path': self.path}).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        size = int(self.headers['Content-Length'])
+        self.server.uploads.append(self.rfile.read(size))
+        body = json.dumps({'size': size}).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FileHandler(StandInHandler):
+    """Request handler that supports range requests for file downloads. The
+    first download request is interrupted after half of the file was sent.
+    Range requests are ignored if the If-Range header does not match the
+    entity tag of the file.
+    """
+    def do_GET(self):
+        self.server.ports.append(self.client_address[1])
+        self.server.validators.append(self.headers.get('If-Range'))
+        start = 0
+        if 'Range' in self.headers and self.headers.get('If-Range') == self.server.etag:
+            start = int(self.headers['Range'][len('bytes='):-1])
+        self.send_response(206 if start else 200)
+        if start:
+            self.send_header('Content-Range', 'bytes {}-{}/{}'.format(start, len(DATA) - 1, len(DATA)))
+        self.send_header('Content-Length', str(len(DATA) - start))
+        self.send_header('ETag', self.server.etag)
+        self.end_headers()
+        if not self.server.interrupted:
+            self.server.interrupted = True
+            self.wfile.write(DATA[start:len(DATA) // 2])
+            self.close_connection = True
+            return
+        self.wfile.write(DATA[start:])
+
+
+class WaitHandler(StandInHandler):
+    """Request handler for long-polling requests that wait for a run state
+    change. The run state changes after the third request.
+    """
+    def do_GET(self):
+        self.server.ports.append(self.client_address[1])
+        state = 'RUNNING' if len(self.server.ports) > 2 else 'PENDING'
+        body = json.dumps({'id': 'R1', 'state': state, 'path': self.path}).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class FakeResponse(object):
+    """Response for requests that are not sent to a server."""
+    def __init__(self, doc):
+        self.doc = doc
+
+    def json(self):
+        return self.doc
+
+    def raise_for_status(self):
+        pass
+
+
+class PollHandler(StandInHandler):
+    """Request handler for a remote API without the route for long-polling
+    requests. The run state changes after the third request for the run.
+    """
+    def do_GET(self):
+        self.server.ports.append(self.client_address[1])
+        if '/wait' in self.path:
+            self.send_response(404)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        state = 'RUNNING' if len(self.server.ports) > 3 else 'PENDING'
+        body = json.dumps({'id': 'R1', 'state': state, 'path': self.path}).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+"""Content of the downloaded and uploaded files."""
+DATA = bytes(range(256)) * 4096
+
+
+@pytest.fixture(params=[StandInHandler])
+def server(request):
+    """Local stand-in server for the remote API."""
+    server = ThreadingHTTPServer(('127.0.0.1', 0), request.param)
+    server.daemon_threads = True
+    server.ports = list()
+    server.uploads = list()
+    server.interrupted = False
+    server.etag = '"v1"'
+    server.validators = list()
+    thread = Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+    remote.close()
+
+
+def test_async_remote_api(server):
+    """Test running many remote API calls concurrently with asyncio."""
+    doc = ServiceDescriptor.from_config(env=config.env()).to_dict()
+    doc['url'] = 'http://127.0.0.1:{}'.format(server.server_address[1])
+    service = ServiceDescriptor(doc)
+    api = API(
+        service=service,
+        workflow_service=None,
+        group_service=None,
+        upload_service=None,
+        run_service=RemoteRunService(descriptor=service),
+        user_service=None
+    )
+
+    async def get_runs(api):
+        return await asyncio.gather(*[api.runs().get_run('R{}'.format(i)) for i in range(50)])
+
+    with AsyncAPI(api, max_workers=4) as async_api:
+        runs = asyncio.run(get_runs(async_api))
+    assert [r['path'] for r in runs] == ['/runs/R{}'.format(i) for i in range(50)]
+    # Connections are reused. There are at most as many connections as there
+    # are workers.
+    assert len(server.ports) == 50
+    assert len(set(server.ports)) <= 4
+
+
+def test_remote_session_keep_alive(server):
+    """Test that consecutive requests reuse the same connection."""
+    url = 'http://127.0.0.1:{}'.format(server.server_address[1])
+    for i in range(5):
+        assert remote.get('{}/{}'.format(url, i)) == {'path': '/{}'.format(i)}
+    assert len(server.ports) == 5
+    assert len(set(server.ports)) == 1
+    assert remote.session() is remote.session()
+
+
+@pytest.mark.parametrize('server', [FileHandler], indirect=True)
+def test_resume_download(server):
+    """Test resuming an interrupted file download."""
+    url = 'http://127.0.0.1:{}/files/data'.format(server.server_address[1])
+    progress = list()
+    with remote.download_file(url, progress=lambda n, size: progress.append((n, size))) as f:
+        assert f.read() == DATA
+    assert server.interrupted
+    assert len(server.ports) == 2
+    assert progress[-1] == (len(DATA), len(DATA))
+    assert [n for n, _ in progress] == sorted(n for n, _ in progress)
+    assert server.validators == [None, '"v1"']
+
+
+@pytest.mark.parametrize('server', [FileHandler], indirect=True)
+def test_resume_download_changed_file(server):
+    """Test error when resuming the download of a file that changed."""
+    url = 'http://127.0.0.1:{}/files/data'.format(server.server_address[1])
+    with remote.download_file(url) as f:
+        # The file changes after the download started.
+        server.etag = '"v2"'
+        with pytest.raises(IOError):
+            f.read()
+    assert server.validators == [None, '"v1"']
+
+
+def test_upload_file(server):
+    """Test uploading a file as a stream of chunks."""
+    url = 'http://127.0.0.1:{}/upload'.format(server.server_address[1])
+    progress = list()
+    file = IOBuffer(BytesIO(DATA))
+    doc = remote.upload_file(
+        url=url,
+        file=file,
+        name='my"file.bin',
+        progress=lambda n, size: progress.append((n, size))
+    )
+    body = server.uploads[0]
+    assert doc == {'size': len(body)}
+    assert DATA in body
+    assert b'filename="my%22file.bin"' in body
+    assert progress[-1] == (len(DATA), len(DATA))
+
+
+def test_upload_file_retry(monkeypatch):
+    """Test that uploads are only restarted if the request body was not
+    sent.
+    """
+    class FailingSession(object):
+        def __init__(self, failures, send):
+            self.failures = failures
+            self.send = send
+            self.requests = 0
+
+        def post(self, url, data, headers):
+            self.requests += 1
+            if self.requests <= self.failures:
+                if self.send:
+                    next(iter(data))
+                raise requests.exceptions.ConnectionError('connection reset')
+            return FakeResponse({'size': len(data)})
+
+    file = IOBuffer(BytesIO(DATA))
+    # Connection errors before the body is sent are retried.
+    session = FailingSession(failures=2, send=False)
+    monkeypatch.setattr(remote, 'session', lambda: session)
+    assert remote.upload_file(url='http://upload', file=file, name='f') is not None
+    assert session.requests == 3
+    # Uploads that failed while the body was sent are not repeated.
+    session = FailingSession(failures=1, send=True)
+    monkeypatch.setattr(remote, 'session', lambda: session)
+    with pytest.raises(requests.exceptions.ConnectionError):
+        remote.upload_file(url='http://upload', file=file, name='f')
+    assert session.requests == 1
+
+
+def test_upload_text_file(server):
+    """Test uploading a file that is opened in text mode."""
+    url = 'http://127.0.0.1:{}/upload'.format(server.server_address[1])
+    doc = remote.upload_file(url=url, file=IOBuffer(StringIO('Hällo')), name='a.txt')
+    body = server.uploads[0]
+    assert doc == {'size': len(body)}
+    assert 'Hällo'.encode('utf-8') in body
+
+
+@pytest.mark.parametrize('server', [WaitHandler], indirect=True)
+def test_wait_for_run(server):
+    """Test waiting for a run state change with long-polling requests."""
+    doc = ServiceDescriptor.from_config(env=config.env()).to_dict()
+    doc['url'] = 'http://127.0.0.1:{}'.format(server.server_address[1])
+    service = RemoteRunService(descriptor=ServiceDescriptor(doc))
+    # Timeout before the state changes.
+    doc = service.wait_for_run('R1', state='PENDING', timeout=0)
+    assert doc['state'] == 'PENDING'
+    assert doc['path'].startswith('/runs/R1/wait?')
+    assert 'state=PENDING' in doc['path']
+    # Repeat requests until the state changes.
+    doc = service.wait_for_run('R1', state='PENDING')
+    assert doc['state'] == 'RUNNING'
+    assert len(server.ports) == 3
+
+
+@pytest.mark.parametrize('server', [PollHandler], indirect=True)
+def test_wait_for_run_without_longpolling(server, monkeypatch):
+    """Test polling the run state if the remote API does not support
+    long-polling requests.
+    """
+    monkeypatch.setattr(remote_run, 'POLL_INTERVAL', 0.01)
+    doc = ServiceDescriptor.from_config(env=config.env()).to_dict()
+    doc['url'] = 'http://127.0.0.1:{}'.format(server.server_address[1])
+    service = RemoteRunService(descriptor=ServiceDescriptor(doc))
+    doc = service.wait_for_run('R1', state='PENDING')
+    assert doc['state'] == 'RUNNING'
+    assert doc['path'] == '/runs/R1'
+    assert len(server.ports) == 4
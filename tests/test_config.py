@@ -79,6 +79,12 @@ def test_config_setter():
     conf = conf.multiprocess_engine()
     assert conf[config.FLOWSERV_BACKEND_MODULE] == 'flowserv.controller.serial.engine.base'
     assert conf[config.FLOWSERV_BACKEND_CLASS] == 'SerialWorkflowEngine'
+    # Password hashing
+    conf = conf.password_hashing(rounds=1000)
+    assert conf[config.FLOWSERV_AUTH_HASHROUNDS] == 1000
+    conf = conf.password_hashing(rounds=2000, workers=4)
+    assert conf[config.FLOWSERV_AUTH_HASHROUNDS] == 2000
+    assert conf[config.FLOWSERV_AUTH_HASHWORKERS] == 4
     # Sync engine
     conf = conf.run_sync()
     assert not conf[config.FLOWSERV_ASYNC]
@@ -41,6 +41,15 @@ def test_cleardir(tmpdir):
     assert os.path.isdir(tmpdir)
 
 
+def test_cursor():
+    """Test encoding and decoding pagination cursors."""
+    cursor = util.encode_cursor(['2021-01-01T00:00:00', 'ABC'])
+    assert util.decode_cursor(cursor) == ['2021-01-01T00:00:00', 'ABC']
+    for value in ['abc', util.encode_cursor({'A': 1})[:-2], None]:
+        with pytest.raises(ValueError):
+            util.decode_cursor(value)
+
+
 def test_datetime():
     """Ensure that timestamp conversion works for ISO strings with or
     without milliseconds.
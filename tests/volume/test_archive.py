@@ -0,0 +1,90 @@
+# This file is part of the Reproducible and Reusable Data Analysis Workflow
+# Server (flowServ).
+#
+# Copyright (C) 2019-2021 NYU.
+#
+# flowServ is free software; you can redistribute it and/or modify it under the
+# terms of the MIT License; see LICENSE file for more details.
+
+"""Unit tests for the streaming tar archive generator."""
+
+import json
+import os
+import pytest
+import sys
+import tarfile
+
+from flowserv.volume.archive import ArchiveFile, archive, compressor, tar_blocks
+from flowserv.volume.fs import FileSystemStorage
+
+import flowserv.error as err
+
+
+FILES = [
+    ('A.json', 'A.json'),
+    ('examples/B.json', os.path.join('examples', 'B.json')),
+    ('data.json', os.path.join('examples', 'data', 'data.json'))
+]
+
+
+@pytest.mark.parametrize('format,mode', [('gzip', 'r|gz'), ('none', 'r|')])
+def test_archive_formats(format, mode, basedir, data_a, data_e):
+    """Test reading streamed archives in different formats."""
+    fh = archive(store=FileSystemStorage(basedir=basedir), files=FILES, format=format)
+    with tarfile.open(fileobj=fh.open(), mode=mode) as tar:
+        members = dict()
+        for info in tar:
+            members[info.name] = json.load(tar.extractfile(info))
+    assert set(members) == {'A.json', 'examples/B.json', 'data.json'}
+    assert members['A.json'] == data_a
+    assert members['data.json'] == data_e
+    # The archive size matches the number of bytes that are read.
+    assert fh.size() == len(fh.open().read())
+
+
+def test_archive_tar_blocks(basedir):
+    """Test the blocks of uncompressed tar archives."""
+    store = FileSystemStorage(basedir=basedir)
+    files = [(name, store.load(key)) for name, key in FILES]
+    data = b''.join(tar_blocks(files))
+    assert len(data) % tarfile.RECORDSIZE == 0
+    assert archive(store, FILES, format='none').size() == len(data)
+    with tarfile.open(fileobj=archive(store, FILES, format='none').open(), mode='r|') as tar:
+        assert tar.getnames() == [name for name, _ in FILES]
+    # Empty archive.
+    assert len(b''.join(tar_blocks([]))) == tarfile.RECORDSIZE
+
+
+def test_archive_invalid_format(basedir):
+    """Test error for unknown archive formats."""
+    with pytest.raises(err.InvalidArgumentError):
+        archive(store=FileSystemStorage(basedir=basedir), files=FILES, format='zip')
+
+
+def test_archive_invalid_level(basedir):
+    """Test error for invalid compression levels when the archive is created."""
+    with pytest.raises(err.InvalidArgumentError):
+        archive(store=FileSystemStorage(basedir=basedir), files=FILES, format='gzip', level=42)
+    with pytest.raises(err.InvalidArgumentError):
+        compressor(format='gzip', level='high')
+
+
+def test_archive_zstd(basedir, data_a):
+    """Test reading streamed archives in zstd format."""
+    zstandard = pytest.importorskip('zstandard')
+    fh = archive(store=FileSystemStorage(basedir=basedir), files=FILES, format='zstd', level=1)
+    assert fh.suffix == '.tar.zst'
+    reader = zstandard.ZstdDecompressor().stream_reader(fh.open())
+    with tarfile.open(fileobj=reader, mode='r|') as tar:
+        members = dict()
+        for info in tar:
+            members[info.name] = json.load(tar.extractfile(info))
+    assert set(members) == {'A.json', 'examples/B.json', 'data.json'}
+    assert members['A.json'] == data_a
+
+
+def test_archive_zstd_missing_package(basedir, monkeypatch):
+    """Test error for the zstd format if the zstandard package is missing."""
+    monkeypatch.setitem(sys.modules, 'zstandard', None)
+    with pytest.raises(err.InvalidArgumentError):
+        ArchiveFile(files=[], format='zstd')
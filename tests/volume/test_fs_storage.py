@@ -8,10 +8,13 @@
 
 """Unit tests for the file system storage volume manager."""
 
+from io import BytesIO
+
 import json
 import os
 import pytest
 
+from flowserv.volume.base import IOBuffer
 from flowserv.volume.fs import FileSystemStorage, walkdir, FS_STORE
 
 import flowserv.error as err
@@ -80,6 +83,24 @@ def test_fs_volume_init(basedir):
     store.close()
 
 
+def test_fs_volume_link_file(basedir, emptydir, data_e):
+    """Test creating hard links for files in a storage volume."""
+    source = FileSystemStorage(basedir=basedir)
+    target = FileSystemStorage(basedir=emptydir)
+    file = source.load('examples/data/data.json')
+    target.link(file=file, dst='data/data.json')
+    filename = os.path.join(emptydir, 'data', 'data.json')
+    assert os.path.samefile(file.filename, filename)
+    # Storing a file at the destination path replaces the link.
+    target.store(file=IOBuffer(BytesIO(b'{}')), dst='data/data.json')
+    assert not os.path.samefile(file.filename, filename)
+    with source.load('examples/data/data.json').open() as f:
+        assert json.load(f) == data_e
+    with target.load('data/data.json').open() as f:
+        assert json.load(f) == {}
+    assert os.listdir(os.path.join(emptydir, 'data')) == ['data.json']
+
+
 def test_fs_volume_load_file(basedir, data_e):
     """Test loading a file from a file system storage volume."""
     store = FileSystemStorage(basedir=basedir)